@@ -9,6 +9,8 @@ MESA交易所适配层模块
 - ExchangeAdapter: 交易所适配器基类
 - ExchangeFactory: 交易所工厂，统一管理和创建交易所实例
 - ExchangeManager: 交易所管理器，处理生命周期管理
+- LocalOrderBook: 本地增量订单簿引擎（WebSocket适配器共享）
+- AccountStateService: 账户状态共享服务（REST轮询请求合并 + 短TTL缓存）
 - 具体交易所实现: HyperliquidAdapter, BackpackAdapter, BinanceAdapter
 
 特性:
@@ -36,9 +38,12 @@ from .models import (
     TickerData,
     OHLCVData,
     OrderBookData,
+    TopOfBook,
     TradeData
 )
 from .adapter import ExchangeAdapter
+from .local_orderbook import LocalOrderBook
+from .account_state import AccountStateService, get_account_state_service
 from .factory import ExchangeFactory, get_exchange_factory
 from .manager import ExchangeManager
 
@@ -48,6 +53,7 @@ from .adapters.backpack import BackpackAdapter
 from .adapters.binance import BinanceAdapter
 from .adapters.paradex import ParadexAdapter
 from .adapters.variational import VariationalAdapter
+from .adapters.simulated import SimulatedExchangeAdapter
 
 __all__ = [
     # 核心接口和基类
@@ -69,7 +75,11 @@ __all__ = [
     'TickerData',
     'OHLCVData',
     'OrderBookData',
+    'TopOfBook',
     'TradeData',
+    'LocalOrderBook',
+    'AccountStateService',
+    'get_account_state_service',
 
     # 管理组件
     'ExchangeFactory',
@@ -82,6 +92,7 @@ __all__ = [
     'BinanceAdapter',
     'ParadexAdapter',
     'VariationalAdapter',
+    'SimulatedExchangeAdapter',
 ]
 
 # 版本信息
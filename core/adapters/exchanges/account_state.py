@@ -0,0 +1,353 @@
+"""
+账户状态共享服务 - REST 轮询请求合并 + 短 TTL 缓存
+
+同一账户上往往有多个组件各自轮询 REST：
+- PositionMonitor 定时查询持仓
+- OrderHealthChecker 健康检查查询挂单/持仓
+- GridEngineImpl REST 轮询挂单
+- BalanceMonitor 定时查询余额
+它们查询的是同一份账户状态，请求高度重叠，容易触发交易所限频。
+
+本模块：
+- single-flight：相同请求（同一账户、同一方法、同一参数）同时只有一个在途，其余协程等待同一结果
+- 短 TTL 缓存：结果通过 ExchangeCacheManager 缓存（默认 1~3 秒，见 cache_config.ACCOUNT_STATE_TTL_CONFIG）
+- 失效：本进程下单/撤单后调用 invalidate('open_orders')，失效之前发起的请求结果不会再被使用
+- 跨进程共享（可选）：设置环境变量 ACCOUNT_STATE_SHARED_DIR 后，结果同时写入该目录，
+  多个网格进程通过文件锁合并同一账户的请求
+
+需要实时数据的场景（成交事件触发、下单后的校验）传 fresh=True 绕过缓存。
+"""
+
+import asyncio
+import hashlib
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .models import BalanceData, OrderData, PositionData
+from .utils.cache_config import get_account_state_ttl
+from .utils.cache_manager import ExchangeCacheManager
+from .utils.logger_factory import get_exchange_logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows 不支持跨进程共享
+    fcntl = None
+
+logger = get_exchange_logger("ExchangeAdapter.account_state")
+
+SHARED_DIR_ENV = "ACCOUNT_STATE_SHARED_DIR"
+
+# 服务内缓存类型 -> ExchangeCacheManager 的缓存分区
+_CACHE_TYPES = {
+    'open_orders': 'open_orders',
+    'positions': 'position',
+    'balances': 'balance',
+}
+
+
+def account_key_for(adapter: Any) -> str:
+    """
+    计算适配器对应的账户标识（凭据的哈希，不含明文）
+
+    同一账户使用不同凭据时会被视为不同账户，只会少合并，不会串号。
+    """
+    config = getattr(adapter, 'config', None)
+    parts = [
+        str(getattr(config, 'exchange_id', '') or type(adapter).__name__),
+        str(bool(getattr(config, 'testnet', False))),
+    ]
+    for field_name in ('api_key', 'api_secret', 'private_key', 'wallet_address'):
+        parts.append(str(getattr(config, field_name, '') or ''))
+    extra = getattr(config, 'extra_params', None)
+    if isinstance(extra, dict):
+        for field_name in ('account_index', 'api_key_index', 'sub_account'):
+            if extra.get(field_name) is not None:
+                parts.append(f"{field_name}={extra[field_name]}")
+    digest = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:16]
+    return f"{parts[0]}_{digest}"
+
+
+class _SharedAccountState:
+    """单个账户的共享状态（缓存、在途请求、失效时间），进程内所有服务视图共用"""
+
+    def __init__(self, account_key: str, shared_dir: Optional[Path]):
+        self.account_key = account_key
+        self.cache = ExchangeCacheManager(exchange_id=account_key)
+        # 在途请求：(kind, key) -> (发起时间, Future)
+        self.inflight: Dict[Tuple[str, str], Tuple[float, asyncio.Future]] = {}
+        # 各类数据最近一次失效的时间（time.time），早于该时间发起的请求结果作废
+        self.invalidated_at: Dict[str, float] = {}
+        self.shared_dir = shared_dir
+        self.stats: Dict[str, int] = {
+            'requests': 0,
+            'cache_hits': 0,
+            'coalesced': 0,
+            'fetches': 0,
+            'shared_hits': 0,
+            'errors': 0,
+        }
+
+
+_states: Dict[str, _SharedAccountState] = {}
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    # 没有协程在等待时，避免 asyncio 报 "Future exception was never retrieved"
+    if not future.cancelled():
+        future.exception()
+
+
+def _resolve_shared_dir(shared_dir: Optional[str]) -> Optional[Path]:
+    path = shared_dir if shared_dir is not None else os.environ.get(SHARED_DIR_ENV)
+    if not path or fcntl is None:
+        return None
+    try:
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory
+    except Exception as e:
+        logger.warning(f"⚠️ [账户状态] 跨进程共享目录不可用，仅进程内共享: {path} ({e})")
+        return None
+
+
+class AccountStateService:
+    """
+    账户状态查询服务（适配器视图）
+
+    同一账户的多个视图共享缓存与在途请求；实际请求使用各自绑定的适配器发出。
+    通过 get_account_state_service(adapter) 获取。
+    """
+
+    def __init__(self, adapter: Any, state: _SharedAccountState):
+        self.adapter = adapter
+        self._state = state
+
+    @property
+    def account_key(self) -> str:
+        return self._state.account_key
+
+    # ============= 查询接口 =============
+
+    async def get_open_orders(self, symbol: Optional[str] = None, fresh: bool = False) -> List[OrderData]:
+        """查询挂单（同参数请求合并 + 短 TTL 缓存）"""
+        return await self._get(
+            'open_orders', symbol or '*', lambda: self.adapter.get_open_orders(symbol), fresh
+        )
+
+    async def get_positions(self, symbols: Optional[List[str]] = None, fresh: bool = False) -> List[PositionData]:
+        """查询持仓（同参数请求合并 + 短 TTL 缓存）"""
+        key = ",".join(sorted(symbols)) if symbols else '*'
+        return await self._get(
+            'positions', key, lambda: self.adapter.get_positions(symbols), fresh
+        )
+
+    async def get_balances(self, fresh: bool = False) -> List[BalanceData]:
+        """查询余额（同参数请求合并 + 短 TTL 缓存）"""
+        return await self._get('balances', '*', self.adapter.get_balances, fresh)
+
+    def invalidate(self, kind: Optional[str] = None) -> None:
+        """
+        使缓存失效（下单/撤单后调用）
+
+        Args:
+            kind: open_orders / positions / balances，None 表示全部
+        """
+        now = time.time()
+        kinds = [kind] if kind else list(_CACHE_TYPES)
+        for name in kinds:
+            self._state.invalidated_at[name] = now
+            self._state.cache.clear(_CACHE_TYPES[name])
+            self._remove_shared(name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self._state.stats)
+        stats['account'] = self._state.account_key
+        stats['inflight'] = len(self._state.inflight)
+        stats['shared'] = self._state.shared_dir is not None
+        return stats
+
+    # ============= 内部实现 =============
+
+    async def _get(
+        self,
+        kind: str,
+        key: str,
+        fetch: Callable[[], Awaitable[list]],
+        fresh: bool,
+    ) -> list:
+        state = self._state
+        state.stats['requests'] += 1
+        invalidated_at = state.invalidated_at.get(kind, 0.0)
+        ttl = get_account_state_ttl(kind)
+
+        if not fresh:
+            cached = state.cache.get(_CACHE_TYPES[kind], key)
+            if cached is not None and cached[0] >= invalidated_at:
+                state.stats['cache_hits'] += 1
+                return list(cached[1])
+
+        slot = (kind, key)
+        entry = state.inflight.get(slot)
+        # 只合并失效之后发起的在途请求；fresh 请求总是重新发起（后续普通请求会合并到它上面）
+        if not fresh and entry is not None and entry[0] >= invalidated_at:
+            state.stats['coalesced'] += 1
+            try:
+                return list(await asyncio.shield(entry[1]))
+            except asyncio.CancelledError:
+                if not entry[1].cancelled():
+                    raise
+                # 发起请求的协程被取消（而不是自己），改为自己发起请求
+
+        started_at = time.time()
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_exception)
+        state.inflight[slot] = (started_at, future)
+        try:
+            result = await self._fetch(kind, key, fetch, started_at, ttl, fresh)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            state.stats['errors'] += 1
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            if state.inflight.get(slot, (None, None))[1] is future:
+                del state.inflight[slot]
+
+        if started_at >= state.invalidated_at.get(kind, 0.0):
+            state.cache.set(_CACHE_TYPES[kind], key, (started_at, result), ttl=ttl)
+        return list(result)
+
+    async def _fetch(
+        self,
+        kind: str,
+        key: str,
+        fetch: Callable[[], Awaitable[list]],
+        started_at: float,
+        ttl: float,
+        fresh: bool,
+    ) -> list:
+        state = self._state
+        if state.shared_dir is None:
+            state.stats['fetches'] += 1
+            return list(await fetch() or [])
+
+        path = self._shared_path(kind, key)
+        invalidated_at = state.invalidated_at.get(kind, 0.0)
+        if not fresh:
+            shared = self._read_shared(path, ttl, invalidated_at)
+            if shared is not None:
+                state.stats['shared_hits'] += 1
+                return shared
+
+        # 跨进程 single-flight：持有文件锁的进程负责请求，其余进程等锁释放后直接读结果
+        lock_fd = await self._acquire_lock(path.with_suffix('.lock'))
+        try:
+            if not fresh:
+                shared = self._read_shared(path, ttl, invalidated_at)
+                if shared is not None:
+                    state.stats['shared_hits'] += 1
+                    return shared
+            state.stats['fetches'] += 1
+            result = list(await fetch() or [])
+            self._write_shared(path, started_at, result)
+            return result
+        finally:
+            self._release_lock(lock_fd)
+
+    # ============= 跨进程共享 =============
+
+    def _shared_path(self, kind: str, key: str) -> Path:
+        key_hash = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+        return self._state.shared_dir / f"{self._state.account_key}.{kind}.{key_hash}.pkl"
+
+    @staticmethod
+    def _read_shared(path: Path, ttl: float, invalidated_at: float) -> Optional[list]:
+        try:
+            with path.open('rb') as f:
+                started_at, result = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"[账户状态] 读取共享缓存失败: {path.name} ({e})")
+            return None
+        if started_at < invalidated_at or time.time() - started_at >= ttl:
+            return None
+        return result
+
+    @staticmethod
+    def _write_shared(path: Path, started_at: float, result: list) -> None:
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with tmp_path.open('wb') as f:
+                pickle.dump((started_at, result), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.debug(f"[账户状态] 写入共享缓存失败: {path.name} ({e})")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def _remove_shared(self, kind: str) -> None:
+        if self._state.shared_dir is None:
+            return
+        for path in self._state.shared_dir.glob(f"{self._state.account_key}.{kind}.*.pkl"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    @staticmethod
+    async def _acquire_lock(lock_path: Path, timeout: float = 10.0) -> Optional[int]:
+        """获取跨进程文件锁（轮询非阻塞加锁，超时后不加锁直接请求）"""
+        try:
+            fd = os.open(str(lock_path), os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            return None
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    return None
+                await asyncio.sleep(0.02)
+            except OSError:
+                os.close(fd)
+                return None
+
+    @staticmethod
+    def _release_lock(fd: Optional[int]) -> None:
+        if fd is None:
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+def get_account_state_service(adapter: Any, shared_dir: Optional[str] = None) -> AccountStateService:
+    """
+    获取适配器对应账户的状态服务
+
+    同一账户（按凭据识别）的所有调用方共享缓存与在途请求。
+
+    Args:
+        adapter: 交易所适配器
+        shared_dir: 跨进程共享目录（默认读取环境变量 ACCOUNT_STATE_SHARED_DIR，未设置则只在进程内共享）
+    """
+    account_key = account_key_for(adapter)
+    state = _states.get(account_key)
+    if state is None:
+        state = _SharedAccountState(account_key, _resolve_shared_dir(shared_dir))
+        _states[account_key] = state
+    return AccountStateService(adapter, state)
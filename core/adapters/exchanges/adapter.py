@@ -7,13 +7,15 @@
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from typing import Dict, List, Optional, Any, Callable
 from decimal import Decimal
 import traceback
 
 from ...services.events import Event, HealthCheckEvent
 from .interface import ExchangeInterface, ExchangeConfig, ExchangeStatus
+from .utils.rate_limiter import TokenBucket
 from .models import (
     OrderData,
     PositionData,
@@ -94,7 +96,7 @@ class ExchangeAdapter(ExchangeInterface):
 
         # 限频控制
         self._rate_limits: Dict[str, List[float]] = {}
-        self._request_timestamps: Dict[str, List[datetime]] = {}
+        self._rate_buckets: Dict[str, TokenBucket] = {}
 
         # 健康监控
         self._health_metrics = {
@@ -374,35 +376,24 @@ class ExchangeAdapter(ExchangeInterface):
         if operation not in self.config.rate_limits:
             return
 
-        limit_config = self.config.rate_limits[operation]
-        max_requests = limit_config.get('max_requests', 100)
-        time_window = limit_config.get('time_window', 60)  # 秒
+        bucket = self._rate_buckets.get(operation)
+        if bucket is None:
+            # max_requests/time_window 折算为令牌桶：容量=max_requests，补充速率=max_requests/time_window
+            limit_config = self.config.rate_limits[operation]
+            max_requests = limit_config.get('max_requests', 100)
+            time_window = limit_config.get('time_window', 60)  # 秒
+            bucket = TokenBucket(max_requests / max(time_window, 1e-6), max_requests)
+            self._rate_buckets[operation] = bucket
+
+        now = time.monotonic()
+        bucket.refill(now)
+        wait_time = bucket.wait_time(1)
+        # 先扣令牌再等待，并发请求依次排到后面的时间点
+        bucket.take(1)
+        if wait_time > 0:
+            self.logger.warning(f"触发限频，等待 {wait_time:.2f} 秒")
+            await asyncio.sleep(wait_time)
 
-        now = datetime.now()
-
-        # 初始化时间戳列表
-        if operation not in self._request_timestamps:
-            self._request_timestamps[operation] = []
-
-        timestamps = self._request_timestamps[operation]
-
-        # 清理过期的时间戳
-        cutoff_time = now - timedelta(seconds=time_window)
-        timestamps[:] = [ts for ts in timestamps if ts > cutoff_time]
-
-        # 检查是否超过限制
-        if len(timestamps) >= max_requests:
-            # 计算需要等待的时间
-            oldest_timestamp = timestamps[0]
-            wait_time = (oldest_timestamp +
-                         timedelta(seconds=time_window) - now).total_seconds()
-
-            if wait_time > 0:
-                self.logger.warning(f"触发限频，等待 {wait_time:.2f} 秒")
-                await asyncio.sleep(wait_time)
-
-        # 记录当前请求时间戳
-        timestamps.append(now)
         self._health_metrics['total_requests'] += 1
 
     # === 心跳检测 ===
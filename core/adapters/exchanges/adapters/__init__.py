@@ -12,6 +12,7 @@
    - EdgeX: 永续合约交易所
    - Lighter: 永续合约交易所
    - Paradex: 永续合约交易所
+   - Simulated: 本地模拟交易所（离线撮合，执行链路压测）
 
    每个适配器都包含:
    - 完整的交易功能实现
@@ -28,6 +29,7 @@ from .edgex import EdgeXAdapter
 from .lighter import LighterAdapter
 from .paradex import ParadexAdapter
 from .variational import VariationalAdapter
+from .simulated import SimulatedExchangeAdapter
 
 __all__ = [
     'HyperliquidAdapter',
@@ -38,4 +40,5 @@ __all__ = [
     'LighterAdapter',
     'ParadexAdapter',
     'VariationalAdapter',
+    'SimulatedExchangeAdapter',
 ]
@@ -7,7 +7,6 @@ Backpack交易所适配器 - 重构版本
 """
 
 import asyncio
-import aiohttp
 import time
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Callable
@@ -20,6 +19,7 @@ from ..adapter import ExchangeAdapter
 from ..interface import ExchangeConfig
 from ..models import *
 from ..subscription_manager import create_subscription_manager, DataType
+from ..utils.http_client import create_session
 from .backpack_base import BackpackBase
 from .backpack_rest import BackpackRest
 from .backpack_websocket import BackpackWebSocket
@@ -168,7 +168,8 @@ class BackpackAdapter(ExchangeAdapter):
         try:
             # 创建session
             if not self._session or self._session.closed:
-                self._session = aiohttp.ClientSession()
+                # 🔥 调优连接池 + 预热/保温，下单不再包含 TCP/TLS 握手
+                self._session = create_session("backpack", warm_urls=[self._rest.base_url])
 
             # 设置session给各模块使用
             self._rest.session = self._session
@@ -730,6 +731,15 @@ class BackpackAdapter(ExchangeAdapter):
                 self.logger.error(f"Backpack批量订阅ticker失败: {str(e)}")
             raise
 
+    def set_top_of_book_mode(self, enabled: bool) -> None:
+        """
+        设置订单簿BBO模式
+
+        开启后订单簿回调收到轻量的 TopOfBook（仅最优一档），
+        完整深度在访问 bids / asks 时才从本地订单簿懒加载。
+        """
+        self._websocket.set_top_of_book_mode(enabled)
+
     async def batch_subscribe_orderbooks(
         self,
         symbols: Optional[List[str]] = None,
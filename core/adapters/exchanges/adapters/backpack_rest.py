@@ -22,6 +22,8 @@ except ImportError:  # pragma: no cover
     _PY_NACL_AVAILABLE = False
 
 from .backpack_base import BackpackBase, BackpackSymbolInfo
+from ..utils.rate_limiter import EndpointClass, get_rate_limiter, classify_request
+from ..utils.http_client import create_session
 from ..models import (
     BalanceData, OrderData, OrderSide, OrderType, OrderStatus,
     TickerData, OrderBookData, OrderBookLevel, TradeData, PositionData, PositionSide,
@@ -46,6 +48,8 @@ class BackpackRest(BackpackBase):
         if not self.api_secret and private_key:
             self.api_secret = private_key
         self.is_authenticated = bool(self.api_key and self.api_secret)
+        # 🔥 进程内共享的令牌桶限流（撤单/下单优先于余额轮询）
+        self._rate_limiter = get_rate_limiter("backpack")
         
         if self.logger:
             if self.is_authenticated:
@@ -74,13 +78,15 @@ class BackpackRest(BackpackBase):
     async def connect(self) -> bool:
         """连接到Backpack REST API"""
         try:
-            # 创建HTTP session
-            self.session = aiohttp.ClientSession()
+            # 创建HTTP session（由 BackpackAdapter 注入时直接复用）
+            if not self.session or self.session.closed:
+                self.session = create_session("backpack", warm_urls=[self.base_url])
 
             # 测试API连接并获取市场数据（一次性完成）
             if self.logger:
                 self.logger.info("测试Backpack API连接并获取市场数据...")
 
+            await self._rate_limiter.acquire(EndpointClass.MARKET)
             async with self.session.get(f"{self.base_url}api/v1/markets", timeout=10) as response:
                 if response.status == 200:
                     if self.logger:
@@ -187,6 +193,7 @@ class BackpackRest(BackpackBase):
     async def health_check(self) -> Dict[str, Any]:
         """健康检查"""
         try:
+            await self._rate_limiter.acquire(EndpointClass.MARKET)
             async with self.session.get(f"{self.base_url}api/v1/markets", timeout=5) as response:
                 if response.status == 200:
                     return {
@@ -213,6 +220,7 @@ class BackpackRest(BackpackBase):
         """心跳检查"""
         if self.session:
             try:
+                await self._rate_limiter.acquire(EndpointClass.MARKET)
                 await self.session.get(f"{self.base_url}api/v1/markets", timeout=5)
             except Exception as e:
                 if self.logger:
@@ -383,6 +391,7 @@ class BackpackRest(BackpackBase):
 
         # 发送请求
         url = f"{self.base_url.rstrip('/')}{endpoint}"
+        await self._rate_limiter.acquire(classify_request(method, endpoint, private=True))
 
         async with self.session.request(
             method=method.upper(),
@@ -414,6 +423,7 @@ class BackpackRest(BackpackBase):
                             self.logger.info(f"API返回纯文本响应: {text_response}")
                         return text_response
             else:
+                self._rate_limiter.observe_status(response.status, response.headers)
                 error_text = await response.text()
                 if self.logger:
                     self.logger.warning(
@@ -714,6 +724,7 @@ class BackpackRest(BackpackBase):
                 raise Exception("无法建立Backpack连接")
 
             # 使用公开API获取ticker数据
+            await self._rate_limiter.acquire(EndpointClass.MARKET)
             async with self.session.get(f"{self.base_url}api/v1/ticker?symbol={mapped_symbol}") as response:
                 if response.status == 200:
                     data = await response.json()
@@ -761,6 +772,7 @@ class BackpackRest(BackpackBase):
                     raise Exception("无法建立Backpack连接")
 
                 # 获取所有ticker数据
+                await self._rate_limiter.acquire(EndpointClass.MARKET)
                 async with self.session.get(f"{self.base_url}api/v1/tickers") as response:
                     if response.status == 200:
                         data = await response.json()
@@ -1844,6 +1856,7 @@ class BackpackRest(BackpackBase):
                 self.logger.info("开始获取Backpack支持的交易对列表...")
 
             # 调用市场API获取所有交易对
+            await self._rate_limiter.acquire(EndpointClass.MARKET)
             async with self.session.get(f"{self.base_url}api/v1/markets") as response:
                 if response.status == 200:
                     markets_data = await response.json()
@@ -1933,6 +1946,7 @@ class BackpackRest(BackpackBase):
                 params["limit"] = limit
 
             # 调用公共API - 不需要认证
+            await self._rate_limiter.acquire(EndpointClass.MARKET)
             async with self.session.get(f"{self.base_url}api/v1/depth", params=params) as response:
                 if response.status == 200:
                     data = await response.json()
@@ -1972,6 +1986,7 @@ class BackpackRest(BackpackBase):
     async def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
         """获取单个交易对行情数据"""
         try:
+            await self._rate_limiter.acquire(EndpointClass.MARKET)
             async with self.session.get(f"{self.base_url}api/v1/ticker?symbol={symbol}") as response:
                 if response.status == 200:
                     return await response.json()
@@ -1986,6 +2001,7 @@ class BackpackRest(BackpackBase):
     async def fetch_all_tickers(self) -> List[Dict[str, Any]]:
         """获取所有交易对行情数据"""
         try:
+            await self._rate_limiter.acquire(EndpointClass.MARKET)
             async with self.session.get(f"{self.base_url}api/v1/tickers") as response:
                 if response.status == 200:
                     return await response.json()
@@ -2052,6 +2068,7 @@ class BackpackRest(BackpackBase):
                 params["limit"] = limit
 
             # 使用公开API获取K线数据
+            await self._rate_limiter.acquire(EndpointClass.MARKET)
             async with self.session.get(f"{self.base_url}api/v1/klines", params=params) as response:
                 if response.status == 200:
                     return await response.json()
@@ -2179,6 +2196,7 @@ class BackpackRest(BackpackBase):
         """获取最近成交"""
         try:
             params = {"symbol": symbol, "limit": limit}
+            await self._rate_limiter.acquire(EndpointClass.MARKET)
             async with self.session.get(f"{self.base_url}api/v1/trades", params=params) as response:
                 if response.status == 200:
                     return await response.json()
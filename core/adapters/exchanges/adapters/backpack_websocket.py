@@ -15,6 +15,8 @@ from decimal import Decimal
 from datetime import datetime
 
 from .backpack_base import BackpackBase
+from ..local_orderbook import LocalOrderBook
+from ..utils.http_client import create_session, get_shared_session
 from ..models import (
     TickerData, OrderBookData, TradeData, OrderBookLevel, OrderSide,
     OrderData, OrderStatus, OrderType
@@ -50,6 +52,7 @@ class BackpackWebSocket(BackpackBase):
         self.trades_callback = None
         self.user_data_callback = None
         self._user_data_callbacks: List[Callable[[Dict[str, Any]], None]] = []
+        self._frame_recorder = None  # 🔥 原始帧录制器（FrameWriter，可选；用于离线回放）
 
         # 初始化状态变量
         self._ws_connected = False
@@ -99,8 +102,10 @@ class BackpackWebSocket(BackpackBase):
         # 因此不使用业务消息超时作为重连触发条件
 
         # 🔥 本地订单簿缓存（用于处理增量更新，参考EdgeX实现）
-        # {symbol: {bids: {price: size}, asks: {price: size}}}
-        self._local_orderbooks: Dict[str, Dict[str, Dict[Decimal, Decimal]]] = {}
+        # {symbol: LocalOrderBook}
+        self._local_orderbooks: Dict[str, LocalOrderBook] = {}
+        # 🔥 BBO模式：只推送 TopOfBook，完整深度按需懒加载
+        self._top_of_book_mode = False
         
         # orderbook数据缓存（用于ticker等其他功能）
         self._latest_orderbooks: Dict[str, Dict[str, Any]] = {}
@@ -167,15 +172,20 @@ class BackpackWebSocket(BackpackBase):
             api_url = "https://api.backpack.exchange/api/v1/status"  # 尝试status端点
             timeout = aiohttp.ClientTimeout(total=8)
 
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(api_url) as response:
-                    return response.status in [200, 404]  # 404也说明服务器可达
+            # 复用共享会话，避免每次检查都重新握手
+            session = get_shared_session()
+            async with session.get(api_url, timeout=timeout) as response:
+                return response.status in [200, 404]  # 404也说明服务器可达
 
         except Exception as e:
             if self.logger:
                 self.logger.warning(f"🏢 Backpack服务器连通性检查失败: {e}")
             return False
 
+    def set_top_of_book_mode(self, enabled: bool) -> None:
+        """设置BBO模式（True 时订单簿回调收到 TopOfBook，而不是完整 OrderBookData）"""
+        self._top_of_book_mode = bool(enabled)
+
     def _is_connection_usable(self) -> bool:
         """检查WebSocket连接是否可用"""
         return (
@@ -256,7 +266,7 @@ class BackpackWebSocket(BackpackBase):
                 
                 # 使用aiohttp建立WebSocket连接
                 if not hasattr(self, '_session') or self._session is None or (self._session and self._session.closed):
-                    self._session = aiohttp.ClientSession()
+                    self._session = create_session("backpack_ws")
                 self._ws_connection = await self._session.ws_connect(self.ws_url)
 
                 if self.logger:
@@ -904,6 +914,8 @@ class BackpackWebSocket(BackpackBase):
 
                 if msg.type == aiohttp.WSMsgType.TEXT:
                     message = msg.data
+                    if self._frame_recorder is not None:
+                        self._frame_recorder.record(message, current_time)
                     await self._process_websocket_message(message)
                 elif msg.type == aiohttp.WSMsgType.PING:
                     # aiohttp在底层自动处理Ping/Pong（C扩展层）
@@ -1279,70 +1291,29 @@ class BackpackWebSocket(BackpackBase):
             # === 🔥 本地订单簿维护逻辑（参考EdgeX） ===
             
             # 初始化本地订单簿（如果不存在）
-            if symbol not in self._local_orderbooks:
-                self._local_orderbooks[symbol] = {
-                    'bids': {},  # {price: size}
-                    'asks': {}   # {price: size}
-                }
+            local_book = self._local_orderbooks.get(symbol)
+            if local_book is None:
+                local_book = LocalOrderBook(symbol)
+                self._local_orderbooks[symbol] = local_book
                 if self.logger:
                     self.logger.info(f"📚 [Backpack] 初始化 {symbol} 本地订单簿")
             
-            # 应用增量更新到买盘
-            bids_raw = data.get('b', [])  # Backpack使用 'b' 表示bids
-            for bid in bids_raw:
-                if len(bid) >= 2:
-                    price = self._safe_decimal(bid[0])
-                    size = self._safe_decimal(bid[1])
-                    
-                    if price:
-                        if size == 0:
-                            # size=0：删除该价格档位
-                            self._local_orderbooks[symbol]['bids'].pop(price, None)
-                        elif size > 0:
-                            # size>0：更新/新增该价格档位
-                            self._local_orderbooks[symbol]['bids'][price] = size
-            
-            # 应用增量更新到卖盘
-            asks_raw = data.get('a', [])  # Backpack使用 'a' 表示asks
-            for ask in asks_raw:
-                if len(ask) >= 2:
-                    price = self._safe_decimal(ask[0])
-                    size = self._safe_decimal(ask[1])
-                    
-                    if price:
-                        if size == 0:
-                            # size=0：删除该价格档位
-                            self._local_orderbooks[symbol]['asks'].pop(price, None)
-                        elif size > 0:
-                            # size>0：更新/新增该价格档位
-                            self._local_orderbooks[symbol]['asks'][price] = size
-            
-            # === 从本地订单簿构造完整的OrderBookData对象 ===
-            local_book = self._local_orderbooks[symbol]
-            
-            # 转换为OrderBookLevel列表（按价格排序）
-            bids = [
-                OrderBookLevel(price=price, size=size)
-                for price, size in sorted(local_book['bids'].items(), reverse=True)  # 买盘：价格从高到低
-            ]
-
-            asks = [
-                OrderBookLevel(price=price, size=size)
-                for price, size in sorted(local_book['asks'].items())  # 卖盘：价格从低到高
-            ]
+            # 应用增量更新（Backpack使用 'b' 表示bids，'a' 表示asks）
+            # size=0：删除该价格档位；size>0：更新/新增该价格档位
+            local_book.apply_delta(data.get('b', []), data.get('a', []))
             
             # 🔥 验证订单簿完整性（必须同时有买盘和卖盘）
-            if not bids or not asks:
+            if not local_book.is_complete:
                 # 订单簿不完整，等待更多数据
                 if self.logger and self._depth_count[symbol] <= 3:
                     self.logger.warning(
-                        f"⚠️ [Backpack] {symbol} 订单簿不完整 (bids={len(bids)}, asks={len(asks)})，"
+                        f"⚠️ [Backpack] {symbol} 订单簿不完整 (bids={local_book.bid_count}, asks={local_book.ask_count})，"
                         f"等待更多数据... (已收到{self._depth_count[symbol]}条depth消息)"
                     )
                 return
             
-            # === 缓存最新的orderbook数据供ticker使用 ===
-            self._cache_orderbook_data(symbol, bids, asks, main_timestamp)
+            # === 缓存最新的orderbook数据供ticker使用（只保留前5档） ===
+            self._cache_orderbook_data(symbol, local_book.top_bids(5), local_book.top_asks(5), main_timestamp)
 
             # 🔥 记录首次构建成功的订单簿
             if not hasattr(self, '_orderbook_ready'):
@@ -1353,16 +1324,14 @@ class BackpackWebSocket(BackpackBase):
                 if self.logger:
                     self.logger.info(
                         f"✅ [Backpack] {symbol} 订单簿构建完成！"
-                        f"买盘档位={len(bids)}, 卖盘档位={len(asks)}, "
-                        f"最优买价={bids[0].price if bids else None}, "
-                        f"最优卖价={asks[0].price if asks else None}"
+                        f"买盘档位={local_book.bid_count}, 卖盘档位={local_book.ask_count}, "
+                        f"最优买价={local_book.best_bid().price}, "
+                        f"最优卖价={local_book.best_ask().price}"
                     )
 
-            # 构造完整的OrderBookData对象
-            orderbook = OrderBookData(
-                symbol=symbol,
-                bids=bids,
-                asks=asks,
+            # 从本地订单簿构造OrderBookData对象（档位已按价格排序；BBO模式下构造TopOfBook，深度按需懒加载）
+            build = local_book.to_top_of_book if self._top_of_book_mode else local_book.to_orderbook_data
+            orderbook = build(
                 timestamp=main_timestamp,
                 nonce=data.get('u'),  # 使用更新ID作为nonce
                 exchange_timestamp=exchange_timestamp,
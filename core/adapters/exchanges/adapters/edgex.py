@@ -1002,6 +1002,15 @@ class EdgeXAdapter(ExchangeAdapter):
                 self.logger.error(f"❌ [EdgeX] 批量订阅ticker失败: {str(e)}")
             raise
 
+    def set_top_of_book_mode(self, enabled: bool) -> None:
+        """
+        设置订单簿BBO模式
+
+        开启后订单簿回调收到轻量的 TopOfBook（仅最优一档），
+        完整深度在访问 bids / asks 时才从本地订单簿懒加载。
+        """
+        self.websocket.set_top_of_book_mode(enabled)
+
     async def batch_subscribe_orderbooks(self, symbols: Optional[List[str]] = None, depth: int = 15, callback: Optional[Callable[[str, OrderBookData], None]] = None) -> None:
         """批量订阅订单簿数据（支持硬编码和动态两种模式）
         
@@ -25,6 +25,8 @@ from functools import wraps
 # 🔥 使用统一日志系统（参考日志编写操作指南）
 from ..utils.setup_logging import LoggingConfig
 from ..utils.logger_factory import get_exchange_logger
+from ..utils.rate_limiter import EndpointClass, get_rate_limiter, classify_request
+from ..utils.http_client import create_session
 
 module_logger = get_exchange_logger("ExchangeAdapter.edgex")
 
@@ -186,6 +188,8 @@ class EdgeXRest(EdgeXBase):
         self.logger.info("[EdgeX] REST: 开始初始化")
         
         self.session = None
+        # 🔥 进程内共享的令牌桶限流（撤单/下单优先于账户查询）
+        self._rate_limiter = get_rate_limiter("edgex")
         self.api_key = getattr(config, 'api_key', '') if config else ''
         self.api_secret = getattr(config, 'api_secret', '') if config else ''
         self.base_url = getattr(config, 'base_url', self.DEFAULT_BASE_URL) if config else self.DEFAULT_BASE_URL
@@ -280,16 +284,18 @@ class EdgeXRest(EdgeXBase):
             verify_ssl = os.getenv('EDGEX_VERIFY_SSL', 'true').lower() == 'true'
             
             # 创建 SSL 上下文
-            connector = None
+            ssl_context = None
             if not verify_ssl:
                 ssl_context = ssl.create_default_context()
                 ssl_context.check_hostname = False
                 ssl_context.verify_mode = ssl.CERT_NONE
-                connector = aiohttp.TCPConnector(ssl=ssl_context)
             
-            self.session = aiohttp.ClientSession(
+            # 🔥 调优连接池 + 预热/保温，下单不再包含 TCP/TLS 握手
+            self.session = create_session(
+                "edgex",
+                ssl=ssl_context,
+                warm_urls=[self.base_url],
                 timeout=aiohttp.ClientTimeout(total=30),
-                connector=connector,
                 headers={
                     'User-Agent': 'EdgeX-Adapter/1.0',
                     'Content-Type': 'application/json'
@@ -453,22 +459,27 @@ class EdgeXRest(EdgeXBase):
         if signed:
             # 🔥 修复：使用新的认证方法
             headers.update(self.get_auth_headers(method, request_path, params, data))
+
+        await self._rate_limiter.acquire(classify_request(method, request_path, private=signed))
             
         try:
             if method.upper() == 'GET':
                 async with self.session.get(url, params=params, headers=headers) as response:
+                    self._rate_limiter.observe_status(response.status, response.headers)
                     result = await response.json()
                     if response.status != 200:
                         raise Exception(f"EdgeX API错误: {result}")
                     return result
             elif method.upper() == 'POST':
                 async with self.session.post(url, json=data, headers=headers) as response:
+                    self._rate_limiter.observe_status(response.status, response.headers)
                     result = await response.json()
                     if response.status != 200:
                         raise Exception(f"EdgeX API错误: {result}")
                     return result
             elif method.upper() == 'DELETE':
                 async with self.session.delete(url, params=params, headers=headers) as response:
+                    self._rate_limiter.observe_status(response.status, response.headers)
                     result = await response.json()
                     if response.status != 200:
                         raise Exception(f"EdgeX API错误: {result}")
@@ -551,6 +562,7 @@ class EdgeXRest(EdgeXBase):
             url = f"https://pro.edgex.exchange/api/v1/public/quote/getDepth"
             
             await self.setup_session()
+            await self._rate_limiter.acquire(EndpointClass.MARKET)
             
             async with self.session.get(url, params=params) as response:
                 if response.status == 200:
@@ -30,6 +30,8 @@ except ImportError:
     WebSocketManager = None
 
 from .edgex_base import EdgeXBase
+from ..local_orderbook import LocalOrderBook
+from ..utils.http_client import create_session, get_shared_session
 from ..models import (
     TickerData,
     OrderBookData,
@@ -102,6 +104,7 @@ class EdgeXWebSocket(EdgeXBase):
         self.orderbook_callback = None
         self.trades_callback = None
         self.user_data_callback = None  # 向后兼容：单个用户数据回调
+        self._frame_recorder = None  # 🔥 原始帧录制器（FrameWriter，可选；用于离线回放）
         
         # 🔥 订单和持仓回调
         self._order_callbacks = []  # 订单更新回调函数列表
@@ -110,7 +113,9 @@ class EdgeXWebSocket(EdgeXBase):
         self._user_data_callbacks = []  # 通用用户数据回调函数列表（支持多个回调）
         
         # 🔥 本地订单簿缓存（用于处理增量更新）
-        self._local_orderbooks: Dict[str, Dict[str, Any]] = {}  # {symbol: {bids: {price: size}, asks: {price: size}}}
+        self._local_orderbooks: Dict[str, LocalOrderBook] = {}  # {symbol: LocalOrderBook}
+        # 🔥 BBO模式：只推送 TopOfBook，完整深度按需懒加载
+        self._top_of_book_mode = False
         
         # 初始化状态变量
         self._ws_connected = False
@@ -193,10 +198,11 @@ class EdgeXWebSocket(EdgeXBase):
             api_url = "https://pro.edgex.exchange/"  # 正确的EdgeX官方端点
             timeout = aiohttp.ClientTimeout(total=8)
             
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(api_url) as response:
-                    # 检查HTTP状态码，2xx和3xx都表示服务器可达
-                    return response.status < 500  # 500以下状态码说明服务器可达
+            # 复用共享会话，避免每次检查都重新握手
+            session = get_shared_session()
+            async with session.get(api_url, timeout=timeout) as response:
+                # 检查HTTP状态码，2xx和3xx都表示服务器可达
+                return response.status < 500  # 500以下状态码说明服务器可达
                     
         except Exception as e:
             if self.logger:
@@ -221,6 +227,10 @@ class EdgeXWebSocket(EdgeXBase):
         
         return True
     
+    def set_top_of_book_mode(self, enabled: bool) -> None:
+        """设置BBO模式（True 时订单簿回调收到 TopOfBook，而不是完整 OrderBookData）"""
+        self._top_of_book_mode = bool(enabled)
+
     def get_network_stats(self) -> Dict[str, int]:
         """获取网络流量统计"""
         return {
@@ -363,7 +373,7 @@ class EdgeXWebSocket(EdgeXBase):
             public_ws_url = self.DEFAULT_WS_URL  # wss://quote.edgex.exchange/api/v1/public/ws
             
             if not hasattr(self, '_session') or (hasattr(self, '_session') and self._session.closed):
-                self._session = aiohttp.ClientSession()
+                self._session = create_session("edgex_ws")
             
             # 🔥 连接公共WebSocket（用于metadata, ticker, orderbook）
             self._ws_connection = await self._session.ws_connect(public_ws_url)
@@ -980,6 +990,8 @@ class EdgeXWebSocket(EdgeXBase):
                 self._last_heartbeat = current_time
                 
                 if msg.type == aiohttp.WSMsgType.TEXT:
+                    if self._frame_recorder is not None:
+                        self._frame_recorder.record(msg.data, current_time)
                     await self._process_websocket_message(msg.data)
                 elif msg.type == aiohttp.WSMsgType.PONG:
                     # 🔥 新增：处理pong响应
@@ -1342,49 +1354,17 @@ class EdgeXWebSocket(EdgeXBase):
                     pass
 
             # 🔥 根据depthType处理数据
+            # 解析数据支持数组[["price", "size"], ...]或字典[{'price': '...', 'size': '...'}, ...]两种格式
             if depth_type == 'SNAPSHOT':
                 # === 快照模式：直接替换本地订单簿 ===
                 if self.logger:
                     self.logger.debug(f"📸 {symbol}: 收到订单簿快照")
                 
-                # 初始化本地订单簿
-                self._local_orderbooks[symbol] = {
-                    'bids': {},  # {price: size}
-                    'asks': {}   # {price: size}
-                }
-                
-                # 解析快照数据（EdgeX格式：支持数组[["price", "size"], ...]或字典[{'price': '...', 'size': '...'}, ...]）
-                for bid in orderbook_data.get('bids', []):
-                    price = None
-                    size = None
-                    
-                    if isinstance(bid, dict):
-                        # 🔥 字典格式：{'price': '...', 'size': '...'}
-                        price = self._safe_decimal(bid.get('price'))
-                        size = self._safe_decimal(bid.get('size'))
-                    elif isinstance(bid, list) and len(bid) >= 2:
-                        # 数组格式：["price", "size"]
-                        price = self._safe_decimal(bid[0])
-                        size = self._safe_decimal(bid[1])
-                    
-                    if price and size and size > 0:
-                        self._local_orderbooks[symbol]['bids'][price] = size
-                
-                for ask in orderbook_data.get('asks', []):
-                    price = None
-                    size = None
-                    
-                    if isinstance(ask, dict):
-                        # 🔥 字典格式：{'price': '...', 'size': '...'}
-                        price = self._safe_decimal(ask.get('price'))
-                        size = self._safe_decimal(ask.get('size'))
-                    elif isinstance(ask, list) and len(ask) >= 2:
-                        # 数组格式：["price", "size"]
-                        price = self._safe_decimal(ask[0])
-                        size = self._safe_decimal(ask[1])
-                    
-                    if price and size and size > 0:
-                        self._local_orderbooks[symbol]['asks'][price] = size
+                local_book = self._local_orderbooks.get(symbol)
+                if local_book is None:
+                    local_book = LocalOrderBook(symbol)
+                    self._local_orderbooks[symbol] = local_book
+                local_book.apply_snapshot(orderbook_data.get('bids', []), orderbook_data.get('asks', []))
                 
             elif depth_type == 'CHANGED':
                 # === 增量模式：应用增量更新到本地订单簿 ===
@@ -1393,109 +1373,21 @@ class EdgeXWebSocket(EdgeXBase):
                     # 这是为了应对EdgeX可能不推送快照的情况
                     if self.logger:
                         self.logger.debug(f"📦 {symbol}: 首次增量更新，初始化本地订单簿")
-                    self._local_orderbooks[symbol] = {
-                        'bids': {},
-                        'asks': {}
-                    }
+                    self._local_orderbooks[symbol] = LocalOrderBook(symbol)
                 
-                # 🔥 诊断：检查收到的数据（DEBUG级别，减少日志写入）
                 bids_raw = orderbook_data.get('bids', [])
                 asks_raw = orderbook_data.get('asks', [])
-                if self.logger:
-                    self.logger.debug(
-                        f"🔍 {symbol}: 增量更新数据 - "
-                        f"bids数量={len(bids_raw)}, asks数量={len(asks_raw)}"
-                    )
                 
-                # 应用增量更新到买盘（支持数组和字典格式）
-                bids_processed = 0
-                bids_added = 0
-                bids_deleted = 0
-                for bid in bids_raw:
-                    price = None
-                    size = None
-                    
-                    if isinstance(bid, dict):
-                        # 🔥 字典格式：{'price': '...', 'size': '...'}
-                        price = self._safe_decimal(bid.get('price'))
-                        size = self._safe_decimal(bid.get('size'))
-                    elif isinstance(bid, list) and len(bid) >= 2:
-                        # 数组格式：["price", "size"]
-                        price = self._safe_decimal(bid[0])
-                        size = self._safe_decimal(bid[1])
-                    else:
-                        continue  # 跳过未知格式
-                    
-                    bids_processed += 1
-                    
-                    if not price:
-                        if self.logger:
-                            self.logger.warning(f"⚠️  {symbol}: bids[{bids_processed-1}]价格解析失败: {bid}")
-                        continue
-                    
-                    if size == 0:
-                        # size=0：删除该价格档位
-                        self._local_orderbooks[symbol]['bids'].pop(price, None)
-                        bids_deleted += 1
-                    elif size > 0:
-                        # size>0：更新/新增该价格档位
-                        self._local_orderbooks[symbol]['bids'][price] = size
-                        bids_added += 1
-                
-                if self.logger and bids_processed > 0:
-                    self.logger.debug(
-                        f"📊 {symbol}: bids处理完成 - "
-                        f"处理={bids_processed}档, 新增/更新={bids_added}档, 删除={bids_deleted}档"
-                    )
-                
-                # 应用增量更新到卖盘（支持数组和字典格式）
-                asks_processed = 0
-                asks_added = 0
-                asks_deleted = 0
-                for ask in asks_raw:
-                    price = None
-                    size = None
-                    
-                    if isinstance(ask, dict):
-                        # 🔥 字典格式：{'price': '...', 'size': '...'}
-                        price = self._safe_decimal(ask.get('price'))
-                        size = self._safe_decimal(ask.get('size'))
-                    elif isinstance(ask, list) and len(ask) >= 2:
-                        # 数组格式：["price", "size"]
-                        price = self._safe_decimal(ask[0])
-                        size = self._safe_decimal(ask[1])
-                    else:
-                        continue  # 跳过未知格式
-                    
-                    asks_processed += 1
-                    
-                    if not price:
-                        if self.logger:
-                            self.logger.warning(f"⚠️  {symbol}: asks[{asks_processed-1}]价格解析失败: {ask}")
-                        continue
-                    
-                    if size == 0:
-                        # size=0：删除该价格档位
-                        self._local_orderbooks[symbol]['asks'].pop(price, None)
-                        asks_deleted += 1
-                    elif size > 0:
-                        # size>0：更新/新增该价格档位
-                        self._local_orderbooks[symbol]['asks'][price] = size
-                        asks_added += 1
-                
-                if self.logger and asks_processed > 0:
-                    self.logger.debug(
-                        f"📊 {symbol}: asks处理完成 - "
-                        f"处理={asks_processed}档, 新增/更新={asks_added}档, 删除={asks_deleted}档"
-                    )
+                # size=0：删除该价格档位；size>0：更新/新增该价格档位
+                local_book = self._local_orderbooks[symbol]
+                local_book.apply_delta(bids_raw, asks_raw)
                 
                 # 🔥 诊断：显示处理后的订单簿状态（DEBUG级别，减少日志写入）
                 if self.logger:
-                    final_bids_count = len(self._local_orderbooks[symbol]['bids'])
-                    final_asks_count = len(self._local_orderbooks[symbol]['asks'])
                     self.logger.debug(
                         f"🔄 {symbol}: 增量更新处理完成 - "
-                        f"处理后: bids={final_bids_count}档, asks={final_asks_count}档"
+                        f"bids数量={len(bids_raw)}, asks数量={len(asks_raw)}, "
+                        f"处理后: bids={local_book.bid_count}档, asks={local_book.ask_count}档"
                     )
             
             else:
@@ -1505,39 +1397,25 @@ class EdgeXWebSocket(EdgeXBase):
                 depth_type = 'SNAPSHOT'
             
             # 🔥 从本地订单簿构造完整的OrderBookData对象
-            if symbol not in self._local_orderbooks:
+            local_book = self._local_orderbooks.get(symbol)
+            if local_book is None:
                 return
             
-            local_book = self._local_orderbooks[symbol]
-            
-            # 转换为OrderBookLevel列表（按价格排序）
-            bids = [
-                OrderBookLevel(price=price, size=size)
-                for price, size in sorted(local_book['bids'].items(), reverse=True)  # 买盘：价格从高到低
-            ]
-            
-            asks = [
-                OrderBookLevel(price=price, size=size)
-                for price, size in sorted(local_book['asks'].items())  # 卖盘：价格从低到高
-            ]
-            
             # 🔥 验证订单簿完整性（必须同时有买盘和卖盘）
-            if not bids or not asks:
+            if not local_book.is_complete:
                 if self.logger:
                     # 🔥 改为DEBUG级别，因为这是正常情况（增量更新可能只有一侧）
                     self.logger.debug(
                         f"⏸️  {symbol}: 订单簿暂不完整 "
-                        f"(bids={len(bids)}, asks={len(asks)}), 等待后续更新"
+                        f"(bids={local_book.bid_count}, asks={local_book.ask_count}), 等待后续更新"
                     )
                 return
 
-            # 创建OrderBookData对象
+            # 创建OrderBookData对象（档位已按价格排序：买盘从高到低，卖盘从低到高）
             main_timestamp = exchange_timestamp if exchange_timestamp else datetime.now()
             
-            orderbook = OrderBookData(
-                symbol=symbol,
-                bids=bids,
-                asks=asks,
+            build = local_book.to_top_of_book if self._top_of_book_mode else local_book.to_orderbook_data
+            orderbook = build(
                 timestamp=main_timestamp,
                 nonce=orderbook_data.get('endVersion'),
                 exchange_timestamp=exchange_timestamp,
@@ -1547,8 +1425,8 @@ class EdgeXWebSocket(EdgeXBase):
             # 🔥 只有完整的订单簿才触发回调（DEBUG级别，减少日志写入）
             if self.logger:
                 self.logger.debug(
-                    f"✅ {symbol}: 订单簿完整 (bids={len(bids)}, asks={len(asks)}), "
-                    f"bid1={bids[0].price if bids else 'N/A'}, ask1={asks[0].price if asks else 'N/A'}"
+                    f"✅ {symbol}: 订单簿完整 (bids={local_book.bid_count}, asks={local_book.ask_count}), "
+                    f"bid1={local_book.best_bid().price}, ask1={local_book.best_ask().price}"
                 )
             
             if self.orderbook_callback:
@@ -25,6 +25,7 @@ from typing import Any, Dict, Optional
 import aiohttp
 
 from .grvt_base import GRVTBase
+from ..utils.http_client import create_session
 
 
 class GRVTRest(GRVTBase):
@@ -45,7 +46,7 @@ class GRVTRest(GRVTBase):
         """获取/懒加载 aiohttp 会话（复用连接池）。"""
         if self._session and not self._session.closed:
             return self._session
-        self._session = aiohttp.ClientSession(timeout=self._timeout, headers={"Content-Type": "application/json"})
+        self._session = create_session("grvt", timeout=self._timeout, headers={"Content-Type": "application/json"})
         return self._session
 
     async def login(self) -> Dict[str, Any]:
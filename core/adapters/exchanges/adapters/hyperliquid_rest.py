@@ -15,6 +15,7 @@ from requests.adapters import HTTPAdapter
 from urllib3.poolmanager import PoolManager
 
 from .hyperliquid_base import HyperliquidBase
+from ..utils.rate_limiter import get_rate_limiter
 from ..models import (
     TickerData, OrderBookData, TradeData, BalanceData, PositionData,
     OrderData, OHLCVData, ExchangeInfo, OrderBookLevel,
@@ -41,6 +42,8 @@ class HyperliquidRest(HyperliquidBase):
         self.exchange: Optional[ccxt.hyperliquid] = None
         self.max_retries = 3
         self.retry_delay = 1.0
+        # 🔥 进程内共享的令牌桶限流（按 Hyperliquid 权重计，撤单/下单优先）
+        self._rate_limiter = get_rate_limiter("hyperliquid")
 
     async def connect(self) -> bool:
         """建立连接"""
@@ -114,9 +117,12 @@ class HyperliquidRest(HyperliquidBase):
     async def _execute_with_retry(self, func, *args, operation_name=None, **kwargs):
         """带重试的API调用 - 支持 async 和同步函数"""
         last_error = None
+        operation = operation_name or func.__name__
 
         for attempt in range(self.max_retries):
             try:
+                await self._rate_limiter.acquire_operation(operation)
+
                 # 🔥 检查是否是协程函数
                 if asyncio.iscoroutinefunction(func):
                     # 如果是 async 函数，直接await
@@ -129,14 +135,14 @@ class HyperliquidRest(HyperliquidBase):
                 return result
             except Exception as e:
                 last_error = e
+                # 429：整个交易所进入冷却，下一次重试的 acquire 会等待冷却结束
+                self._rate_limiter.observe_error(e)
                 if attempt < self.max_retries - 1:
-                    operation = operation_name or func.__name__
                     if self.logger:
                         self.logger.warning(
                             f"{operation} API调用失败 (尝试 {attempt + 1}/{self.max_retries}): {str(e)}")
                     await asyncio.sleep(self.retry_delay * (attempt + 1))
                 else:
-                    operation = operation_name or func.__name__
                     if self.logger:
                         self.logger.error(f"{operation} API调用最终失败: {str(e)}")
 
@@ -9,12 +9,12 @@ import asyncio
 import json
 import time
 import websockets
-import httpx
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Callable, Set, Tuple
 from decimal import Decimal
 
 from ..interface import ExchangeConfig
+from ..utils.http_client import create_httpx_client, start_keep_warm
 from ..models import TickerData, OrderBookData, TradeData, OrderBookLevel, OrderSide
 from .hyperliquid_base import HyperliquidBase
 
@@ -74,9 +74,10 @@ class HyperliquidNativeWebSocket:
         # 初始化连接状态监控
         self._init_connection_monitoring()
         
-        # REST API客户端
-        self._http_client = httpx.AsyncClient(timeout=10.0)
+        # REST API客户端（共享连接池参数，安装 h2 时走 HTTP/2）
+        self._http_client = create_httpx_client("hyperliquid", timeout=10.0)
         self._base_url = "https://api.hyperliquid.xyz"
+        self._keep_warm_task: Optional[asyncio.Task] = None
         
         # 控制标志
         self._native_tasks = set()
@@ -131,6 +132,18 @@ class HyperliquidNativeWebSocket:
                 
             if self.logger:
                 self.logger.info(f"开始连接Hyperliquid原生WebSocket: {self._base.ws_url}")
+
+            # 🔥 REST客户端预热/保温（断开时会被关闭，重连时重建）
+            if self._http_client.is_closed:
+                # 旧客户端的保温任务可能还在 sleep，先取消再为新客户端启动
+                if self._keep_warm_task and not self._keep_warm_task.done():
+                    self._keep_warm_task.cancel()
+                self._http_client = create_httpx_client("hyperliquid", timeout=10.0)
+            # 重连时保温任务仍在运行则复用，避免每次 connect 叠加一个任务
+            if self._keep_warm_task is None or self._keep_warm_task.done():
+                self._keep_warm_task = start_keep_warm(
+                    self._http_client, [self._base_url], name="hyperliquid"
+                )
                 
             # 🔥 增加连接超时和重试逻辑
             max_retries = 3
@@ -228,7 +241,14 @@ class HyperliquidNativeWebSocket:
         self._orderbook_cache.clear()
         self._latest_orderbooks.clear()
         
-        # 关闭HTTP客户端
+        # 停止保温任务并关闭HTTP客户端
+        if self._keep_warm_task and not self._keep_warm_task.done():
+            self._keep_warm_task.cancel()
+            try:
+                await self._keep_warm_task
+            except asyncio.CancelledError:
+                pass
+        self._keep_warm_task = None
         if self._http_client:
             await self._http_client.aclose()
         
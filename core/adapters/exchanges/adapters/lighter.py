@@ -40,6 +40,8 @@ class LighterAdapter(ExchangeAdapter):
         self._websocket = LighterWebSocket(config_dict)
         # 由 orchestrator 注入
         self._backoff_controller = None
+        # 订单簿BBO模式（局部重建WS时需要继承）
+        self._top_of_book_mode = False
         
         # 🔥 优化：将WebSocket引用传递给REST（用于缓存订单簿）
         self._rest.ws = self._websocket
@@ -869,6 +871,31 @@ class LighterAdapter(ExchangeAdapter):
             normalized_symbol, side, quantity, reduce_only, skip_order_index_query
         )
 
+    async def place_limit_orders_batch(
+        self,
+        orders: List[Dict[str, Any]]
+    ) -> List[Optional[OrderData]]:
+        """
+        批量下限价单（lighter专用：本地nonce分配 + 并发签名 + sendtxbatch分块提交）
+
+        Args:
+            orders: 订单列表，每项包含 symbol/side/quantity/price（side 可为 OrderSide 或字符串），
+                    可选 client_order_id/reduce_only/time_in_force
+
+        Returns:
+            与 orders 一一对应的 OrderData（失败为 None）
+        """
+        normalized_orders: List[Dict[str, Any]] = []
+        for order in orders:
+            payload = dict(order)
+            payload["symbol"] = self._normalize_symbol(payload.get("symbol"))
+            side = payload.get("side")
+            payload["side"] = side.value.lower() if isinstance(side, OrderSide) else str(side).lower()
+            normalized_orders.append(payload)
+
+        self.logger.info(f"[Lighter] 批量创建限价单: {len(normalized_orders)}笔")
+        return await self._rest.place_limit_orders_batch(normalized_orders)
+
     async def place_market_orders_ws_batch(
         self,
         orders: List[Dict[str, Any]],
@@ -1095,6 +1122,16 @@ class LighterAdapter(ExchangeAdapter):
         
         self.logger.info(f"✅ 批量订阅完成: {len(symbols)} 个交易对")
     
+    def set_top_of_book_mode(self, enabled: bool) -> None:
+        """
+        设置订单簿BBO模式
+
+        开启后订单簿回调收到轻量的 TopOfBook（仅最优一档），
+        完整深度在访问 bids / asks 时才从本地订单簿懒加载。
+        """
+        self._top_of_book_mode = bool(enabled)
+        self._websocket.set_top_of_book_mode(self._top_of_book_mode)
+
     async def batch_subscribe_orderbooks(self, symbols: List[str], callback: Optional[Callable] = None) -> None:
         """
         批量订阅多个交易对的订单簿数据（参考套利监控的订阅方式）
@@ -1275,6 +1312,7 @@ class LighterAdapter(ExchangeAdapter):
             new_ws._balance_cache = self._balance_cache
             new_ws._position_callbacks = self._position_callbacks
             new_ws._order_callbacks = self._order_callbacks
+            new_ws.set_top_of_book_mode(self._top_of_book_mode)
 
             # REST-WS 关联
             new_rest.ws = new_ws
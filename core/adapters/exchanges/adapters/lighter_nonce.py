@@ -0,0 +1,129 @@
+"""
+Lighter 本地 nonce 分配器
+
+Lighter 每个 API Key 的 nonce 必须严格递增、不能跳号。过去为了避免冲突，
+网格批量下单只能逐笔串行 create_order（每笔一次往返）。
+
+本模块按账户（account_index, api_key_index）提供：
+- 连续号段预留：一次性在本地取出 N 个连续 nonce（同步完成，不会被其它协程插队）
+- 批量流程互斥锁：同一账户的批量签名/提交流程串行，单笔下单不受影响
+- 号段作废：签名失败、交易未发出时不做本地回滚，而是从 API 重新同步
+  （回滚发生在 await 之后，期间单笔下单可能已取走后续 nonce，回滚会导致重复发号）
+- 从 API 重新同步：提交被拒后读取服务端 next_nonce，推算本批已被接受的笔数
+
+nonce 的实际计数仍由 SDK SignerClient 自带的 nonce_manager 维护（单笔 create_order/
+cancel_order 也从它取号），这里只在其上做号段预留与重新同步；号段一旦取出就不再本地回滚，异常后一律以服务端为准，
+保证两条路径不会重复发号。
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.logger_factory import get_exchange_logger
+
+logger = get_exchange_logger("ExchangeAdapter.lighter")
+
+
+class LighterNonceAllocator:
+    """
+    单个 Lighter 账户（API Key）的 nonce 分配器
+
+    Args:
+        account_index: 账户索引
+        api_key_index: API Key 索引（None 表示由 SDK 选择）
+    """
+
+    def __init__(self, account_index: Optional[int], api_key_index: Optional[int]):
+        self.account_index = account_index
+        self.api_key_index = api_key_index
+        # 批量流程互斥：同一账户同一时刻只有一个批次在预留/提交
+        self.lock = asyncio.Lock()
+        self.stats: Dict[str, int] = {
+            'reserved': 0,
+            'resyncs': 0,
+        }
+
+    def reserve(self, signer_client: Any, count: int) -> Tuple[int, List[int]]:
+        """
+        预留 count 个连续 nonce
+
+        整个过程是同步调用，期间不会切换协程，因此号段一定连续。
+
+        Returns:
+            (api_key_index, nonce列表)
+        """
+        if count <= 0:
+            return self._resolve_api_key_index(), []
+        requested_key = self.api_key_index if self.api_key_index is not None else -1
+        api_key_index, first = signer_client.get_api_key_nonce(requested_key, -1)
+        nonces = [first]
+        for _ in range(count - 1):
+            _, nonce = signer_client.get_api_key_nonce(api_key_index, -1)
+            nonces.append(nonce)
+        self.api_key_index = api_key_index
+        self.stats['reserved'] += count
+
+        # SDK 的乐观 nonce 管理器应返回连续号段；否则说明有其它路径在并发取号
+        if nonces[-1] - nonces[0] != count - 1:
+            logger.warning(
+                f"⚠️ [Lighter] nonce号段不连续: {nonces[0]}..{nonces[-1]} (数量={count})，"
+                f"提交失败时将从API重新同步"
+            )
+        return api_key_index, nonces
+
+    async def resync(self, signer_client: Any, transaction_api: Any = None) -> Optional[int]:
+        """
+        从 API 重新同步 nonce
+
+        Returns:
+            服务端的下一个可用 nonce（读取失败返回 None）
+        """
+        api_key_index = self._resolve_api_key_index()
+        self.stats['resyncs'] += 1
+
+        next_nonce: Optional[int] = None
+        if transaction_api is not None and self.account_index is not None:
+            try:
+                result = await transaction_api.next_nonce(
+                    account_index=self.account_index,
+                    api_key_index=api_key_index,
+                )
+                value = getattr(result, 'nonce', result)
+                next_nonce = int(value) if value is not None else None
+            except Exception as e:
+                logger.warning(f"⚠️ [Lighter] 查询next_nonce失败: {e}")
+
+        # SDK 的 hard_refresh_nonce 是同步HTTP调用，放到线程里避免阻塞事件循环
+        manager = getattr(signer_client, 'nonce_manager', None)
+        refresh = getattr(manager, 'hard_refresh_nonce', None)
+        if refresh is not None:
+            try:
+                await asyncio.to_thread(refresh, api_key_index)
+            except Exception as e:
+                logger.warning(f"⚠️ [Lighter] 刷新SDK nonce失败: {e}")
+
+        logger.info(
+            f"🔄 [Lighter] nonce已从API重新同步: account={self.account_index}, "
+            f"api_key_index={api_key_index}, next_nonce={next_nonce}"
+        )
+        return next_nonce
+
+    def _resolve_api_key_index(self) -> int:
+        return self.api_key_index if self.api_key_index is not None else 0
+
+
+# 进程内按账户共享：同一账户的多个 LighterRest 实例使用同一把批量锁
+_allocators: Dict[Tuple[Optional[int], Optional[int]], LighterNonceAllocator] = {}
+
+
+def get_nonce_allocator(
+    account_index: Optional[int],
+    api_key_index: Optional[int],
+) -> LighterNonceAllocator:
+    """获取（或创建）账户对应的 nonce 分配器"""
+    key = (account_index, api_key_index)
+    allocator = _allocators.get(key)
+    if allocator is None:
+        allocator = LighterNonceAllocator(account_index, api_key_index)
+        _allocators[key] = allocator
+    return allocator
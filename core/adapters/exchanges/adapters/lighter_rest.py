@@ -56,6 +56,8 @@ from ..models import (
     OrderData, PositionData, ExchangeInfo, OrderBookLevel, OrderSide, OrderType, OrderStatus
 )
 from .lighter_base import LighterBase
+from .lighter_nonce import LighterNonceAllocator, get_nonce_allocator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List, Callable, Tuple
 from decimal import Decimal, ROUND_DOWN
 from datetime import datetime
@@ -65,6 +67,7 @@ import ssl
 import os
 
 from ..utils.logger_factory import get_exchange_logger
+from ..utils.rate_limiter import EndpointClass, get_rate_limiter
 
 logger = get_exchange_logger("ExchangeAdapter.lighter")
 
@@ -111,6 +114,9 @@ class LighterRest(LighterBase):
         self.candlestick_api: Optional[CandlestickApi] = None
         self.funding_api: Optional[FundingApi] = None
 
+        # 🔥 进程内共享的令牌桶限流（撤单/下单优先于账户查询）
+        self._rate_limiter = get_rate_limiter("lighter")
+
         # 连接状态
         self._connected = False
 
@@ -134,6 +140,15 @@ class LighterRest(LighterBase):
             logger.warning(f"⚠️ Lighter WebSocket初始化失败: {e}")
             self._websocket = None
 
+        # 🔥 批量下单流水线（本地nonce + 并发签名 + sendtxbatch分块提交）
+        batch_config = (config.get('api_config') or {}).get('batch_orders') or {}
+        self._batch_chunk_size = max(1, int(batch_config.get('chunk_size', 20)))
+        self._batch_sign_workers = max(1, int(batch_config.get('sign_workers', 4)))
+        self._batch_resync_retries = max(0, int(batch_config.get('nonce_resync_retries', 2)))
+        self._nonce_allocator: Optional[LighterNonceAllocator] = None
+        self._sign_executor: Optional[ThreadPoolExecutor] = None
+        self._last_client_order_id = 0
+
         # 🔥 令牌缓存（避免频繁生成令牌）
         self._auth_token_cache = None
         self._auth_token_expiry = 0  # 令牌过期时间戳
@@ -384,6 +399,9 @@ class LighterRest(LighterBase):
                     await close_fn()
             if self.api_client:
                 await self.api_client.close()
+            if self._sign_executor:
+                self._sign_executor.shutdown(wait=False)
+                self._sign_executor = None
             self._connected = False
             logger.info("Lighter REST客户端已关闭")
         except Exception as e:
@@ -418,6 +436,15 @@ class LighterRest(LighterBase):
                 api_key_index=api_key_index,
             )
 
+    async def _limited(self, endpoint_class: str, call: Callable, *args, weight: float = 1, **kwargs):
+        """经令牌桶限流后调用 SDK 接口；429 错误反馈给限流器进入冷却"""
+        await self._rate_limiter.acquire(endpoint_class, weight)
+        try:
+            return await call(*args, **kwargs)
+        except Exception as e:
+            self._rate_limiter.observe_error(e)
+            raise
+
     # ============= 市场数据 =============
 
     async def _load_markets(self):
@@ -438,7 +465,7 @@ class LighterRest(LighterBase):
         try:
             # 获取订单簿列表（包含市场信息）
             # ⚠️ 必须使用此API，它会返回所有市场包括market_id=0的ETH
-            response = await self.order_api.order_books()
+            response = await self._limited(EndpointClass.MARKET, self.order_api.order_books)
 
             if hasattr(response, 'order_books'):
                 markets = []
@@ -479,7 +506,7 @@ class LighterRest(LighterBase):
         """
         try:
             # 获取订单簿信息
-            response = await self.order_api.order_books()
+            response = await self._limited(EndpointClass.MARKET, self.order_api.order_books)
 
             symbols = []
             if hasattr(response, 'order_books'):
@@ -545,7 +572,7 @@ class LighterRest(LighterBase):
                 return None
 
             # 获取市场统计信息（包含价格信息）
-            response = await self.order_api.order_book_details(market_id=market_id)
+            response = await self._limited(EndpointClass.MARKET, self.order_api.order_book_details, market_id=market_id)
 
             detail = None
             if response and hasattr(response, 'order_book_details') and response.order_book_details:
@@ -566,7 +593,7 @@ class LighterRest(LighterBase):
             bid_price = last_price
             ask_price = last_price
             try:
-                orderbook_response = await self.order_api.order_book_orders(
+                orderbook_response = await self._limited(EndpointClass.MARKET, self.order_api.order_book_orders,
                     market_id=market_id, limit=1)
                 if orderbook_response and getattr(orderbook_response, 'bids', None):
                     bid_price = self._safe_decimal(
@@ -614,7 +641,7 @@ class LighterRest(LighterBase):
                 return None
 
             # 使用 order_book_orders 获取订单簿深度
-            response = await self.order_api.order_book_orders(market_id=market_id, limit=limit)
+            response = await self._limited(EndpointClass.MARKET, self.order_api.order_book_orders, market_id=market_id, limit=limit)
 
             if not response:
                 return None
@@ -684,7 +711,7 @@ class LighterRest(LighterBase):
                 return []
 
             # 获取最近成交
-            response = await self.order_api.recent_trades(market_id=market_id, limit=limit)
+            response = await self._limited(EndpointClass.MARKET, self.order_api.recent_trades, market_id=market_id, limit=limit)
 
             trades = []
             if hasattr(response, 'trades') and response.trades:
@@ -735,7 +762,7 @@ class LighterRest(LighterBase):
 
         try:
             # 获取账户信息
-            response = await self.account_api.account(by="index", value=str(self.account_index))
+            response = await self._limited(EndpointClass.ACCOUNT, self.account_api.account, by="index", value=str(self.account_index))
 
             balances = []
 
@@ -817,7 +844,7 @@ class LighterRest(LighterBase):
 
                 try:
                     # 使用 account_active_orders API（SDK 方法是异步的，直接 await）
-                    response = await self.order_api.account_active_orders(
+                    response = await self._limited(EndpointClass.ACCOUNT, self.order_api.account_active_orders,
                         account_index=self.account_index,
                         market_id=market_id if market_id is not None else 255,  # 255 = 所有市场
                         auth=auth_token
@@ -970,7 +997,7 @@ class LighterRest(LighterBase):
 
             # 获取历史订单 (Lighter API 限制 limit <= 100)
             safe_limit = min(limit, 100)
-            response = await self.order_api.account_inactive_orders(
+            response = await self._limited(EndpointClass.ACCOUNT, self.order_api.account_inactive_orders,
                 account_index=self.account_index,
                 limit=safe_limit,
                 auth=auth_token,
@@ -1022,7 +1049,7 @@ class LighterRest(LighterBase):
         for attempt in range(max_retries + 1):
             try:
                 # 获取账户信息（包含持仓）
-                response = await self.account_api.account(by="index", value=str(self.account_index))
+                response = await self._limited(EndpointClass.ACCOUNT, self.account_api.account, by="index", value=str(self.account_index))
                 # 成功获取，跳出重试循环
                 break
             except Exception as e:
@@ -1211,7 +1238,7 @@ class LighterRest(LighterBase):
 
             # 获取市场详情，动态获取价格精度
             logger.debug(f"🔍 获取市场详情: market_id={market_index}")
-            market_details = await self.order_api.order_book_details(market_id=market_index)
+            market_details = await self._limited(EndpointClass.MARKET, self.order_api.order_book_details, market_id=market_index)
             price_decimals = self._extract_price_decimals(market_details)
 
             # 如果详情未提供或解析失败，尝试从已加载的 markets 字典兜底（含 price_decimals）
@@ -1556,7 +1583,7 @@ class LighterRest(LighterBase):
 
         return result
 
-    async def _build_signed_market_order_tx(
+    async def _prepare_market_order_spec(
         self,
         symbol: str,
         side: str,
@@ -1567,7 +1594,7 @@ class LighterRest(LighterBase):
         client_order_id: Optional[int] = None,
         target_price: Optional[Decimal] = None
     ) -> Optional[Dict[str, Any]]:
-        """构建市价单的签名交易数据，不立即发送"""
+        """构建市价单的签名参数（不取nonce、不签名，供批量流水线使用）"""
         if not self.signer_client:
             logger.error("SignerClient 未初始化，无法签名订单")
             return None
@@ -1584,7 +1611,6 @@ class LighterRest(LighterBase):
             logger.error(f"未找到市场信息: {symbol}")
             return None
 
-        # 🔥 修复：先检查前置条件，避免获取nonce后再失败
         avg_execution_price = await self._calculate_slippage_protection_price(
             symbol,
             side,
@@ -1601,74 +1627,322 @@ class LighterRest(LighterBase):
             avg_execution_price,
             side,
             reduce_only=reduce_only,
-            client_order_id=client_order_id,
+            client_order_id=client_order_id if client_order_id is not None else self._next_client_order_id(),
         )
 
-        # 🔥 修复：只有在所有前置条件都满足后，才获取nonce
-        # 这样可以避免nonce被消耗但订单没有发送的情况
-        api_key_index, nonce = self.signer_client.get_api_key_nonce(-1, -1)
-
         import lighter
-        sign_result = self.signer_client.sign_create_order(
-            market_index=params['market_index'],
-            client_order_index=params['client_order_index'],
-            base_amount=params['base_amount'],
-            price=params['avg_execution_price'],
-            order_type=lighter.SignerClient.ORDER_TYPE_MARKET,
-            time_in_force=lighter.SignerClient.ORDER_TIME_IN_FORCE_IMMEDIATE_OR_CANCEL,
-            trigger_price=lighter.SignerClient.NIL_TRIGGER_PRICE,
-            order_expiry=lighter.SignerClient.DEFAULT_IOC_EXPIRY,
-            is_ask=params['is_ask'],
-            reduce_only=int(params['reduce_only']),
-            nonce=nonce,
+        return {
+            "sign_params": {
+                "market_index": params['market_index'],
+                "client_order_index": params['client_order_index'],
+                "base_amount": params['base_amount'],
+                "price": params['avg_execution_price'],
+                "order_type": lighter.SignerClient.ORDER_TYPE_MARKET,
+                "time_in_force": lighter.SignerClient.ORDER_TIME_IN_FORCE_IMMEDIATE_OR_CANCEL,
+                "trigger_price": lighter.SignerClient.NIL_TRIGGER_PRICE,
+                "order_expiry": lighter.SignerClient.DEFAULT_IOC_EXPIRY,
+                "is_ask": params['is_ask'],
+                "reduce_only": int(params['reduce_only']),
+            },
+            "context": {
+                "symbol": symbol,
+                "side": side,
+                "quantity": quantity,
+                "reduce_only": reduce_only,
+                "client_order_id": params['client_order_index'],
+                "avg_execution_price": avg_execution_price,
+                "order_type": "market",
+            }
+        }
+
+    async def _prepare_limit_order_spec(
+        self,
+        symbol: str,
+        side: str,
+        quantity: Decimal,
+        price: Decimal,
+        **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        """构建限价单的签名参数（不取nonce、不签名，供批量流水线使用）"""
+        market_info = await self._get_market_info(symbol)
+        if not market_info:
+            logger.error(f"未找到市场信息: {symbol}")
+            return None
+
+        kwargs.setdefault("client_order_id", self._next_client_order_id())
+        params = self._convert_limit_order_params(
+            market_info, quantity, price, side, **kwargs
         )
-        if not isinstance(sign_result, tuple):
-            raise RuntimeError("sign_create_order 返回未知类型")
 
-        if len(sign_result) == 4:
-            tx_type, tx_info, tx_hash, err = sign_result
-        elif len(sign_result) == 3:
-            tx_type, tx_info, err = sign_result
-            tx_hash = None
-        elif len(sign_result) == 2:
-            # 兼容旧版 lighter SDK：返回 (tx_info, err)
-            tx_info, err = sign_result
-            tx_type = getattr(
-                lighter.SignerClient,
-                "TX_TYPE_CREATE_ORDER",
-                14  # 默认值
-            )
-            tx_hash = None
+        import lighter
+        ioc = lighter.SignerClient.ORDER_TIME_IN_FORCE_IMMEDIATE_OR_CANCEL
+        if params['time_in_force'] == ioc:
+            order_expiry = lighter.SignerClient.DEFAULT_IOC_EXPIRY
         else:
-            raise RuntimeError("sign_create_order 返回异常结果")
+            order_expiry = getattr(lighter.SignerClient, "DEFAULT_28_DAY_ORDER_EXPIRY", -1)
 
-        if err:
-            logger.error(f"签名市价单失败: {self.parse_error(err)}")
-            # 🔥 修复：签名失败时立即回滚nonce
-            try:
-                self.signer_client.nonce_manager.acknowledge_failure(
-                    api_key_index)
-                logger.debug(f"✅ Nonce回滚成功: api_key_index={api_key_index}")
-            except Exception as ack_err:
-                logger.warning(f"⚠️ Nonce回滚失败: {ack_err}")
-            return None
+        # 与 _execute_limit_order 一致：返回给上层的是按精度调整后的价格
+        price_decimals = market_info['price_decimals']
+        quantize_precision = Decimal("1") if price_decimals == 0 else Decimal(10) ** (-price_decimals)
 
-        payload = {
-            "tx_type": tx_type,
-            "tx_info": tx_info,
-            "api_key_index": api_key_index,
+        return {
+            "sign_params": {
+                "market_index": params['market_index'],
+                "client_order_index": params['client_order_index'],
+                "base_amount": params['base_amount'],
+                "price": params['price'],
+                "is_ask": params['is_ask'],
+                "order_type": params['order_type'],
+                "time_in_force": params['time_in_force'],
+                "reduce_only": int(params['reduce_only']),
+                "trigger_price": params['trigger_price'],
+                "order_expiry": order_expiry,
+            },
             "context": {
                 "symbol": symbol,
                 "side": side,
                 "quantity": quantity,
-                "reduce_only": reduce_only,
+                "reduce_only": bool(params['reduce_only']),
                 "client_order_id": params['client_order_index'],
-                "avg_execution_price": avg_execution_price
+                "avg_execution_price": price.quantize(quantize_precision),
+                "order_type": "limit",
             }
         }
-        if tx_hash is not None:
-            payload["tx_hash"] = tx_hash
-        return payload
+
+    def _next_client_order_id(self) -> int:
+        """
+        生成进程内递增的 client_order_id
+
+        批量下单时同一毫秒内会构建多笔订单，不能再直接用 loop.time() 毫秒值。
+        """
+        candidate = int(asyncio.get_event_loop().time() * 1000)
+        self._last_client_order_id = max(candidate, self._last_client_order_id + 1)
+        return self._last_client_order_id
+
+    @staticmethod
+    def _unpack_sign_result(sign_result: Any) -> Tuple[Any, Any, Any, Any]:
+        """兼容不同 SDK 版本的 sign_create_order 返回值，统一为 (tx_type, tx_info, tx_hash, err)"""
+        if not isinstance(sign_result, tuple):
+            raise RuntimeError("sign_create_order 返回未知类型")
+        if len(sign_result) == 4:
+            return sign_result
+        if len(sign_result) == 3:
+            tx_type, tx_info, err = sign_result
+            return tx_type, tx_info, None, err
+        if len(sign_result) == 2:
+            # 兼容旧版 lighter SDK：返回 (tx_info, err)
+            import lighter
+            tx_info, err = sign_result
+            tx_type = getattr(lighter.SignerClient, "TX_TYPE_CREATE_ORDER", 14)
+            return tx_type, tx_info, None, err
+        raise RuntimeError("sign_create_order 返回异常结果")
+
+    def _sign_one(self, sign_params: Dict[str, Any], nonce: int) -> Tuple[Any, Any, Any, Any]:
+        try:
+            return self._unpack_sign_result(
+                self.signer_client.sign_create_order(nonce=nonce, **sign_params)
+            )
+        except Exception as e:
+            return None, None, None, str(e)
+
+    async def _sign_specs(
+        self,
+        specs: List[Dict[str, Any]],
+        nonces: List[int]
+    ) -> List[Tuple[Any, Any, Any, Any]]:
+        """
+        对一组订单签名（nonce 已预先分配）
+
+        签名是对本地签名库的同步调用；订单较多时放到线程池并发执行，
+        每笔的 nonce 已经固定，签名完成的先后顺序不影响提交顺序。
+        """
+        if self._batch_sign_workers <= 1 or len(specs) <= 2:
+            return [self._sign_one(spec["sign_params"], nonce) for spec, nonce in zip(specs, nonces)]
+
+        if self._sign_executor is None:
+            self._sign_executor = ThreadPoolExecutor(
+                max_workers=self._batch_sign_workers,
+                thread_name_prefix="lighter-sign"
+            )
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*(
+            loop.run_in_executor(self._sign_executor, self._sign_one, spec["sign_params"], nonce)
+            for spec, nonce in zip(specs, nonces)
+        ))
+
+    def _get_nonce_allocator(self) -> LighterNonceAllocator:
+        if self._nonce_allocator is None:
+            self._nonce_allocator = get_nonce_allocator(self.account_index, self.api_key_index)
+        return self._nonce_allocator
+
+    @staticmethod
+    def _is_nonce_error(message: Optional[str]) -> bool:
+        text = str(message or "").lower()
+        return "21104" in text or "invalid nonce" in text
+
+    async def _sign_and_send_batch(self, specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        批量下单流水线：本地分配nonce → 并发签名 → sendtxbatch 分块提交
+
+        - 一次预留与待提交订单数相同的连续 nonce
+        - 各块按 nonce 顺序依次提交（一个往返提交 batch_chunk_size 笔）
+        - 某块被拒：从 API 重新同步 nonce，按服务端 next_nonce 推算该块已被接受的笔数，
+          剩余订单用新 nonce 重新签名后继续提交（仅 nonce 类错误重试，最多 nonce_resync_retries 次）
+
+        Args:
+            specs: _prepare_*_order_spec 生成的订单（sign_params + context）
+
+        Returns:
+            与 specs 一一对应的结果：{'sent': bool, 'tx_hash': Optional[str], 'error': Optional[str]}
+        """
+        results: List[Dict[str, Any]] = [
+            {"sent": False, "tx_hash": None, "error": None} for _ in specs
+        ]
+        if not specs:
+            return results
+        if not self._websocket:
+            raise RuntimeError("WebSocket 模块未初始化，无法发送批量订单")
+
+        allocator = self._get_nonce_allocator()
+        pending = list(range(len(specs)))
+        resyncs_left = self._batch_resync_retries
+
+        async with allocator.lock:
+            while pending:
+                _, nonces = allocator.reserve(self.signer_client, len(pending))
+                signed = await self._sign_specs([specs[i] for i in pending], nonces)
+
+                sign_failed = [
+                    (i, item) for i, item in zip(pending, signed) if item[3] or not item[1]
+                ]
+                if sign_failed:
+                    # 签名失败：整段nonce都未发出。签名在线程池中执行，期间单笔下单可能已取走
+                    # 后续nonce，不能在本地回滚计数，改为从API重新同步后剔除失败订单重新预留
+                    await allocator.resync(self.signer_client, self.transaction_api)
+                    for i, item in sign_failed:
+                        reason = self.parse_error(item[3]) if item[3] else "tx_info为空"
+                        results[i]["error"] = f"签名失败: {reason}"
+                        logger.error(f"❌ [Lighter] 批量下单签名失败: {specs[i]['context']} | {reason}")
+                    pending = [i for i in pending if results[i]["error"] is None]
+                    continue
+
+                pending, error = await self._send_signed_chunks(
+                    pending, signed, nonces, results, allocator
+                )
+                if not pending:
+                    break
+                if resyncs_left <= 0 or not self._is_nonce_error(error):
+                    for i in pending:
+                        results[i]["error"] = error
+                    break
+                resyncs_left -= 1
+                logger.warning(
+                    f"🔁 [Lighter] nonce已重新同步，重新签名剩余 {len(pending)} 笔订单 "
+                    f"(剩余重试={resyncs_left})"
+                )
+
+        return results
+
+    async def _send_signed_chunks(
+        self,
+        pending: List[int],
+        signed: List[Tuple[Any, Any, Any, Any]],
+        nonces: List[int],
+        results: List[Dict[str, Any]],
+        allocator: LighterNonceAllocator,
+    ) -> Tuple[List[int], Optional[str]]:
+        """按 nonce 顺序分块提交；返回 (未被接受的订单下标, 错误信息)"""
+        chunk_size = self._batch_chunk_size
+        for start in range(0, len(pending), chunk_size):
+            indices = pending[start:start + chunk_size]
+            chunk = signed[start:start + chunk_size]
+            # 批量交易按笔数计权重，与单笔下单共用下单通道
+            await self._rate_limiter.acquire(EndpointClass.ORDER, len(chunk))
+            try:
+                response = await self._websocket.send_tx_batch(
+                    [item[0] for item in chunk],
+                    [item[1] for item in chunk]
+                )
+            except Exception as e:
+                next_nonce = await allocator.resync(self.signer_client, self.transaction_api)
+                accepted = 0
+                if next_nonce is not None:
+                    accepted = min(max(next_nonce - nonces[start], 0), len(indices))
+                for i in indices[:accepted]:
+                    results[i]["sent"] = True
+                logger.error(
+                    f"❌ [Lighter] 批量提交被拒: 第{start // chunk_size + 1}块 "
+                    f"({len(indices)}笔, 已接受{accepted}笔), error={e}"
+                )
+                return pending[start + accepted:], str(e)
+
+            tx_hashes = response.get("tx_hash") if isinstance(response, dict) else None
+            for k, i in enumerate(indices):
+                results[i]["sent"] = True
+                if isinstance(tx_hashes, list) and k < len(tx_hashes):
+                    results[i]["tx_hash"] = tx_hashes[k]
+        return [], None
+
+    async def place_limit_orders_batch(
+        self,
+        orders: List[Dict[str, Any]]
+    ) -> List[Optional[OrderData]]:
+        """
+        批量下限价单（本地nonce + 并发签名 + sendtxbatch分块提交）
+
+        N 笔订单只需 ceil(N / batch_chunk_size) 次往返，替代逐笔串行 create_order。
+
+        Args:
+            orders: 订单列表，每项包含 symbol/side/quantity/price，
+                    可选 client_order_id/reduce_only/time_in_force
+
+        Returns:
+            与 orders 一一对应的 OrderData（失败为 None）
+        """
+        if not self._validate_order_preconditions():
+            return [None] * len(orders)
+
+        specs: List[Optional[Dict[str, Any]]] = []
+        for order in orders:
+            try:
+                extra = {
+                    key: order[key]
+                    for key in ("client_order_id", "reduce_only", "time_in_force")
+                    if order.get(key) is not None
+                }
+                spec = await self._prepare_limit_order_spec(
+                    order["symbol"],
+                    str(order["side"]).lower(),
+                    Decimal(str(order["quantity"])),
+                    Decimal(str(order["price"])),
+                    **extra
+                )
+            except Exception as e:
+                logger.error(f"❌ [Lighter] 批量限价单参数错误: {order} | {e}")
+                spec = None
+            specs.append(spec)
+
+        valid = [i for i, spec in enumerate(specs) if spec]
+        results = await self._sign_and_send_batch([specs[i] for i in valid])
+
+        placed: List[Optional[OrderData]] = [None] * len(orders)
+        for i, result in zip(valid, results):
+            if result["sent"]:
+                placed[i] = self._build_ws_batch_order_placeholder(
+                    specs[i]["context"], result["tx_hash"])
+            else:
+                logger.error(
+                    f"❌ [Lighter] 批量限价单失败: {specs[i]['context']['side']} "
+                    f"{specs[i]['context']['quantity']}@{specs[i]['context']['avg_execution_price']} | "
+                    f"{result['error']}"
+                )
+
+        sent = sum(1 for order in placed if order)
+        logger.info(
+            f"✅ [Lighter] 批量限价单完成: 成功{sent}/{len(orders)}笔, "
+            f"失败{len(orders) - sent}笔 (分块={self._batch_chunk_size})"
+        )
+        return placed
 
     async def place_market_orders_via_ws_batch(
         self,
@@ -1688,15 +1962,9 @@ class LighterRest(LighterBase):
             logger.error(msg)
             raise RuntimeError(msg)
 
-        signed_payloads: List[Dict[str, Any]] = []
-        api_key_indices: List[int] = []
-        order_contexts: List[Dict[str, Any]] = []
+        specs: List[Dict[str, Any]] = []
         skipped_orders: List[Dict[str, Any]] = []
 
-        # 🔥 关键修复：记录签名失败信息，用于判断是否需要回滚
-        sign_failed = False
-        sign_error_msg = None
-
         for order in orders:
             symbol = order.get("symbol")
             side = order.get("side")
@@ -1721,34 +1989,22 @@ class LighterRest(LighterBase):
                 })
                 continue
 
-            try:
-                signed = await self._build_signed_market_order_tx(
-                    symbol,
-                    side,
-                    qty,
-                    reduce_only=reduce_only,
-                    slippage_multiplier=slippage_multiplier,
-                    client_order_id=order.get("client_order_id"),
-                    target_price=target_price
-                )
-                if not signed:
-                    # 🔥 关键：签名失败，需要回滚所有已获取的nonce
-                    sign_failed = True
-                    sign_error_msg = f"签名失败: {order}"
-                    logger.error(f"❌ {sign_error_msg}")
-                    break  # 立即中断，不再处理后续订单
-
-                signed_payloads.append(signed)
-                api_key_indices.append(signed["api_key_index"])
-
-            except Exception as sign_err:
-                # 🔥 关键：签名异常，需要回滚所有已获取的nonce
-                sign_failed = True
-                sign_error_msg = f"签名异常: {sign_err}, 订单: {order}"
+            spec = await self._prepare_market_order_spec(
+                symbol,
+                side,
+                qty,
+                reduce_only=reduce_only,
+                slippage_multiplier=slippage_multiplier,
+                client_order_id=order.get("client_order_id"),
+                target_price=target_price
+            )
+            if not spec:
+                # 🔥 还未分配任何nonce，直接终止整批（与单腿提交相比，宁可整批不发）
+                sign_error_msg = f"签名失败: {order}"
                 logger.error(f"❌ {sign_error_msg}")
-                break  # 立即中断，不再处理后续订单
-            context = signed.get("context", {})
-            context.update({
+                raise RuntimeError(f"批量下单签名失败: {sign_error_msg}")
+
+            spec["context"].update({
                 "symbol": symbol,
                 "side": side,
                 "quantity": qty,
@@ -1756,28 +2012,9 @@ class LighterRest(LighterBase):
                 "reduce_only": reduce_only,
                 "position_available": adjustment.get("available")
             })
-            order_contexts.append(context)
+            specs.append(spec)
 
-        # 🔥 第二阶段：如果签名失败，回滚所有已获取的nonce
-        if sign_failed:
-            logger.warning(
-                f"⚠️ 批量下单签名阶段失败，回滚已获取的 {len(api_key_indices)} 个nonce")
-            for api_key_index in api_key_indices:
-                try:
-                    self.signer_client.nonce_manager.acknowledge_failure(
-                        api_key_index)
-                    logger.debug(f"✅ 回滚nonce: api_key_index={api_key_index}")
-                except Exception as rollback_err:
-                    logger.warning(
-                        f"⚠️ 回滚nonce失败: api_key_index={api_key_index}, error={rollback_err}")
-
-            # 抛出异常，终止批量下单
-            raise RuntimeError(f"批量下单签名失败，已回滚所有nonce: {sign_error_msg}")
-
-        tx_types = [item["tx_type"] for item in signed_payloads]
-        tx_infos = [item["tx_info"] for item in signed_payloads]
-
-        if not signed_payloads:
+        if not specs:
             logger.info(
                 "ℹ️ [Lighter] WS批量市价单无有效订单（全部因无可平仓持仓被跳过）"
             )
@@ -1786,49 +2023,42 @@ class LighterRest(LighterBase):
                 "skipped_orders": skipped_orders
             }
 
-        # 🔥 修复：将整个发送过程包在try块中，确保失败时能回滚nonce
-        try:
-            response = await self._websocket.send_tx_batch(tx_types, tx_infos)
-            # 统一打印一次返回摘要，便于排障：
-            # - 若返回中包含 error，说明交易请求并未真正成功（可能被拒绝/限流/参数错误）
-            # - 若无 tx_hash，则后续很难从链上/服务端侧追踪
-            if isinstance(response, dict) and response.get("error"):
-                logger.error("❌ WS批量市价单返回错误: %s", response.get("error"))
-                raise RuntimeError(str(response))
+        results = await self._sign_and_send_batch(specs)
+        sent = [(spec, result) for spec, result in zip(specs, results) if result["sent"]]
+        failed = [(spec, result) for spec, result in zip(specs, results) if not result["sent"]]
 
-            tx_hashes = response.get("tx_hash") if isinstance(response, dict) else None
-            if isinstance(tx_hashes, list):
-                logger.info(
-                    "✅ WS批量市价单已发送，等待成交: tx_hash_count=%s first_tx_hash=%s",
-                    len(tx_hashes),
-                    tx_hashes[0] if tx_hashes else None,
-                )
-            else:
-                logger.info("✅ WS批量市价单已发送，等待成交")
-            if isinstance(tx_hashes, list):
-                orders_data: List[OrderData] = []
-                for idx, ctx in enumerate(order_contexts):
-                    tx_hash = tx_hashes[idx] if idx < len(tx_hashes) else None
-                    orders_data.append(
-                        self._build_ws_batch_order_placeholder(ctx, tx_hash))
-                response["orders"] = orders_data
-            else:
-                response["orders"] = [
-                    self._build_ws_batch_order_placeholder(ctx, None)
-                    for ctx in order_contexts
-                ]
-            if skipped_orders:
-                response["skipped_orders"] = skipped_orders
-            return response
-        except Exception as e:
-            logger.error(f"WS批量市价单发送失败: {e}")
-            for api_key_index in api_key_indices:
-                try:
-                    self.signer_client.nonce_manager.acknowledge_failure(
-                        api_key_index)
-                except Exception:
-                    pass
-            raise RuntimeError(f"WS批量市价单发送失败: {e}") from e
+        if not sent:
+            error = next((result["error"] for _, result in failed if result["error"]), "未知错误")
+            logger.error(f"WS批量市价单发送失败: {error}")
+            raise RuntimeError(f"WS批量市价单发送失败: {error}")
+
+        tx_hashes = [result["tx_hash"] for _, result in sent]
+        logger.info(
+            "✅ WS批量市价单已发送，等待成交: tx_hash_count=%s first_tx_hash=%s",
+            len(tx_hashes),
+            tx_hashes[0] if tx_hashes else None,
+        )
+        response: Dict[str, Any] = {
+            "tx_hash": tx_hashes,
+            "orders": [
+                self._build_ws_batch_order_placeholder(spec["context"], result["tx_hash"])
+                for spec, result in sent
+            ],
+        }
+        if failed:
+            # 部分订单未被接受（例如重新同步后仍被拒），上层按单腿场景处理
+            response["failed_orders"] = [
+                {
+                    "symbol": spec["context"]["symbol"],
+                    "side": spec["context"]["side"],
+                    "error": result["error"],
+                }
+                for spec, result in failed
+            ]
+            logger.error(f"❌ WS批量市价单部分失败: {response['failed_orders']}")
+        if skipped_orders:
+            response["skipped_orders"] = skipped_orders
+        return response
 
     def _build_ws_batch_order_placeholder(
         self,
@@ -1846,13 +2076,14 @@ class LighterRest(LighterBase):
         avg_price = context.get("avg_execution_price")
 
         order_side = OrderSide.BUY if side != "sell" else OrderSide.SELL
+        order_type = OrderType.LIMIT if context.get("order_type") == "limit" else OrderType.MARKET
 
         return OrderData(
             id=str(client_order_id),
             client_id=str(client_order_id),
             symbol=symbol,
             side=order_side,
-            type=OrderType.MARKET,
+            type=order_type,
             amount=quantity,
             price=avg_price,
             filled=Decimal("0"),
@@ -1886,8 +2117,7 @@ class LighterRest(LighterBase):
         """执行市价单"""
         # 🔥 生成唯一的 client_order_id（确保整个流程使用同一个值）
         if "client_order_id" not in kwargs:
-            kwargs["client_order_id"] = int(
-                asyncio.get_event_loop().time() * 1000)
+            kwargs["client_order_id"] = self._next_client_order_id()
 
         # 🔥 获取滑点倍数（支持动态调整）
         slippage_multiplier = kwargs.pop("slippage_multiplier", Decimal("1.0"))
@@ -1906,7 +2136,7 @@ class LighterRest(LighterBase):
 
         # 执行下单
         try:
-            tx, tx_hash, err = await self.signer_client.create_market_order(**params)
+            tx, tx_hash, err = await self._limited(EndpointClass.ORDER, self.signer_client.create_market_order, **params)
 
             # 处理结果
             return await self._handle_order_result(
@@ -1935,8 +2165,7 @@ class LighterRest(LighterBase):
 
         # 🔥 生成唯一的 client_order_id（确保整个流程使用同一个值）
         if "client_order_id" not in kwargs:
-            kwargs["client_order_id"] = int(
-                asyncio.get_event_loop().time() * 1000)
+            kwargs["client_order_id"] = self._next_client_order_id()
 
         # 转换参数
         params = self._convert_limit_order_params(
@@ -1946,7 +2175,7 @@ class LighterRest(LighterBase):
         # 执行下单
         try:
             import lighter
-            tx, tx_hash, err = await self.signer_client.create_order(**params)
+            tx, tx_hash, err = await self._limited(EndpointClass.ORDER, self.signer_client.create_order, **params)
 
             # 🔥 处理结果（使用调整后的价格，与_convert_limit_order_params保持一致）
             price_decimals = market_info['price_decimals']
@@ -2122,8 +2351,8 @@ class LighterRest(LighterBase):
         - 大多数CEX使用固定的1e8或1e6
         - Lighter根据价格大小动态选择精度，以优化Layer 2性能
         """
-        # 🔥 nonce冲突已通过grid_engine_impl.py中的串行下单解决
-        # 串行下单确保了nonce自然递增，无需在此添加延迟
+        # 🔥 单笔下单的nonce由SDK分配；多笔订单请使用 place_limit_orders_batch
+        # （本地号段预留 + 并发签名 + sendtxbatch分块提交），不要并发调用本方法
 
         logger.debug(
             f"📝 开始下单: symbol={symbol}, side={side}, type={order_type}, qty={quantity}")
@@ -2222,7 +2451,7 @@ class LighterRest(LighterBase):
                         f"模式={margin_mode}({margin_mode_value}), 杠杆={leverage}x")
 
             # 调用 SDK 设置保证金模式和杠杆
-            tx, tx_hash, err = await self.signer_client.update_leverage(
+            tx, tx_hash, err = await self._limited(EndpointClass.ACCOUNT, self.signer_client.update_leverage,
                 market_index=market_index,
                 margin_mode=margin_mode_value,
                 leverage=leverage
@@ -2283,7 +2512,7 @@ class LighterRest(LighterBase):
                 return False
 
             # 取消订单
-            tx, tx_hash, err = await self.signer_client.cancel_order(
+            tx, tx_hash, err = await self._limited(EndpointClass.CANCEL, self.signer_client.cancel_order,
                 market_index=market_index,
                 order_index=int(order_id),
             )
@@ -2337,7 +2566,7 @@ class LighterRest(LighterBase):
             # 只有 SCHEDULED 模式才需要传真实的时间戳
             try:
                 # 使用 IMMEDIATE 模式：立即取消所有订单
-                tx, tx_hash, err = await self.signer_client.cancel_all_orders(
+                tx, tx_hash, err = await self._limited(EndpointClass.CANCEL, self.signer_client.cancel_all_orders,
                     time_in_force=lighter.SignerClient.CANCEL_ALL_TIF_IMMEDIATE,
                     timestamp_ms=0  # 🔥 IMMEDIATE 模式必须传 0，不能传当前时间
                 )
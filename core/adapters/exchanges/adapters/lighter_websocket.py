@@ -44,6 +44,7 @@ import ssl
 import os
 
 from ..utils.logger_factory import get_exchange_logger
+from ..utils.http_client import get_shared_session
 
 logger = get_exchange_logger("ExchangeAdapter.lighter")
 
@@ -62,6 +63,7 @@ except ImportError:
     logger.warning("websockets库未安装，无法使用直接订阅功能")
 
 from .lighter_base import LighterBase
+from ..local_orderbook import LocalOrderBook
 from ..models import (
     TickerData, OrderBookData, TradeData, OrderData, PositionData,
     OrderBookLevel, OrderStatus, OrderSide, OrderType
@@ -98,8 +100,10 @@ class LighterWebSocket(LighterBase):
         # 数据缓存
         self._order_books: Dict[str, OrderBookData] = {}
         # 🔥 本地订单簿状态维护（参考 test_sol_orderbook.py）
-        # {market_index: {'bids': {price: size}, 'asks': {price: size}}}
-        self._local_orderbooks: Dict[int, Dict[str, Dict[str, str]]] = {}
+        # {market_index: LocalOrderBook}
+        self._local_orderbooks: Dict[int, LocalOrderBook] = {}
+        # 🔥 BBO模式：只推送 TopOfBook，完整深度按需懒加载
+        self._top_of_book_mode = False
         self._account_data: Dict[str, Any] = {}
         # 🔥 持仓缓存（供position_monitor使用）
         self._position_cache: Dict[str, Dict[str, Any]] = {}
@@ -184,6 +188,9 @@ class LighterWebSocket(LighterBase):
         self._network_bytes_sent = 0
         self._ws_manual_health_ping_sent = False
 
+        # 🔥 原始帧录制器（FrameWriter，可选；用于离线回放）
+        self._frame_recorder = None
+
         # 🔥 数据超时检测（参考 test_sol_orderbook.py）
         self._last_message_time: float = 0  # 最后接收消息的时间戳（包含心跳）
         self._last_business_message_time: float = 0  # 最后一次业务消息时间戳
@@ -602,6 +609,10 @@ class LighterWebSocket(LighterBase):
             if ticker:
                 self._trigger_ticker_callbacks(ticker)
     
+    def set_top_of_book_mode(self, enabled: bool) -> None:
+        """设置BBO模式（True 时订单簿回调收到 TopOfBook，而不是完整 OrderBookData）"""
+        self._top_of_book_mode = bool(enabled)
+
     def get_network_stats(self) -> Dict[str, int]:
         """获取网络流量统计"""
         return {
@@ -1106,6 +1117,8 @@ class LighterWebSocket(LighterBase):
 
             self._network_bytes_received += len(message.encode("utf-8"))
             self._last_message_time = time.time()
+            if self._frame_recorder is not None:
+                self._frame_recorder.record(message, self._last_message_time)
             message_count += 1
 
             if message_count % 5000 == 0:
@@ -1241,54 +1254,18 @@ class LighterWebSocket(LighterBase):
             else:
                 logger.warning(f"⚠️ [Lighter] 订单簿timestamp解析失败！原始值={raw_timestamp}")
             
-            # 初始化本地缓存
-            self._local_orderbooks[market_index] = {
-                'bids': {},  # {price: size}
-                'asks': {},  # {price: size}
-                'timestamp': parsed_timestamp,
-                'offset': orderbook_data.get('offset'),
-                'nonce': orderbook_data.get('nonce')
-            }
-            
-            # 处理 bids（只添加 size > 0 的条目）
-            bids = orderbook_data.get('bids', [])
-            for bid in bids:
-                if isinstance(bid, dict):
-                    price = bid.get('price')
-                    size = bid.get('size')
-                elif isinstance(bid, (list, tuple)) and len(bid) >= 2:
-                    price, size = bid[0], bid[1]
-                else:
-                    continue
-                
-                # 🔥 只添加 price 和 size 都存在且 size > 0 的条目
-                if price and size:
-                    try:
-                        size_float = float(size)
-                        if size_float > 0:
-                            self._local_orderbooks[market_index]['bids'][str(price)] = str(size)
-                    except (ValueError, TypeError):
-                        continue  # 忽略无效的 size 值
+            # 初始化本地缓存（复用已有对象，保留已推断的价格精度）
+            local_book = self._local_orderbooks.get(market_index)
+            if local_book is None:
+                symbol = self._get_symbol_from_market_index(market_index) or str(market_index)
+                local_book = LocalOrderBook(symbol)
+                self._local_orderbooks[market_index] = local_book
             
-            # 处理 asks（只添加 size > 0 的条目）
-            asks = orderbook_data.get('asks', [])
-            for ask in asks:
-                if isinstance(ask, dict):
-                    price = ask.get('price')
-                    size = ask.get('size')
-                elif isinstance(ask, (list, tuple)) and len(ask) >= 2:
-                    price, size = ask[0], ask[1]
-                else:
-                    continue
-                
-                # 🔥 只添加 price 和 size 都存在且 size > 0 的条目
-                if price and size:
-                    try:
-                        size_float = float(size)
-                        if size_float > 0:
-                            self._local_orderbooks[market_index]['asks'][str(price)] = str(size)
-                    except (ValueError, TypeError):
-                        continue  # 忽略无效的 size 值
+            # 只保留 size > 0 的条目（LocalOrderBook 自动忽略 size <= 0 和无效档位）
+            local_book.apply_snapshot(orderbook_data.get('bids', []), orderbook_data.get('asks', []))
+            local_book.timestamp = parsed_timestamp
+            local_book.nonce = orderbook_data.get('nonce')
+            local_book.metadata['offset'] = orderbook_data.get('offset')
                     
         except Exception as e:
             logger.error(f"❌ [Lighter] 初始化订单簿失败 (market_index={market_index}): {e}", exc_info=True)
@@ -1309,68 +1286,21 @@ class LighterWebSocket(LighterBase):
             
             local_book = self._local_orderbooks[market_index]
             
-            # 处理 bids 更新
-            bids = orderbook_data.get('bids', [])
-            for bid in bids:
-                if isinstance(bid, dict):
-                    price = bid.get('price')
-                    size = bid.get('size')
-                elif isinstance(bid, (list, tuple)) and len(bid) >= 2:
-                    price, size = bid[0], bid[1]
-                else:
-                    continue
-                
-                if price:
-                    price_str = str(price)
-                    try:
-                        size_float = float(size) if size is not None else 0.0
-                    except (ValueError, TypeError):
-                        size_float = 0.0
-                    
-                    # size = 0 表示删除该价格档位
-                    if size_float == 0:
-                        local_book['bids'].pop(price_str, None)
-                    elif size_float > 0:
-                        # 更新或添加（只保存 size > 0 的条目）
-                        local_book['bids'][price_str] = str(size)
-            
-            # 处理 asks 更新
-            asks = orderbook_data.get('asks', [])
-            for ask in asks:
-                if isinstance(ask, dict):
-                    price = ask.get('price')
-                    size = ask.get('size')
-                elif isinstance(ask, (list, tuple)) and len(ask) >= 2:
-                    price, size = ask[0], ask[1]
-                else:
-                    continue
-                
-                if price:
-                    price_str = str(price)
-                    try:
-                        size_float = float(size) if size is not None else 0.0
-                    except (ValueError, TypeError):
-                        size_float = 0.0
-                    
-                    # size = 0 表示删除该价格档位
-                    if size_float == 0:
-                        local_book['asks'].pop(price_str, None)
-                    elif size_float > 0:
-                        # 更新或添加（只保存 size > 0 的条目）
-                        local_book['asks'][price_str] = str(size)
+            # size = 0 表示删除该价格档位，size > 0 更新或添加
+            local_book.apply_delta(orderbook_data.get('bids', []), orderbook_data.get('asks', []))
             
             # 更新元数据（timestamp/offset/nonce）
             raw_timestamp = orderbook_data.get('timestamp')
             parsed_timestamp = self._parse_timestamp_value(raw_timestamp)
             if parsed_timestamp:
-                local_book['timestamp'] = parsed_timestamp
+                local_book.timestamp = parsed_timestamp
                 logger.debug(f"[Lighter] 更新订单簿timestamp: {parsed_timestamp}")
             elif raw_timestamp:
                 logger.warning(f"⚠️ [Lighter] 订单簿更新timestamp解析失败: {raw_timestamp}")
             if 'offset' in orderbook_data:
-                local_book['offset'] = orderbook_data.get('offset')
+                local_book.metadata['offset'] = orderbook_data.get('offset')
             if 'nonce' in orderbook_data:
-                local_book['nonce'] = orderbook_data.get('nonce')
+                local_book.nonce = orderbook_data.get('nonce')
                         
         except Exception as e:
             logger.error(f"❌ [Lighter] 应用订单簿更新失败 (market_index={market_index}): {e}", exc_info=True)
@@ -1387,56 +1317,21 @@ class LighterWebSocket(LighterBase):
             OrderBookData 对象，如果本地订单簿不存在或没有有效数据则返回 None
         """
         try:
-            if market_index not in self._local_orderbooks:
+            local_book = self._local_orderbooks.get(market_index)
+            if local_book is None:
                 return None
             
-            local_book = self._local_orderbooks[market_index]
-            bids = []
-            asks = []
-            
-            # 构建 bids（从高到低排序，过滤掉 size=0 的条目）
-            if local_book.get('bids'):
-                sorted_bids = sorted(local_book['bids'].items(), key=lambda x: float(x[0]), reverse=True)
-                for price_str, size_str in sorted_bids:
-                    size_decimal = self._safe_decimal(size_str)
-                    # 🔥 只添加 size > 0 的条目
-                    if size_decimal and size_decimal > 0:
-                        bids.append(OrderBookLevel(
-                            price=self._safe_decimal(price_str),
-                            size=size_decimal
-                        ))
-            
-            # 构建 asks（从低到高排序，过滤掉 size=0 的条目）
-            if local_book.get('asks'):
-                sorted_asks = sorted(local_book['asks'].items(), key=lambda x: float(x[0]))
-                for price_str, size_str in sorted_asks:
-                    size_decimal = self._safe_decimal(size_str)
-                    # 🔥 只添加 size > 0 的条目
-                    if size_decimal and size_decimal > 0:
-                        asks.append(OrderBookLevel(
-                            price=self._safe_decimal(price_str),
-                            size=size_decimal
-                        ))
-            
-            # 🔥 如果 bids 或 asks 为空，返回 None（避免返回无效的订单簿）
-            if not bids or not asks:
-                return None
-            
-            timestamp = local_book.get('timestamp') or datetime.now()
-            return OrderBookData(
-                symbol=symbol,
-                bids=bids,
-                asks=asks,
-                timestamp=timestamp,
-                nonce=local_book.get('nonce'),
-                exchange_timestamp=local_book.get('timestamp'),
-                raw_data={
-                    'source': 'local_cache',
-                    'market_index': market_index,
-                    'offset': local_book.get('offset'),
-                    'nonce': local_book.get('nonce')
-                }
-            )
+            local_book.symbol = symbol
+            raw_data = {
+                'source': 'local_cache',
+                'market_index': market_index,
+                'offset': local_book.metadata.get('offset'),
+                'nonce': local_book.nonce
+            }
+            # 🔥 bids 或 asks 为空时返回 None（避免返回无效的订单簿）
+            if self._top_of_book_mode:
+                return local_book.to_top_of_book(raw_data=raw_data)
+            return local_book.to_orderbook_data(raw_data=raw_data)
         except Exception as e:
             logger.error(f"❌ [Lighter] 构建订单簿失败 (symbol={symbol}, market_index={market_index}): {e}", exc_info=True)
             return None
@@ -1492,9 +1387,9 @@ class LighterWebSocket(LighterBase):
     def _extract_ticker_from_orderbook(self, symbol: str, raw_data: Dict[str, Any], order_book: OrderBookData) -> Optional[TickerData]:
         """从订单簿中提取ticker数据"""
         try:
-            best_bid = order_book.bids[0].price if order_book.bids else Decimal(
+            best_bid = order_book.best_bid.price if order_book.best_bid else Decimal(
                 "0")
-            best_ask = order_book.asks[0].price if order_book.asks else Decimal(
+            best_ask = order_book.best_ask.price if order_book.best_ask else Decimal(
                 "0")
 
             # 最新价格取中间价
@@ -2143,12 +2038,13 @@ class LighterWebSocket(LighterBase):
         """检查Lighter交易所服务器连通性"""
         try:
             import aiohttp
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "https://mainnet.zklighter.elliot.ai/",
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    return response.status == 200
+            # 复用共享会话，避免每次检查都新建会话并重新握手
+            session = get_shared_session()
+            async with session.get(
+                "https://mainnet.zklighter.elliot.ai/",
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                return response.status == 200
         except Exception:
             return False
 
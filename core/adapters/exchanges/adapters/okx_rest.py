@@ -13,6 +13,7 @@ from typing import Dict, List, Optional, Any
 from decimal import Decimal
 
 from .okx_base import OKXBase
+from ..utils.rate_limiter import get_rate_limiter
 from ..models import (
     TickerData, OrderBookData, TradeData, BalanceData, OrderData,
     PositionData, OHLCVData, ExchangeInfo, ExchangeType,
@@ -45,6 +46,8 @@ class OKXRest(OKXBase):
 
         # ccxt 不是线程安全的：用锁串行化所有请求，避免并发触发限频/竞态
         self._ccxt_lock = asyncio.Lock()
+        # 🔥 进程内共享的令牌桶限流：在排锁之前按优先级通道取令牌，撤单不会排在余额轮询后面
+        self._rate_limiter = get_rate_limiter("okx")
         
     async def initialize(self) -> bool:
         """初始化CCXT交易所实例"""
@@ -91,9 +94,11 @@ class OKXRest(OKXBase):
     async def _execute_with_retry(self, func, *args, **kwargs):
         """带重试的API调用"""
         last_error = None
+        operation = getattr(func, '__name__', None)
         
         for attempt in range(self.max_retries):
             try:
+                await self._rate_limiter.acquire_operation(operation)
                 async with self._ccxt_lock:
                     result = await asyncio.get_event_loop().run_in_executor(
                         None, func, *args, **kwargs
@@ -101,6 +106,7 @@ class OKXRest(OKXBase):
                     return result
             except Exception as e:
                 last_error = e
+                self._rate_limiter.observe_error(e)
                 if attempt < self.max_retries - 1:
                     if self.logger:
                         self.logger.warning(f"API调用失败 (尝试 {attempt + 1}/{self.max_retries}): {str(e)}")
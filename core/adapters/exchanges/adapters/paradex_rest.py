@@ -37,6 +37,8 @@ from ..models import (
 
 from .paradex_base import ParadexBase
 from ..utils.logger_factory import get_exchange_logger
+from ..utils.rate_limiter import EndpointClass, get_rate_limiter, classify_request
+from ..utils.http_client import create_session
 
 logger = get_exchange_logger("ExchangeAdapter.paradex")
 
@@ -109,6 +111,9 @@ class ParadexRest(ParadexBase):
         # 是否为只读模式（只有JWT Token，没有私钥）
         self.readonly_mode = bool(self.jwt_token) and not bool(self.api_key)
         
+        # 🔥 进程内共享的令牌桶限流（撤单/下单优先于账户查询）
+        self._rate_limiter = get_rate_limiter("paradex")
+
         # 初始化 Paradex 官方 SDK 客户端（用于订单签名）
         self._paradex_client = None
         self._paradex_api_client = None
@@ -154,15 +159,20 @@ class ParadexRest(ParadexBase):
                 verify_ssl = os.getenv('PARADEX_VERIFY_SSL', 'true').lower() == 'true'
                 
                 # 创建 SSL 上下文
-                connector = None
+                ssl_context = None
                 if not verify_ssl:
                     ssl_context = ssl.create_default_context()
                     ssl_context.check_hostname = False
                     ssl_context.verify_mode = ssl.CERT_NONE
-                    connector = aiohttp.TCPConnector(ssl=ssl_context)
                 
+                # 🔥 调优连接池 + 预热/保温，下单不再包含 TCP/TLS 握手
                 timeout = aiohttp.ClientTimeout(total=30)
-                self.session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+                self.session = create_session(
+                    "paradex",
+                    ssl=ssl_context,
+                    warm_urls=[self.get_base_url()],
+                    timeout=timeout,
+                )
                 
             # 测试连接
             markets = await self.get_markets()
@@ -240,6 +250,8 @@ class ParadexRest(ParadexBase):
         # 添加认证头
         if auth_required and self.jwt_token:
             headers['Authorization'] = f'Bearer {self.jwt_token}'
+
+        await self._rate_limiter.acquire(classify_request(method, endpoint, private=auth_required))
             
         try:
             async with self.session.request(
@@ -256,6 +268,7 @@ class ParadexRest(ParadexBase):
                     
                 # 处理其他状态码
                 if response.status not in [200, 201]:
+                    self._rate_limiter.observe_status(response.status, response.headers)
                     error_text = await response.text()
                     raise Exception(f"API请求失败 [{response.status}]: {error_text}")
                     
@@ -611,6 +624,7 @@ class ParadexRest(ParadexBase):
             if self.logger:
                 self.logger.info(f"创建 Paradex 订单: {paradex_symbol} {side.value} {amount} @ {price}")
                 
+            await self._rate_limiter.acquire(EndpointClass.ORDER)
             response = await asyncio.to_thread(
                 self._paradex_api_client.submit_order,
                 sdk_order
@@ -623,6 +637,7 @@ class ParadexRest(ParadexBase):
             return self._parse_order(response)
             
         except Exception as e:
+            self._rate_limiter.observe_error(e)
             if self.logger:
                 self.logger.error(f"创建订单失败: {e}")
             raise Exception(f"Paradex 订单创建失败: {str(e)}")
@@ -642,6 +657,7 @@ class ParadexRest(ParadexBase):
             raise Exception("未初始化 paradex SDK 客户端，无法取消订单")
         
         try:
+            await self._rate_limiter.acquire(EndpointClass.CANCEL)
             await asyncio.to_thread(
                 self._paradex_api_client.cancel_order,
                 order_id
@@ -650,6 +666,7 @@ class ParadexRest(ParadexBase):
                 self.logger.info(f"✅ 订单取消成功: {order_id}")
             return self._create_cancelled_order(order_id, symbol)
         except Exception as e:
+            self._rate_limiter.observe_error(e)
             if self.logger:
                 self.logger.error(f"取消订单失败 {order_id}: {e}")
             raise
@@ -695,6 +712,7 @@ class ParadexRest(ParadexBase):
             if symbol:
                 params['market'] = self.convert_to_paradex_symbol(symbol)
             
+            await self._rate_limiter.acquire(EndpointClass.CANCEL)
             await asyncio.to_thread(
                 self._paradex_api_client.cancel_all_orders,
                 params if params else None
@@ -123,6 +123,7 @@ class ParadexWebSocket(ParadexBase):
         self._ticker_callbacks: Dict[str, List[Callable]] = {}
         self._orderbook_callbacks: Dict[str, List[Callable]] = {}
         self._trade_callbacks: Dict[str, List[Callable]] = {}
+        self._frame_recorder = None  # 🔥 原始帧录制器（FrameWriter，可选；用于离线回放）
         
         # 🔥 订单状态与成交回调（用于执行器）
         self._order_fill_callbacks: List[Callable] = []
@@ -252,6 +253,8 @@ class ParadexWebSocket(ParadexBase):
                 self._last_message_time = current_time
                 self._last_business_message_time = current_time
                 self._message_count += 1
+                if self._frame_recorder is not None:
+                    self._frame_recorder.record(message, current_time)
                 
                 # 📊 每5000条消息打印一次统计（参考 Lighter 适配器）
                 if self._message_count % 5000 == 0:
@@ -0,0 +1,817 @@
+"""
+本地模拟交易所适配器（离线执行链路压测）
+
+背景：
+- ArbitrageExecutor / OrderStrategyExecutor / GridEngineImpl 原本只能对接真实交易所
+- 本适配器在进程内实现完整的 ExchangeInterface：下单、撤单、成交、持仓、余额、
+  以及 WebSocket 风格的订单/持仓推送，用于离线测量开/平仓延迟、重试风暴与批量挂单吞吐
+
+撮合模型：
+- 盘口来源：内置随机游走（book_source=synthetic）或外部推送（feed_orderbook，回放/合成行情）
+- 市价单/可成交限价单按当前盘口逐档吃单（盘口不被消耗，由行情驱动刷新），不足部分撤销（IOC）
+- 挂单在盘口更新穿价时按挂单价成交（maker），每次更新最多成交最优档数量
+- 成交推送经过 notify 延迟后按顺序投递，与真实交易所的 WS 推送时序一致
+
+延迟/拒单配置（config.extra_params）：
+    latency:   {order_ack_ms, cancel_ack_ms, query_ms, notify_ms, jitter_ms}
+    rejection: {reject_rate, cancel_reject_rate, timeout_rate, rate_limit_per_second, min_order_size}
+    其余：symbols, initial_prices, default_price, book_depth, level_size, tick_pct,
+         volatility, book_update_interval, book_source, initial_balance, taker_fee, maker_fee, seed
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import inspect
+import itertools
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from ..adapter import ExchangeAdapter
+from ..interface import ExchangeConfig
+from ..models import (
+    BalanceData,
+    ExchangeInfo,
+    ExchangeType,
+    MarginMode,
+    OHLCVData,
+    OrderBookData,
+    OrderBookLevel,
+    OrderData,
+    OrderSide,
+    OrderStatus,
+    OrderType,
+    PositionData,
+    PositionSide,
+    TickerData,
+    TradeData,
+)
+
+_ZERO = Decimal("0")
+_CLOSED_STATUSES = (OrderStatus.FILLED, OrderStatus.CANCELED, OrderStatus.REJECTED, OrderStatus.EXPIRED)
+
+
+@dataclass
+class SimulatedLatencyProfile:
+    """延迟配置（毫秒）"""
+    order_ack_ms: float = 20.0      # 下单往返延迟（撮合发生在中点）
+    cancel_ack_ms: float = 15.0     # 撤单往返延迟
+    query_ms: float = 10.0          # REST 查询延迟（订单/持仓/余额/盘口）
+    notify_ms: float = 5.0          # 成交 → WS 推送延迟
+    jitter_ms: float = 5.0          # 均匀抖动幅度（±）
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "SimulatedLatencyProfile":
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: float(v) for k, v in (data or {}).items() if k in names})
+
+    def sample(self, rng: random.Random, base_ms: float) -> float:
+        """采样一次延迟（秒）"""
+        if base_ms <= 0 and self.jitter_ms <= 0:
+            return 0.0
+        return max(0.0, base_ms + rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000.0
+
+
+@dataclass
+class SimulatedRejectionProfile:
+    """拒单/异常配置"""
+    reject_rate: float = 0.0            # 下单被拒概率
+    cancel_reject_rate: float = 0.0     # 撤单失败概率
+    timeout_rate: float = 0.0           # 下单响应丢失概率（订单已落地，但调用方收到超时）
+    rate_limit_per_second: int = 0      # 每秒下单上限（超出直接返回429，0=不限）
+    min_order_size: Decimal = _ZERO     # 最小下单量
+    reject_message: str = "simulated rejection"
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "SimulatedRejectionProfile":
+        data = dict(data or {})
+        profile = cls()
+        for key in ("reject_rate", "cancel_reject_rate", "timeout_rate"):
+            if key in data:
+                setattr(profile, key, float(data[key]))
+        if "rate_limit_per_second" in data:
+            profile.rate_limit_per_second = int(data["rate_limit_per_second"])
+        if "min_order_size" in data:
+            profile.min_order_size = Decimal(str(data["min_order_size"]))
+        if "reject_message" in data:
+            profile.reject_message = str(data["reject_message"])
+        return profile
+
+
+class SimulatedWebSocket:
+    """
+    模拟 WebSocket 组件
+
+    接口与各交易所 WebSocket 组件保持一致，ArbitrageExecutor / OrderMonitor 通过
+    adapter._websocket 发现并注册 subscribe_orders / subscribe_order_fills / subscribe_positions。
+    """
+
+    order_fill_ws_enabled = True
+
+    def __init__(self, adapter: "SimulatedExchangeAdapter"):
+        self._adapter = adapter
+        self._ws_connected = False
+        self._order_callbacks: List[Callable] = []
+        self._order_fill_callbacks: List[Callable] = []
+        self._position_callbacks: List[Callable] = []
+        self._user_data_callbacks: List[Callable] = []
+        self._orderbook_callbacks: Dict[str, List[Callable]] = {}
+        self._ticker_callbacks: Dict[str, List[Callable]] = {}
+
+    @property
+    def connected(self) -> bool:
+        return self._ws_connected
+
+    async def subscribe_orders(self, callback: Callable) -> None:
+        self._order_callbacks.append(callback)
+
+    async def subscribe_order_fills(self, callback: Callable) -> None:
+        self._order_fill_callbacks.append(callback)
+
+    async def subscribe_positions(self, callback: Callable) -> None:
+        self._position_callbacks.append(callback)
+
+    async def subscribe_user_data(self, callback: Callable) -> None:
+        self._user_data_callbacks.append(callback)
+
+    async def subscribe_orderbook(self, symbol: str, callback: Callable) -> None:
+        self._orderbook_callbacks.setdefault(symbol, []).append(callback)
+
+    async def subscribe_ticker(self, symbol: str, callback: Callable) -> None:
+        self._ticker_callbacks.setdefault(symbol, []).append(callback)
+
+    async def unsubscribe(self, symbol: Optional[str] = None) -> None:
+        if symbol is None:
+            self._orderbook_callbacks.clear()
+            self._ticker_callbacks.clear()
+        else:
+            self._orderbook_callbacks.pop(symbol, None)
+            self._ticker_callbacks.pop(symbol, None)
+
+    def lookup_cached_order(self, order_id: str, symbol: Optional[str] = None) -> Optional[OrderData]:
+        return self._adapter._lookup_order(order_id)
+
+
+class SimulatedExchangeAdapter(ExchangeAdapter):
+    """本地模拟交易所适配器（撮合 + 账户 + 推送）"""
+
+    def __init__(self, config: ExchangeConfig, event_bus=None):
+        super().__init__(config, event_bus)
+        params = config.extra_params or {}
+
+        self.latency = SimulatedLatencyProfile.from_dict(params.get("latency"))
+        self.rejection = SimulatedRejectionProfile.from_dict(params.get("rejection"))
+        self._rng = random.Random(params.get("seed", 7))
+
+        # 盘口参数
+        self._book_source = str(params.get("book_source", "synthetic"))
+        self._initial_prices: Dict[str, Decimal] = {
+            str(k): Decimal(str(v)) for k, v in (params.get("initial_prices") or {}).items()
+        }
+        self._default_price = Decimal(str(params.get("default_price", "100")))
+        self._book_depth = int(params.get("book_depth", 10))
+        self._level_size = Decimal(str(params.get("level_size", "5")))
+        self._tick_pct = float(params.get("tick_pct", 0.0001))
+        self._volatility = float(params.get("volatility", 0.0002))
+        self._book_update_interval = float(params.get("book_update_interval", 0.1))
+
+        # 费率 / 账户
+        self._taker_fee = Decimal(str(params.get("taker_fee", "0.0003")))
+        self._maker_fee = Decimal(str(params.get("maker_fee", "0.0001")))
+        self._settlement_asset = str(params.get("settlement_asset", "USDC"))
+        self._balance = Decimal(str(params.get("initial_balance", "100000")))
+        self._leverage: Dict[str, int] = {}
+        self._margin_mode: Dict[str, str] = {}
+
+        # 撮合状态
+        self._books: Dict[str, OrderBookData] = {}
+        self._mids: Dict[str, float] = {}
+        self._orders: Dict[str, OrderData] = {}
+        self._client_index: Dict[str, str] = {}
+        self._resting: Dict[str, Dict[str, OrderData]] = {}   # symbol -> {order_id: order}
+        self._positions: Dict[str, Dict[str, Decimal]] = {}   # symbol -> {size(带符号), entry_price, realized_pnl}
+        self._position_cache: Dict[str, Dict[str, Any]] = {}  # 与 WS 持仓缓存格式一致（网格引擎读取）
+        self._order_ids = itertools.count(1)
+        self._id_prefix = str(params.get("order_id_prefix") or config.exchange_id)
+        self._trade_ids = itertools.count(1)
+        self._submit_times: Deque[float] = deque()
+
+        # 推送按投递时间保序
+        self._last_delivery_at = 0.0
+        self._pending_deliveries: set = set()
+
+        self._websocket = SimulatedWebSocket(self)
+        self._ws_connected = False
+        self._book_task: Optional[asyncio.Task] = None
+
+        for symbol in params.get("symbols") or []:
+            self._ensure_book(str(symbol))
+
+        self.stats: Dict[str, int] = {
+            "orders_submitted": 0,
+            "orders_rejected": 0,
+            "orders_timed_out": 0,
+            "rate_limited": 0,
+            "cancels_requested": 0,
+            "cancels_rejected": 0,
+            "fills": 0,
+            "notifications": 0,
+        }
+
+    # ============= 生命周期 =============
+
+    async def _do_connect(self) -> bool:
+        self._ws_connected = True
+        self._websocket._ws_connected = True
+        if self._book_source == "synthetic" and self._book_update_interval > 0:
+            self._book_task = asyncio.create_task(self._book_loop())
+        return True
+
+    async def _do_disconnect(self) -> None:
+        self._ws_connected = False
+        self._websocket._ws_connected = False
+        if self._book_task:
+            self._book_task.cancel()
+            try:
+                await self._book_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._book_task = None
+        for task in list(self._pending_deliveries):
+            task.cancel()
+        self._pending_deliveries.clear()
+
+    async def _do_authenticate(self) -> bool:
+        return True
+
+    async def _do_health_check(self) -> Dict[str, Any]:
+        return {"simulated": True, "stats": self.get_simulation_stats()}
+
+    async def _do_heartbeat(self) -> None:
+        self._update_heartbeat()
+
+    # ============= 盘口 =============
+
+    def _ensure_book(self, symbol: str) -> OrderBookData:
+        book = self._books.get(symbol)
+        if book is None:
+            mid = float(self._initial_prices.get(symbol, self._default_price))
+            self._mids[symbol] = mid
+            book = self._build_book(symbol, mid)
+            self._books[symbol] = book
+        return book
+
+    def _build_book(self, symbol: str, mid: float) -> OrderBookData:
+        tick = mid * self._tick_pct
+        size = self._level_size
+        bids = [
+            OrderBookLevel(price=Decimal(f"{mid - tick * (i + 1):.8g}"), size=size)
+            for i in range(self._book_depth)
+        ]
+        asks = [
+            OrderBookLevel(price=Decimal(f"{mid + tick * (i + 1):.8g}"), size=size)
+            for i in range(self._book_depth)
+        ]
+        now = datetime.now()
+        return OrderBookData(
+            symbol=symbol, bids=bids, asks=asks, timestamp=now,
+            exchange_timestamp=now, received_timestamp=now,
+        )
+
+    async def _book_loop(self) -> None:
+        """内置随机游走行情"""
+        try:
+            while True:
+                await asyncio.sleep(self._book_update_interval)
+                for symbol in list(self._books.keys()):
+                    mid = self._mids[symbol] * (1.0 + self._rng.gauss(0.0, self._volatility))
+                    self._mids[symbol] = mid
+                    await self.feed_orderbook(symbol, self._build_book(symbol, mid))
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.error(f"❌ [模拟交易所] 行情循环异常: {e}")
+
+    async def feed_orderbook(self, symbol: str, orderbook: OrderBookData) -> None:
+        """
+        推送新盘口（外部回放/合成行情入口）
+
+        更新撮合盘口、撮合穿价挂单，并分发给订单簿订阅者。
+        """
+        self._books[symbol] = orderbook
+        if orderbook.bids and orderbook.asks:
+            self._mids[symbol] = float((orderbook.bids[0].price + orderbook.asks[0].price) / 2)
+        self._match_resting(symbol)
+        for callback in list(self._websocket._orderbook_callbacks.get(symbol, ())):
+            await self._invoke(callback, orderbook)
+        ticker_callbacks = self._websocket._ticker_callbacks.get(symbol)
+        if ticker_callbacks:
+            ticker = self._ticker_from_book(symbol)
+            for callback in list(ticker_callbacks):
+                await self._invoke(callback, ticker)
+
+    def _ticker_from_book(self, symbol: str) -> TickerData:
+        book = self._ensure_book(symbol)
+        bid = book.bids[0].price if book.bids else None
+        ask = book.asks[0].price if book.asks else None
+        last = (bid + ask) / 2 if bid is not None and ask is not None else (bid or ask)
+        return TickerData(
+            symbol=symbol,
+            timestamp=datetime.now(),
+            bid=bid,
+            ask=ask,
+            bid_size=book.bids[0].size if book.bids else None,
+            ask_size=book.asks[0].size if book.asks else None,
+            last=last,
+            mark_price=last,
+            funding_rate=_ZERO,
+        )
+
+    # ============= 撮合 =============
+
+    def _crosses(self, order: OrderData, book: OrderBookData) -> bool:
+        if order.side == OrderSide.BUY:
+            return bool(book.asks) and (order.price is None or order.price >= book.asks[0].price)
+        return bool(book.bids) and (order.price is None or order.price <= book.bids[0].price)
+
+    def _match_taker(self, order: OrderData) -> None:
+        """按盘口逐档吃单（市价单不限价，限价单只吃到限价）"""
+        book = self._ensure_book(order.symbol)
+        levels = book.asks if order.side == OrderSide.BUY else book.bids
+        limit = None if order.type == OrderType.MARKET else order.price
+        for level in levels:
+            if order.remaining <= _ZERO:
+                break
+            if limit is not None:
+                if order.side == OrderSide.BUY and level.price > limit:
+                    break
+                if order.side == OrderSide.SELL and level.price < limit:
+                    break
+            qty = min(order.remaining, level.size)
+            if qty > _ZERO:
+                self._apply_fill(order, qty, level.price, self._taker_fee, taker=True)
+
+    def _match_resting(self, symbol: str) -> None:
+        """盘口更新后撮合穿价挂单（按挂单价成交，每次最多成交最优档数量）"""
+        resting = self._resting.get(symbol)
+        if not resting:
+            return
+        book = self._books.get(symbol)
+        if book is None:
+            return
+        for order_id, order in list(resting.items()):
+            if not self._crosses(order, book):
+                continue
+            level = book.asks[0] if order.side == OrderSide.BUY else book.bids[0]
+            qty = min(order.remaining, level.size)
+            if qty > _ZERO:
+                self._apply_fill(order, qty, order.price, self._maker_fee, taker=False)
+            if order.remaining <= _ZERO:
+                resting.pop(order_id, None)
+            self._notify(order)
+
+    def _apply_fill(self, order: OrderData, qty: Decimal, price: Decimal, fee_rate: Decimal, taker: bool) -> None:
+        order.filled += qty
+        order.remaining = order.amount - order.filled
+        order.cost += qty * price
+        order.average = order.cost / order.filled
+        fee = qty * price * fee_rate
+        order.fee = {"currency": self._settlement_asset, "cost": (order.fee or {}).get("cost", _ZERO) + fee}
+        order.trades.append({
+            "id": str(next(self._trade_ids)),
+            "price": price,
+            "amount": qty,
+            "fee": fee,
+            "taker": taker,
+            "timestamp": datetime.now(),
+        })
+        order.updated = datetime.now()
+        order.status = OrderStatus.FILLED if order.remaining <= _ZERO else OrderStatus.OPEN
+        self._balance -= fee
+        self._update_position(order.symbol, qty if order.side == OrderSide.BUY else -qty, price)
+        self.stats["fills"] += 1
+
+    def _update_position(self, symbol: str, delta: Decimal, price: Decimal) -> None:
+        pos = self._positions.setdefault(symbol, {"size": _ZERO, "entry_price": _ZERO, "realized_pnl": _ZERO})
+        size = pos["size"]
+        new_size = size + delta
+        if size == _ZERO or (size > _ZERO) == (delta > _ZERO):
+            # 开仓/加仓：更新均价
+            pos["entry_price"] = (abs(size) * pos["entry_price"] + abs(delta) * price) / abs(new_size)
+        else:
+            # 减仓/反手：结算已平部分
+            closed = min(abs(size), abs(delta))
+            direction = Decimal("1") if size > _ZERO else Decimal("-1")
+            pnl = (price - pos["entry_price"]) * closed * direction
+            pos["realized_pnl"] += pnl
+            self._balance += pnl
+            if new_size == _ZERO:
+                pos["entry_price"] = _ZERO
+            elif (new_size > _ZERO) != (size > _ZERO):
+                pos["entry_price"] = price
+        pos["size"] = new_size
+        self._position_cache[symbol] = {
+            "size": new_size,
+            "entry_price": pos["entry_price"],
+            "realized_pnl": pos["realized_pnl"],
+            "unrealized_pnl": self._unrealized_pnl(symbol),
+            "side": "long" if new_size > _ZERO else ("short" if new_size < _ZERO else "None"),
+            "timestamp": datetime.now(),
+        }
+
+    def _unrealized_pnl(self, symbol: str) -> Decimal:
+        pos = self._positions.get(symbol)
+        if not pos or pos["size"] == _ZERO or symbol not in self._mids:
+            return _ZERO
+        mark = Decimal(str(self._mids[symbol]))
+        return (mark - pos["entry_price"]) * pos["size"]
+
+    # ============= 推送 =============
+
+    def _notify(self, order: OrderData) -> None:
+        """按 notify 延迟投递订单快照（保持推送顺序）"""
+        if not self._ws_connected:
+            return
+        now = time.monotonic()
+        deliver_at = max(now + self.latency.sample(self._rng, self.latency.notify_ms), self._last_delivery_at)
+        self._last_delivery_at = deliver_at
+        snapshot = copy.copy(order)
+        snapshot.trades = list(order.trades)
+        task = asyncio.create_task(self._deliver(snapshot, deliver_at - now))
+        self._pending_deliveries.add(task)
+        task.add_done_callback(self._pending_deliveries.discard)
+
+    async def _deliver(self, order: OrderData, delay: float) -> None:
+        if delay > 0:
+            await asyncio.sleep(delay)
+        ws = self._websocket
+        self.stats["notifications"] += 1
+        for callback in list(ws._order_callbacks):
+            await self._invoke(callback, order)
+        if order.status == OrderStatus.FILLED:
+            for callback in list(ws._order_fill_callbacks):
+                await self._invoke(callback, order)
+        for callback in list(ws._user_data_callbacks):
+            await self._invoke(callback, order)
+        if order.filled > _ZERO and ws._position_callbacks:
+            position = self._position_data(order.symbol)
+            for callback in list(ws._position_callbacks):
+                await self._invoke(callback, position)
+
+    async def _invoke(self, callback: Callable, *args) -> None:
+        try:
+            result = callback(*args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            self.logger.error(f"❌ [模拟交易所] 回调执行失败: {e}")
+
+    # ============= 市场数据接口 =============
+
+    async def get_exchange_info(self) -> ExchangeInfo:
+        return ExchangeInfo(
+            name=self.config.name,
+            id=self.config.exchange_id,
+            type=ExchangeType.PERPETUAL,
+            supported_features=["perpetual_trading", "orderbook", "ticker", "user_data", "simulated"],
+            rate_limits=self.config.rate_limits,
+            precision=self.config.precision,
+            fees={"maker": self._maker_fee, "taker": self._taker_fee},
+            markets={symbol: {"symbol": symbol} for symbol in self._books},
+            status="online",
+            timestamp=datetime.now(),
+        )
+
+    async def get_ticker(self, symbol: str) -> TickerData:
+        await self._query_delay()
+        return self._ticker_from_book(symbol)
+
+    async def get_tickers(self, symbols: Optional[List[str]] = None) -> List[TickerData]:
+        await self._query_delay()
+        return [self._ticker_from_book(s) for s in (symbols or list(self._books.keys()))]
+
+    async def get_orderbook(self, symbol: str, limit: Optional[int] = None) -> OrderBookData:
+        await self._query_delay()
+        book = self._ensure_book(symbol)
+        if limit:
+            return OrderBookData(
+                symbol=symbol, bids=book.bids[:limit], asks=book.asks[:limit],
+                timestamp=book.timestamp, exchange_timestamp=book.exchange_timestamp,
+            )
+        return book
+
+    async def get_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[OHLCVData]:
+        return []
+
+    async def get_trades(
+        self,
+        symbol: str,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[TradeData]:
+        return []
+
+    # ============= 账户接口 =============
+
+    async def get_balances(self) -> List[BalanceData]:
+        await self._query_delay()
+        used = sum(
+            (abs(pos["size"]) * pos["entry_price"] / max(1, self._leverage.get(symbol, self.config.default_leverage))
+             for symbol, pos in self._positions.items()),
+            _ZERO,
+        )
+        total = self._balance + sum((self._unrealized_pnl(s) for s in self._positions), _ZERO)
+        return [BalanceData(
+            currency=self._settlement_asset,
+            free=total - used,
+            used=used,
+            total=total,
+            usd_value=total,
+            timestamp=datetime.now(),
+            raw_data={},
+        )]
+
+    def _position_data(self, symbol: str) -> PositionData:
+        pos = self._positions.get(symbol) or {"size": _ZERO, "entry_price": _ZERO, "realized_pnl": _ZERO}
+        size = pos["size"]
+        mark = Decimal(str(self._mids[symbol])) if symbol in self._mids else None
+        return PositionData(
+            symbol=symbol,
+            side=PositionSide.LONG if size >= _ZERO else PositionSide.SHORT,
+            size=abs(size),
+            entry_price=pos["entry_price"],
+            mark_price=mark,
+            current_price=mark,
+            unrealized_pnl=self._unrealized_pnl(symbol),
+            realized_pnl=pos["realized_pnl"],
+            percentage=None,
+            leverage=self._leverage.get(symbol, self.config.default_leverage),
+            margin_mode=MarginMode.ISOLATED if self._margin_mode.get(symbol) == "isolated" else MarginMode.CROSS,
+            margin=_ZERO,
+            liquidation_price=None,
+            timestamp=datetime.now(),
+            raw_data={"signed_size": size},
+        )
+
+    async def get_positions(self, symbols: Optional[List[str]] = None) -> List[PositionData]:
+        await self._query_delay()
+        wanted = set(symbols) if symbols else None
+        return [
+            self._position_data(symbol)
+            for symbol, pos in self._positions.items()
+            if pos["size"] != _ZERO and (wanted is None or symbol in wanted)
+        ]
+
+    # ============= 交易接口 =============
+
+    async def create_order(
+        self,
+        symbol: str,
+        side: OrderSide,
+        order_type: OrderType,
+        amount: Decimal,
+        price: Optional[Decimal] = None,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> OrderData:
+        """
+        下单
+
+        往返延迟的前半段后进入撮合，后半段后返回响应；
+        响应与真实 DEX 一致只反映受理状态，成交通过 WS 推送（report_fills_in_response=True 时响应带成交）。
+        """
+        params = dict(params or {})
+        rtt = self.latency.sample(self._rng, self.latency.order_ack_ms)
+        await asyncio.sleep(rtt / 2)
+
+        self.stats["orders_submitted"] += 1
+        self._check_rate_limit_or_raise()
+        amount = Decimal(str(amount))
+        price = Decimal(str(price)) if price is not None else None
+
+        if self.rejection.reject_rate > 0 and self._rng.random() < self.rejection.reject_rate:
+            self.stats["orders_rejected"] += 1
+            await asyncio.sleep(rtt / 2)
+            raise Exception(self.rejection.reject_message)
+        if amount <= _ZERO or amount < self.rejection.min_order_size:
+            self.stats["orders_rejected"] += 1
+            await asyncio.sleep(rtt / 2)
+            raise ValueError(f"invalid order size: {amount} (min {self.rejection.min_order_size})")
+        if order_type != OrderType.MARKET and price is None:
+            self.stats["orders_rejected"] += 1
+            raise ValueError("限价单必须指定价格")
+
+        if params.get("reduce_only"):
+            pos_size = self._positions.get(symbol, {}).get("size", _ZERO)
+            closable = -pos_size if side == OrderSide.BUY else pos_size
+            if closable <= _ZERO:
+                self.stats["orders_rejected"] += 1
+                await asyncio.sleep(rtt / 2)
+                raise Exception("invalid reduce only mode")
+            amount = min(amount, closable)
+
+        # 订单ID带交易所前缀：多个模拟交易所并存时执行器按订单ID路由推送，不能重复
+        seq = next(self._order_ids)
+        client_id = str(params.get("client_id") or params.get("clientId") or f"{self._id_prefix}-c{seq}")
+        order = OrderData(
+            id=f"{self._id_prefix}-{seq}",
+            client_id=client_id,
+            symbol=symbol,
+            side=side,
+            type=order_type,
+            amount=amount,
+            price=price,
+            filled=_ZERO,
+            remaining=amount,
+            cost=_ZERO,
+            average=None,
+            status=OrderStatus.OPEN,
+            timestamp=datetime.now(),
+            updated=None,
+            fee=None,
+            trades=[],
+            params=params,
+            raw_data={"simulated": True},
+        )
+        self._orders[order.id] = order
+        self._client_index[client_id] = order.id
+
+        book = self._ensure_book(symbol)
+        post_only = order_type == OrderType.POST_ONLY or bool(params.get("post_only"))
+        if post_only and self._crosses(order, book):
+            order.status = OrderStatus.REJECTED
+            self.stats["orders_rejected"] += 1
+            self._notify(order)
+        elif order_type in (OrderType.MARKET, OrderType.IOC, OrderType.FOK) or self._crosses(order, book):
+            if order_type == OrderType.FOK and self._available(order, book) < order.amount:
+                order.status = OrderStatus.CANCELED
+            else:
+                self._match_taker(order)
+                if order.remaining > _ZERO:
+                    if order_type in (OrderType.MARKET, OrderType.IOC, OrderType.FOK):
+                        order.status = OrderStatus.CANCELED
+                    else:
+                        self._resting.setdefault(symbol, {})[order.id] = order
+            self._notify(order)
+        else:
+            self._resting.setdefault(symbol, {})[order.id] = order
+
+        response = copy.copy(order)
+        if not self.config.extra_params.get("report_fills_in_response", False) and response.status == OrderStatus.FILLED:
+            response.status = OrderStatus.OPEN
+            response.filled = _ZERO
+            response.remaining = response.amount
+            response.cost = _ZERO
+            response.average = None
+            response.trades = []
+
+        await asyncio.sleep(rtt / 2)
+        if self.rejection.timeout_rate > 0 and self._rng.random() < self.rejection.timeout_rate:
+            self.stats["orders_timed_out"] += 1
+            raise asyncio.TimeoutError("simulated request timeout (order may be live)")
+        return response
+
+    def _available(self, order: OrderData, book: OrderBookData) -> Decimal:
+        levels = book.asks if order.side == OrderSide.BUY else book.bids
+        total = _ZERO
+        for level in levels:
+            if order.side == OrderSide.BUY and level.price > order.price:
+                break
+            if order.side == OrderSide.SELL and level.price < order.price:
+                break
+            total += level.size
+        return total
+
+    def _check_rate_limit_or_raise(self) -> None:
+        limit = self.rejection.rate_limit_per_second
+        if limit <= 0:
+            return
+        now = time.monotonic()
+        window = self._submit_times
+        while window and now - window[0] > 1.0:
+            window.popleft()
+        if len(window) >= limit:
+            self.stats["rate_limited"] += 1
+            self.stats["orders_rejected"] += 1
+            raise Exception("429 Too Many Requests (simulated rate limit)")
+        window.append(now)
+
+    async def cancel_order(self, order_id: str, symbol: str) -> OrderData:
+        self.stats["cancels_requested"] += 1
+        await asyncio.sleep(self.latency.sample(self._rng, self.latency.cancel_ack_ms))
+        order = self._lookup_order(order_id)
+        if order is None:
+            raise Exception(f"order not found: {order_id}")
+        if order.status in _CLOSED_STATUSES:
+            raise Exception(f"order is closed: {order_id} ({order.status.value})")
+        if self.rejection.cancel_reject_rate > 0 and self._rng.random() < self.rejection.cancel_reject_rate:
+            self.stats["cancels_rejected"] += 1
+            raise Exception(f"simulated cancel rejection: {order_id}")
+        self._resting.get(order.symbol, {}).pop(order.id, None)
+        order.status = OrderStatus.CANCELED
+        order.updated = datetime.now()
+        self._notify(order)
+        return copy.copy(order)
+
+    async def cancel_all_orders(self, symbol: Optional[str] = None) -> List[OrderData]:
+        canceled = []
+        symbols = [symbol] if symbol else list(self._resting.keys())
+        for sym in symbols:
+            for order_id in list(self._resting.get(sym, {}).keys()):
+                try:
+                    canceled.append(await self.cancel_order(order_id, sym))
+                except Exception as e:
+                    self.logger.warning(f"⚠️ [模拟交易所] 撤单失败 {order_id}: {e}")
+        return canceled
+
+    def _lookup_order(self, order_id: Optional[str]) -> Optional[OrderData]:
+        if order_id is None:
+            return None
+        key = str(order_id)
+        order = self._orders.get(key)
+        if order is None and key in self._client_index:
+            order = self._orders.get(self._client_index[key])
+        return order
+
+    async def get_order(self, order_id: str, symbol: str) -> OrderData:
+        await self._query_delay()
+        order = self._lookup_order(order_id)
+        if order is None:
+            raise Exception(f"order not found: {order_id}")
+        return copy.copy(order)
+
+    async def get_open_orders(self, symbol: Optional[str] = None) -> List[OrderData]:
+        await self._query_delay()
+        symbols = [symbol] if symbol else list(self._resting.keys())
+        return [copy.copy(o) for sym in symbols for o in self._resting.get(sym, {}).values()]
+
+    async def get_order_history(
+        self,
+        symbol: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[OrderData]:
+        await self._query_delay()
+        orders = [
+            copy.copy(o) for o in self._orders.values()
+            if (symbol is None or o.symbol == symbol) and (since is None or o.timestamp >= since)
+        ]
+        return orders[-limit:] if limit else orders
+
+    async def _query_delay(self) -> None:
+        delay = self.latency.sample(self._rng, self.latency.query_ms)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    # ============= 交易设置 =============
+
+    async def set_leverage(self, symbol: str, leverage: int) -> Dict[str, Any]:
+        self._leverage[symbol] = int(leverage)
+        return {"symbol": symbol, "leverage": int(leverage), "success": True}
+
+    async def set_margin_mode(self, symbol: str, margin_mode: str) -> Dict[str, Any]:
+        self._margin_mode[symbol] = str(margin_mode).lower()
+        return {"symbol": symbol, "margin_mode": self._margin_mode[symbol], "success": True}
+
+    # ============= 订阅 =============
+
+    async def subscribe_ticker(self, symbol: str, callback: Callable[[TickerData], None]) -> None:
+        self._ensure_book(symbol)
+        await self._websocket.subscribe_ticker(symbol, callback)
+
+    async def subscribe_orderbook(self, symbol: str, callback: Callable[[OrderBookData], None]) -> None:
+        self._ensure_book(symbol)
+        await self._websocket.subscribe_orderbook(symbol, callback)
+
+    async def subscribe_trades(self, symbol: str, callback: Callable[[TradeData], None]) -> None:
+        # 模拟交易所不产生公开成交流
+        return None
+
+    async def subscribe_user_data(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        await self._websocket.subscribe_user_data(callback)
+
+    async def unsubscribe(self, symbol: Optional[str] = None) -> None:
+        await self._websocket.unsubscribe(symbol)
+
+    # ============= 统计 =============
+
+    def get_simulation_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "open_orders": sum(len(v) for v in self._resting.values()),
+            "total_orders": len(self._orders),
+            "balance": float(self._balance),
+            "positions": {s: float(p["size"]) for s, p in self._positions.items() if p["size"] != _ZERO},
+        }
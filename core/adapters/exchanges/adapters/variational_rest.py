@@ -16,6 +16,7 @@ from typing import Any, Dict, Optional
 import aiohttp
 
 from ..interface import ExchangeConfig
+from ..utils.http_client import create_session
 
 
 @dataclass(frozen=True)
@@ -117,7 +118,7 @@ class VariationalRestClient:
             cookie_jar = aiohttp.CookieJar()
             if self._cookies:
                 cookie_jar.update_cookies(self._cookies)
-            self._session = aiohttp.ClientSession(timeout=timeout, headers=self._headers, cookie_jar=cookie_jar)
+            self._session = create_session("variational", timeout=timeout, headers=self._headers, cookie_jar=cookie_jar)
             return self._session
 
     async def get_indicative_quote(
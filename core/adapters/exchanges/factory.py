@@ -293,6 +293,38 @@ class ExchangeFactory:
         except ImportError as e:
             self.logger.warning(f"部分内置适配器注册失败: {str(e)}")
 
+        # 本地模拟交易所不依赖任何交易所SDK，单独注册，避免受上面导入失败影响
+        try:
+            from .adapters.simulated import SimulatedExchangeAdapter
+
+            self.register_adapter(
+                exchange_id="simulated",
+                adapter_class=SimulatedExchangeAdapter,
+                exchange_type=ExchangeType.PERPETUAL,
+                name="Simulated Exchange",
+                description="本地模拟交易所（离线撮合，用于执行链路压测）",
+                supported_features=[
+                    "perpetual_trading",
+                    "orderbook",
+                    "ticker",
+                    "user_data",
+                    "simulated",
+                ],
+                default_config={
+                    "testnet": True,
+                    "default_leverage": 1,
+                    "enable_websocket": True,
+                    "extra_params": {
+                        "book_source": "synthetic",
+                        "initial_balance": "100000",
+                        "latency": {"order_ack_ms": 20, "cancel_ack_ms": 15, "query_ms": 10, "notify_ms": 5, "jitter_ms": 5},
+                        "rejection": {"reject_rate": 0.0, "cancel_reject_rate": 0.0, "timeout_rate": 0.0},
+                    },
+                },
+            )
+        except ImportError as e:
+            self.logger.warning(f"模拟交易所适配器注册失败: {str(e)}")
+
     def register_adapter(
         self,
         exchange_id: str,
@@ -387,6 +419,13 @@ class ExchangeFactory:
             else:
                 adapter = entry.adapter_class(config)
 
+            # 🔥 行情共享：配置了守护进程 socket 时，行情订阅改走本机行情共享服务
+            shared_socket = (config.extra_params or {}).get('shared_market_data_socket')
+            if shared_socket:
+                from ...services.market_data.client import SharedMarketDataAdapter
+                adapter = SharedMarketDataAdapter(adapter, socket_path=shared_socket)
+                self.logger.info(f"📡 {exchange_id} 行情订阅使用共享服务: {shared_socket}")
+
             self.logger.info(f"创建交易所适配器实例: {exchange_id}")
             return adapter
 
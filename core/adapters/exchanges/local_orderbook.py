@@ -0,0 +1,254 @@
+"""
+本地订单簿引擎
+
+为需要自行维护增量订单簿的 WebSocket 适配器（Lighter / EdgeX / Backpack）
+提供统一的本地订单簿实现：
+
+- 价格按 tick 缩放为整数键，避免字符串/float 比较带来的排序误差
+- 每一侧维护有序数组（bisect），快照/增量按档位 O(log n) 定位
+- 最优买/卖价 O(1)，前 N 档 O(N)，不再在每条增量后对整侧重新 sorted()
+- 档位对象（OrderBookLevel）在档位变化时创建一次，构建快照时直接复用
+- 支持只输出 BBO（TopOfBook），完整深度按需懒加载
+"""
+
+from bisect import bisect_left
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .models import OrderBookData, OrderBookLevel, TopOfBook
+
+
+class LocalOrderBook:
+    """单个交易对的本地订单簿（整数 tick 键 + 有序数组）"""
+
+    __slots__ = (
+        'symbol', 'timestamp', 'nonce', 'metadata',
+        '_price_decimals', '_scale',
+        '_bid_keys', '_ask_keys', '_bids', '_asks',
+    )
+
+    def __init__(self, symbol: str, price_decimals: Optional[int] = None):
+        """
+        Args:
+            symbol: 交易对符号
+            price_decimals: 价格小数位数（已知时传入，未知时根据收到的价格自动扩展）
+        """
+        self.symbol = symbol
+        self.timestamp: Optional[datetime] = None
+        self.nonce: Optional[Any] = None
+        self.metadata: Dict[str, Any] = {}
+
+        self._price_decimals = max(0, int(price_decimals or 0))
+        self._scale = Decimal(10) ** self._price_decimals
+
+        # 买盘键取负数保存，使两侧数组都按"最优在前"升序排列
+        self._bid_keys: List[int] = []
+        self._ask_keys: List[int] = []
+        self._bids: Dict[int, OrderBookLevel] = {}
+        self._asks: Dict[int, OrderBookLevel] = {}
+
+    # ============= 写入 =============
+
+    def clear(self) -> None:
+        """清空两侧档位（保留元数据）"""
+        self._bid_keys.clear()
+        self._ask_keys.clear()
+        self._bids.clear()
+        self._asks.clear()
+
+    def apply_snapshot(self, bids: Iterable[Any], asks: Iterable[Any]) -> None:
+        """
+        应用全量快照：清空后写入所有 size > 0 的档位
+
+        Args:
+            bids: 买盘档位，支持 [price, size] / (price, size) / {'price', 'size'}
+            asks: 卖盘档位，格式同上
+        """
+        self.clear()
+        self.apply_delta(bids, asks)
+
+    def apply_delta(self, bids: Iterable[Any], asks: Iterable[Any]) -> None:
+        """
+        应用增量更新：size = 0 删除档位，size > 0 新增/覆盖档位
+
+        Args:
+            bids: 买盘增量档位
+            asks: 卖盘增量档位
+        """
+        for entry in bids or ():
+            parsed = self._parse_entry(entry)
+            if parsed is not None:
+                self._set_level(True, parsed[0], parsed[1])
+        for entry in asks or ():
+            parsed = self._parse_entry(entry)
+            if parsed is not None:
+                self._set_level(False, parsed[0], parsed[1])
+
+    def set_bid(self, price: Any, size: Any) -> None:
+        """设置单个买盘档位（size <= 0 表示删除）"""
+        parsed = self._parse_entry((price, size))
+        if parsed is not None:
+            self._set_level(True, parsed[0], parsed[1])
+
+    def set_ask(self, price: Any, size: Any) -> None:
+        """设置单个卖盘档位（size <= 0 表示删除）"""
+        parsed = self._parse_entry((price, size))
+        if parsed is not None:
+            self._set_level(False, parsed[0], parsed[1])
+
+    # ============= 读取 =============
+
+    @property
+    def bid_count(self) -> int:
+        return len(self._bid_keys)
+
+    @property
+    def ask_count(self) -> int:
+        return len(self._ask_keys)
+
+    @property
+    def is_complete(self) -> bool:
+        """两侧均有有效档位"""
+        return bool(self._bid_keys) and bool(self._ask_keys)
+
+    def best_bid(self) -> Optional[OrderBookLevel]:
+        """最优买价档位 O(1)"""
+        return self._bids[self._bid_keys[0]] if self._bid_keys else None
+
+    def best_ask(self) -> Optional[OrderBookLevel]:
+        """最优卖价档位 O(1)"""
+        return self._asks[self._ask_keys[0]] if self._ask_keys else None
+
+    def top_bids(self, depth: Optional[int] = None) -> List[OrderBookLevel]:
+        """前 N 档买盘（价格从高到低），depth 为 None 时返回全部"""
+        keys = self._bid_keys if depth is None else self._bid_keys[:depth]
+        levels = self._bids
+        return [levels[k] for k in keys]
+
+    def top_asks(self, depth: Optional[int] = None) -> List[OrderBookLevel]:
+        """前 N 档卖盘（价格从低到高），depth 为 None 时返回全部"""
+        keys = self._ask_keys if depth is None else self._ask_keys[:depth]
+        levels = self._asks
+        return [levels[k] for k in keys]
+
+    def to_orderbook_data(
+        self,
+        depth: Optional[int] = None,
+        timestamp: Optional[datetime] = None,
+        nonce: Optional[Any] = None,
+        exchange_timestamp: Optional[datetime] = None,
+        raw_data: Optional[Dict[str, Any]] = None,
+    ) -> Optional[OrderBookData]:
+        """
+        构建 OrderBookData（任一侧为空时返回 None）
+
+        Args:
+            depth: 每侧最多输出的档位数（None 表示全部）
+            timestamp: 主时间戳（默认使用本地订单簿时间戳或当前时间）
+            nonce: 序列号（默认使用本地订单簿 nonce）
+            exchange_timestamp: 交易所时间戳（默认使用本地订单簿时间戳）
+            raw_data: 原始数据
+        """
+        if not self._bid_keys or not self._ask_keys:
+            return None
+
+        return OrderBookData(
+            symbol=self.symbol,
+            bids=self.top_bids(depth),
+            asks=self.top_asks(depth),
+            timestamp=timestamp or self.timestamp or datetime.now(),
+            nonce=nonce if nonce is not None else self.nonce,
+            exchange_timestamp=exchange_timestamp if exchange_timestamp is not None else self.timestamp,
+            raw_data=raw_data if raw_data is not None else {},
+        )
+
+    def to_top_of_book(
+        self,
+        timestamp: Optional[datetime] = None,
+        nonce: Optional[Any] = None,
+        exchange_timestamp: Optional[datetime] = None,
+        raw_data: Optional[Dict[str, Any]] = None,
+    ) -> Optional[TopOfBook]:
+        """
+        构建 BBO 记录（任一侧为空时返回 None）
+
+        不复制任何档位；完整深度在消费方访问 bids / asks 时从本订单簿懒加载。
+        参数含义同 to_orderbook_data。
+        """
+        if not self._bid_keys or not self._ask_keys:
+            return None
+
+        return TopOfBook(
+            symbol=self.symbol,
+            best_bid=self._bids[self._bid_keys[0]],
+            best_ask=self._asks[self._ask_keys[0]],
+            timestamp=timestamp or self.timestamp or datetime.now(),
+            nonce=nonce if nonce is not None else self.nonce,
+            exchange_timestamp=exchange_timestamp if exchange_timestamp is not None else self.timestamp,
+            raw_data=raw_data,
+            depth_source=self,
+        )
+
+    # ============= 内部实现 =============
+
+    @staticmethod
+    def _to_decimal(value: Any) -> Optional[Decimal]:
+        if value is None or value == '':
+            return None
+        if isinstance(value, Decimal):
+            return value
+        try:
+            return Decimal(str(value))
+        except (InvalidOperation, ValueError, TypeError):
+            return None
+
+    def _parse_entry(self, entry: Any) -> Optional[Tuple[Decimal, Decimal]]:
+        """解析单个档位为 (price, size)，无效档位返回 None"""
+        if isinstance(entry, dict):
+            price, size = entry.get('price'), entry.get('size')
+        elif isinstance(entry, (list, tuple)) and len(entry) >= 2:
+            price, size = entry[0], entry[1]
+        else:
+            return None
+
+        price_dec = self._to_decimal(price)
+        if not price_dec or price_dec <= 0:
+            return None
+        size_dec = self._to_decimal(size)
+        if size_dec is None:
+            size_dec = Decimal('0')
+        return price_dec, size_dec
+
+    def _price_key(self, price: Decimal) -> int:
+        """价格 → 整数 tick 键（必要时扩展小数位数并重建键）"""
+        exponent = price.as_tuple().exponent
+        decimals = -exponent if isinstance(exponent, int) and exponent < 0 else 0
+        if decimals > self._price_decimals:
+            self._rescale(decimals)
+        return int(price * self._scale)
+
+    def _rescale(self, decimals: int) -> None:
+        """价格精度提升时整体放大已有键（只在首次遇到更高精度时发生）"""
+        factor = 10 ** (decimals - self._price_decimals)
+        self._price_decimals = decimals
+        self._scale = Decimal(10) ** decimals
+        self._bid_keys = [k * factor for k in self._bid_keys]
+        self._ask_keys = [k * factor for k in self._ask_keys]
+        self._bids = {k * factor: v for k, v in self._bids.items()}
+        self._asks = {k * factor: v for k, v in self._asks.items()}
+
+    def _set_level(self, is_bid: bool, price: Decimal, size: Decimal) -> None:
+        tick = self._price_key(price)
+        if is_bid:
+            key, keys, levels = -tick, self._bid_keys, self._bids
+        else:
+            key, keys, levels = tick, self._ask_keys, self._asks
+
+        if size > 0:
+            if key not in levels:
+                keys.insert(bisect_left(keys, key), key)
+            levels[key] = OrderBookLevel(price=price, size=size)
+        elif key in levels:
+            del levels[key]
+            del keys[bisect_left(keys, key)]
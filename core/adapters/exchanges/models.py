@@ -6,6 +6,7 @@
 """
 
 from dataclasses import dataclass, field
+from functools import cached_property
 from enum import Enum
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union
@@ -436,10 +437,29 @@ class OrderBookLevel:
 
     def __post_init__(self):
         """数据验证和转换"""
-        if isinstance(self.price, (int, float, str)):
-            self.price = Decimal(str(self.price))
-        if isinstance(self.size, (int, float, str)):
-            self.size = Decimal(str(self.size))
+        # str/int 可直接精确构造 Decimal，只有 float 需要经过 str() 保留原始字面值
+        price = self.price
+        if not isinstance(price, Decimal):
+            if isinstance(price, float):
+                self.price = Decimal(str(price))
+            elif isinstance(price, (int, str)):
+                self.price = Decimal(price)
+        size = self.size
+        if not isinstance(size, Decimal):
+            if isinstance(size, float):
+                self.size = Decimal(str(size))
+            elif isinstance(size, (int, str)):
+                self.size = Decimal(size)
+
+    @cached_property
+    def price_float(self) -> float:
+        """价格的 float 值（首次访问时转换并缓存，供价差热路径使用）"""
+        return float(self.price)
+
+    @cached_property
+    def size_float(self) -> float:
+        """数量的 float 值（首次访问时转换并缓存）"""
+        return float(self.size)
 
 
 @dataclass
@@ -477,6 +497,129 @@ class OrderBookData:
         return None
 
 
+class TopOfBook:
+    """
+    最优买卖价（BBO）轻量记录
+
+    与 OrderBookData 保持鸭子类型兼容（best_bid / best_ask / 时间戳链条 / bids / asks），
+    只持有最优一档；完整深度在首次访问 bids / asks 时才从深度来源物化。
+
+    深度来源可以是:
+    - OrderBookData: 直接返回其 bids / asks
+    - 提供 top_bids() / top_asks() 的本地订单簿（LocalOrderBook）: 返回物化时刻的最新深度
+    """
+
+    __slots__ = (
+        'symbol', 'timestamp', 'nonce',
+        'exchange_timestamp', 'received_timestamp', 'processed_timestamp', 'sent_timestamp',
+        'raw_data', '_best_bid', '_best_ask', '_depth_source', '_bids', '_asks',
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        best_bid: Optional[OrderBookLevel],
+        best_ask: Optional[OrderBookLevel],
+        timestamp: datetime,
+        nonce: Optional[int] = None,
+        exchange_timestamp: Optional[datetime] = None,
+        received_timestamp: Optional[datetime] = None,
+        processed_timestamp: Optional[datetime] = None,
+        sent_timestamp: Optional[datetime] = None,
+        raw_data: Optional[Dict[str, Any]] = None,
+        depth_source: Any = None,
+    ):
+        self.symbol = symbol
+        self._best_bid = best_bid
+        self._best_ask = best_ask
+        self.timestamp = timestamp
+        self.nonce = nonce
+        self.exchange_timestamp = exchange_timestamp
+        self.received_timestamp = received_timestamp
+        self.processed_timestamp = processed_timestamp
+        self.sent_timestamp = sent_timestamp
+        self.raw_data = raw_data if raw_data is not None else {}
+        self._depth_source = depth_source
+        self._bids: Optional[List[OrderBookLevel]] = None
+        self._asks: Optional[List[OrderBookLevel]] = None
+
+    @classmethod
+    def from_orderbook(cls, orderbook: OrderBookData) -> 'TopOfBook':
+        """从完整订单簿提取 BBO（保留原订单簿作为深度来源）"""
+        return cls(
+            symbol=orderbook.symbol,
+            best_bid=orderbook.best_bid,
+            best_ask=orderbook.best_ask,
+            timestamp=orderbook.timestamp,
+            nonce=orderbook.nonce,
+            exchange_timestamp=orderbook.exchange_timestamp,
+            received_timestamp=orderbook.received_timestamp,
+            processed_timestamp=orderbook.processed_timestamp,
+            sent_timestamp=orderbook.sent_timestamp,
+            raw_data=orderbook.raw_data,
+            depth_source=orderbook,
+        )
+
+    @property
+    def best_bid(self) -> Optional[OrderBookLevel]:
+        """最优买价"""
+        return self._best_bid
+
+    @property
+    def best_ask(self) -> Optional[OrderBookLevel]:
+        """最优卖价"""
+        return self._best_ask
+
+    @property
+    def spread(self) -> Optional[Decimal]:
+        """买卖价差"""
+        if self._best_bid and self._best_ask:
+            return self._best_ask.price - self._best_bid.price
+        return None
+
+    @property
+    def bids(self) -> List[OrderBookLevel]:
+        """买盘深度（懒加载）"""
+        if self._bids is None:
+            self._materialize()
+        return self._bids
+
+    @property
+    def asks(self) -> List[OrderBookLevel]:
+        """卖盘深度（懒加载）"""
+        if self._asks is None:
+            self._materialize()
+        return self._asks
+
+    def _materialize(self) -> None:
+        source = self._depth_source
+        bids: List[OrderBookLevel] = []
+        asks: List[OrderBookLevel] = []
+        if isinstance(source, OrderBookData):
+            bids, asks = source.bids, source.asks
+        elif source is not None and hasattr(source, 'top_bids'):
+            bids, asks = source.top_bids(), source.top_asks()
+        # 深度来源不可用时至少保留最优一档
+        self._bids = bids or ([self._best_bid] if self._best_bid else [])
+        self._asks = asks or ([self._best_ask] if self._best_ask else [])
+        self._depth_source = None
+
+    def to_orderbook_data(self) -> OrderBookData:
+        """物化为完整的 OrderBookData"""
+        return OrderBookData(
+            symbol=self.symbol,
+            bids=self.bids,
+            asks=self.asks,
+            timestamp=self.timestamp,
+            nonce=self.nonce,
+            exchange_timestamp=self.exchange_timestamp,
+            received_timestamp=self.received_timestamp,
+            processed_timestamp=self.processed_timestamp,
+            sent_timestamp=self.sent_timestamp,
+            raw_data=self.raw_data,
+        )
+
+
 @dataclass
 class TradeData:
     """成交数据模型"""
@@ -44,6 +44,31 @@ from .reconnect_manager import (
     ReconnectConfig,
     ReconnectStrategy,
 )
+from .frame_recorder import (
+    FrameRecorder,
+    FrameWriter,
+    iter_frames,
+    read_context,
+    list_recorded_exchanges,
+)
+from .rate_limiter import (
+    EndpointClass,
+    TokenBucket,
+    RestRateLimiter,
+    RATE_LIMIT_CONFIG,
+    get_rate_limiter,
+    configure_rate_limiter,
+)
+from .http_client import (
+    HTTP_CLIENT_CONFIG,
+    create_session,
+    create_httpx_client,
+    get_shared_session,
+    close_shared_sessions,
+    prewarm,
+    start_keep_warm,
+    get_http_client_stats,
+)
 from .error_handler import (
     exchange_api_retry,
     ErrorCategory,
@@ -84,4 +109,29 @@ __all__ = [
     'ErrorCategory',
     'categorize_error',
     'handle_exchange_error',
+
+    # REST 统一限流（令牌桶）
+    'EndpointClass',
+    'TokenBucket',
+    'RestRateLimiter',
+    'RATE_LIMIT_CONFIG',
+    'get_rate_limiter',
+    'configure_rate_limiter',
+
+    # HTTP 连接池（共享调优参数 + 预热/保温）
+    'HTTP_CLIENT_CONFIG',
+    'create_session',
+    'create_httpx_client',
+    'get_shared_session',
+    'close_shared_sessions',
+    'prewarm',
+    'start_keep_warm',
+    'get_http_client_stats',
+
+    # 原始帧录制（离线回放/基准测试）
+    'FrameRecorder',
+    'FrameWriter',
+    'iter_frames',
+    'read_context',
+    'list_recorded_exchanges',
 ]
@@ -0,0 +1,322 @@
+"""
+异步日志写入器
+
+LoggingConfig 的队列模式（config/logging.yaml: async_logging: true）：
+- 调用方（事件循环）只做级别判断 + 入队，格式化与 write() 全部在后台线程完成
+- 后台线程批量取出记录，按目标 handler 批量写入，每批只 flush 一次；文件轮转也在后台线程
+- 同一日志文件只保留一个 RotatingFileHandler（多个 logger 共享），避免多个 handler 各自轮转同一文件
+- 队列拥塞时 INFO/DEBUG 按策略采样或丢弃，WARNING 及以上进入独立队列保证不丢；
+  丢弃数量由后台线程汇总后写入一条告警
+
+磁盘卡顿只会让后台线程变慢，不再表现为行情处理延迟。
+"""
+
+import atexit
+import logging
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from decimal import Decimal
+from logging.handlers import RotatingFileHandler
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# 可以安全延迟格式化的参数类型（不可变，入队后不会被调用方修改）
+_IMMUTABLE_ARG_TYPES = (str, int, float, bool, type(None), bytes, Decimal)
+
+# 唤醒后台线程的占位项（优先记录到达 / 停止）
+_WAKE = (None, None)
+
+
+def _record_created(item: logging.LogRecord) -> float:
+    return item.created
+
+
+class BatchingRotatingFileHandler(RotatingFileHandler):
+    """支持批量写入的轮转文件 handler（只在后台线程中使用）"""
+
+    def emit_batch(self, records: List[logging.LogRecord]) -> None:
+        """批量写入：逐条检查轮转，整批结束后 flush 一次"""
+        self.acquire()
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            for record in records:
+                try:
+                    if self.shouldRollover(record):
+                        self.stream.flush()
+                        self.doRollover()
+                        if self.stream is None:  # delay=True 时 doRollover 不会重新打开
+                            self.stream = self._open()
+                    self.stream.write(self.format(record) + self.terminator)
+                except Exception:
+                    self.handleError(record)
+            self.stream.flush()
+        finally:
+            self.release()
+
+
+class AsyncLogWriter:
+    """
+    后台日志写入线程（进程内单例）
+
+    Args:
+        buffer_size: 普通记录队列容量
+        flush_interval: 空闲时的最长等待时间（秒）
+        batch_size: 单批最多处理的记录数
+        overflow_policy: 队列拥塞时 INFO/DEBUG 的处理方式：sample=按比例采样，drop=直接丢弃
+        sample_rate: 采样模式下每 N 条保留 1 条
+        high_watermark: 队列占用超过该比例时进入拥塞模式
+    """
+
+    _instance: Optional["AsyncLogWriter"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        buffer_size: int = 1000,
+        flush_interval: float = 1.0,
+        batch_size: int = 256,
+        overflow_policy: str = "sample",
+        sample_rate: int = 10,
+        high_watermark: float = 0.8,
+    ):
+        self.buffer_size = max(1, int(buffer_size))
+        self.flush_interval = max(0.01, float(flush_interval))
+        self.batch_size = max(1, int(batch_size))
+        self.overflow_policy = overflow_policy if overflow_policy in ("sample", "drop") else "sample"
+        self.sample_rate = max(1, int(sample_rate))
+        self._high_water = max(1, int(self.buffer_size * high_watermark))
+
+        self._queue: "queue.Queue[Tuple[logging.Handler, logging.LogRecord]]" = queue.Queue(self.buffer_size)
+        # WARNING 及以上不受容量限制（量小且不可丢）
+        self._priority: Deque[Tuple[logging.Handler, logging.LogRecord]] = deque()
+        self._stopped = False
+
+        # 同一文件共享的 handler：{(path, formatter_class): handler}
+        self._file_handlers: Dict[Tuple[str, type], BatchingRotatingFileHandler] = {}
+        self._file_handlers_lock = threading.Lock()
+
+        self._sample_counter = 0
+        self.stats: Dict[str, int] = {
+            'enqueued': 0,
+            'written': 0,
+            'dropped': 0,
+            'sampled_out': 0,
+            'batches': 0,
+        }
+        self._reported_drops = 0
+        self._last_drop_report = 0.0
+        self.drop_report_interval = 5.0
+
+        self._thread = threading.Thread(target=self._run, name="AsyncLogWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    @classmethod
+    def get_instance(cls, **settings: Any) -> "AsyncLogWriter":
+        """获取进程内单例（首次调用时按 settings 创建）"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(**settings)
+        return cls._instance
+
+    def get_file_handler(
+        self,
+        path: str,
+        formatter_class: type,
+        max_bytes: int,
+        backup_count: int,
+    ) -> BatchingRotatingFileHandler:
+        """获取（或创建）指定文件的共享 handler"""
+        key = (str(path), formatter_class)
+        with self._file_handlers_lock:
+            handler = self._file_handlers.get(key)
+            if handler is None:
+                handler = BatchingRotatingFileHandler(
+                    path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True
+                )
+                handler.setFormatter(formatter_class())
+                self._file_handlers[key] = handler
+            return handler
+
+    # ============= 调用方（任意线程） =============
+
+    def submit(self, target: logging.Handler, record: logging.LogRecord) -> None:
+        """投递一条记录（不阻塞）"""
+        if self._stopped:
+            self._write_now(target, record)
+            return
+        if record.levelno >= logging.WARNING:
+            self._priority.append((target, record))
+            self.stats['enqueued'] += 1
+            self._wake()
+            return
+
+        q = self._queue
+        if q.qsize() >= self._high_water:
+            # 拥塞：按策略采样/丢弃低级别日志
+            if self.overflow_policy == "drop":
+                self.stats['dropped'] += 1
+                return
+            self._sample_counter += 1
+            if self._sample_counter % self.sample_rate:
+                self.stats['sampled_out'] += 1
+                return
+        try:
+            q.put_nowait((target, record))
+            self.stats['enqueued'] += 1
+        except queue.Full:
+            self.stats['dropped'] += 1
+
+    def _wake(self) -> None:
+        try:
+            self._queue.put_nowait(_WAKE)
+        except queue.Full:
+            pass  # 队列满说明后台线程正忙，稍后自然会处理优先记录
+
+    # ============= 后台线程 =============
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch:
+                self._write_batch(batch)
+            elif self._stopped:
+                break
+            self._report_drops()
+
+    def _next_batch(self) -> List[Tuple[logging.Handler, logging.LogRecord]]:
+        batch: List[Tuple[logging.Handler, logging.LogRecord]] = []
+        priority = self._priority
+        q = self._queue
+        if not priority:
+            try:
+                item = q.get(timeout=self.flush_interval)
+            except queue.Empty:
+                return batch
+            if item is not _WAKE:
+                batch.append(item)
+        while priority and len(batch) < self.batch_size:
+            batch.append(priority.popleft())
+        while len(batch) < self.batch_size:
+            try:
+                item = q.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _WAKE:
+                batch.append(item)
+        return batch
+
+    def _write_batch(self, batch: List[Tuple[logging.Handler, logging.LogRecord]]) -> None:
+        # 按目标 handler 分组，保持每个 handler 内的记录顺序
+        grouped: Dict[int, Tuple[logging.Handler, List[logging.LogRecord]]] = {}
+        for target, record in batch:
+            entry = grouped.get(id(target))
+            if entry is None:
+                grouped[id(target)] = (target, [record])
+            else:
+                entry[1].append(record)
+
+        for target, records in grouped.values():
+            # 优先记录先出队，按产生时间恢复文件内的顺序
+            records.sort(key=_record_created)
+            try:
+                if isinstance(target, BatchingRotatingFileHandler):
+                    target.emit_batch(records)
+                else:
+                    for record in records:
+                        target.handle(record)
+            except Exception:
+                pass
+        self.stats['written'] += len(batch)
+        self.stats['batches'] += 1
+
+    def _write_now(self, target: logging.Handler, record: logging.LogRecord) -> None:
+        try:
+            if isinstance(target, BatchingRotatingFileHandler):
+                target.emit_batch([record])
+            else:
+                target.handle(record)
+        except Exception:
+            pass
+
+    def _report_drops(self) -> None:
+        lost = self.stats['dropped'] + self.stats['sampled_out']
+        if lost == self._reported_drops:
+            return
+        now = time.monotonic()
+        if now - self._last_drop_report < self.drop_report_interval and not self._stopped:
+            return
+        self._last_drop_report = now
+        delta = lost - self._reported_drops
+        self._reported_drops = lost
+        try:
+            sys.stderr.write(f"⚠️  [异步日志] 队列拥塞，已丢弃/采样掉 {delta} 条低级别日志（累计 {lost}）\n")
+        except Exception:
+            pass
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """停止后台线程并写完剩余记录（atexit 自动调用）"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wake()
+        self._thread.join(timeout)
+        # 线程退出后仍可能有残留（例如超时），在当前线程写完
+        remaining: List[Tuple[logging.Handler, logging.LogRecord]] = list(self._priority)
+        self._priority.clear()
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _WAKE:
+                remaining.append(item)
+        if remaining:
+            self._write_batch(remaining)
+        with self._file_handlers_lock:
+            for handler in self._file_handlers.values():
+                try:
+                    handler.close()
+                except Exception:
+                    pass
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = dict(self.stats)
+        stats['queued'] = self._queue.qsize() + len(self._priority)
+        return stats
+
+
+class AsyncDispatchHandler(logging.Handler):
+    """
+    挂在 logger 上的轻量 handler：只做级别判断和入队
+
+    格式化延迟到后台线程；参数中含可变对象、参数为单个映射或 msg 不是字符串时，
+    先在调用方渲染消息，避免写盘时内容已被修改。
+    """
+
+    def __init__(self, target: logging.Handler, writer: AsyncLogWriter):
+        super().__init__(target.level)
+        self.target = target
+        self.writer = writer
+
+    def emit(self, record: logging.LogRecord) -> None:
+        args = record.args
+        # 🔥 msg 为任意对象（str() 延迟到写盘时）或参数为单个映射时，一律先渲染
+        if (not isinstance(record.msg, str) or isinstance(args, Mapping)
+                or (args and not all(isinstance(value, _IMMUTABLE_ARG_TYPES) for value in args))):
+            record.msg = record.getMessage()
+            record.args = None
+        self.writer.submit(self.target, record)
+
+    def flush(self) -> None:
+        # 写入由后台线程按批 flush，这里不阻塞调用方
+        pass
+
+    def setFormatter(self, fmt: Optional[logging.Formatter]) -> None:
+        # 格式化发生在目标 handler 上
+        self.target.setFormatter(fmt)
@@ -14,6 +14,14 @@ CACHE_TTL_CONFIG = {
     'user_stats': 180,   # 用户统计缓存180秒（Lighter专用）
 }
 
+# 🔥 账户状态共享服务（account_state.py）的短TTL（秒）
+# 多个轮询组件在该时间内的相同请求直接复用结果；下单/撤单会主动使挂单缓存失效
+ACCOUNT_STATE_TTL_CONFIG = {
+    'open_orders': 1.0,
+    'positions': 1.0,
+    'balances': 3.0,
+}
+
 # 🔥 余额自动刷新间隔（秒）
 BALANCE_REFRESH_INTERVAL = 15.0  # 从3秒改为15秒，减少API调用频率
 
@@ -29,6 +37,18 @@ def get_cache_ttl(cache_type: str) -> int:
     """
     return CACHE_TTL_CONFIG.get(cache_type, 60)  # 默认60秒
 
+def get_account_state_ttl(kind: str) -> float:
+    """
+    获取账户状态服务的缓存TTL
+
+    Args:
+        kind: 数据类型（open_orders, positions, balances）
+
+    Returns:
+        缓存TTL（秒）
+    """
+    return ACCOUNT_STATE_TTL_CONFIG.get(kind, 1.0)
+
 def get_balance_refresh_interval() -> float:
     """
     获取余额自动刷新间隔
@@ -44,6 +44,7 @@ class ExchangeCacheManager:
     - orderbook: 订单簿缓存
     - ticker: Ticker缓存
     - market_info: 市场信息缓存
+    - open_orders: 挂单缓存（账户状态共享服务使用）
     """
     
     def __init__(self, exchange_id: str = "unknown"):
@@ -61,6 +62,7 @@ class ExchangeCacheManager:
             'ticker': {},
             'market_info': {},
             'user_stats': {},
+            'open_orders': {},
         }
         self._stats = {
             'hits': 0,
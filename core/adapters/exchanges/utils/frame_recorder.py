@@ -0,0 +1,161 @@
+"""
+WebSocket 原始帧录制
+
+提供行情原始帧的紧凑追加式存储，用于离线回放/基准测试：
+- 每个交易所一个文件：{root}/{exchange}.frames
+- 文件头：MAGIC（8 字节）
+- 每条记录：<d 接收时间(epoch 秒)> <I 负载长度> <负载(UTF-8 原始文本)>
+- 上下文（符号映射、订阅列表等回放所需的适配器状态）：{root}/{exchange}.meta.json
+
+写入经过大缓冲区，热路径上只有一次 struct.pack + 内存拷贝；
+文件只追加，进程中断时最多丢失最后一段未刷盘的数据，已写入部分仍可读取。
+"""
+
+import json
+import logging
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+# 🔥 关键修复：阻止日志传播到父logger（避免输出到终端UI）
+logger.propagate = False
+
+FRAME_MAGIC = b"MDFRAME1"
+_HEADER = struct.Struct("<dI")
+
+FRAME_SUFFIX = ".frames"
+META_SUFFIX = ".meta.json"
+
+
+class FrameWriter:
+    """单个交易所的原始帧写入器"""
+
+    def __init__(self, path: Path, flush_interval: float = 1.0, buffer_size: int = 1 << 20):
+        """
+        Args:
+            path: 帧文件路径
+            flush_interval: 刷盘间隔（秒）
+            buffer_size: 写缓冲大小（字节）
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        path.parent.mkdir(parents=True, exist_ok=True)
+        new_file = not path.exists() or path.stat().st_size == 0
+        self._file = open(path, "ab", buffering=buffer_size)
+        if new_file:
+            self._file.write(FRAME_MAGIC)
+        self._last_flush = time.monotonic()
+        self.frames = 0
+        self.bytes = 0
+
+    def record(self, message: Union[str, bytes], recv_ts: Optional[float] = None) -> None:
+        """追加一条原始帧（recv_ts 缺省为当前时间）"""
+        if self._file is None:
+            return
+        payload = message.encode("utf-8") if isinstance(message, str) else bytes(message)
+        self._file.write(_HEADER.pack(time.time() if recv_ts is None else recv_ts, len(payload)))
+        self._file.write(payload)
+        self.frames += 1
+        self.bytes += len(payload)
+
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self._file.flush()
+            self._last_flush = now
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.flush()
+                self._file.close()
+            finally:
+                self._file = None
+
+
+class FrameRecorder:
+    """按交易所分文件的原始帧录制器"""
+
+    def __init__(self, root: Union[str, Path], flush_interval: float = 1.0):
+        """
+        Args:
+            root: 录制目录
+            flush_interval: 刷盘间隔（秒）
+        """
+        self.root = Path(root)
+        self.flush_interval = flush_interval
+        self._writers: Dict[str, FrameWriter] = {}
+
+    def writer(self, exchange: str) -> FrameWriter:
+        """获取（或创建）交易所对应的写入器"""
+        writer = self._writers.get(exchange)
+        if writer is None:
+            writer = FrameWriter(self.root / f"{exchange}{FRAME_SUFFIX}", self.flush_interval)
+            self._writers[exchange] = writer
+        return writer
+
+    def write_context(self, exchange: str, context: Dict[str, Any]) -> None:
+        """保存回放所需的适配器上下文（覆盖写入）"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / f"{exchange}{META_SUFFIX}"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(context, f, ensure_ascii=False, default=str)
+        tmp.replace(path)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            exchange: {"frames": w.frames, "bytes": w.bytes}
+            for exchange, w in self._writers.items()
+        }
+
+    def close(self) -> None:
+        for exchange, writer in self._writers.items():
+            try:
+                writer.close()
+            except Exception as e:
+                logger.warning(f"⚠️ [帧录制] 关闭 {exchange} 写入器失败: {e}")
+
+
+def list_recorded_exchanges(root: Union[str, Path]) -> List[str]:
+    """录制目录中包含帧文件的交易所"""
+    root = Path(root)
+    if not root.exists():
+        return []
+    return sorted(p.name[: -len(FRAME_SUFFIX)] for p in root.glob(f"*{FRAME_SUFFIX}"))
+
+
+def read_context(root: Union[str, Path], exchange: str) -> Dict[str, Any]:
+    """读取交易所上下文（不存在时返回空字典）"""
+    path = Path(root) / f"{exchange}{META_SUFFIX}"
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def iter_frames(path: Union[str, Path]) -> Iterator[Tuple[float, str]]:
+    """
+    顺序读取帧文件
+
+    Yields:
+        (接收时间, 原始文本)；文件尾部不完整的记录会被忽略
+    """
+    with open(path, "rb", buffering=1 << 20) as f:
+        if f.read(len(FRAME_MAGIC)) != FRAME_MAGIC:
+            raise ValueError(f"不是有效的帧文件: {path}")
+        header_size = _HEADER.size
+        while True:
+            header = f.read(header_size)
+            if len(header) < header_size:
+                return
+            recv_ts, length = _HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                return
+            yield recv_ts, payload.decode("utf-8")
@@ -0,0 +1,282 @@
+"""
+交易所HTTP客户端工厂（连接池 + 长连接保温）
+
+过去各适配器直接 aiohttp.ClientSession()：
+- 默认连接器 keep-alive 只有 15 秒、不限单主机连接数、DNS 缓存 10 秒
+- 连通性检查每次调用都新建一个会话（每次都是完整的 TCP/TLS 握手）
+- 空闲一段时间后的第一笔下单要重新握手，延迟里多出几十到上百毫秒
+
+本模块统一提供：
+- create_session(): 调优过的 TCPConnector（总连接数/单主机连接数、长 keep-alive、
+  DNS 缓存、清理半关闭的 TLS 连接）；aiohttp 的连接本身已开启 TCP_NODELAY
+- create_httpx_client(): httpx 客户端的连接池上限与 keep-alive，安装了 h2 时启用 HTTP/2，
+  并显式设置 TCP_NODELAY
+- warm_urls: 启动时预热连接，并按间隔（小于服务端空闲超时）保温，下单路径不再包含握手
+- get_shared_session(): 进程内共享会话，给连通性检查之类的一次性请求使用（不要关闭）
+- get_http_client_stats(): 按会话名统计请求数、新建/复用连接数、DNS 缓存命中
+"""
+
+import asyncio
+import importlib.util
+import socket
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .logger_factory import get_exchange_logger
+
+logger = get_exchange_logger("ExchangeAdapter.http_client")
+
+# 🔥 连接池参数
+HTTP_CLIENT_CONFIG: Dict[str, Any] = {
+    'limit': 100,                 # 会话总连接数上限
+    'limit_per_host': 16,         # 单主机连接数上限
+    'keepalive_timeout': 75.0,    # 空闲连接保留时间（秒，aiohttp 默认 15 秒）
+    'ttl_dns_cache': 300,         # DNS 缓存时间（秒，aiohttp 默认 10 秒）
+    'keep_warm_interval': 20.0,   # 保温间隔（秒，需小于服务端空闲超时，通常 60 秒）
+    'warm_timeout': 5.0,          # 单次预热请求超时（秒）
+}
+
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _stats_for(name: str) -> Dict[str, int]:
+    stats = _stats.get(name)
+    if stats is None:
+        stats = {
+            'sessions': 0,
+            'requests': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'dns_cache_hits': 0,
+            'dns_cache_misses': 0,
+            'warm_requests': 0,
+            'warm_failures': 0,
+        }
+        _stats[name] = stats
+    return stats
+
+
+def _trace_config(name: str) -> aiohttp.TraceConfig:
+    """连接复用统计（aiohttp 请求追踪钩子）"""
+    stats = _stats_for(name)
+    trace = aiohttp.TraceConfig()
+
+    def counter(key: str):
+        async def _inc(session, context, params):
+            stats[key] += 1
+        return _inc
+
+    trace.on_request_start.append(counter('requests'))
+    trace.on_connection_create_end.append(counter('connections_created'))
+    trace.on_connection_reuseconn.append(counter('connections_reused'))
+    trace.on_dns_cache_hit.append(counter('dns_cache_hits'))
+    trace.on_dns_cache_miss.append(counter('dns_cache_misses'))
+    return trace
+
+
+def create_connector(ssl: Any = None, **overrides: Any) -> aiohttp.TCPConnector:
+    """
+    创建调优过的 TCPConnector
+
+    Args:
+        ssl: SSL 配置（None 表示默认校验；可传入 SSLContext 或 False）
+        **overrides: 覆盖 HTTP_CLIENT_CONFIG 中的连接池参数
+    """
+    cfg = {**HTTP_CLIENT_CONFIG, **overrides}
+    kwargs: Dict[str, Any] = {
+        'limit': cfg['limit'],
+        'limit_per_host': cfg['limit_per_host'],
+        'keepalive_timeout': cfg['keepalive_timeout'],
+        'use_dns_cache': True,
+        'ttl_dns_cache': cfg['ttl_dns_cache'],
+        'enable_cleanup_closed': True,
+    }
+    if ssl is not None:
+        kwargs['ssl'] = ssl
+    return aiohttp.TCPConnector(**kwargs)
+
+
+def create_session(
+    name: str,
+    *,
+    ssl: Any = None,
+    warm_urls: Optional[Iterable[str]] = None,
+    **session_kwargs: Any,
+) -> aiohttp.ClientSession:
+    """
+    创建使用共享调优参数的 aiohttp 会话（需在事件循环内调用）
+
+    Args:
+        name: 会话名（统计用，如 "backpack"、"edgex"）
+        ssl: SSL 配置，见 create_connector
+        warm_urls: 需要预热并保温的地址（一般为 REST base_url）；会话关闭后保温任务自动退出
+        **session_kwargs: 透传给 ClientSession（timeout、headers 等）
+    """
+    session = aiohttp.ClientSession(
+        connector=create_connector(ssl=ssl),
+        trace_configs=[_trace_config(name)],
+        **session_kwargs,
+    )
+    _stats_for(name)['sessions'] += 1
+    urls = list(warm_urls or [])
+    if urls:
+        start_keep_warm(session, urls, name=name)
+    return session
+
+
+def create_httpx_client(name: str, timeout: float = 10.0, **client_kwargs: Any):
+    """
+    创建使用共享连接池参数的 httpx.AsyncClient（安装 h2 时启用 HTTP/2）
+
+    Args:
+        name: 客户端名（统计用）
+        timeout: 请求超时（秒）
+        **client_kwargs: 透传给 httpx.AsyncClient
+    """
+    import httpx
+
+    cfg = HTTP_CLIENT_CONFIG
+    limits = httpx.Limits(
+        max_connections=cfg['limit'],
+        max_keepalive_connections=cfg['limit_per_host'],
+        keepalive_expiry=cfg['keepalive_timeout'],
+    )
+    socket_options = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+    try:
+        transport = httpx.AsyncHTTPTransport(
+            http2=HTTP2_AVAILABLE, limits=limits, socket_options=socket_options
+        )
+    except TypeError:
+        # 旧版本 httpx 不支持 socket_options
+        transport = httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=limits)
+    stats = _stats_for(name)
+    stats['sessions'] += 1
+
+    async def _count_request(request) -> None:
+        stats['requests'] += 1
+
+    event_hooks = client_kwargs.pop('event_hooks', None) or {}
+    event_hooks = {**event_hooks, 'request': [*event_hooks.get('request', []), _count_request]}
+    return httpx.AsyncClient(timeout=timeout, transport=transport, event_hooks=event_hooks, **client_kwargs)
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/" if parts.scheme and parts.netloc else url
+
+
+def _is_closed(client: Any) -> bool:
+    if isinstance(client, aiohttp.ClientSession):
+        return client.closed
+    return bool(getattr(client, 'is_closed', True))
+
+
+async def prewarm(client: Any, urls: Iterable[str], name: str = 'default') -> int:
+    """
+    预热连接：对每个地址的源站发一次 HEAD，建立并放回连接池
+
+    只关心连接是否建立，响应状态码不重要。
+
+    Returns:
+        成功预热的地址数量
+    """
+    stats = _stats_for(name)
+    timeout = HTTP_CLIENT_CONFIG['warm_timeout']
+    origins = list(dict.fromkeys(_origin(url) for url in urls))
+
+    async def _warm(url: str) -> bool:
+        try:
+            if isinstance(client, aiohttp.ClientSession):
+                async with client.head(url, timeout=aiohttp.ClientTimeout(total=timeout),
+                                       allow_redirects=False) as response:
+                    await response.read()
+            else:
+                await client.head(url, timeout=timeout)
+            stats['warm_requests'] += 1
+            return True
+        except Exception as e:
+            stats['warm_failures'] += 1
+            logger.debug(f"[HTTP] 预热连接失败 {url}: {e}")
+            return False
+
+    results = await asyncio.gather(*(_warm(url) for url in origins))
+    return sum(1 for ok in results if ok)
+
+
+def start_keep_warm(
+    client: Any,
+    urls: Iterable[str],
+    *,
+    name: str = 'default',
+    interval: Optional[float] = None,
+) -> asyncio.Task:
+    """
+    启动保温任务：立即预热一次，之后每 interval 秒访问一次，直到客户端关闭
+
+    Returns:
+        保温任务（调用方无需管理，客户端关闭后自动退出）
+    """
+    urls = list(urls)
+    interval = interval or HTTP_CLIENT_CONFIG['keep_warm_interval']
+
+    async def _loop() -> None:
+        try:
+            while not _is_closed(client):
+                await prewarm(client, urls, name)
+                await asyncio.sleep(interval)
+        except asyncio.CancelledError:
+            pass
+
+    task = asyncio.get_running_loop().create_task(_loop())
+    _keep_warm_tasks.add(task)
+    task.add_done_callback(_keep_warm_tasks.discard)
+    return task
+
+
+# 保留任务引用，避免被垃圾回收
+_keep_warm_tasks: set = set()
+
+# 进程内共享会话（按事件循环区分）：{(loop_id, name): session}
+_shared_sessions: Dict[tuple, aiohttp.ClientSession] = {}
+
+
+def get_shared_session(name: str = 'shared') -> aiohttp.ClientSession:
+    """
+    获取进程内共享的会话（连通性检查等一次性请求使用，调用方不要关闭）
+
+    需在事件循环内调用；每个事件循环各自一份。
+    """
+    key = (id(asyncio.get_running_loop()), name)
+    session = _shared_sessions.get(key)
+    if session is None or session.closed:
+        session = create_session(name)
+        _shared_sessions[key] = session
+    return session
+
+
+async def close_shared_sessions() -> None:
+    """关闭当前事件循环的共享会话（进程退出前调用）"""
+    loop_id = id(asyncio.get_running_loop())
+    for key in [key for key in _shared_sessions if key[0] == loop_id]:
+        session = _shared_sessions.pop(key)
+        if not session.closed:
+            await session.close()
+
+
+def get_http_client_stats() -> Dict[str, Dict[str, Any]]:
+    """按会话名返回连接统计（含连接复用率）"""
+    result: Dict[str, Dict[str, Any]] = {}
+    for name, stats in _stats.items():
+        connections = stats['connections_created'] + stats['connections_reused']
+        result[name] = {
+            **stats,
+            'reuse_ratio': round(stats['connections_reused'] / connections, 4) if connections else 0.0,
+        }
+    return result
@@ -0,0 +1,388 @@
+"""
+交易所REST统一限流器（令牌桶）
+
+过去的限流各自为政：
+- ExchangeAdapter._check_rate_limit 每次调用都重建一遍 datetime 时间戳列表
+- ArbitrageExecutor 有自己的 ExchangeRateLimiter（只管执行节奏）
+- 大部分 REST 适配器完全没有限流，触发 429 后只能靠重试硬扛
+
+本模块按 (交易所, 端点类别) 提供 O(1) 的令牌桶：
+- 每个交易所一个总桶（账户/IP 的总额度），各端点类别可再配置独立的子桶
+- 请求按权重扣减令牌（如 Hyperliquid info 请求权重 2/20，下单权重 1）
+- 突发容量 burst：空闲时积累的令牌允许瞬时打满额度
+- 优先级通道：撤单 > 下单 > 账户查询/行情。低优先级请求不能把总桶用到
+  预留水位以下，因此撤单永远不会排在余额轮询后面
+- 429 反馈：收到 429 / Retry-After 后整个交易所进入冷却，并清空令牌
+
+用法：
+    limiter = get_rate_limiter("backpack")
+    await limiter.acquire(EndpointClass.CANCEL)
+    ...
+    limiter.observe_status(response.status, response.headers)
+"""
+
+import asyncio
+import re
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from .logger_factory import get_exchange_logger
+
+logger = get_exchange_logger("ExchangeAdapter.rate_limiter")
+
+
+class EndpointClass:
+    """端点类别（同时决定优先级通道）"""
+    CANCEL = 'cancel'
+    ORDER = 'order'
+    ACCOUNT = 'account'
+    MARKET = 'market'
+
+
+# 🔥 优先级通道：低优先级请求不能把总桶用到 (预留水位 × 系数) 以下
+_LANE_RESERVE_FACTOR = {
+    EndpointClass.CANCEL: 0.0,
+    EndpointClass.ORDER: 0.5,
+    EndpointClass.ACCOUNT: 1.0,
+    EndpointClass.MARKET: 1.0,
+}
+
+# 🔥 各交易所默认额度（rate: 每秒补充的令牌数，burst: 桶容量）
+# classes 为端点类别的独立子桶，weights 为按操作名配置的请求权重
+RATE_LIMIT_CONFIG: Dict[str, Dict[str, Any]] = {
+    'default': {
+        'rate': 10.0,
+        'burst': 20.0,
+        'reserve_ratio': 0.2,     # 总桶中为撤单/下单预留的比例
+        'cooldown': 2.0,          # 429 未带 Retry-After 时的冷却秒数
+    },
+    'lighter': {
+        'rate': 10.0,
+        'burst': 30.0,
+        'classes': {
+            EndpointClass.ACCOUNT: {'rate': 4.0, 'burst': 10.0},
+        },
+    },
+    'backpack': {
+        'rate': 20.0,
+        'burst': 50.0,
+        'classes': {
+            EndpointClass.ACCOUNT: {'rate': 5.0, 'burst': 15.0},
+        },
+    },
+    'edgex': {
+        'rate': 20.0,
+        'burst': 40.0,
+        'classes': {
+            EndpointClass.ORDER: {'rate': 10.0, 'burst': 20.0},
+            EndpointClass.CANCEL: {'rate': 20.0, 'burst': 40.0},
+            EndpointClass.ACCOUNT: {'rate': 5.0, 'burst': 10.0},
+        },
+    },
+    'paradex': {
+        'rate': 20.0,
+        'burst': 40.0,
+        'classes': {
+            EndpointClass.ACCOUNT: {'rate': 10.0, 'burst': 20.0},
+        },
+    },
+    # Hyperliquid 按权重计：每分钟 1200 权重
+    'hyperliquid': {
+        'rate': 20.0,
+        'burst': 100.0,
+        'weights': {
+            'get_ticker': 20,
+            'get_tickers': 20,
+            'get_orderbook': 2,
+            'get_ohlcv': 20,
+            'get_trades': 20,
+            'get_balances': 2,
+            'get_swap_balances': 2,
+            'get_positions': 2,
+            'get_order': 2,
+            'get_open_orders': 20,
+            'get_order_history': 20,
+        },
+    },
+    # OKX 按接口分别限频（如下单/撤单 60次/2秒，余额/持仓 10次/2秒）
+    'okx': {
+        'rate': 20.0,
+        'burst': 40.0,
+        'classes': {
+            EndpointClass.ORDER: {'rate': 30.0, 'burst': 60.0},
+            EndpointClass.CANCEL: {'rate': 30.0, 'burst': 60.0},
+            EndpointClass.ACCOUNT: {'rate': 5.0, 'burst': 10.0},
+            EndpointClass.MARKET: {'rate': 10.0, 'burst': 20.0},
+        },
+    },
+}
+
+_ACCOUNT_KEYWORDS = (
+    'balance', 'position', 'order', 'account', 'leverage', 'margin',
+    'fill', 'my_trades', 'capital', 'collateral', 'nonce',
+)
+
+# 含 'order' 但属于行情的名称，需在账户关键字之前判定
+_MARKET_KEYWORDS = ('orderbook', 'order_book', 'order-book', 'depth')
+
+
+def classify_operation(name: Optional[str]) -> str:
+    """
+    按操作名/方法名推断端点类别
+
+    同时适用于适配器内部操作名（cancel_order、get_balances）和 ccxt 方法名
+    （fetch_balance、create_order）。
+    """
+    if not name:
+        return EndpointClass.MARKET
+    lowered = name.lower()
+    if 'cancel' in lowered:
+        return EndpointClass.CANCEL
+    if lowered.startswith(('create', 'place', 'edit', 'amend')):
+        return EndpointClass.ORDER
+    if any(keyword in lowered for keyword in _MARKET_KEYWORDS):
+        return EndpointClass.MARKET
+    if any(keyword in lowered for keyword in _ACCOUNT_KEYWORDS):
+        return EndpointClass.ACCOUNT
+    return EndpointClass.MARKET
+
+
+def classify_request(method: str, path: str, private: bool = False) -> str:
+    """
+    按 HTTP 方法和路径推断端点类别
+
+    Args:
+        method: HTTP 方法
+        path: 请求路径
+        private: 是否为需要认证的接口（未识别为下单/撤单时归为账户类）
+    """
+    method = method.upper()
+    lowered = path.lower()
+    if method == 'DELETE' or 'cancel' in lowered:
+        return EndpointClass.CANCEL
+    if any(keyword in lowered for keyword in _MARKET_KEYWORDS):
+        return EndpointClass.MARKET
+    if method in ('POST', 'PUT') and 'order' in lowered:
+        return EndpointClass.ORDER
+    return EndpointClass.ACCOUNT if private else EndpointClass.MARKET
+
+
+def parse_retry_after(headers: Optional[Mapping[str, Any]]) -> Optional[float]:
+    """解析 Retry-After 响应头（秒）；缺失或格式不对返回 None"""
+    if not headers:
+        return None
+    value = headers.get('Retry-After') or headers.get('retry-after')
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    return seconds if seconds > 0 else None
+
+
+# ccxt 限频异常类型（按类名匹配，ccxt 为可选依赖）
+_RATE_LIMIT_ERROR_TYPES = frozenset({'RateLimitExceeded', 'DDoSProtection'})
+# 文本特征：限频短语本身即可判定；独立的 429 只有与限频短语同时出现才算
+# （裸子串会误匹配订单号、价格、nonce 等数字）
+_RATE_LIMIT_PHRASE = re.compile(r'too many requests|rate[ _-]?limit', re.IGNORECASE)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """判断异常是否为限频错误（HTTP 429 状态码 / ccxt.RateLimitExceeded / 文本特征）"""
+    for attr in ('status', 'status_code'):
+        status = getattr(error, attr, None)
+        try:
+            if status is not None and int(status) == 429:
+                return True
+        except (TypeError, ValueError):
+            pass
+    if any(cls.__name__ in _RATE_LIMIT_ERROR_TYPES for cls in type(error).__mro__):
+        return True
+    return _RATE_LIMIT_PHRASE.search(str(error)) is not None
+
+
+class TokenBucket:
+    """
+    令牌桶（按需补充，无后台任务）
+
+    Args:
+        rate: 每秒补充的令牌数
+        capacity: 桶容量（突发上限）
+    """
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = max(float(rate), 1e-6)
+        self.capacity = max(float(capacity), 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def wait_time(self, weight: float, floor: float = 0.0) -> float:
+        """扣除 weight 后仍不低于 floor 还需要等待的秒数（需求超过容量时按满桶计算）"""
+        needed = min(weight + floor, self.capacity)
+        deficit = needed - self.tokens
+        return deficit / self.rate if deficit > 0 else 0.0
+
+    def take(self, weight: float) -> None:
+        self.tokens -= weight
+
+    def drain(self) -> None:
+        # 同时重置补充起点，否则下次 refill 会把排空前的空闲时间补回来
+        self.tokens = min(self.tokens, 0.0)
+        self.updated = time.monotonic()
+
+
+class RestRateLimiter:
+    """
+    单个交易所的 REST 限流器（进程内共享，见 get_rate_limiter）
+
+    Args:
+        exchange: 交易所名称
+        config: 限流配置（结构同 RATE_LIMIT_CONFIG 中的单项）
+    """
+
+    def __init__(self, exchange: str, config: Optional[Dict[str, Any]] = None):
+        self.exchange = exchange
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._weights: Dict[str, float] = {}
+        self._cooldown_until: float = 0.0
+        self.stats: Dict[str, float] = {
+            'acquired': 0,
+            'throttled': 0,
+            'wait_seconds': 0.0,
+            'cooldowns': 0,
+        }
+        self.configure(config or {})
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """（重新）加载配置，未指定的项使用 default"""
+        defaults = RATE_LIMIT_CONFIG['default']
+        rate = float(config.get('rate', defaults['rate']))
+        burst = float(config.get('burst', defaults['burst']))
+        self._total = TokenBucket(rate, burst)
+        self._reserve = self._total.capacity * float(config.get('reserve_ratio', defaults['reserve_ratio']))
+        self._default_cooldown = float(config.get('cooldown', defaults['cooldown']))
+        self._buckets = {
+            endpoint_class: TokenBucket(cfg.get('rate', rate), cfg.get('burst', burst))
+            for endpoint_class, cfg in (config.get('classes') or {}).items()
+        }
+        self._weights = {name: float(w) for name, w in (config.get('weights') or {}).items()}
+
+    def weight_for(self, operation: Optional[str], default: float = 1.0) -> float:
+        """按操作名查询请求权重"""
+        if operation is None:
+            return default
+        return self._weights.get(operation, default)
+
+    async def acquire(self, endpoint_class: str = EndpointClass.MARKET, weight: float = 1.0) -> float:
+        """
+        获取令牌（不足时等待）
+
+        Returns:
+            实际等待的秒数
+        """
+        floor = self._reserve * _LANE_RESERVE_FACTOR.get(endpoint_class, 1.0)
+        bucket = self._buckets.get(endpoint_class)
+        waited = 0.0
+        while True:
+            now = time.monotonic()
+            wait = self._cooldown_until - now
+            if wait <= 0:
+                self._total.refill(now)
+                wait = self._total.wait_time(weight, floor)
+                if bucket is not None:
+                    bucket.refill(now)
+                    wait = max(wait, bucket.wait_time(weight))
+                if wait <= 0:
+                    self._total.take(weight)
+                    if bucket is not None:
+                        bucket.take(weight)
+                    stats = self.stats
+                    stats['acquired'] += 1
+                    if waited > 0:
+                        stats['throttled'] += 1
+                        stats['wait_seconds'] += waited
+                    return waited
+            # 醒来后重新检查：期间到达的高优先级请求可以先拿走令牌
+            await asyncio.sleep(wait)
+            waited += wait
+
+    async def acquire_operation(self, operation: Optional[str], weight: Optional[float] = None) -> float:
+        """按操作名获取令牌（类别由 classify_operation 推断，权重取配置）"""
+        if weight is None:
+            weight = self.weight_for(operation)
+        return await self.acquire(classify_operation(operation), weight)
+
+    def register_cooldown(self, seconds: Optional[float] = None) -> None:
+        """进入冷却（收到 429 时调用）：冷却期间所有请求暂停，令牌清零"""
+        cooldown = seconds if seconds and seconds > 0 else self._default_cooldown
+        target = time.monotonic() + cooldown
+        if target > self._cooldown_until:
+            self._cooldown_until = target
+            self.stats['cooldowns'] += 1
+            logger.warning(f"⏸️ [限流] {self.exchange} 触发限频，冷却 {cooldown:.2f}s")
+        self._total.drain()
+        for bucket in self._buckets.values():
+            bucket.drain()
+
+    def observe_status(self, status: int, headers: Optional[Mapping[str, Any]] = None) -> bool:
+        """根据响应状态码反馈限频；返回是否为限频响应"""
+        if status != 429 and status != 418:
+            return False
+        self.register_cooldown(parse_retry_after(headers))
+        return True
+
+    def observe_error(self, error: BaseException) -> bool:
+        """根据异常反馈限频；返回是否为限频错误"""
+        if not is_rate_limit_error(error):
+            return False
+        headers = getattr(error, 'headers', None)
+        self.register_cooldown(parse_retry_after(headers) if isinstance(headers, Mapping) else None)
+        return True
+
+    @property
+    def cooling_down(self) -> bool:
+        return time.monotonic() < self._cooldown_until
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._total.refill(now)
+        return {
+            'exchange': self.exchange,
+            'tokens': round(self._total.tokens, 2),
+            'capacity': self._total.capacity,
+            'cooldown_remaining': max(0.0, self._cooldown_until - now),
+            **self.stats,
+        }
+
+
+# 进程内按交易所共享：同一交易所的多个适配器/服务共用一份额度
+_limiters: Dict[str, RestRateLimiter] = {}
+
+
+def get_rate_limiter(exchange: str) -> RestRateLimiter:
+    """获取（或创建）交易所对应的 REST 限流器"""
+    key = (exchange or 'default').lower()
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = RestRateLimiter(key, RATE_LIMIT_CONFIG.get(key, {}))
+        _limiters[key] = limiter
+    return limiter
+
+
+def configure_rate_limiter(exchange: str, config: Dict[str, Any]) -> RestRateLimiter:
+    """覆盖某个交易所的限流配置（未指定的项沿用 RATE_LIMIT_CONFIG）"""
+    key = (exchange or 'default').lower()
+    merged = dict(RATE_LIMIT_CONFIG.get(key, {}))
+    merged.update(config or {})
+    limiter = get_rate_limiter(key)
+    limiter.configure(merged)
+    return limiter
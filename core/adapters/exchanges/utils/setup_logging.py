@@ -2,6 +2,9 @@
 日志系统配置工具
 
 提供统一的日志配置接口，支持多种格式化器
+
+config/logging.yaml 中 async_logging: true 时启用队列模式：logger 上只挂轻量的入队 handler，
+格式化、写盘与文件轮转由后台线程批量完成（见 async_log_writer.py）。
 """
 
 import logging
@@ -9,7 +12,9 @@ import os
 import sys
 from pathlib import Path
 from logging.handlers import RotatingFileHandler
-from typing import Optional
+from typing import Any, Dict, Optional
+
+import yaml
 
 from .log_formatter import (
     CompactFormatter,
@@ -20,6 +25,7 @@ from .log_formatter import (
     format_sync_log,
     simplify_order_id
 )
+from .async_log_writer import AsyncDispatchHandler, AsyncLogWriter
 
 
 class LoggingConfig:
@@ -37,6 +43,12 @@ class LoggingConfig:
     ENV_ENABLE_CONSOLE_KEY = "ENABLE_CONSOLE_LOGS"
     # 环境变量控制：可关闭文件输出以降低云端磁盘IO
     ENV_ENABLE_FILE_KEY = "ENABLE_FILE_LOGS"
+    # 环境变量控制：覆盖 logging.yaml 中的 async_logging
+    ENV_ASYNC_KEY = "ASYNC_LOGS"
+
+    # 异步日志配置来源
+    CONFIG_PATH = Path("config/logging.yaml")
+    _async_settings: Optional[Dict[str, Any]] = None
 
     # 格式化器类型
     FORMATTER_TYPES = {
@@ -84,6 +96,61 @@ class LoggingConfig:
 
         return logger
 
+    @classmethod
+    def _load_async_settings(cls) -> Dict[str, Any]:
+        """
+        读取异步日志配置（只读取一次）
+
+        logging.yaml 顶层字段：
+            async_logging: 是否启用队列模式
+            buffer_size / flush_interval: 队列容量 / 空闲刷新间隔
+            async_batch_size: 单批写入条数
+            async_overflow_policy: 拥塞时 INFO/DEBUG 的处理方式（sample / drop）
+            async_sample_rate: 采样模式下每 N 条保留 1 条
+        """
+        if cls._async_settings is not None:
+            return cls._async_settings
+
+        data: Dict[str, Any] = {}
+        try:
+            if cls.CONFIG_PATH.exists():
+                with open(cls.CONFIG_PATH, 'r', encoding='utf-8') as f:
+                    data = yaml.safe_load(f) or {}
+        except Exception:
+            data = {}
+
+        enabled = bool(data.get('async_logging', False))
+        flag = os.getenv(cls.ENV_ASYNC_KEY)
+        if flag is not None:
+            enabled = flag.strip().lower() in {"1", "true", "yes", "on"}
+
+        cls._async_settings = {
+            'enabled': enabled,
+            'writer': {
+                'buffer_size': int(data.get('buffer_size', 1000)),
+                'flush_interval': float(data.get('flush_interval', 1.0)),
+                'batch_size': int(data.get('async_batch_size', 256)),
+                'overflow_policy': str(data.get('async_overflow_policy', 'sample')),
+                'sample_rate': int(data.get('async_sample_rate', 10)),
+            },
+        }
+        return cls._async_settings
+
+    @classmethod
+    def _is_async_enabled(cls) -> bool:
+        return cls._load_async_settings()['enabled']
+
+    @classmethod
+    def _get_async_writer(cls) -> AsyncLogWriter:
+        return AsyncLogWriter.get_instance(**cls._load_async_settings()['writer'])
+
+    @classmethod
+    def get_async_stats(cls) -> Optional[Dict[str, int]]:
+        """异步日志统计（未启用时返回 None）"""
+        if not cls._is_async_enabled() or AsyncLogWriter._instance is None:
+            return None
+        return AsyncLogWriter._instance.get_stats()
+
     @classmethod
     def _is_console_enabled(cls) -> bool:
         """
@@ -123,6 +190,8 @@ class LoggingConfig:
             formatter_type, CompactFormatter)
         handler.setFormatter(formatter_class())
 
+        if cls._is_async_enabled():
+            return AsyncDispatchHandler(handler, cls._get_async_writer())
         return handler
 
     @classmethod
@@ -131,8 +200,20 @@ class LoggingConfig:
         # 确保日志目录存在
         cls.LOG_DIR.mkdir(parents=True, exist_ok=True)
 
-        # 创建RotatingFileHandler
         file_path = cls.LOG_DIR / log_file
+        formatter_class = cls.FORMATTER_TYPES.get(
+            formatter_type, DetailedFormatter)
+
+        if cls._is_async_enabled():
+            # 队列模式：同一文件共享一个后台写入的 handler
+            writer = cls._get_async_writer()
+            target = writer.get_file_handler(
+                str(file_path), formatter_class, cls.MAX_BYTES, cls.BACKUP_COUNT)
+            handler = AsyncDispatchHandler(target, writer)
+            handler.setLevel(cls.DEFAULT_LEVEL)
+            return handler
+
+        # 创建RotatingFileHandler
         handler = RotatingFileHandler(
             file_path,
             maxBytes=cls.MAX_BYTES,
@@ -140,10 +221,6 @@ class LoggingConfig:
             encoding='utf-8'
         )
         handler.setLevel(cls.DEFAULT_LEVEL)
-
-        # 获取格式化器
-        formatter_class = cls.FORMATTER_TYPES.get(
-            formatter_type, DetailedFormatter)
         handler.setFormatter(formatter_class())
 
         return handler
@@ -26,6 +26,8 @@ import aiohttp
 import websockets
 from websockets.exceptions import ConnectionClosed, WebSocketException
 
+from .utils.http_client import create_session
+
 
 class WSDataType(Enum):
     """WebSocket数据类型"""
@@ -120,7 +122,7 @@ class WebSocketManager(ABC):
         
         try:
             self.is_running = True
-            self.session = aiohttp.ClientSession()
+            self.session = create_session("websocket_manager")
             
             # 启动连接任务
             self.tasks.add(asyncio.create_task(self._connection_manager()))
@@ -344,8 +344,8 @@ class DataAggregator:
         except Exception as e:
             self.logger.error(f"启动 {exchange_name} orderbook监控时出错: {e}")
     
-    async def _start_trades_monitoring(self, exchange_name: str, adapter: ExchangeAdapter, symbols: List[str]) -> None:
-        """启动trades监控"""
+    async def _start_trades_monitoring(self, exchange_name: str, adapter: ExchangeAdapter, symbols: List[str]) -> bool:
+        """启动trades监控（返回是否订阅成功）"""
         try:
             # 创建trades数据回调
             async def trades_callback(symbol: str, trade_data: TradeData):
@@ -365,9 +365,11 @@ class DataAggregator:
                     
                     callback = await create_symbol_callback(symbol)
                     await adapter.subscribe_trades(symbol, callback)
+            return True
                     
         except Exception as e:
             self.logger.error(f"启动 {exchange_name} trades监控时出错: {e}")
+            return False
     
     async def _start_user_data_monitoring(self, exchange_name: str, adapter: ExchangeAdapter) -> None:
         """启动user_data监控"""
@@ -856,6 +858,30 @@ class DataAggregator:
             self.logger.error(f"❌ {exchange_id} orderbook订阅失败: {e}")
             return False
     
+    async def subscribe_trades(self, exchange_id: str, symbols: List[str]) -> bool:
+        """订阅单个交易所的trades数据"""
+        try:
+            # 从ExchangeManager获取适配器
+            connected_adapters = self.exchange_manager.get_connected_adapters()
+            
+            if exchange_id not in connected_adapters:
+                self.logger.error(f"未找到交易所: {exchange_id}")
+                return False
+            
+            if not await self._start_trades_monitoring(exchange_id, connected_adapters[exchange_id], symbols):
+                return False
+            
+            # 更新订阅状态
+            self.subscribed_symbols.update(symbols)
+            self.subscribed_exchanges.add(exchange_id)
+            
+            self.logger.info(f"✅ {exchange_id} trades订阅成功: {len(symbols)} 个交易对")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"❌ {exchange_id} trades订阅失败: {e}")
+            return False
+    
     async def unsubscribe_ticker(self, exchange_id: str, symbols: List[str]) -> bool:
         """取消订阅ticker数据"""
         try:
@@ -9,7 +9,8 @@
 """
 
 from .spread_calculator import SpreadCalculator, SpreadData
+from .spread_matrix import SpreadMatrix
 from .exchange_locker import ExchangeLocker
 
-__all__ = ['SpreadCalculator', 'SpreadData', 'ExchangeLocker']
+__all__ = ['SpreadCalculator', 'SpreadData', 'SpreadMatrix', 'ExchangeLocker']
 
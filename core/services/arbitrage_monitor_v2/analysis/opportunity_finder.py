@@ -8,6 +8,7 @@
 """
 
 import asyncio
+import heapq
 import time
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
@@ -88,6 +89,8 @@ class OpportunityFinder:
         self.config = monitor_config
         self.debug = debug_config
         self.scroller = scroller  # 🔥 混合模式：实时滚动输出
+        # 每次只取价差最大的前 K 个方向（0 = 不限制）
+        self.top_k = max(0, int(getattr(monitor_config, 'opportunity_top_k', 0) or 0))
         
         # 当前追踪的机会 {key: ArbitrageOpportunity}
         self.opportunities: Dict[str, ArbitrageOpportunity] = {}
@@ -105,7 +108,8 @@ class OpportunityFinder:
     def find_opportunities(
         self,
         spreads: List[SpreadData],
-        funding_rates: Optional[Dict[str, Dict[str, float]]] = None
+        funding_rates: Optional[Dict[str, Dict[str, float]]] = None,
+        top_k: Optional[int] = None
     ) -> List[ArbitrageOpportunity]:
         """
         从价差数据中识别套利机会
@@ -113,10 +117,15 @@ class OpportunityFinder:
         Args:
             spreads: 价差数据列表
             funding_rates: 资金费率 {exchange: {symbol: rate}}
+            top_k: 只考虑价差最大的前 K 个方向（None 使用配置的 opportunity_top_k，0 = 不限制）
             
         Returns:
             套利机会列表
         """
+        k = self.top_k if top_k is None else top_k
+        if k and len(spreads) > k:
+            spreads = heapq.nlargest(k, spreads, key=lambda spread: spread.spread_pct)
+        
         current_opportunities = []
         current_keys = set()
         symbol_stats: Dict[str, Dict[str, Optional[SpreadData]]] = {}
@@ -29,6 +29,25 @@ logger = LoggingConfig.setup_logger(
 )
 logger.propagate = False
 
+# 数值模式：decimal=全程 Decimal（默认，兼容旧行为）；float=热路径使用 float64 计算价差
+NUMERIC_MODE_DECIMAL = "decimal"
+NUMERIC_MODE_FLOAT = "float"
+
+
+def _price_float(level) -> float:
+    """读取档位价格的 float 值（OrderBookLevel 缓存 price_float，其它对象兜底转换）"""
+    try:
+        return level.price_float
+    except AttributeError:
+        return float(level.price)
+
+
+def _size_float(level) -> float:
+    try:
+        return level.size_float
+    except AttributeError:
+        return float(level.size)
+
 
 @dataclass
 class SpreadData:
@@ -56,20 +75,49 @@ class SpreadData:
 class SpreadCalculator:
     """差价计算器"""
     
-    def __init__(self, debug_config: DebugConfig):
+    def __init__(self, debug_config: DebugConfig, numeric_mode: str = NUMERIC_MODE_DECIMAL):
         """
         初始化差价计算器
         
         Args:
             debug_config: Debug配置
+            numeric_mode: 数值模式（decimal / float）
+                - float 模式下价差百分比与盘口校验使用 float64（省掉 Decimal 除法）；
+                  盘口档位仍以 Decimal 为准，SpreadData 的价格/数量/绝对价差保持 Decimal，下单边界无需转换
         """
         self.debug = debug_config
+        self.numeric_mode = NUMERIC_MODE_DECIMAL
+        self._float_mode = False
+        self.set_numeric_mode(numeric_mode)
         self._calc_counter = 0
         self._warning_log_times: Dict[str, float] = {}
         self._warning_log_interval = 60.0  # 秒级：同一类型的警告最多每分钟打印一次
         self._status_log_times: Dict[str, float] = {}
         self._status_log_interval = 60.0  # 状态日志：默认每个symbol每分钟一次
     
+    def set_numeric_mode(self, numeric_mode: Optional[str]) -> None:
+        """切换数值模式（未知取值回退为 decimal）"""
+        mode = str(numeric_mode or NUMERIC_MODE_DECIMAL).strip().lower()
+        if mode not in (NUMERIC_MODE_DECIMAL, NUMERIC_MODE_FLOAT):
+            logger.warning(f"[价差计算] 未知数值模式 {numeric_mode!r}，使用 decimal")
+            mode = NUMERIC_MODE_DECIMAL
+        self.numeric_mode = mode
+        self._float_mode = mode == NUMERIC_MODE_FLOAT
+
+    def _spread_between(self, buy_level, sell_level) -> Tuple[Decimal, float]:
+        """
+        计算 (绝对价差, 价差百分比)：在 buy_level 的 Ask 买入、在 sell_level 的 Bid 卖出
+        
+        绝对价差始终为 Decimal（与 SpreadData 字段类型一致，一次减法开销很小）；
+        float 模式下只有价差百分比走 float64。
+        """
+        if self._float_mode:
+            buy_price = _price_float(buy_level)
+            spread_pct = (_price_float(sell_level) - buy_price) / buy_price * 100.0
+            return sell_level.price - buy_level.price, spread_pct
+        spread_abs = sell_level.price - buy_level.price
+        return spread_abs, float((spread_abs / buy_level.price) * 100)
+
     def calculate_spreads(
         self,
         symbol: str,
@@ -129,8 +177,7 @@ class SpreadCalculator:
                 # 计算价差：(ex2的Bid - ex1的Ask) / ex1的Ask * 100
                 # 如果 ex2的Bid > ex1的Ask，价差为正（有利可图）
                 # 如果 ex2的Bid <= ex1的Ask，价差为负或0（无利可图或亏损）
-                spread_abs_1 = ob2.best_bid.price - ob1.best_ask.price
-                spread_pct_1 = float((spread_abs_1 / ob1.best_ask.price) * 100)
+                spread_abs_1, spread_pct_1 = self._spread_between(ob1.best_ask, ob2.best_bid)
                 
                 spreads.append(SpreadData(
                     symbol=symbol,
@@ -150,8 +197,7 @@ class SpreadCalculator:
                 # 计算价差：(ex1的Bid - ex2的Ask) / ex2的Ask * 100
                 # 如果 ex1的Bid > ex2的Ask，价差为正（有利可图）
                 # 如果 ex1的Bid <= ex2的Ask，价差为负或0（无利可图或亏损）
-                spread_abs_2 = ob1.best_bid.price - ob2.best_ask.price
-                spread_pct_2 = float((spread_abs_2 / ob2.best_ask.price) * 100)
+                spread_abs_2, spread_pct_2 = self._spread_between(ob2.best_ask, ob1.best_bid)
                 
                 spreads.append(SpreadData(
                     symbol=symbol,
@@ -199,17 +245,30 @@ class SpreadCalculator:
         Returns:
             是否有效
         """
-        if not orderbook.best_bid or not orderbook.best_ask:
+        best_bid = orderbook.best_bid
+        best_ask = orderbook.best_ask
+        if not best_bid or not best_ask:
             return False
+
+        if self._float_mode:
+            bid_price = _price_float(best_bid)
+            ask_price = _price_float(best_ask)
+            return (
+                bid_price > 0
+                and ask_price > 0
+                and _size_float(best_bid) > 0
+                and _size_float(best_ask) > 0
+                and bid_price < ask_price
+            )
         
-        if orderbook.best_bid.price <= 0 or orderbook.best_ask.price <= 0:
+        if best_bid.price <= 0 or best_ask.price <= 0:
             return False
         
-        if orderbook.best_bid.size <= 0 or orderbook.best_ask.size <= 0:
+        if best_bid.size <= 0 or best_ask.size <= 0:
             return False
         
         # 检查价差合理性（Bid应该小于Ask）
-        if orderbook.best_bid.price >= orderbook.best_ask.price:
+        if best_bid.price >= best_ask.price:
             return False
         
         return True
@@ -260,12 +319,10 @@ class SpreadCalculator:
             return None
         
         # 方向1: ex1买 -> ex2卖
-        spread1_abs = orderbook2.best_bid.price - orderbook1.best_ask.price
-        spread1_pct = float((spread1_abs / orderbook1.best_ask.price) * 100)
+        spread1_abs, spread1_pct = self._spread_between(orderbook1.best_ask, orderbook2.best_bid)
         
         # 方向2: ex2买 -> ex1卖
-        spread2_abs = orderbook1.best_bid.price - orderbook2.best_ask.price
-        spread2_pct = float((spread2_abs / orderbook2.best_ask.price) * 100)
+        spread2_abs, spread2_pct = self._spread_between(orderbook2.best_ask, orderbook1.best_bid)
         
         # 选择更大的价差
         if spread1_pct > spread2_pct and spread1_pct > 0:
@@ -367,8 +424,7 @@ class SpreadCalculator:
                     ),
                 )
                 return
-            spread_abs = sell_level.price - buy_level.price
-            spread_pct = float((spread_abs / buy_level.price) * 100)
+            spread_abs, spread_pct = self._spread_between(buy_level, sell_level)
             spreads.append(
                 SpreadData(
                     symbol=symbol,
@@ -482,8 +538,7 @@ class SpreadCalculator:
         sell_price = sell_level.price
         buy_size = buy_level.size
         sell_size = sell_level.size
-        spread_abs = sell_price - buy_price
-        spread_pct = float((spread_abs / buy_price) * 100)
+        spread_abs, spread_pct = self._spread_between(buy_level, sell_level)
 
         return SpreadData(
             symbol=opening_spread.symbol,
@@ -850,8 +905,7 @@ class SpreadCalculator:
         
         # 🔥 方向1: 买入leg1，卖出leg2
         # 计算价差：(leg2的Bid - leg1的Ask) / leg1的Ask * 100
-        spread_abs_1 = ob2.best_bid.price - ob1.best_ask.price
-        spread_pct_1 = float((spread_abs_1 / ob1.best_ask.price) * 100)
+        spread_abs_1, spread_pct_1 = self._spread_between(ob1.best_ask, ob2.best_bid)
         
         spreads.append(SpreadData(
             symbol=pair_id,  # 使用组合ID作为symbol
@@ -869,8 +923,7 @@ class SpreadCalculator:
         
         # 🔥 方向2: 买入leg2，卖出leg1（如果允许反向）
         if allow_reverse:
-            spread_abs_2 = ob1.best_bid.price - ob2.best_ask.price
-            spread_pct_2 = float((spread_abs_2 / ob2.best_ask.price) * 100)
+            spread_abs_2, spread_pct_2 = self._spread_between(ob2.best_ask, ob1.best_bid)
             
             spreads.append(SpreadData(
                 symbol=pair_id,
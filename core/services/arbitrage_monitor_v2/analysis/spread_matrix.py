@@ -0,0 +1,400 @@
+"""
+跨交易所价差矩阵（NumPy 向量化）
+
+职责：
+- 为每个 symbol 维护所有交易所的最优买/卖价与数量数组
+- 用 N×N 方向矩阵保存全部方向的价差百分比：pct[i, j] = 在 i 的 Ask 买入、在 j 的 Bid 卖出
+- 某个交易所盘口变化时只重算该交易所对应的一行一列，全量重算使用一次广播
+- 提供最优方向、跨 symbol Top-K、SpreadData 列表与 UI/API payload
+
+与 SpreadCalculator.calculate_spreads() 的关系：
+- 输出的方向集合与 calculate_spreads() 一致（两两交易所、双向、包含负价差）
+- 盘口校验规则与 SpreadCalculator._validate_orderbook() 一致
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from core.adapters.exchanges.models import OrderBookData
+from .spread_calculator import SpreadData
+
+_NEG_INF = -np.inf
+
+
+class SpreadMatrix:
+    """跨交易所价差矩阵（symbol × 交易所 × 交易所）"""
+
+    def __init__(self, exchanges: Optional[Iterable[str]] = None, initial_symbols: int = 64):
+        """
+        Args:
+            exchanges: 预先登记的交易所（未登记的交易所在首次更新时自动加入）
+            initial_symbols: symbol 维度的初始容量（不足时自动翻倍扩容）
+        """
+        self._exchange_index: Dict[str, int] = {}
+        self._exchanges: List[str] = []
+        self._symbol_index: Dict[str, int] = {}
+        self._symbols: List[str] = []
+
+        self._symbol_cap = max(1, int(initial_symbols))
+        self._exchange_cap = 1
+        self._allocate(self._symbol_cap, self._exchange_cap)
+
+        for exchange in exchanges or ():
+            self._ensure_exchange(exchange)
+
+    # ============= 写入 =============
+
+    def update(self, symbol: str, exchange: str, orderbook: Optional[OrderBookData]) -> bool:
+        """
+        用交易所最新订单簿更新矩阵（只重算该交易所对应的行/列）
+
+        Returns:
+            最优档位是否发生变化（未变化时不做任何计算）
+        """
+        best_bid = orderbook.best_bid if orderbook is not None else None
+        best_ask = orderbook.best_ask if orderbook is not None else None
+        s = self._ensure_symbol(symbol)
+        k = self._ensure_exchange(exchange)
+
+        # 档位对象未变（LocalOrderBook 只在档位变化时新建档位对象）→ 跳过
+        bid_levels = self._bid_levels[s]
+        ask_levels = self._ask_levels[s]
+        if bid_levels[k] is best_bid and ask_levels[k] is best_ask:
+            return False
+
+        bid_levels[k] = best_bid
+        ask_levels[k] = best_ask
+        if best_bid is not None and best_ask is not None:
+            bid_price = self._as_float(best_bid, 'price')
+            ask_price = self._as_float(best_ask, 'price')
+            bid_size = self._as_float(best_bid, 'size')
+            ask_size = self._as_float(best_ask, 'size')
+            self._bid[s, k] = bid_price
+            self._ask[s, k] = ask_price
+            self._bid_size[s, k] = bid_size
+            self._ask_size[s, k] = ask_size
+            self._valid[s, k] = (
+                bid_price > 0 and ask_price > 0
+                and bid_size > 0 and ask_size > 0
+                and bid_price < ask_price
+            )
+        else:
+            self._valid[s, k] = False
+
+        self._update_cross(s, k)
+        return True
+
+    def invalidate(self, symbol: str, exchange: str) -> None:
+        """移除某交易所在该 symbol 上的盘口（数据过期/断线）"""
+        s = self._symbol_index.get(symbol)
+        k = self._exchange_index.get(exchange)
+        if s is None or k is None:
+            return
+        if self._bid_levels[s][k] is None and self._ask_levels[s][k] is None:
+            return
+        self._bid_levels[s][k] = None
+        self._ask_levels[s][k] = None
+        self._valid[s, k] = False
+        self._update_cross(s, k)
+
+    def sync(self, symbol: str, orderbooks: Dict[str, OrderBookData]) -> int:
+        """
+        按当前可用订单簿同步一个 symbol：变化的交易所更新行/列，缺失的交易所失效
+
+        Args:
+            symbol: 交易对
+            orderbooks: {exchange: orderbook}（通常为按新鲜度筛选后的订单簿）
+
+        Returns:
+            本次发生变化的交易所数量
+        """
+        changed = 0
+        for exchange, orderbook in orderbooks.items():
+            if self.update(symbol, exchange, orderbook):
+                changed += 1
+
+        s = self._ensure_symbol(symbol)
+        bid_levels = self._bid_levels[s]
+        ask_levels = self._ask_levels[s]
+        for exchange, k in self._exchange_index.items():
+            if exchange not in orderbooks and (
+                bid_levels[k] is not None or ask_levels[k] is not None
+            ):
+                self.invalidate(symbol, exchange)
+                changed += 1
+        return changed
+
+    def recompute(self, symbol: str) -> None:
+        """一次广播重算该 symbol 的整个方向矩阵"""
+        s = self._symbol_index.get(symbol)
+        if s is None:
+            return
+        n = len(self._exchanges)
+        bid = self._bid[s, :n]
+        ask = self._ask[s, :n]
+        valid = self._valid[s, :n]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct = (bid[np.newaxis, :] - ask[:, np.newaxis]) / ask[:, np.newaxis] * 100.0
+        mask = valid[:, np.newaxis] & valid[np.newaxis, :]
+        np.fill_diagonal(mask, False)
+        self._pct[s, :n, :n] = np.where(mask, pct, _NEG_INF)
+
+    # ============= 读取 =============
+
+    @property
+    def exchanges(self) -> List[str]:
+        return list(self._exchanges)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def spread_pct_matrix(self, symbol: str) -> Optional[np.ndarray]:
+        """返回该 symbol 的方向价差矩阵副本（无效方向为 -inf），行=买入交易所，列=卖出交易所"""
+        s = self._symbol_index.get(symbol)
+        if s is None:
+            return None
+        n = len(self._exchanges)
+        return self._pct[s, :n, :n].copy()
+
+    def spreads(self, symbol: str, min_spread_pct: Optional[float] = None) -> List[SpreadData]:
+        """
+        该 symbol 所有有效方向的 SpreadData（每对交易所依次输出 A买B卖、B买A卖）
+
+        Args:
+            min_spread_pct: 只返回价差百分比不低于该值的方向（None 表示全部）
+        """
+        s = self._symbol_index.get(symbol)
+        if s is None:
+            return []
+        buys, sells, values = self._valid_directions(s, min_spread_pct)
+        return [
+            self._build_spread(s, buy, sell, value)
+            for buy, sell, value in zip(buys, sells, values)
+        ]
+
+    def best_direction(self, symbol: str) -> Optional[SpreadData]:
+        """该 symbol 价差百分比最大的方向"""
+        s = self._symbol_index.get(symbol)
+        if s is None:
+            return None
+        n = len(self._exchanges)
+        pct = self._pct[s, :n, :n]
+        flat_idx = int(np.argmax(pct))
+        buy, sell = divmod(flat_idx, n)
+        value = pct[buy, sell]
+        if not value > _NEG_INF:
+            return None
+        return self._build_spread(s, buy, sell, float(value))
+
+    def top_k(
+        self,
+        k: int,
+        min_spread_pct: Optional[float] = None,
+        symbol: Optional[str] = None,
+    ) -> List[SpreadData]:
+        """
+        前 K 个方向（按价差百分比从大到小），默认跨所有 symbol
+
+        Args:
+            k: 返回数量
+            min_spread_pct: 最小价差百分比过滤
+            symbol: 只在该 symbol 内选取（None 表示跨所有 symbol）
+        """
+        if k <= 0 or not self._symbols:
+            return []
+        n = len(self._exchanges)
+        first = 0
+        if symbol is None:
+            pct = self._pct[:len(self._symbols), :n, :n].reshape(-1)
+        else:
+            s = self._symbol_index.get(symbol)
+            if s is None:
+                return []
+            first = s
+            pct = self._pct[s, :n, :n].reshape(-1)
+        k = min(k, pct.size)
+        candidates = np.argpartition(pct, -k)[-k:]
+        candidates = candidates[np.argsort(pct[candidates])[::-1]]
+
+        threshold = _NEG_INF if min_spread_pct is None else float(min_spread_pct)
+        per_symbol = n * n
+        result: List[SpreadData] = []
+        for flat_idx in candidates:
+            value = pct[flat_idx]
+            if not value > _NEG_INF or value < threshold:
+                break
+            s, rest = divmod(int(flat_idx), per_symbol)
+            s += first
+            buy, sell = divmod(rest, n)
+            result.append(self._build_spread(s, buy, sell, float(value)))
+        return result
+
+    def payload(self, symbol: str) -> List[Dict[str, object]]:
+        """
+        该 symbol 所有有效方向的 JSON 友好数据（字段同 ArbitrageOrchestrator 的 symbol_spreads）
+
+        直接读取 float 数组，不经过 Decimal。
+        """
+        s = self._symbol_index.get(symbol)
+        if s is None:
+            return []
+        buys, sells, values = self._valid_directions(s)
+        if not buys:
+            return []
+        exchanges = self._exchanges
+        ask = self._ask[s].tolist()
+        bid = self._bid[s].tolist()
+        ask_size = self._ask_size[s].tolist()
+        bid_size = self._bid_size[s].tolist()
+
+        rows: List[Dict[str, object]] = []
+        for buy, sell, value in zip(buys, sells, values):
+            price_buy = ask[buy]
+            price_sell = bid[sell]
+            rows.append({
+                "symbol": symbol,
+                "exchange_buy": exchanges[buy],
+                "exchange_sell": exchanges[sell],
+                "price_buy": price_buy,
+                "price_sell": price_sell,
+                "size_buy": ask_size[buy],
+                "size_sell": bid_size[sell],
+                "spread_abs": price_sell - price_buy,
+                "spread_pct": value,
+                "buy_symbol": symbol,
+                "sell_symbol": symbol,
+            })
+        return rows
+
+    # ============= 内部实现 =============
+
+    @staticmethod
+    def _as_float(level, attr: str) -> float:
+        cached = getattr(level, f'{attr}_float', None)
+        if cached is not None:
+            return cached
+        return float(getattr(level, attr))
+
+    def _allocate(self, symbol_cap: int, exchange_cap: int) -> None:
+        """按容量分配（或扩容并保留已有数据）"""
+        old = None
+        if hasattr(self, '_bid'):
+            old = (self._bid, self._ask, self._bid_size, self._ask_size, self._valid, self._pct)
+
+        self._bid = np.zeros((symbol_cap, exchange_cap), dtype=np.float64)
+        self._ask = np.zeros((symbol_cap, exchange_cap), dtype=np.float64)
+        self._bid_size = np.zeros((symbol_cap, exchange_cap), dtype=np.float64)
+        self._ask_size = np.zeros((symbol_cap, exchange_cap), dtype=np.float64)
+        self._valid = np.zeros((symbol_cap, exchange_cap), dtype=bool)
+        self._pct = np.full((symbol_cap, exchange_cap, exchange_cap), _NEG_INF, dtype=np.float64)
+        # 档位对象引用（构造 SpreadData 时复用盘口的 Decimal，且用于判断档位是否变化）
+        old_bid_levels = getattr(self, '_bid_levels', [])
+        old_ask_levels = getattr(self, '_ask_levels', [])
+        self._bid_levels: List[List[Optional[object]]] = []
+        self._ask_levels: List[List[Optional[object]]] = []
+        for idx in range(symbol_cap):
+            bid_row = list(old_bid_levels[idx]) if idx < len(old_bid_levels) else []
+            ask_row = list(old_ask_levels[idx]) if idx < len(old_ask_levels) else []
+            bid_row.extend([None] * (exchange_cap - len(bid_row)))
+            ask_row.extend([None] * (exchange_cap - len(ask_row)))
+            self._bid_levels.append(bid_row)
+            self._ask_levels.append(ask_row)
+
+        if old is not None:
+            s, n = old[0].shape
+            self._bid[:s, :n] = old[0]
+            self._ask[:s, :n] = old[1]
+            self._bid_size[:s, :n] = old[2]
+            self._ask_size[:s, :n] = old[3]
+            self._valid[:s, :n] = old[4]
+            self._pct[:s, :n, :n] = old[5]
+
+        self._symbol_cap = symbol_cap
+        self._exchange_cap = exchange_cap
+        self._direction_order: Dict[int, tuple] = {}
+
+    def _ensure_symbol(self, symbol: str) -> int:
+        idx = self._symbol_index.get(symbol)
+        if idx is not None:
+            return idx
+        idx = len(self._symbols)
+        if idx >= self._symbol_cap:
+            self._allocate(self._symbol_cap * 2, self._exchange_cap)
+        self._symbol_index[symbol] = idx
+        self._symbols.append(symbol)
+        return idx
+
+    def _ensure_exchange(self, exchange: str) -> int:
+        idx = self._exchange_index.get(exchange)
+        if idx is not None:
+            return idx
+        idx = len(self._exchanges)
+        if idx >= self._exchange_cap:
+            self._allocate(self._symbol_cap, max(idx + 1, self._exchange_cap * 2))
+        self._exchange_index[exchange] = idx
+        self._exchanges.append(exchange)
+        return idx
+
+    def _update_cross(self, s: int, k: int) -> None:
+        """重算交易所 k 对应的行（k 买入）和列（k 卖出）"""
+        n = len(self._exchanges)
+        pct = self._pct[s]
+        if not self._valid[s, k]:
+            pct[k, :n] = _NEG_INF
+            pct[:n, k] = _NEG_INF
+            return
+
+        bid = self._bid[s, :n]
+        ask = self._ask[s, :n]
+        valid = self._valid[s, :n]
+        ask_k = ask[k]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            row = (bid - ask_k) / ask_k * 100.0
+            col = (bid[k] - ask) / ask * 100.0
+        pct[k, :n] = np.where(valid, row, _NEG_INF)
+        pct[:n, k] = np.where(valid, col, _NEG_INF)
+        pct[k, k] = _NEG_INF
+
+    def _valid_directions(self, s: int, min_spread_pct: Optional[float] = None):
+        """
+        有效方向的 (买入索引列表, 卖出索引列表, 价差百分比列表)
+
+        按交易所登记顺序，每对交易所 (i < j) 依次输出 i买j卖、j买i卖。
+        """
+        n = len(self._exchanges)
+        order = self._direction_order.get(n)
+        if order is None:
+            upper_i, upper_j = np.triu_indices(n, k=1)
+            buys = np.empty(upper_i.size * 2, dtype=np.intp)
+            sells = np.empty(upper_i.size * 2, dtype=np.intp)
+            buys[0::2], sells[0::2] = upper_i, upper_j
+            buys[1::2], sells[1::2] = upper_j, upper_i
+            order = (buys, sells)
+            self._direction_order[n] = order
+
+        buys, sells = order
+        values = self._pct[s][buys, sells]
+        mask = values > _NEG_INF
+        if min_spread_pct is not None:
+            mask &= values >= float(min_spread_pct)
+        return buys[mask].tolist(), sells[mask].tolist(), values[mask].tolist()
+
+    def _build_spread(self, s: int, buy: int, sell: int, spread_pct: float) -> SpreadData:
+        symbol = self._symbols[s]
+        buy_level = self._ask_levels[s][buy]
+        sell_level = self._bid_levels[s][sell]
+        return SpreadData(
+            symbol=symbol,
+            exchange_buy=self._exchanges[buy],
+            exchange_sell=self._exchanges[sell],
+            price_buy=buy_level.price,
+            price_sell=sell_level.price,
+            size_buy=buy_level.size,
+            size_sell=sell_level.size,
+            spread_abs=sell_level.price - buy_level.price,
+            spread_pct=spread_pct,
+            buy_symbol=symbol,
+            sell_symbol=symbol,
+        )
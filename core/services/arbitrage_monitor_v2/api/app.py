@@ -6,10 +6,10 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from pydantic import BaseModel, Field
 import time
 import asyncio
-import json
 import heapq
 
 from .runtime import MonitorApiRuntime, DEFAULT_WATCHLIST_TTL_SECONDS
+from .stream_broadcaster import DashboardFilter, DashboardStreamBroadcaster, normalize_filter
 from .web_ui import render_monitor_ui_html
 
 
@@ -81,11 +81,14 @@ def create_app(config_path: Path, enable_ui: bool = False) -> FastAPI:
                 await task
             except Exception:
                 pass
+        await stream_broadcaster.close()
         await runtime.stop()
 
     @app.get("/health")
     async def health() -> Dict[str, Any]:
-        return await runtime.health()
+        payload = await runtime.health()
+        payload["stream"] = stream_broadcaster.get_stats()
+        return payload
 
     @app.get("/")
     async def root() -> RedirectResponse:
@@ -95,6 +98,40 @@ def create_app(config_path: Path, enable_ui: bool = False) -> FastAPI:
     async def ui() -> HTMLResponse:
         return HTMLResponse(render_monitor_ui_html())
 
+    def _build_dashboard_header() -> Dict[str, Any]:
+        """快照头部字段（时间、启动状态、分析延迟、队列信息），不涉及行数据"""
+        now = time.time()
+        watch_pairs = runtime.watchlist.active_pairs()
+        header: Dict[str, Any] = {
+            "generated_at": now,
+            "started": runtime.started,
+            "starting": runtime.starting,
+            "start_error": runtime.start_error,
+            "watchlist_pairs": len(watch_pairs),
+            "watchlist_exchanges": sorted({e for e, _ in watch_pairs}),
+            "watchlist_symbols": sorted({s for _, s in watch_pairs}),
+        }
+        if not runtime.started:
+            header.update(analysis_age_ms=None, last_analysis_at=None, queue_info="starting")
+            return header
+
+        last_at = runtime.orchestrator.last_analysis_at
+        stats = runtime.orchestrator.get_stats()
+        proc_stats = stats.get("data_processor") or {}
+        header.update(
+            analysis_age_ms=None if not last_at else max((now - float(last_at)) * 1000, 0.0),
+            last_analysis_at=last_at,
+            queue_info=(
+                f"ob_q={proc_stats.get('orderbook_queue_size', '-')}"
+                f"(peak={proc_stats.get('orderbook_queue_peak', '-')}) "
+                f"tk_q={proc_stats.get('ticker_queue_size', '-')}"
+                f"(peak={proc_stats.get('ticker_queue_peak', '-')}) "
+                f"ob_p95={_safe_float(proc_stats.get('orderbook_delay_p95_ms'), 0.0):.1f}ms "
+                f"tk_p95={_safe_float(proc_stats.get('ticker_delay_p95_ms'), 0.0):.1f}ms"
+            ),
+        )
+        return header
+
     async def _build_dashboard_snapshot(
         *,
         interval_ms: int,
@@ -109,34 +146,26 @@ def create_app(config_path: Path, enable_ui: bool = False) -> FastAPI:
         symbol_like_norm = (symbol_like or "").strip().upper()
         min_abs = None if min_abs_spread_pct is None else float(min_abs_spread_pct)
 
-        now = time.time()
-        watch_pairs = runtime.watchlist.active_pairs()
-        watchlist_exchanges = sorted({e for e, _ in watch_pairs})
-        watchlist_symbols = sorted({s for _, s in watch_pairs})
+        header = _build_dashboard_header()
         if not runtime.started:
             return {
                 "type": "snapshot",
-                "generated_at": now,
-                "started": runtime.started,
-                "starting": runtime.starting,
-                "start_error": runtime.start_error,
-                "watchlist_pairs": len(watch_pairs),
-                "watchlist_exchanges": watchlist_exchanges,
-                "watchlist_symbols": watchlist_symbols,
-                "analysis_age_ms": None,
-                "last_analysis_at": None,
+                **header,
                 "symbols_with_spreads": 0,
                 "opportunities_count": 0,
                 "top_spreads": top_spreads,
                 "top_opps": top_opps,
                 "opportunities": [],
                 "top_spread_rows": [],
-                "queue_info": "starting",
             }
 
         analysis = await runtime.orchestrator.get_latest_analysis()
+        # 头部的分析时间与本次读取的分析产物保持一致
         last_at = analysis.get("last_analysis_at")
-        analysis_age_ms = None if not last_at else max((now - float(last_at)) * 1000, 0.0)
+        header["last_analysis_at"] = last_at
+        header["analysis_age_ms"] = (
+            None if not last_at else max((header["generated_at"] - float(last_at)) * 1000, 0.0)
+        )
 
         opps: List[Dict[str, Any]] = list(analysis.get("opportunities") or [])
         if symbol_like_norm:
@@ -167,37 +196,40 @@ def create_app(config_path: Path, enable_ui: bool = False) -> FastAPI:
                 key=lambda r: abs(_safe_float(r.get("spread_pct"), 0.0)),
             )
 
-        stats = runtime.orchestrator.get_stats()
-        proc_stats = stats.get("data_processor") or {}
-        queue_info = (
-            f"ob_q={proc_stats.get('orderbook_queue_size', '-')}"
-            f"(peak={proc_stats.get('orderbook_queue_peak', '-')}) "
-            f"tk_q={proc_stats.get('ticker_queue_size', '-')}"
-            f"(peak={proc_stats.get('ticker_queue_peak', '-')}) "
-            f"ob_p95={_safe_float(proc_stats.get('orderbook_delay_p95_ms'), 0.0):.1f}ms "
-            f"tk_p95={_safe_float(proc_stats.get('ticker_delay_p95_ms'), 0.0):.1f}ms"
-        )
-
         return {
             "type": "snapshot",
-            "generated_at": now,
-            "started": runtime.started,
-            "starting": runtime.starting,
-            "start_error": runtime.start_error,
-            "watchlist_pairs": len(watch_pairs),
-            "watchlist_exchanges": watchlist_exchanges,
-            "watchlist_symbols": watchlist_symbols,
-            "analysis_age_ms": analysis_age_ms,
-            "last_analysis_at": last_at,
+            **header,
             "symbols_with_spreads": len(symbol_spreads),
             "opportunities_count": len(analysis.get("opportunities") or []),
             "top_spreads": top_spreads,
             "top_opps": top_opps,
             "opportunities": opps,
             "top_spread_rows": top_rows,
-            "queue_info": queue_info,
         }
 
+    async def _build_stream_snapshot(f: DashboardFilter) -> Dict[str, Any]:
+        return await _build_dashboard_snapshot(
+            interval_ms=f.interval_ms,
+            top_spreads=f.top_spreads,
+            top_opps=f.top_opps,
+            symbol_like=f.symbol_like,
+            min_abs_spread_pct=f.min_abs_spread_pct,
+        )
+
+    def _stream_generation() -> Any:
+        # 未启动时以启动状态作为代数；启动后以分析产物代数为准
+        if not runtime.started:
+            return ("starting", runtime.starting, runtime.start_error)
+        return ("ready", runtime.orchestrator.analysis_generation)
+
+    # /ws/stream：相同过滤参数的连接共享同一个快照构建任务，按增量帧推送
+    stream_broadcaster = DashboardStreamBroadcaster(
+        build_snapshot=_build_stream_snapshot,
+        generation_fn=_stream_generation,
+        build_header=_build_dashboard_header,
+    )
+    app.state.stream_broadcaster = stream_broadcaster
+
     @app.get("/ui/data")
     async def ui_data(
         interval_ms: int = Query(default=1000),
@@ -312,19 +344,17 @@ def create_app(config_path: Path, enable_ui: bool = False) -> FastAPI:
         top_opps: int = 50,
         symbol_like: Optional[str] = None,
         min_abs_spread_pct: Optional[float] = None,
+        delta: bool = False,
     ) -> None:
+        # delta=true 需客户端显式开启；默认保持原协议：每个间隔推送全量快照
         await websocket.accept()
+        subscriber = stream_broadcaster.subscribe(
+            normalize_filter(interval_ms, top_spreads, top_opps, symbol_like, min_abs_spread_pct),
+            delta=delta,
+        )
         try:
             while True:
-                payload = await _build_dashboard_snapshot(
-                    interval_ms=interval_ms,
-                    top_spreads=top_spreads,
-                    top_opps=top_opps,
-                    symbol_like=symbol_like,
-                    min_abs_spread_pct=min_abs_spread_pct,
-                )
-                await websocket.send_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
-                await asyncio.sleep(interval_ms / 1000)
+                await websocket.send_text(await subscriber.next_frame())
         except WebSocketDisconnect:
             return
         except Exception:
@@ -332,5 +362,7 @@ def create_app(config_path: Path, enable_ui: bool = False) -> FastAPI:
                 await websocket.close()
             except Exception:
                 pass
+        finally:
+            stream_broadcaster.unsubscribe(subscriber)
 
     return app
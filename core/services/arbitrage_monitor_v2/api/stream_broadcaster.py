@@ -0,0 +1,286 @@
+"""
+/ws/stream 推送广播器
+
+- 过滤参数相同的订阅者归为一组，每组只有一个构建任务：
+  每个分析代数只构建一次快照、只序列化一次，与连接数无关
+- 增量帧：按 symbol|exchange_buy|exchange_sell 与上一帧对比，只推送变化的行；
+  每 full_frame_every 帧、新订阅者以及积压的订阅者推送全量帧
+- 每个订阅者只缓存最新一帧：慢客户端不会阻塞广播，积压时自动改发全量帧
+
+帧格式：
+- 全量帧：{"type": "snapshot", "seq": n, ...与 /ui/data 相同的字段}
+- 增量帧：{"type": "delta", "seq": n, "base_seq": n-1, ...头部字段,
+           "top_spread_rows": {"upsert": [...], "remove": [key...], "order": [key...]},
+           "opportunities": {...同上}}
+- 心跳帧：{"type": "heartbeat", "seq": n, "generated_at": ts}（分析代数未变化时）
+
+增量帧与心跳帧只发给显式开启 delta 的订阅者；默认订阅者每个间隔都收到全量帧（原协议）。
+分析代数未变化时，全量帧复用缓存的行数据，但头部字段（generated_at、analysis_age_ms、
+queue_info、启动状态等）每个间隔重新生成，分析停滞时旧看板能看到 analysis_age_ms 持续增长。
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# 按行做增量编码的字段
+ROW_SECTIONS = ("top_spread_rows", "opportunities")
+
+
+class DashboardFilter(NamedTuple):
+    """订阅过滤参数（已归一化，可作为分组键）"""
+    interval_ms: int
+    top_spreads: int
+    top_opps: int
+    symbol_like: str
+    min_abs_spread_pct: Optional[float]
+
+
+def normalize_filter(
+    interval_ms: int,
+    top_spreads: int,
+    top_opps: int,
+    symbol_like: Optional[str],
+    min_abs_spread_pct: Optional[float],
+) -> DashboardFilter:
+    """与 _build_dashboard_snapshot 相同的参数归一化规则"""
+    return DashboardFilter(
+        interval_ms=max(int(interval_ms or 1000), 200),
+        top_spreads=max(min(int(top_spreads or 200), 2000), 0),
+        top_opps=max(min(int(top_opps or 50), 500), 0),
+        symbol_like=(symbol_like or "").strip().upper(),
+        min_abs_spread_pct=None if min_abs_spread_pct is None else float(min_abs_spread_pct),
+    )
+
+
+def _row_key(row: Dict[str, Any]) -> str:
+    return f"{row.get('symbol', '')}|{row.get('exchange_buy', '')}|{row.get('exchange_sell', '')}"
+
+
+def _dumps(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+class StreamSubscriber:
+    """单个 WebSocket 订阅者的发送缓冲（只保留最新一帧）"""
+
+    def __init__(self, stream_filter: DashboardFilter, delta: bool = False):
+        self.filter = stream_filter
+        self.delta = delta
+        self.needs_full = True
+        self.frames_sent = 0
+        self.frames_conflated = 0
+        self._pending: Optional[str] = None
+        self._pending_is_heartbeat = False
+        self._event = asyncio.Event()
+
+    def offer(self, delta_text: Optional[str], full_text: Callable[[], str]) -> None:
+        """投递一帧：需要全量/不接受增量/上一帧仍未发出时改投全量帧"""
+        lagging = self._pending is not None and not self._pending_is_heartbeat
+        if lagging:
+            self.frames_conflated += 1
+        if self.needs_full or not self.delta or delta_text is None or lagging:
+            text = full_text()
+            self.needs_full = False
+        else:
+            text = delta_text
+        self._pending = text
+        self._pending_is_heartbeat = False
+        self._event.set()
+
+    def offer_heartbeat(self, text: str) -> None:
+        """心跳不覆盖尚未发出的数据帧"""
+        if self._pending is not None:
+            return
+        self._pending = text
+        self._pending_is_heartbeat = True
+        self._event.set()
+
+    async def next_frame(self) -> str:
+        """等待下一帧"""
+        while self._pending is None:
+            self._event.clear()
+            await self._event.wait()
+        text = self._pending
+        self._pending = None
+        self._pending_is_heartbeat = False
+        self.frames_sent += 1
+        return text
+
+
+class _StreamGroup:
+    """同一过滤参数的订阅者组"""
+
+    def __init__(self, stream_filter: DashboardFilter):
+        self.filter = stream_filter
+        self.subscribers: Set[StreamSubscriber] = set()
+        self.task: Optional[asyncio.Task] = None
+        self.seq = 0
+        self.generation: Any = None
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.rows: Dict[str, Dict[str, Dict[str, Any]]] = {section: {} for section in ROW_SECTIONS}
+        self.last_full_seq = 0
+        self._full_text: Optional[str] = None
+        self._full_text_seq = -1
+        self.builds = 0
+
+    def refresh_header(self, header: Dict[str, Any]) -> None:
+        """更新快照头部字段（行数据不变，seq 不变，只让全量帧重新序列化）"""
+        self.snapshot = dict(self.snapshot or {}, **header)
+        self._full_text_seq = -1
+
+    def full_text(self) -> str:
+        """当前快照的全量帧（每个 seq 只序列化一次）"""
+        if self._full_text_seq != self.seq:
+            self._full_text = _dumps(dict(self.snapshot or {}, seq=self.seq))
+            self._full_text_seq = self.seq
+        return self._full_text or ""
+
+
+class DashboardStreamBroadcaster:
+    """dashboard 快照的共享构建 + 增量推送"""
+
+    def __init__(
+        self,
+        build_snapshot: Callable[[DashboardFilter], Awaitable[Dict[str, Any]]],
+        generation_fn: Callable[[], Any],
+        full_frame_every: int = 30,
+        build_header: Optional[Callable[[], Dict[str, Any]]] = None,
+    ):
+        """
+        Args:
+            build_snapshot: 按过滤参数构建快照（与 /ui/data 返回相同）
+            generation_fn: 返回当前分析代数（变化时才重建快照）
+            full_frame_every: 每隔多少帧强制推送一次全量帧
+            build_header: 生成快照头部字段（时间/健康状态，开销小）；代数未变化时
+                每个间隔刷新一次，供未开启增量的订阅者使用
+        """
+        self._build_snapshot = build_snapshot
+        self._generation_fn = generation_fn
+        self._build_header = build_header
+        self.full_frame_every = max(1, int(full_frame_every))
+        self._groups: Dict[DashboardFilter, _StreamGroup] = {}
+
+    # ============= 订阅管理 =============
+
+    def subscribe(self, stream_filter: DashboardFilter, delta: bool = False) -> StreamSubscriber:
+        subscriber = StreamSubscriber(stream_filter, delta=delta)
+        group = self._groups.get(stream_filter)
+        if group is None:
+            group = _StreamGroup(stream_filter)
+            self._groups[stream_filter] = group
+        group.subscribers.add(subscriber)
+
+        if group.snapshot is not None:
+            # 组内已有快照：新订阅者立即收到当前全量帧
+            subscriber.offer(None, group.full_text)
+        if group.task is None or group.task.done():
+            group.task = asyncio.create_task(self._run_group(group))
+        return subscriber
+
+    def unsubscribe(self, subscriber: StreamSubscriber) -> None:
+        group = self._groups.get(subscriber.filter)
+        if group is None:
+            return
+        group.subscribers.discard(subscriber)
+        if not group.subscribers:
+            self._groups.pop(subscriber.filter, None)
+            if group.task and not group.task.done():
+                group.task.cancel()
+
+    async def close(self) -> None:
+        groups = list(self._groups.values())
+        self._groups.clear()
+        for group in groups:
+            if group.task and not group.task.done():
+                group.task.cancel()
+                try:
+                    await group.task
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "groups": len(self._groups),
+            "subscribers": sum(len(g.subscribers) for g in self._groups.values()),
+            "snapshot_builds": sum(g.builds for g in self._groups.values()),
+            "frames_conflated": sum(
+                s.frames_conflated for g in self._groups.values() for s in g.subscribers
+            ),
+        }
+
+    # ============= 构建与推送 =============
+
+    async def _run_group(self, group: _StreamGroup) -> None:
+        interval = group.filter.interval_ms / 1000
+        while group.subscribers:
+            try:
+                generation = self._generation_fn()
+                if group.snapshot is None or generation != group.generation:
+                    snapshot = await self._build_snapshot(group.filter)
+                    group.builds += 1
+                    group.generation = generation
+                    self._publish(group, snapshot)
+                else:
+                    self._heartbeat(group)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("ws stream snapshot build failed")
+            await asyncio.sleep(interval)
+
+    def _publish(self, group: _StreamGroup, snapshot: Dict[str, Any]) -> None:
+        base_seq = group.seq
+        group.seq += 1
+        group.snapshot = snapshot
+
+        rows_now: Dict[str, Dict[str, Dict[str, Any]]] = {
+            section: {_row_key(r): r for r in snapshot.get(section) or []}
+            for section in ROW_SECTIONS
+        }
+
+        # 周期性全量帧：让增量订阅者定期自校正
+        full_due = group.seq - group.last_full_seq >= self.full_frame_every
+        if full_due:
+            group.last_full_seq = group.seq
+        delta_text: Optional[str] = None
+        if not full_due and any(s.delta and not s.needs_full for s in group.subscribers):
+            frame: Dict[str, Any] = {
+                k: v for k, v in snapshot.items() if k not in ROW_SECTIONS
+            }
+            frame["type"] = "delta"
+            frame["seq"] = group.seq
+            frame["base_seq"] = base_seq
+            for section in ROW_SECTIONS:
+                prev = group.rows[section]
+                now = rows_now[section]
+                frame[section] = {
+                    "upsert": [r for k, r in now.items() if prev.get(k) != r],
+                    "remove": [k for k in prev if k not in now],
+                    "order": list(now.keys()),
+                }
+            delta_text = _dumps(frame)
+
+        group.rows = rows_now
+        for subscriber in list(group.subscribers):
+            subscriber.offer(delta_text, group.full_text)
+
+    def _heartbeat(self, group: _StreamGroup) -> None:
+        text = _dumps({"type": "heartbeat", "seq": group.seq, "generated_at": time.time()})
+        if (
+            group.snapshot is not None
+            and self._build_header is not None
+            and any(s.needs_full or not s.delta for s in group.subscribers)
+        ):
+            # 全量帧复用缓存的行数据，头部字段按当前时间/状态刷新
+            group.refresh_header(self._build_header())
+        for subscriber in list(group.subscribers):
+            if group.snapshot is not None and (subscriber.needs_full or not subscriber.delta):
+                # 未开启增量的订阅者不认识心跳帧：按原协议重发全量快照
+                subscriber.offer(None, group.full_text)
+            else:
+                subscriber.offer_heartbeat(text)
@@ -37,13 +37,30 @@ class MonitorConfig:
     ws_max_reconnect_attempts: int = 5  # 最大重连次数
     
     # 数据队列配置
-    orderbook_queue_size: int = 1000  # 订单簿队列大小
+    orderbook_queue_size: int = 1000  # 订单簿队列大小（订单簿已改用按交易对合并的邮箱，仅保留兼容）
     ticker_queue_size: int = 500  # Ticker队列大小
     analysis_queue_size: int = 100  # 分析结果队列大小
     
     # 性能配置
     analysis_interval_ms: int = 10  # 分析间隔（毫秒）
+    orderbook_bbo_only: bool = False  # 订单簿只接收最优买卖价（TopOfBook），深度按需懒加载
+    numeric_mode: str = "decimal"  # 价差数值模式：decimal=全程Decimal；float=热路径使用float64（下单仍为Decimal）
+    spread_matrix_enabled: bool = False  # 使用 NumPy 价差矩阵（SpreadMatrix）计算跨交易所价差
+    opportunity_top_k: int = 0  # 每个交易对只取价差最大的前 K 个方向识别机会（0 = 不限制）
+    event_driven_analysis: bool = False  # 事件驱动分析：只重算订单簿发生变化的交易对
+    analysis_max_latency_ms: int = 10  # 事件驱动模式下合并突发更新的最大延迟预算（毫秒）
+    analysis_full_scan_interval_ms: int = 1000  # 事件驱动模式下兜底全量扫描间隔（毫秒）
     ui_refresh_interval_ms: int = 1000  # UI刷新间隔（毫秒）- 降低频率避免卡顿
+    shared_bbo_enabled: bool = False  # 共享内存 BBO 表：DataProcessor 写入，其它进程无锁读取最新盘口
+    shared_bbo_path: str = "/dev/shm/arbitrage_bbo.tbl"  # BBO 表文件路径
+    shared_bbo_capacity: int = 4096  # BBO 表最大 (交易所, 交易对) 数量
+    ingest_workers_enabled: bool = False  # 多进程接入：每个交易所（或交易对分片）一个进程负责连接与解析
+    ingest_worker_count: int = 0  # 工作进程数上限（0 = 每个分片一个进程）
+    ingest_symbol_shards: int = 1  # 每个交易所的交易对切分份数（>1 时同一交易所开多个连接）
+    ingest_orderbook_depth: int = 5  # 工作进程转发的订单簿档位数（bbo_only 时固定为 1）
+    ingest_max_inflight_batches: int = 4  # 每个工作进程未确认批次上限（背压）
+    ingest_heartbeat_interval: float = 1.0  # 工作进程心跳间隔（秒）
+    ingest_worker_timeout: float = 10.0  # 心跳超时（秒），超时标记为 stalled
     
     # 健康检查配置
     health_check_interval: int = 10  # 健康检查间隔（秒）
@@ -142,6 +159,23 @@ class ConfigManager:
                 perf = data['performance']
                 self.config.analysis_interval_ms = perf.get('analysis_interval_ms', 10)
                 self.config.ui_refresh_interval_ms = perf.get('ui_refresh_interval_ms', 200)
+                self.config.orderbook_bbo_only = bool(perf.get('orderbook_bbo_only', False))
+                self.config.numeric_mode = str(perf.get('numeric_mode', 'decimal'))
+                self.config.spread_matrix_enabled = bool(perf.get('spread_matrix_enabled', False))
+                self.config.opportunity_top_k = max(0, int(perf.get('opportunity_top_k', 0) or 0))
+                self.config.event_driven_analysis = bool(perf.get('event_driven_analysis', False))
+                self.config.analysis_max_latency_ms = perf.get('analysis_max_latency_ms', 10)
+                self.config.analysis_full_scan_interval_ms = perf.get('analysis_full_scan_interval_ms', 1000)
+                self.config.shared_bbo_enabled = bool(perf.get('shared_bbo_enabled', False))
+                self.config.shared_bbo_path = str(perf.get('shared_bbo_path', self.config.shared_bbo_path))
+                self.config.shared_bbo_capacity = int(perf.get('shared_bbo_capacity', self.config.shared_bbo_capacity))
+                self.config.ingest_workers_enabled = bool(perf.get('ingest_workers_enabled', False))
+                self.config.ingest_worker_count = int(perf.get('ingest_worker_count', self.config.ingest_worker_count))
+                self.config.ingest_symbol_shards = int(perf.get('ingest_symbol_shards', self.config.ingest_symbol_shards))
+                self.config.ingest_orderbook_depth = int(perf.get('ingest_orderbook_depth', self.config.ingest_orderbook_depth))
+                self.config.ingest_max_inflight_batches = int(perf.get('ingest_max_inflight_batches', self.config.ingest_max_inflight_batches))
+                self.config.ingest_heartbeat_interval = float(perf.get('ingest_heartbeat_interval', self.config.ingest_heartbeat_interval))
+                self.config.ingest_worker_timeout = float(perf.get('ingest_worker_timeout', self.config.ingest_worker_timeout))
             
             if 'health_check' in data:
                 health = data['health_check']
@@ -327,6 +361,23 @@ class ConfigManager:
             'performance': {
                 'analysis_interval_ms': self.config.analysis_interval_ms,
                 'ui_refresh_interval_ms': self.config.ui_refresh_interval_ms,
+                'orderbook_bbo_only': self.config.orderbook_bbo_only,
+                'numeric_mode': self.config.numeric_mode,
+                'spread_matrix_enabled': self.config.spread_matrix_enabled,
+                'opportunity_top_k': self.config.opportunity_top_k,
+                'event_driven_analysis': self.config.event_driven_analysis,
+                'analysis_max_latency_ms': self.config.analysis_max_latency_ms,
+                'analysis_full_scan_interval_ms': self.config.analysis_full_scan_interval_ms,
+                'shared_bbo_enabled': self.config.shared_bbo_enabled,
+                'shared_bbo_path': self.config.shared_bbo_path,
+                'shared_bbo_capacity': self.config.shared_bbo_capacity,
+                'ingest_workers_enabled': self.config.ingest_workers_enabled,
+                'ingest_worker_count': self.config.ingest_worker_count,
+                'ingest_symbol_shards': self.config.ingest_symbol_shards,
+                'ingest_orderbook_depth': self.config.ingest_orderbook_depth,
+                'ingest_max_inflight_batches': self.config.ingest_max_inflight_batches,
+                'ingest_heartbeat_interval': self.config.ingest_heartbeat_interval,
+                'ingest_worker_timeout': self.config.ingest_worker_timeout,
             },
             'health_check': {
                 'interval': self.config.health_check_interval,
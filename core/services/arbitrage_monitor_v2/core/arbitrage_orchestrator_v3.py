@@ -66,6 +66,7 @@ from ..execution.arbitrage_executor import ArbitrageExecutor, ExecutionRequest
 # 数据接收和处理（复用现有模块）
 from ..data.data_receiver import DataReceiver
 from ..data.data_processor import DataProcessor
+from ..data.conflating_mailbox import ConflatingMailbox
 
 # UI显示（可选）
 from ..display.ui_manager import UIManager
@@ -192,8 +193,12 @@ class ArbitrageOrchestratorV3:
                 funding_rate_extreme_multiplier=thresholds.funding_rate_extreme_multiplier,
                 spread_stability_threshold=thresholds.spread_stability_threshold,
                 spread_extreme_ratio=thresholds.spread_extreme_ratio,
-                spread_extreme_multiplier=thresholds.spread_extreme_multiplier
+                spread_extreme_multiplier=thresholds.spread_extreme_multiplier,
+                # 🔥 增量模式：记录器写入样本时推送，滑动窗口统计量持续更新
+                incremental_mode=self.history_recorder is not None
             )
+            if self.history_recorder is not None:
+                self.history_calculator.attach_recorder(self.history_recorder)
             logger.info("✅ [总调度器] 历史数据计算器已初始化（已从配置加载稳定性判断参数）")
         except Exception as e:
             logger.warning(f"⚠️  [总调度器] 历史数据计算器初始化失败: {e}，将使用None")
@@ -201,7 +206,7 @@ class ArbitrageOrchestratorV3:
             self.history_calculator = None
         
         # 初始化数据分析模块
-        self.spread_calculator = SpreadCalculator(self.debug)
+        self.spread_calculator = SpreadCalculator(self.debug, numeric_mode=self.monitor_config.numeric_mode)
         self.exchange_locker = ExchangeLocker()
         
         # 持仓限制提醒频率控制
@@ -266,7 +271,7 @@ class ArbitrageOrchestratorV3:
         )
         
         # 数据接收和处理（复用现有模块）
-        self.orderbook_queue = asyncio.Queue(maxsize=self.monitor_config.orderbook_queue_size)
+        self.orderbook_queue = ConflatingMailbox()  # 按交易对合并，深度上限 = 交易对数量
         self.ticker_queue = asyncio.Queue(maxsize=self.monitor_config.ticker_queue_size)
         
         # 🔥 混合模式：创建实时滚动区管理器（用于UI）
@@ -282,7 +287,9 @@ class ArbitrageOrchestratorV3:
             self.orderbook_queue,
             self.ticker_queue,
             self.debug,
-            scroller=self.scroller  # 🔥 传递滚动区管理器
+            scroller=self.scroller,  # 🔥 传递滚动区管理器
+            shared_bbo_path=self.monitor_config.shared_bbo_path if self.monitor_config.shared_bbo_enabled else None,
+            shared_bbo_capacity=self.monitor_config.shared_bbo_capacity
         )
         
         # UI管理器（可选，用于显示系统状态）
@@ -487,7 +494,10 @@ class ArbitrageOrchestratorV3:
         logger.info("📡 [总调度器] 正在订阅市场数据...")
         
         try:
-            await self.data_receiver.subscribe_all(self.monitor_config.symbols)
+            await self.data_receiver.subscribe_all(
+                self.monitor_config.symbols,
+                bbo_only=self.monitor_config.orderbook_bbo_only,
+            )
             logger.info(f"✅ [总调度器] 已订阅 {len(self.monitor_config.symbols)} 个交易对")
         except Exception as e:
             logger.error(f"❌ [总调度器] 订阅市场数据失败: {e}", exc_info=True)
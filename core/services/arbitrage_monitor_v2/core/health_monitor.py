@@ -5,10 +5,11 @@
 - 监控WebSocket连接状态
 - 监控数据更新时间
 - 检测异常和超时
+- 记录多进程接入工作进程的存活状态
 """
 
 import asyncio
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict
 
@@ -31,6 +32,9 @@ class HealthMonitor:
         # 连接状态 {exchange: status}
         self.connection_status: Dict[str, str] = {}
         
+        # 接入工作进程状态 {worker_id: {status, pid, heartbeat_age, ...}}
+        self.worker_status: Dict[str, Dict[str, Any]] = {}
+        
         # 运行状态
         self.running = False
         self.monitor_task: Optional[asyncio.Task] = None
@@ -125,6 +129,24 @@ class HealthMonitor:
         """
         self.last_data_time[exchange][symbol] = datetime.now()
 
+    def update_worker_status(self, worker_id: str, info: Dict[str, Any]):
+        """
+        更新接入工作进程状态（由 IngestWorkerPool 上报）
+        
+        Args:
+            worker_id: 工作进程ID
+            info: 状态信息（status: starting/alive/stalled/dead/stopped）
+        """
+        self.worker_status[worker_id] = dict(info)
+    
+    def get_worker_status(self) -> Dict[str, Dict[str, Any]]:
+        """获取所有接入工作进程的状态"""
+        return {worker_id: dict(info) for worker_id, info in self.worker_status.items()}
+    
+    def workers_healthy(self) -> bool:
+        """所有接入工作进程是否都在正常发送心跳（未启用多进程接入时为 True）"""
+        return all(info.get('status') in ("starting", "alive") for info in self.worker_status.values())
+
     def prune_inactive(self, active_pairs: List[tuple]) -> None:
         active_by_exchange: Dict[str, set] = defaultdict(set)
         for exchange, symbol in active_pairs:
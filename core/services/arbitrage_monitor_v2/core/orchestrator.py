@@ -10,17 +10,21 @@
 import asyncio
 import logging
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from pathlib import Path
 
 from core.adapters.exchanges.factory import ExchangeFactory
+from core.adapters.exchanges.utils.http_client import close_shared_sessions, get_http_client_stats
 from core.utils.config_loader import ExchangeConfigLoader
 
 from ..config.monitor_config import ConfigManager, MonitorConfig
 from ..config.debug_config import DebugConfig
 from ..data.data_receiver import DataReceiver
 from ..data.data_processor import DataProcessor
+from ..data.conflating_mailbox import ConflatingMailbox
+from ..data.ingest_workers import IngestWorkerPool
 from ..analysis.spread_calculator import SpreadCalculator
+from ..analysis.spread_matrix import SpreadMatrix
 from ..analysis.opportunity_finder import OpportunityFinder
 from ..display.ui_manager import UIManager
 from .health_monitor import HealthMonitor
@@ -66,9 +70,17 @@ class ArbitrageOrchestrator:
         self._latest_opportunities: List[dict] = []
         self._latest_symbol_spreads: Dict[str, list] = {}
         self._last_analysis_at: Optional[float] = None
+        # 🔥 分析代数：每发布一次分析产物 +1（API 推送据此判断是否需要重建快照）
+        self._analysis_generation: int = 0
+
+        # 🔥 事件驱动分析：缓存每个交易对最近一次的分析结果，未变化的交易对直接复用
+        # {symbol: (spreads_payload, opportunities, opportunities_payload, spreads)}
+        # spreads 用于未变化的交易对继续按轮写入历史记录（只跳过重算，不跳过记录）
+        self._analysis_cache: Dict[str, Tuple[List[Dict[str, object]], List, List[Dict[str, object]], List]] = {}
+        self._last_full_scan_time: float = 0.0
         
         # 创建队列
-        self.orderbook_queue = asyncio.Queue(maxsize=self.config.orderbook_queue_size)
+        self.orderbook_queue = ConflatingMailbox()  # 按交易对合并，深度上限 = 交易对数量
         self.ticker_queue = asyncio.Queue(maxsize=self.config.ticker_queue_size)
         self.analysis_queue = asyncio.Queue(maxsize=self.config.analysis_queue_size)
         
@@ -87,10 +99,16 @@ class ArbitrageOrchestrator:
             self.orderbook_queue,
             self.ticker_queue,
             self.debug,
-            scroller=self.scroller  # 🔥 传递滚动区管理器
+            scroller=self.scroller,  # 🔥 传递滚动区管理器
+            shared_bbo_path=self.config.shared_bbo_path if self.config.shared_bbo_enabled else None,
+            shared_bbo_capacity=self.config.shared_bbo_capacity
         )
         
-        self.spread_calculator = SpreadCalculator(self.debug)
+        self.spread_calculator = SpreadCalculator(self.debug, numeric_mode=self.config.numeric_mode)
+        # 🔥 向量化价差矩阵（可选）：盘口变化时只重算该交易所的行/列
+        self.spread_matrix: Optional[SpreadMatrix] = (
+            SpreadMatrix(exchanges=self.config.exchanges) if self.config.spread_matrix_enabled else None
+        )
         
         self.opportunity_finder = OpportunityFinder(
             self.config,
@@ -109,6 +127,22 @@ class ArbitrageOrchestrator:
             data_timeout_seconds=self.config.data_timeout_seconds
         )
         
+        # 🔥 多进程接入（可选）：连接与解析放到工作进程，主进程只接收紧凑盘口
+        self.ingest_pool: Optional[IngestWorkerPool] = None
+        if self.config.ingest_workers_enabled:
+            self.ingest_pool = IngestWorkerPool(
+                self.orderbook_queue,
+                self.ticker_queue,
+                health_monitor=self.health_monitor,
+                worker_count=self.config.ingest_worker_count,
+                symbol_shards=self.config.ingest_symbol_shards,
+                depth=self.config.ingest_orderbook_depth,
+                max_inflight_batches=self.config.ingest_max_inflight_batches,
+                heartbeat_interval=self.config.ingest_heartbeat_interval,
+                worker_timeout=self.config.ingest_worker_timeout,
+                ticker_queue_size=self.config.ticker_queue_size,
+            )
+        
         # 🔥 历史记录器（可选，根据配置启用）
         self.history_recorder: Optional[SpreadHistoryRecorder] = None
         if self.config.spread_history_enabled:
@@ -166,8 +200,19 @@ class ArbitrageOrchestrator:
                 'opportunities': list(self._latest_opportunities),
                 'symbol_spreads': dict(self._latest_symbol_spreads),
                 'last_analysis_at': self._last_analysis_at,
+                'generation': self._analysis_generation,
             }
     
+    @property
+    def analysis_generation(self) -> int:
+        """最近一次分析产物的代数（无锁读取）"""
+        return self._analysis_generation
+
+    @property
+    def last_analysis_at(self) -> Optional[float]:
+        """最近一次分析完成的时间戳（无锁读取）"""
+        return self._last_analysis_at
+    
     async def start(self):
         """启动系统"""
         if self.running:
@@ -180,11 +225,19 @@ class ArbitrageOrchestrator:
         
         self.running = True
         
-        # 1. 初始化交易所适配器
-        await self._init_adapters()
-        
-        # 2. 订阅市场数据
-        await self._subscribe_data()
+        if self.ingest_pool:
+            # 1-2. 多进程接入：各工作进程自行连接交易所并订阅
+            await self.ingest_pool.start(
+                self.config.exchanges,
+                self.config.symbols,
+                bbo_only=self.config.orderbook_bbo_only
+            )
+        else:
+            # 1. 初始化交易所适配器
+            await self._init_adapters()
+            
+            # 2. 订阅市场数据
+            await self._subscribe_data()
         
         # 3. 启动数据处理器
         await self.data_processor.start()
@@ -253,8 +306,17 @@ class ArbitrageOrchestrator:
         await self.health_monitor.stop()
         if self.ui_manager:
             self.ui_manager.stop()
+        if self.ingest_pool:
+            await self.ingest_pool.stop()
         await self.data_receiver.cleanup()
         
+        # 🔥 关闭适配器共用的HTTP会话（连通性检查等）
+        try:
+            logger.info(f"[HTTP] 连接统计: {get_http_client_stats()}")
+            await close_shared_sessions()
+        except Exception as e:
+            logger.warning(f"⚠️  [HTTP] 关闭共享会话失败: {e}")
+        
         print("✅ 套利监控系统已停止")
     
     async def _init_adapters(self):
@@ -388,7 +450,7 @@ class ArbitrageOrchestrator:
         """订阅市场数据"""
         print("📡 正在订阅市场数据...")
         
-        await self.data_receiver.subscribe_all(self.config.symbols)
+        await self.data_receiver.subscribe_all(self.config.symbols, bbo_only=self.config.orderbook_bbo_only)
         
         print(f"✅ 已订阅 {len(self.config.symbols)} 个代币")
     
@@ -399,6 +461,11 @@ class ArbitrageOrchestrator:
         try:
             while self.running:
                 try:
+                    # 🔥 事件驱动模式：等待订单簿变化（None 表示本轮全量扫描）
+                    dirty_symbols: Optional[Set[str]] = None
+                    if self.config.event_driven_analysis:
+                        dirty_symbols = await self._wait_for_dirty_symbols()
+
                     # 获取所有订单簿数据
                     all_orderbooks = self.data_processor.get_all_orderbooks()
                     all_tickers = self.data_processor.get_all_tickers()
@@ -417,6 +484,19 @@ class ArbitrageOrchestrator:
                         # 在规模化订阅/行情高频时，适当让出执行权可显著降低队列积压与处理延迟
                         if idx % 3 == 0:
                             await asyncio.sleep(0)
+
+                        # 订单簿未变化的交易对直接复用上一轮结果（历史记录仍写入最近一次的价差）
+                        if dirty_symbols is not None and symbol not in dirty_symbols:
+                            cached = self._analysis_cache.get(symbol)
+                            if cached:
+                                symbol_spreads[symbol] = cached[0]
+                                all_opportunities.extend(cached[1])
+                                all_opportunities_payload.extend(cached[2])
+                                await self._record_spread_history(
+                                    symbol, cached[3], self._collect_funding_rates(symbol)
+                                )
+                            continue
+
                         # 收集该交易对在各交易所的订单簿
                         orderbooks = {}
                         for exchange in self.config.exchanges:
@@ -426,44 +506,42 @@ class ArbitrageOrchestrator:
                                 # 更新健康监控
                                 self.health_monitor.update_data_time(exchange, symbol)
                         
+                        # 价差矩阵同步（缺失/过期的交易所会被置为无效）
+                        if self.spread_matrix is not None:
+                            self.spread_matrix.sync(symbol, orderbooks)
+
                         # 至少需要2个交易所有数据
                         if len(orderbooks) < 2:
+                            self._analysis_cache.pop(symbol, None)
                             continue
                         
-                        # 计算价差（现在包含所有价差，包括正负差价）
-                        spreads = self.spread_calculator.calculate_spreads(symbol, orderbooks)
-                        
-                        # 🔥 保存所有价差数据（用于UI或对外 API）
-                        # 同一个代币可能有2个方向的价差，都需要显示
-                        symbol_spreads[symbol] = [
-                            {
-                                "symbol": s.symbol,
-                                "exchange_buy": s.exchange_buy,
-                                "exchange_sell": s.exchange_sell,
-                                "price_buy": float(s.price_buy),
-                                "price_sell": float(s.price_sell),
-                                "size_buy": float(s.size_buy),
-                                "size_sell": float(s.size_sell),
-                                "spread_abs": float(s.spread_abs),
-                                "spread_pct": float(s.spread_pct),
-                                "buy_symbol": s.buy_symbol,
-                                "sell_symbol": s.sell_symbol,
-                            }
-                            for s in (spreads or [])
-                        ]
+                        if self.spread_matrix is not None:
+                            # 🔥 矩阵模式：价差与 UI/API payload 直接由 float 数组生成
+                            spreads = self.spread_matrix.spreads(symbol)
+                            symbol_spreads[symbol] = self.spread_matrix.payload(symbol)
+                        else:
+                            # 计算价差（现在包含所有价差，包括正负差价）
+                            spreads = self.spread_calculator.calculate_spreads(symbol, orderbooks)
+                            
+                            # 🔥 保存所有价差数据（用于UI或对外 API）
+                            # 同一个代币可能有2个方向的价差，都需要显示
+                            symbol_spreads[symbol] = self._build_spreads_payload(spreads)
                         
                         # 收集资金费率
-                        funding_rates = {}
-                        for exchange in self.config.exchanges:
-                            ticker = self.data_processor.get_ticker(exchange, symbol)
-                            if ticker and hasattr(ticker, 'funding_rate'):
-                                funding_rates[exchange] = {symbol: ticker.funding_rate}
+                        funding_rates = self._collect_funding_rates(symbol)
                         
-                        # 识别机会
-                        opportunities = self.opportunity_finder.find_opportunities(spreads, funding_rates)
+                        # 识别机会（配置了 top_k 时矩阵模式直接在数组上选出候选方向）
+                        top_k = self.opportunity_finder.top_k
+                        candidates = spreads
+                        if top_k and self.spread_matrix is not None:
+                            candidates = self.spread_matrix.top_k(top_k, symbol=symbol)
+                        opportunities = self.opportunity_finder.find_opportunities(
+                            candidates, funding_rates, top_k=top_k
+                        )
                         all_opportunities.extend(opportunities)
+                        opportunities_payload: List[Dict[str, object]] = []
                         for opp in opportunities:
-                            all_opportunities_payload.append(
+                            opportunities_payload.append(
                                 {
                                     "symbol": opp.symbol,
                                     "exchange_buy": opp.exchange_buy,
@@ -483,48 +561,30 @@ class ArbitrageOrchestrator:
                                     "trigger_condition": opp.trigger_condition,
                                 }
                             )
+                        all_opportunities_payload.extend(opportunities_payload)
+                        if self.config.event_driven_analysis:
+                            self._analysis_cache[symbol] = (
+                                symbol_spreads[symbol], opportunities, opportunities_payload, spreads
+                            )
                         
                         # 🔥 历史记录（非阻塞，只写入内存，性能影响 < 0.01ms）
                         # 🔥 修改：记录所有价差数据（包括正负差价），而不是只记录opportunities
                         # 🔥 同一个代币可能有2个方向的价差（ex1买->ex2卖 和 ex2买->ex1卖），都需要记录
-                        if self.config.spread_history_enabled and self.history_recorder:
-                            for spread in spreads:
-                                # 🔥 从spread数据中提取资金费率（如果可用）
-                                funding_rate_buy = funding_rates.get(spread.exchange_buy, {}).get(symbol)
-                                funding_rate_sell = funding_rates.get(spread.exchange_sell, {}).get(symbol)
-                                funding_rate_diff = None
-                                if funding_rate_buy is not None and funding_rate_sell is not None:
-                                    # 🔥 资金费率差应该永远为正数（绝对值差值）
-                                    funding_rate_diff = abs(funding_rate_sell - funding_rate_buy)
-                                
-                                # 非阻塞写入时间窗口缓存（< 0.001ms）
-                                # 🔥 主要记录：价差百分比（包括正负差价）、资金费率、资金费率差
-                                await self.history_recorder.record_spread({
-                                    'symbol': spread.symbol,
-                                    'exchange_buy': spread.exchange_buy,
-                                    'exchange_sell': spread.exchange_sell,
-                                    'price_buy': float(spread.price_buy),
-                                    'price_sell': float(spread.price_sell),
-                                    'spread_pct': spread.spread_pct,  # 🔥 主要数据：价差百分比（正数表示有利可图，负数表示亏损）
-                                    'funding_rate_buy': funding_rate_buy,  # 🔥 主要数据：买入交易所资金费率
-                                    'funding_rate_sell': funding_rate_sell,  # 🔥 主要数据：卖出交易所资金费率
-                                    'funding_rate_diff': funding_rate_diff,  # 🔥 主要数据：资金费率差（8小时费率差，小数形式，如0.0001表示0.01%）
-                                    'funding_rate_diff_annual': funding_rate_diff * 1095 * 100 if funding_rate_diff else None,  # 🔥 年化资金费率差（8小时费率差 × 1095 × 100，转换为百分比形式，如54.71%）
-                                    'size_buy': float(spread.size_buy),
-                                    'size_sell': float(spread.size_sell),
-                                })
+                        await self._record_spread_history(symbol, spreads, funding_rates)
                     
                     async with self._latest_analysis_lock:
                         self._latest_opportunities = list(all_opportunities_payload)
                         self._latest_symbol_spreads = dict(symbol_spreads)
                         self._last_analysis_at = time.time()
+                        self._analysis_generation += 1
 
                     if self.ui_manager:
                         # 更新UI（传递价差数据，保证数据一致性）
                         self._update_ui(all_opportunities, symbol_spreads=symbol_spreads)
                     
-                    # 短暂休眠
-                    await asyncio.sleep(self.config.analysis_interval_ms / 1000)
+                    # 短暂休眠（事件驱动模式由 _wait_for_dirty_symbols 负责等待）
+                    if not self.config.event_driven_analysis:
+                        await asyncio.sleep(self.config.analysis_interval_ms / 1000)
                     
                 except Exception as e:
                     if self.debug.is_debug_enabled() and self.ui_manager:
@@ -554,6 +614,89 @@ class ArbitrageOrchestrator:
             else:
                 logger.error("分析引擎错误: %s", e, exc_info=True)
     
+    def _collect_funding_rates(self, symbol: str) -> Dict[str, Dict[str, float]]:
+        """收集该交易对在各交易所的资金费率 {exchange: {symbol: rate}}"""
+        funding_rates = {}
+        for exchange in self.config.exchanges:
+            ticker = self.data_processor.get_ticker(exchange, symbol)
+            if ticker and hasattr(ticker, 'funding_rate'):
+                funding_rates[exchange] = {symbol: ticker.funding_rate}
+        return funding_rates
+
+    async def _record_spread_history(self, symbol: str, spreads, funding_rates: Dict[str, Dict[str, float]]) -> None:
+        """写入价差历史（非阻塞，只写入内存）"""
+        if not (self.config.spread_history_enabled and self.history_recorder):
+            return
+        for spread in spreads:
+            # 🔥 从spread数据中提取资金费率（如果可用）
+            funding_rate_buy = funding_rates.get(spread.exchange_buy, {}).get(symbol)
+            funding_rate_sell = funding_rates.get(spread.exchange_sell, {}).get(symbol)
+            funding_rate_diff = None
+            if funding_rate_buy is not None and funding_rate_sell is not None:
+                # 🔥 资金费率差应该永远为正数（绝对值差值）
+                funding_rate_diff = abs(funding_rate_sell - funding_rate_buy)
+
+            # 非阻塞写入时间窗口缓存（< 0.001ms）
+            # 🔥 主要记录：价差百分比（包括正负差价）、资金费率、资金费率差
+            await self.history_recorder.record_spread({
+                'symbol': spread.symbol,
+                'exchange_buy': spread.exchange_buy,
+                'exchange_sell': spread.exchange_sell,
+                'price_buy': float(spread.price_buy),
+                'price_sell': float(spread.price_sell),
+                'spread_pct': spread.spread_pct,  # 🔥 主要数据：价差百分比（正数表示有利可图，负数表示亏损）
+                'funding_rate_buy': funding_rate_buy,  # 🔥 主要数据：买入交易所资金费率
+                'funding_rate_sell': funding_rate_sell,  # 🔥 主要数据：卖出交易所资金费率
+                'funding_rate_diff': funding_rate_diff,  # 🔥 主要数据：资金费率差（8小时费率差，小数形式，如0.0001表示0.01%）
+                'funding_rate_diff_annual': funding_rate_diff * 1095 * 100 if funding_rate_diff else None,  # 🔥 年化资金费率差（8小时费率差 × 1095 × 100，转换为百分比形式，如54.71%）
+                'size_buy': float(spread.size_buy),
+                'size_sell': float(spread.size_sell),
+            })
+
+    @staticmethod
+    def _build_spreads_payload(spreads) -> List[Dict[str, object]]:
+        """SpreadData 列表 → UI/对外 API 使用的 JSON 友好结构"""
+        return [
+            {
+                "symbol": s.symbol,
+                "exchange_buy": s.exchange_buy,
+                "exchange_sell": s.exchange_sell,
+                "price_buy": float(s.price_buy),
+                "price_sell": float(s.price_sell),
+                "size_buy": float(s.size_buy),
+                "size_sell": float(s.size_sell),
+                "spread_abs": float(s.spread_abs),
+                "spread_pct": float(s.spread_pct),
+                "buy_symbol": s.buy_symbol,
+                "sell_symbol": s.sell_symbol,
+            }
+            for s in (spreads or [])
+        ]
+
+    async def _wait_for_dirty_symbols(self) -> Optional[Set[str]]:
+        """
+        事件驱动模式下等待订单簿变化
+
+        有更新时立即唤醒，并在 analysis_max_latency_ms 预算内合并突发更新；
+        到达 analysis_full_scan_interval_ms 时返回 None，触发一次全量扫描。
+        """
+        processor = self.data_processor
+        full_scan_interval = max(0.0, self.config.analysis_full_scan_interval_ms / 1000)
+        remaining = self._last_full_scan_time + full_scan_interval - time.monotonic()
+        if remaining > 0:
+            await processor.wait_for_dirty(timeout=remaining)
+
+        if processor.has_dirty_symbols():
+            coalesce_wait = self.config.analysis_max_latency_ms / 1000 - processor.dirty_age_seconds()
+            await asyncio.sleep(coalesce_wait if coalesce_wait > 0 else 0)
+
+        dirty_symbols = processor.pop_dirty_symbols()
+        now = time.monotonic()
+        if now - self._last_full_scan_time >= full_scan_interval:
+            self._last_full_scan_time = now
+            return None
+        return dirty_symbols
+
     def _update_ui(self, opportunities: List, symbol_spreads: Optional[Dict[str, List[Dict[str, object]]]] = None):
         """
         更新UI数据（带节流，避免卡顿）
@@ -573,7 +716,7 @@ class ArbitrageOrchestrator:
             'exchanges': self.config.exchanges,
             'symbols_count': len(self.config.symbols),
             'active_opportunities': len(opportunities),
-            **self.data_receiver.get_stats(),
+            **(self.ingest_pool.get_stats() if self.ingest_pool else self.data_receiver.get_stats()),
             **self.data_processor.get_stats(),
             **self.opportunity_finder.get_stats(),
         }
@@ -626,6 +769,8 @@ class ArbitrageOrchestrator:
             'data_processor': self.data_processor.get_stats(),
             'opportunity_finder': self.opportunity_finder.get_stats(),
             'health': self.health_monitor.get_all_status(),
+            'ingest_workers': self.health_monitor.get_worker_status(),
+            'http_clients': get_http_client_stats(),
         }
 
 
@@ -248,7 +248,20 @@ class OrchestratorBootstrap:
                 )
 
             subscription_symbols = list(subscription_symbols)
-            await data_receiver.subscribe_all(subscription_symbols)
+            if orc.ingest_pool:
+                # 多进程接入：行情由工作进程订阅，本进程适配器只用于交易
+                await orc.health_monitor.start(orc.monitor_config.health_check_interval)
+                await orc.ingest_pool.start(
+                    orc.monitor_config.exchanges,
+                    subscription_symbols,
+                    bbo_only=getattr(orc.monitor_config, 'orderbook_bbo_only', False),
+                )
+                logger.info(f"✅ [统一调度] 多进程接入已订阅 {len(subscription_symbols)} 个交易对")
+                return
+            await data_receiver.subscribe_all(
+                subscription_symbols,
+                bbo_only=getattr(orc.monitor_config, 'orderbook_bbo_only', False),
+            )
             logger.info(f"✅ [统一调度] 已订阅 {len(subscription_symbols)} 个交易对")
         except Exception as exc:
             logger.error(f"❌ [统一调度] 订阅市场数据失败: {exc}", exc_info=True)
@@ -20,6 +20,7 @@ from ..config.monitor_config import ConfigManager, MonitorConfig
 from ..config.debug_config import DebugConfig
 from ..data.data_receiver import DataReceiver
 from ..data.data_processor import DataProcessor
+from ..data.conflating_mailbox import ConflatingMailbox
 from ..analysis.spread_calculator import SpreadCalculator
 from ..analysis.opportunity_finder import OpportunityFinder
 from ..display.simple_printer import SimplePrinter
@@ -60,7 +61,7 @@ class ArbitrageOrchestratorSimple:
         self.debug = debug_config or DebugConfig()
         
         # 创建队列
-        self.orderbook_queue = asyncio.Queue(maxsize=self.config.orderbook_queue_size)
+        self.orderbook_queue = ConflatingMailbox()  # 按交易对合并，深度上限 = 交易对数量
         self.ticker_queue = asyncio.Queue(maxsize=self.config.ticker_queue_size)
         self.analysis_queue = asyncio.Queue(maxsize=self.config.analysis_queue_size)
         
@@ -79,10 +80,12 @@ class ArbitrageOrchestratorSimple:
             self.orderbook_queue,
             self.ticker_queue,
             self.debug,
-            scroller=self.printer  # 🔥 传递打印器（兼容接口）
+            scroller=self.printer,  # 🔥 传递打印器（兼容接口）
+            shared_bbo_path=self.config.shared_bbo_path if self.config.shared_bbo_enabled else None,
+            shared_bbo_capacity=self.config.shared_bbo_capacity
         )
         
-        self.spread_calculator = SpreadCalculator(self.debug)
+        self.spread_calculator = SpreadCalculator(self.debug, numeric_mode=self.config.numeric_mode)
         
         self.opportunity_finder = OpportunityFinder(
             self.config,
@@ -351,7 +354,7 @@ class ArbitrageOrchestratorSimple:
         """订阅市场数据"""
         print("📡 正在订阅市场数据...")
         
-        await self.data_receiver.subscribe_all(self.config.symbols)
+        await self.data_receiver.subscribe_all(self.config.symbols, bbo_only=self.config.orderbook_bbo_only)
         
         print(f"✅ 已订阅 {len(self.config.symbols)} 个代币")
     
@@ -13,7 +13,7 @@ import asyncio
 import logging
 import time
 from decimal import Decimal
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
 
 from core.adapters.exchanges.utils.setup_logging import LoggingConfig
 from ..analysis.spread_calculator import SpreadData
@@ -146,16 +146,22 @@ class SpreadPipeline:
         except Exception as exc:
             logger.error(f"❌ [统一调度] 处理{symbol}异常: {exc}", exc_info=True)
 
-    async def process_multi_leg_pairs(self) -> None:
-        """处理多腿套利组合。"""
+    async def process_multi_leg_pairs(self, pairs: Optional[Iterable] = None) -> None:
+        """
+        处理多腿套利组合。
+
+        Args:
+            pairs: 只处理指定的组合（事件驱动模式下为脏组合），None 表示全部
+        """
         orc = self.orchestrator
-        if not orc.multi_leg_pairs:
+        pairs = orc.multi_leg_pairs if pairs is None else list(pairs)
+        if not pairs:
             return
 
         try:
             orderbooks: Dict[Tuple[str, str], "OrderBookData"] = {}
 
-            for pair in orc.multi_leg_pairs:
+            for pair in pairs:
                 leg1_symbol = pair.leg_primary.normalized_symbol()
                 leg1_exchange = pair.leg_primary.normalized_exchange()
                 leg1_ob = orc.data_processor.get_orderbook(
@@ -176,7 +182,7 @@ class SpreadPipeline:
                 if leg2_ob:
                     orderbooks[(leg2_exchange, leg2_symbol)] = leg2_ob
 
-            for pair in orc.multi_leg_pairs:
+            for pair in pairs:
                 spreads = orc.spread_calculator.calculate_multi_leg_spread(
                     pair_id=pair.pair_id,
                     leg_primary_exchange=pair.leg_primary.normalized_exchange(),
@@ -230,17 +236,23 @@ class SpreadPipeline:
         except Exception as exc:
             logger.error(f"❌ [统一调度] 处理多腿套利异常: {exc}", exc_info=True)
 
-    async def process_trading_pairs(self) -> None:
-        """处理多交易所套利组合。"""
+    async def process_trading_pairs(self, pairs: Optional[Iterable["TradingPair"]] = None) -> None:
+        """
+        处理多交易所套利组合。
+
+        Args:
+            pairs: 只处理指定的套利对（事件驱动模式下为脏套利对），None 表示全部
+        """
         orc = self.orchestrator
-        if not orc.multi_exchange_pairs:
+        pairs = orc.multi_exchange_pairs if pairs is None else list(pairs)
+        if not pairs:
             return
 
         tasks = [
-            self._process_single_trading_pair(pair) for pair in orc.multi_exchange_pairs
+            self._process_single_trading_pair(pair) for pair in pairs
         ]
         results = await asyncio.gather(*tasks, return_exceptions=True)
-        for pair, result in zip(orc.multi_exchange_pairs, results):
+        for pair, result in zip(pairs, results):
             if isinstance(result, Exception):
                 logger.error(
                     "❌ [统一调度] 处理多交易所套利对 %s 异常: %s",
@@ -249,6 +261,23 @@ class SpreadPipeline:
                     exc_info=result,
                 )
 
+    @staticmethod
+    def select_dirty_trading_pairs(
+        pairs: Iterable["TradingPair"],
+        dirty_symbols: Set[str],
+    ) -> List["TradingPair"]:
+        """筛选订单簿发生变化的多交易所套利对。"""
+        return [pair for pair in pairs if pair.normalized_symbol() in dirty_symbols]
+
+    @staticmethod
+    def select_dirty_multi_leg_pairs(pairs: Iterable, dirty_symbols: Set[str]) -> List:
+        """筛选任一腿订单簿发生变化的多腿组合。"""
+        return [
+            pair for pair in pairs
+            if pair.leg_primary.normalized_symbol() in dirty_symbols
+            or pair.leg_secondary.normalized_symbol() in dirty_symbols
+        ]
+
     async def _process_single_trading_pair(self, pair: "TradingPair") -> None:
         orc = self.orchestrator
         symbol_key = pair.trading_pair_id
@@ -363,19 +392,16 @@ class SpreadPipeline:
     ) -> Dict[str, "OrderBookData"]:
         """复用原 `_get_orderbooks_for_symbol` 逻辑。"""
         orc = self.orchestrator
-        orderbooks: Dict[str, "OrderBookData"] = {}
-        excluded: List[str] = []
-
-        for exchange_name in orc.monitor_config.exchanges:
-            orderbook = orc.data_processor.get_orderbook(
-                exchange_name,
-                symbol,
-                max_age_seconds=orc.data_freshness_seconds,
-            )
-            if orderbook:
-                orderbooks[exchange_name] = orderbook
-            else:
-                excluded.append(exchange_name)
+        exchanges = orc.monitor_config.exchanges
+        # 按注册表 ID 一次取出该交易对在各交易所的有效订单簿
+        orderbooks: Dict[str, "OrderBookData"] = orc.data_processor.get_symbol_orderbooks(
+            symbol,
+            exchanges,
+            max_age_seconds=orc.data_freshness_seconds,
+        )
+        excluded: List[str] = [
+            exchange_name for exchange_name in exchanges if exchange_name not in orderbooks
+        ]
 
         if excluded:
             logger.debug(
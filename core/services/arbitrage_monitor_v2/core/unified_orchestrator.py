@@ -49,6 +49,8 @@ from ..analysis.spread_calculator import SpreadCalculator, SpreadData
 from ..guards.reduce_only_guard import ReduceOnlyGuard
 from ..data.data_receiver import DataReceiver
 from ..data.data_processor import DataProcessor
+from ..data.conflating_mailbox import ConflatingMailbox
+from ..data.ingest_workers import IngestWorkerPool
 from ..display.ui_manager import UIManager, UIMode
 from ..display.realtime_scroller import RealtimeScroller
 from ..utils.orchestrator_utils import ThrottledLogger, LiquidityFailureLogger
@@ -57,6 +59,7 @@ from .orchestrator_ui_controller import OrchestratorUIController
 from .spread_pipeline import SpreadPipeline
 from .reduce_only_probe_service import ReduceOnlyProbeService
 from .orchestrator_bootstrap import OrchestratorBootstrap
+from .health_monitor import HealthMonitor
 from ..models import FundingRateData, PositionSegment, SegmentedPosition
 from ..risk_control.global_risk_controller import GlobalRiskController
 from .debug_state_printer import DebugStatePrinter
@@ -66,6 +69,7 @@ from core.adapters.exchanges.interface import ExchangeInterface
 from core.adapters.exchanges.models import OrderBookData
 
 from core.adapters.exchanges.utils.setup_logging import LoggingConfig
+from core.adapters.exchanges.utils.http_client import close_shared_sessions, get_http_client_stats
 
 # 调度层默认降到 WARNING，减少大行情下的日志格式化与写入开销
 logger = LoggingConfig.setup_logger(
@@ -134,7 +138,7 @@ class UnifiedOrchestrator:
         logger.info("✅ [统一调度] 配置加载完成")
         
         # 创建队列
-        self.orderbook_queue = asyncio.Queue(maxsize=self.monitor_config.orderbook_queue_size)
+        self.orderbook_queue = ConflatingMailbox()  # 按交易对合并，深度上限 = 交易对数量
         self.ticker_queue = asyncio.Queue(maxsize=self.monitor_config.ticker_queue_size)
         
         # 初始化交易所适配器
@@ -144,8 +148,13 @@ class UnifiedOrchestrator:
         self.bootstrapper.init_exchange_adapters()
         self.reduce_only_guard = ReduceOnlyGuard(ZoneInfo("Asia/Shanghai"))
         
-        # 初始化数据分析模块
-        self.spread_calculator = SpreadCalculator(self.debug)
+        # 初始化数据分析模块（system_mode.numeric_mode 优先，其次监控配置）
+        self.spread_calculator = SpreadCalculator(
+            self.debug,
+            numeric_mode=self.config_manager.get_system_mode().get(
+                'numeric_mode', self.monitor_config.numeric_mode
+            ),
+        )
         
         # 🔥 初始化错误避让控制器
         from ..risk_control.error_backoff_controller import ErrorBackoffController
@@ -236,8 +245,30 @@ class UnifiedOrchestrator:
             self.orderbook_queue,
             self.ticker_queue,
             self.debug,
-            scroller=self.scroller
+            scroller=self.scroller,
+            shared_bbo_path=self.monitor_config.shared_bbo_path if self.monitor_config.shared_bbo_enabled else None,
+            shared_bbo_capacity=self.monitor_config.shared_bbo_capacity
         )
+        
+        # 🔥 多进程接入（可选）：行情连接与解析放到工作进程；交易仍使用本进程的适配器
+        self.health_monitor: Optional[HealthMonitor] = None
+        self.ingest_pool: Optional[IngestWorkerPool] = None
+        if self.monitor_config.ingest_workers_enabled:
+            self.health_monitor = HealthMonitor(
+                data_timeout_seconds=self.monitor_config.data_timeout_seconds
+            )
+            self.ingest_pool = IngestWorkerPool(
+                self.orderbook_queue,
+                self.ticker_queue,
+                health_monitor=self.health_monitor,
+                worker_count=self.monitor_config.ingest_worker_count,
+                symbol_shards=self.monitor_config.ingest_symbol_shards,
+                depth=self.monitor_config.ingest_orderbook_depth,
+                max_inflight_batches=self.monitor_config.ingest_max_inflight_batches,
+                heartbeat_interval=self.monitor_config.ingest_heartbeat_interval,
+                worker_timeout=self.monitor_config.ingest_worker_timeout,
+                ticker_queue_size=self.monitor_config.ticker_queue_size,
+            )
         self.executor.set_live_price_resolver(self._resolve_live_price_from_cache)
         
         # 初始化UI
@@ -253,6 +284,17 @@ class UnifiedOrchestrator:
         
         # 数据新鲜度配置
         self.data_freshness_seconds = self.config_manager.get_system_mode().get('data_freshness_seconds', 3.0)
+
+        # 🔥 事件驱动调度：只计算订单簿发生变化的交易对，替代固定间隔轮询
+        system_mode = self.config_manager.get_system_mode()
+        self.event_driven: bool = bool(system_mode.get('event_driven', False))
+        self.event_max_latency_seconds: float = max(
+            0.0, float(system_mode.get('event_max_latency_ms', 10)) / 1000.0
+        )
+        self.event_full_scan_interval: float = max(
+            self.loop_interval, float(system_mode.get('event_full_scan_interval_seconds', 1.0))
+        )
+        self._last_full_scan_time: float = 0.0
         
         # Ticker日志控制
         self._missing_ticker_logged: Set[Tuple[str, str]] = set()
@@ -845,9 +887,22 @@ class UnifiedOrchestrator:
         await self.ui_controller.stop()
         await self.reduce_only_probe_service.stop()
         
+        # 停止多进程接入
+        if self.ingest_pool:
+            await self.ingest_pool.stop()
+        if self.health_monitor:
+            await self.health_monitor.stop()
+        
         # 断开所有交易所
         await self.bootstrapper.disconnect_all_exchanges()
         
+        # 🔥 关闭适配器共用的HTTP会话（连通性检查等）
+        try:
+            logger.info(f"[HTTP] 连接统计: {get_http_client_stats()}")
+            await close_shared_sessions()
+        except Exception as e:
+            logger.warning(f"⚠️  [统一调度] 关闭共享HTTP会话失败: {e}")
+        
         logger.info("✅ [统一调度] 调度器已停止")
     
     async def _main_loop(self):
@@ -862,6 +917,11 @@ class UnifiedOrchestrator:
                     if risk_status.is_paused:
                         await asyncio.sleep(self.loop_interval)
                         continue
+
+                    # 🔥 事件驱动模式：等待脏 symbol（None 表示本轮全量扫描）
+                    dirty_symbols: Optional[Set[str]] = None
+                    if self.event_driven:
+                        dirty_symbols = await self._wait_for_dirty_symbols()
                     
                     # 并行处理所有交易对，提升多symbol时的吞吐
                     symbol_tasks = []
@@ -870,6 +930,8 @@ class UnifiedOrchestrator:
                         symbol_upper = symbol.upper()
                         if symbol_upper in self.multi_exchange_symbols:
                             continue
+                        if dirty_symbols is not None and symbol_upper not in dirty_symbols:
+                            continue
                         if not self.config_manager.is_symbol_enabled(symbol_upper):
                             continue
                         symbol_list.append(symbol_upper)
@@ -888,17 +950,18 @@ class UnifiedOrchestrator:
                     
                     # 🔥 处理多腿套利组合
                     if self.multi_leg_pairs:
-                        await self._process_multi_leg_pairs()
+                        await self._process_multi_leg_pairs(dirty_symbols)
 
                     # 🔥 处理多交易所套利组合
                     if self.multi_exchange_pairs:
-                        await self._process_trading_pairs()
+                        await self._process_trading_pairs(dirty_symbols)
                     
                     # 🔥 周期性输出状态汇总
                     self._log_status_summary()
                     
-                    # 等待下一次循环
-                    await asyncio.sleep(self.loop_interval)
+                    # 等待下一次循环（事件驱动模式由 _wait_for_dirty_symbols 负责等待）
+                    if not self.event_driven:
+                        await asyncio.sleep(self.loop_interval)
                     
                 except asyncio.CancelledError:
                     logger.info("⚠️  [统一调度] 主循环收到取消信号")
@@ -917,6 +980,34 @@ class UnifiedOrchestrator:
         finally:
             logger.info("✅ [统一调度] 主循环已停止")
     
+    async def _wait_for_dirty_symbols(self) -> Optional[Set[str]]:
+        """
+        事件驱动模式下等待订单簿变化
+
+        - 有更新时立即唤醒，在 event_max_latency 预算内合并同一批突发更新
+        - 到达 event_full_scan_interval 时返回 None，触发一次全量扫描
+          （兜底持仓时间、数据过期等与订单簿更新无关的判断）
+
+        Returns:
+            本轮需要处理的脏 symbol 集合；None 表示处理全部
+        """
+        processor = self.data_processor
+        remaining = self._last_full_scan_time + self.event_full_scan_interval - time.monotonic()
+        if remaining > 0:
+            await processor.wait_for_dirty(timeout=remaining)
+
+        # 合并突发：最早的脏标记最多等待 max_latency，期间到达的更新并入同一批
+        if processor.has_dirty_symbols():
+            coalesce_wait = self.event_max_latency_seconds - processor.dirty_age_seconds()
+            await asyncio.sleep(coalesce_wait if coalesce_wait > 0 else 0)
+
+        dirty_symbols = processor.pop_dirty_symbols()
+        now = time.monotonic()
+        if now - self._last_full_scan_time >= self.event_full_scan_interval:
+            self._last_full_scan_time = now
+            return None
+        return dirty_symbols
+
     def _should_enforce_orderbook_liquidity(self, symbol: str) -> bool:
         """
         判断是否需要对该symbol启用对手盘深度校验
@@ -1291,8 +1382,13 @@ class UnifiedOrchestrator:
         )
 
     
-    async def _process_multi_leg_pairs(self):
-        await self.spread_pipeline.process_multi_leg_pairs()
+    async def _process_multi_leg_pairs(self, dirty_symbols: Optional[Set[str]] = None):
+        pairs = None
+        if dirty_symbols is not None:
+            pairs = self.spread_pipeline.select_dirty_multi_leg_pairs(self.multi_leg_pairs, dirty_symbols)
+            if not pairs:
+                return
+        await self.spread_pipeline.process_multi_leg_pairs(pairs)
 
     def _select_reverse_spread(
         self,
@@ -1341,8 +1437,13 @@ class UnifiedOrchestrator:
             sell_symbol=spread.buy_symbol
         )
 
-    async def _process_trading_pairs(self):
-        await self.spread_pipeline.process_trading_pairs()
+    async def _process_trading_pairs(self, dirty_symbols: Optional[Set[str]] = None):
+        pairs = None
+        if dirty_symbols is not None:
+            pairs = self.spread_pipeline.select_dirty_trading_pairs(self.multi_exchange_pairs, dirty_symbols)
+            if not pairs:
+                return
+        await self.spread_pipeline.process_trading_pairs(pairs)
     
     def _get_funding_rate_data(
         self,
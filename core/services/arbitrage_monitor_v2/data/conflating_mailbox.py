@@ -0,0 +1,98 @@
+"""
+订单簿合并邮箱（latest-value-wins）
+
+职责：
+- 按 (exchange, symbol) 保存每个交易对「尚未处理的最新订单簿」
+- 新订单簿到达时 O(1) 覆盖旧的待处理项（保留原排队位置，不插队也不饿死）
+- 记录每个交易对被合并（覆盖）的次数
+
+与 asyncio.Queue 接口兼容（put_nowait / get_nowait / qsize / empty / task_done），
+DataReceiver / DataProcessor 无需区分。队列深度上限 = 订阅的交易对数量，与行情速率无关；
+突发行情时不会再像有界队列那样丢弃最旧数据（可能是冷门交易对唯一的一次更新）。
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+MailboxKey = Tuple[str, str]
+
+
+class ConflatingMailbox:
+    """按 (exchange, symbol) 合并的订单簿邮箱"""
+
+    # 不设容量上限：深度天然受交易对数量约束（DataProcessor 据此跳过高水位丢弃）
+    maxsize = 0
+
+    def __init__(self):
+        self._pending: "OrderedDict[MailboxKey, Dict[str, Any]]" = OrderedDict()
+        self._coalesced: Dict[MailboxKey, int] = {}
+        self.puts = 0
+        self.gets = 0
+        self.coalesced_total = 0
+        self.peak = 0
+
+    # ============= asyncio.Queue 兼容接口 =============
+
+    def put_nowait(self, item: Dict[str, Any]) -> None:
+        """投递订单簿（同一交易对的待处理项直接被覆盖）"""
+        key = (item['exchange'], item['symbol'])
+        pending = self._pending
+        self.puts += 1
+        if key in pending:
+            pending[key] = item
+            self._coalesced[key] = self._coalesced.get(key, 0) + 1
+            self.coalesced_total += 1
+            return
+        pending[key] = item
+        size = len(pending)
+        if size > self.peak:
+            self.peak = size
+
+    async def put(self, item: Dict[str, Any]) -> None:
+        self.put_nowait(item)
+
+    def get_nowait(self) -> Dict[str, Any]:
+        """按交易对首次排队的顺序取出"""
+        if not self._pending:
+            raise asyncio.QueueEmpty
+        self.gets += 1
+        return self._pending.popitem(last=False)[1]
+
+    def qsize(self) -> int:
+        return len(self._pending)
+
+    def empty(self) -> bool:
+        return not self._pending
+
+    def full(self) -> bool:
+        return False
+
+    def task_done(self) -> None:
+        pass
+
+    # ============= 统计 =============
+
+    def coalesced_count(self, exchange: str, symbol: str) -> int:
+        return self._coalesced.get((exchange, symbol), 0)
+
+    def top_coalesced(self, limit: Optional[int] = 10) -> List[Tuple[str, str, int]]:
+        """合并次数最多的交易对 [(exchange, symbol, count)]"""
+        items = sorted(self._coalesced.items(), key=lambda kv: kv[1], reverse=True)
+        if limit is not None:
+            items = items[:limit]
+        return [(exchange, symbol, count) for (exchange, symbol), count in items]
+
+    def get_stats(self, top: int = 10) -> Dict[str, Any]:
+        return {
+            'pending': len(self._pending),
+            'peak': self.peak,
+            'puts': self.puts,
+            'gets': self.gets,
+            'coalesced_total': self.coalesced_total,
+            'coalesced_keys': len(self._coalesced),
+            'coalesced_by_key': {
+                f"{exchange}:{symbol}": count
+                for exchange, symbol, count in self.top_coalesced(top)
+            },
+        }
@@ -10,7 +10,7 @@
 import asyncio
 import time
 from datetime import timezone
-from typing import Dict, Optional, List, Deque
+from typing import Dict, Optional, List, Deque, Set, Union
 from datetime import datetime
 from collections import defaultdict
 from collections import deque
@@ -20,6 +20,9 @@ from core.adapters.exchanges.models import OrderBookData, TickerData
 from core.adapters.exchanges.utils.setup_logging import LoggingConfig
 import logging
 from ..config.debug_config import DebugConfig
+from .conflating_mailbox import ConflatingMailbox
+from .shared_bbo import SharedBBOWriter, safe_float
+from .symbol_registry import get_symbol_registry
 
 # 创建独立日志文件，避免输出到终端导致界面抖动
 # 高频数据路径，默认降级到 WARNING，避免大行情时日志刷屏造成 I/O 压力
@@ -44,19 +47,23 @@ class DataProcessor:
     
     def __init__(
         self,
-        orderbook_queue: asyncio.Queue,
+        orderbook_queue: Union[ConflatingMailbox, asyncio.Queue],
         ticker_queue: asyncio.Queue,
         debug_config: DebugConfig,
-        scroller=None  # 实时滚动区管理器（可选）
+        scroller=None,  # 实时滚动区管理器（可选）
+        shared_bbo_path: Optional[str] = None,
+        shared_bbo_capacity: int = 4096
     ):
         """
         初始化数据处理器
         
         Args:
-            orderbook_queue: 订单簿队列
+            orderbook_queue: 订单簿队列（ConflatingMailbox：同一交易对只保留最新一份待处理订单簿）
             ticker_queue: Ticker队列
             debug_config: Debug配置
             scroller: 实时滚动区管理器（用于实时打印）
+            shared_bbo_path: 共享内存 BBO 表路径（None 表示不启用），供其它进程无锁读取最新盘口
+            shared_bbo_capacity: BBO 表最大 (交易所, 交易对) 数量
         """
         self.orderbook_queue = orderbook_queue
         self.ticker_queue = ticker_queue
@@ -66,6 +73,10 @@ class DataProcessor:
         # 数据存储 {exchange: {symbol: data}}
         self.orderbooks: Dict[str, Dict[str, OrderBookData]] = defaultdict(dict)
         self.tickers: Dict[str, Dict[str, TickerData]] = defaultdict(dict)
+
+        # 🚀 按整数 ID 索引的订单簿表 [symbol_id][exchange_id]（ID 由交易对注册表分配）
+        self.symbol_registry = get_symbol_registry()
+        self._orderbook_table: List[List[Optional[OrderBookData]]] = []
         
         # 数据时间戳 {exchange: {symbol: datetime}}
         self.orderbook_timestamps: Dict[str, Dict[str, datetime]] = defaultdict(dict)
@@ -98,6 +109,22 @@ class DataProcessor:
         self.stats = {
             'processing_errors': 0,
         }
+
+        # 🔥 脏集合调度：订单簿更新后标记 symbol，供编排器事件驱动地只计算变化的交易对
+        self._dirty_symbols: Set[str] = set()
+        self._dirty_event = asyncio.Event()
+        self._dirty_since: Optional[float] = None  # 脏集合由空变为非空的时间（monotonic）
+        self._dirty_marks: int = 0
+        self._dirty_pops: int = 0
+        
+        # 🔥 共享内存 BBO 表（跨进程读取最新盘口，见 shared_bbo.py）
+        self.shared_bbo: Optional[SharedBBOWriter] = None
+        if shared_bbo_path:
+            try:
+                self.shared_bbo = SharedBBOWriter(shared_bbo_path, shared_bbo_capacity)
+                logger.info(f"共享内存 BBO 表已启用: {shared_bbo_path} (容量 {shared_bbo_capacity})")
+            except Exception as e:
+                logger.error(f"共享内存 BBO 表创建失败，已禁用: {e}")
         
         # 运行状态
         self.running = False
@@ -125,6 +152,12 @@ class DataProcessor:
                     await task
                 except asyncio.CancelledError:
                     pass
+        if self.shared_bbo:
+            try:
+                self.shared_bbo.close()
+            except Exception as e:
+                logger.warning(f"关闭共享内存 BBO 表失败: {e}")
+            self.shared_bbo = None
         print("🛑 数据处理器已停止")
     
     async def _process_orderbook_loop(self):
@@ -167,7 +200,8 @@ class DataProcessor:
         """在时间片内尽量清空队列，避免固定条数限制带来的延迟。"""
         loop_start = time.perf_counter()
         processed = 0
-        # 队列接近满时（≥80%）丢弃最旧，优先保留最新，避免长时间积压
+        # 有界队列接近满时（≥80%）丢弃最旧，优先保留最新，避免长时间积压
+        # （ConflatingMailbox 无容量上限，入队时已按交易对合并，不走这里）
         if q.maxsize:
             high_water = max(int(q.maxsize * 0.8), q.maxsize - 2)
             while q.qsize() > high_water:
@@ -218,6 +252,14 @@ class DataProcessor:
         
         # 更新订单簿状态
         self.orderbooks[exchange][symbol] = orderbook
+        symbol_id = item.get('symbol_id')
+        if symbol_id is None:
+            # 来自多进程采集等未携带 ID 的数据源
+            key = self.symbol_registry.key(exchange, symbol)
+            exchange_id, symbol_id = key.exchange_id, key.symbol_id
+        else:
+            exchange_id = item['exchange_id']
+        self._store_orderbook(exchange_id, symbol_id, orderbook)
         self.orderbook_timestamps[exchange][symbol] = received_timestamp
         if exchange_timestamp:
             self.orderbook_exchange_timestamps[exchange][symbol] = exchange_timestamp
@@ -239,6 +281,12 @@ class DataProcessor:
         # 🔥 记录处理时间戳（用于滑动窗口统计）
         current_time = time.time()
         self.orderbook_processed_timestamps.append(current_time)
+
+        # 🔥 标记脏 symbol，唤醒事件驱动的价差计算
+        self.mark_dirty(symbol)
+
+        if self.shared_bbo:
+            self._publish_shared_bbo(exchange, symbol, orderbook)
         
         # 抽样打印延迟信息，便于确认时戳链路（默认每60秒一次，避免刷屏）
         if (
@@ -323,7 +371,91 @@ class DataProcessor:
         # 记录处理时间戳（用于滑动窗口统计）
         current_time = time.time()
         self.ticker_processed_timestamps.append(current_time)
+
+        if self.shared_bbo and getattr(ticker, 'funding_rate', None) is not None:
+            self.shared_bbo.update_funding(exchange, symbol, safe_float(ticker.funding_rate))
+
+    def _publish_shared_bbo(self, exchange: str, symbol: str, orderbook: OrderBookData) -> None:
+        """把最优买卖价写入共享内存 BBO 表"""
+        best_bid = orderbook.best_bid
+        best_ask = orderbook.best_ask
+        if not best_bid or not best_ask:
+            return
+        exchange_ts = orderbook.exchange_timestamp
+        try:
+            exchange_ns = int(exchange_ts.timestamp() * 1e9) if isinstance(exchange_ts, datetime) else 0
+        except (OverflowError, OSError, ValueError):
+            exchange_ns = 0
+        self.shared_bbo.update(
+            exchange,
+            symbol,
+            best_bid.price_float,
+            best_ask.price_float,
+            best_bid.size_float,
+            best_ask.size_float,
+            exchange_ns,
+        )
     
+    def _store_orderbook(self, exchange_id: int, symbol_id: int, orderbook: OrderBookData) -> None:
+        table = self._orderbook_table
+        if symbol_id >= len(table):
+            table.extend([] for _ in range(symbol_id + 1 - len(table)))
+        row = table[symbol_id]
+        if exchange_id >= len(row):
+            row.extend([None] * (exchange_id + 1 - len(row)))
+        row[exchange_id] = orderbook
+
+    def get_orderbook_by_id(
+        self,
+        exchange_id: int,
+        symbol_id: int,
+        max_age_seconds: float = 2.0
+    ) -> Optional[OrderBookData]:
+        """
+        按注册表 ID 获取订单簿（数组下标访问，带时效性检查）
+        
+        Args:
+            exchange_id: 交易所 ID
+            symbol_id: 标准交易对 ID
+            max_age_seconds: 最大数据年龄（秒），默认2秒
+        """
+        try:
+            orderbook = self._orderbook_table[symbol_id][exchange_id]
+        except IndexError:
+            return None
+        if not orderbook:
+            return None
+        registry = self.symbol_registry
+        return self._check_orderbook_fresh(
+            registry.exchanges[exchange_id], registry.symbols[symbol_id], orderbook, max_age_seconds
+        )
+
+    def get_symbol_orderbooks(
+        self,
+        symbol: str,
+        exchanges: List[str],
+        max_age_seconds: float = 2.0
+    ) -> Dict[str, OrderBookData]:
+        """
+        获取同一交易对在多个交易所的有效订单簿 {exchange: orderbook}
+
+        交易对只解析一次 ID，之后按行下标逐个交易所取数据。
+        """
+        result: Dict[str, OrderBookData] = {}
+        registry = self.symbol_registry
+        symbol_id = registry.find_symbol_id(symbol)
+        if symbol_id is None or symbol_id >= len(self._orderbook_table):
+            return result
+        row = self._orderbook_table[symbol_id]
+        for exchange in exchanges:
+            exchange_id = registry.find_exchange_id(exchange)
+            if exchange_id is None or exchange_id >= len(row):
+                continue
+            orderbook = row[exchange_id]
+            if orderbook and self._check_orderbook_fresh(exchange, symbol, orderbook, max_age_seconds):
+                result[exchange] = orderbook
+        return result
+
     def get_orderbook(self, exchange: str, symbol: str, max_age_seconds: float = 2.0) -> Optional[OrderBookData]:
         """
         获取订单簿数据（带时效性检查）
@@ -339,7 +471,16 @@ class DataProcessor:
         orderbook = self.orderbooks.get(exchange, {}).get(symbol)
         if not orderbook:
             return None
-        
+        return self._check_orderbook_fresh(exchange, symbol, orderbook, max_age_seconds)
+
+    def _check_orderbook_fresh(
+        self,
+        exchange: str,
+        symbol: str,
+        orderbook: OrderBookData,
+        max_age_seconds: float
+    ) -> Optional[OrderBookData]:
+        """时效性检查：通过返回订单簿本身，过期返回None"""
         # 🔥 时效性检查：需要同时满足“交易所时间戳”和“本地接收时间”两种约束
         now = datetime.now()
         now_ts = time.time()
@@ -443,6 +584,57 @@ class DataProcessor:
                 + (f" | 抑制重复: {suppressed} 次" if suppressed else "")
             )
     
+    # ============= 脏集合调度 =============
+
+    def mark_dirty(self, symbol: str) -> None:
+        """标记 symbol 的订单簿已变化（同一 symbol 的多次更新在被消费前自动合并）"""
+        if not self._dirty_symbols:
+            self._dirty_since = time.monotonic()
+        self._dirty_symbols.add(symbol)
+        self._dirty_marks += 1
+        self._dirty_event.set()
+
+    def has_dirty_symbols(self) -> bool:
+        """是否存在待处理的脏 symbol"""
+        return bool(self._dirty_symbols)
+
+    def dirty_age_seconds(self) -> float:
+        """最早一个未消费的脏标记距今的时间（秒），无脏数据时返回 0"""
+        if not self._dirty_symbols or self._dirty_since is None:
+            return 0.0
+        return max(0.0, time.monotonic() - self._dirty_since)
+
+    def pop_dirty_symbols(self) -> Set[str]:
+        """取出并清空当前脏集合"""
+        dirty = self._dirty_symbols
+        self._dirty_symbols = set()
+        self._dirty_since = None
+        self._dirty_event.clear()
+        if dirty:
+            self._dirty_pops += 1
+        return dirty
+
+    async def wait_for_dirty(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待出现脏 symbol
+
+        Args:
+            timeout: 最长等待时间（秒），None 表示一直等待
+
+        Returns:
+            是否存在脏 symbol（超时返回 False）
+        """
+        if self._dirty_symbols:
+            return True
+        try:
+            if timeout is None:
+                await self._dirty_event.wait()
+            else:
+                await asyncio.wait_for(self._dirty_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return bool(self._dirty_symbols)
+
     def get_ticker(self, exchange: str, symbol: str) -> Optional[TickerData]:
         """
         获取Ticker数据
@@ -514,6 +706,16 @@ class DataProcessor:
         ob_delay = _delay_stats(self._orderbook_delay_ms)
         tk_delay = _delay_stats(self._ticker_delay_ms)
 
+        # 🔥 合并邮箱：每个交易对被覆盖（未处理即被更新的订单簿替换）的次数
+        mailbox_stats = {}
+        if isinstance(self.orderbook_queue, ConflatingMailbox):
+            mb = self.orderbook_queue.get_stats()
+            mailbox_stats = {
+                'orderbook_coalesced_total': mb['coalesced_total'],
+                'orderbook_coalesced_keys': mb['coalesced_keys'],
+                'orderbook_coalesced_by_key': mb['coalesced_by_key'],
+            }
+
         return {
             **self.stats,
             'orderbook_processed': orderbook_processed,
@@ -532,6 +734,10 @@ class DataProcessor:
             'ticker_delay_p95_ms': tk_delay["p95_ms"],
             'ticker_delay_max_ms': tk_delay["max_ms"],
             'ticker_delay_samples': int(tk_delay["samples"]),
+            'dirty_symbols_pending': len(self._dirty_symbols),
+            'dirty_marks': self._dirty_marks,
+            'dirty_batches': self._dirty_pops,
+            **mailbox_stats,
         }
     
     def is_data_available(self, exchange: str, symbol: str) -> bool:
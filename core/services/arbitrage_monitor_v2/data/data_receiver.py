@@ -16,6 +16,7 @@ from collections import defaultdict
 from core.adapters.exchanges.models import OrderBookData, TickerData
 from core.services.arbitrage_monitor.utils.symbol_converter import SimpleSymbolConverter
 from ..config.debug_config import DebugConfig
+from .symbol_registry import get_symbol_registry
 
 
 class DataReceiver:
@@ -39,7 +40,7 @@ class DataReceiver:
         初始化数据接收器
         
         Args:
-            orderbook_queue: 订单簿队列
+            orderbook_queue: 订单簿队列（ConflatingMailbox 或 asyncio.Queue）
             ticker_queue: Ticker队列
             debug_config: Debug配置
         """
@@ -74,6 +75,9 @@ class DataReceiver:
         self.symbol_converter = SimpleSymbolConverter(logger)
         logger.info("✅ Symbol转换器已初始化")
 
+        # 🚀 交易对注册表：原生符号 -> (exchange_id, symbol_id, 标准符号)，每条消息一次 dict 命中
+        self.symbol_registry = get_symbol_registry()
+
     def set_should_accept(self, predicate: Optional[Callable[[str, str], bool]]) -> None:
         """设置动态过滤函数（用于 watchlist/TTL）"""
         self._should_accept = predicate
@@ -97,12 +101,15 @@ class DataReceiver:
         self.adapters[exchange] = adapter
         print(f"✅ [{exchange}] 适配器已注册到数据接收层")
     
-    async def subscribe_all(self, symbols: list):
+    async def subscribe_all(self, symbols: list, bbo_only: bool = False):
         """
         订阅所有交易对的数据
         
         Args:
             symbols: 交易对列表（标准格式，如 BTC-USDC-PERP）
+            bbo_only: 是否只接收最优买卖价（TopOfBook）。支持BBO模式的适配器
+                (Lighter/EdgeX/Backpack) 不再为每条消息构建完整深度，
+                其余适配器仍推送完整 OrderBookData
         
         扩展说明：
         ============================================================
@@ -122,6 +129,9 @@ class DataReceiver:
            - EdgeX格式：callback(orderbook: OrderBookData) - 只有orderbook参数
         ============================================================
         """
+        if bbo_only:
+            self._enable_top_of_book_mode()
+        
         # print(f"\n🔍 [DataReceiver] 开始订阅，已注册的适配器: {list(self.adapters.keys())}")
         # print(f"🔍 [DataReceiver] 要订阅的symbols: {symbols}\n")
         
@@ -149,6 +159,7 @@ class DataReceiver:
                 if exchange == "lighter":
                     # 🔥 固定 exchange 值，避免闭包变量捕获问题
                     exchange_name = "lighter"
+                    lighter_symbols = self.symbol_registry.native_table(exchange_name)
                     
                     # 创建Lighter专用的统一回调（只有一个参数）
                     # 🔥 使用默认参数绑定，避免闭包捕获问题
@@ -156,12 +167,11 @@ class DataReceiver:
                         """Lighter订单簿统一回调（只接收orderbook参数）"""
                         try:
                             # orderbook.symbol 可能是Lighter格式（如 "BTC"）或标准格式（如 "BTC-USDC-PERP"）
-                            # 需要尝试转换，如果转换失败则使用原始symbol
-                            try:
-                                std_symbol = self.symbol_converter.convert_from_exchange(orderbook.symbol, "lighter")
-                            except Exception:
-                                # 如果转换失败，可能是已经是标准格式，直接使用
-                                std_symbol = orderbook.symbol
+                            # 两种写法都登记在注册表中，未命中时按转换规则登记
+                            key = lighter_symbols.get(orderbook.symbol) or self.symbol_registry.resolve(
+                                _exchange_name, orderbook.symbol
+                            )
+                            std_symbol = key.symbol
                             
                             if self._is_accepted(_exchange_name, std_symbol):
                                 # 直接验证并入队
@@ -177,6 +187,8 @@ class DataReceiver:
                                     self.orderbook_queue.put_nowait({
                                         'exchange': _exchange_name,
                                         'symbol': std_symbol,
+                                        'exchange_id': key.exchange_id,
+                                        'symbol_id': key.symbol_id,
                                         'data': orderbook,
                                         'timestamp': datetime.now()
                                     })
@@ -193,8 +205,11 @@ class DataReceiver:
                     def lighter_ticker_callback(ticker, _exchange_name=exchange_name):
                         """Lighter ticker统一回调（只接收ticker参数）"""
                         try:
-                            # 转换symbol到标准格式
-                            std_symbol = receiver_self.symbol_converter.convert_from_exchange(ticker.symbol, "lighter")
+                            # 转换symbol到标准格式（注册表命中时只需一次 dict 查找）
+                            key = lighter_symbols.get(ticker.symbol) or receiver_self.symbol_registry.resolve(
+                                _exchange_name, ticker.symbol
+                            )
+                            std_symbol = key.symbol
                             
                             if receiver_self._is_accepted(_exchange_name, std_symbol):
                                 # 直接入队，避免二次符号转换（队列满时丢弃旧数据，保证实时性）
@@ -202,6 +217,8 @@ class DataReceiver:
                                     receiver_self.ticker_queue.put_nowait({
                                         'exchange': _exchange_name,
                                         'symbol': std_symbol,
+                                        'exchange_id': key.exchange_id,
+                                        'symbol_id': key.symbol_id,
                                         'data': ticker,
                                         'timestamp': datetime.now()
                                     })
@@ -252,6 +269,10 @@ class DataReceiver:
                     
                     # 🔥 固定 exchange 值，避免闭包变量捕获问题
                     exchange_name_edgex = "edgex"
+                    edgex_symbols = self.symbol_registry.native_table(exchange_name_edgex)
+                    # 标准回调只创建一次（避免每条消息重新构造闭包）
+                    edgex_orderbook_callback = self._create_orderbook_callback(exchange_name_edgex)
+                    edgex_ticker_callback = self._create_ticker_callback(exchange_name_edgex)
                     
                     # 🔥 创建EdgeX专用的统一回调（兼容两种调用方式）
                     # EdgeX会同时调用全局回调和特定订阅回调：
@@ -276,12 +297,14 @@ class DataReceiver:
                             else:
                                 return  # 参数错误，静默忽略
                             
-                            # 🔥 从symbol转换为标准格式
-                            std_symbol = self.symbol_converter.convert_from_exchange(symbol, _exchange_name)
+                            # 🔥 从symbol转换为标准格式（注册表命中时只需一次 dict 查找）
+                            std_symbol = (
+                                edgex_symbols.get(symbol) or self.symbol_registry.resolve(_exchange_name, symbol)
+                            ).symbol
                             
                             if self._is_accepted(_exchange_name, std_symbol):
                                 # 调用标准回调（需要symbol和orderbook两个参数）
-                                self._create_orderbook_callback(_exchange_name)(std_symbol, orderbook)
+                                edgex_orderbook_callback(std_symbol, orderbook)
                         except Exception as e:
                             if self.debug.is_debug_enabled():
                                 print(f"❌ [edgex] 订单簿回调失败: {e}")
@@ -294,9 +317,11 @@ class DataReceiver:
                             if len(args) == 2:
                                 symbol, ticker = args
                                 # EdgeX 已经提供了symbol，只需要转换
-                                std_symbol = self.symbol_converter.convert_from_exchange(symbol, _exchange_name)
+                                std_symbol = (
+                                    edgex_symbols.get(symbol) or self.symbol_registry.resolve(_exchange_name, symbol)
+                                ).symbol
                                 if self._is_accepted(_exchange_name, std_symbol):
-                                    self._create_ticker_callback(_exchange_name)(std_symbol, ticker)
+                                    edgex_ticker_callback(std_symbol, ticker)
                         except Exception as e:
                             if self.debug.is_debug_enabled():
                                 print(f"❌ [edgex] ticker回调失败: {e}")
@@ -324,6 +349,10 @@ class DataReceiver:
                     
                     # 🔥 固定 exchange 值，避免闭包变量捕获问题
                     exchange_name_backpack = "backpack"
+                    backpack_symbols = self.symbol_registry.native_table(exchange_name_backpack)
+                    backpack_watchlist = set(symbols)
+                    backpack_orderbook_callback = self._create_orderbook_callback(exchange_name_backpack)
+                    backpack_ticker_callback = self._create_ticker_callback(exchange_name_backpack)
                     
                     # 创建Backpack专用的统一回调包装器（兼容两种调用方式）
                     # 🔥 使用默认参数绑定，避免闭包捕获问题
@@ -341,13 +370,14 @@ class DataReceiver:
                                 return
                             
                             # 转换symbol到标准格式
-                            std_symbol = self.symbol_converter.convert_from_exchange(symbol, _exchange_name)
+                            std_symbol = (
+                                backpack_symbols.get(symbol) or self.symbol_registry.resolve(_exchange_name, symbol)
+                            ).symbol
                             
                             # 检查symbol是否在监控列表中
-                            if std_symbol in symbols:
+                            if std_symbol in backpack_watchlist:
                                 # 调用标准回调（使用固定的 _exchange_name）
-                                callback = self._create_orderbook_callback(_exchange_name)
-                                callback(std_symbol, orderbook)
+                                backpack_orderbook_callback(std_symbol, orderbook)
                         except Exception as e:
                             # 静默处理错误，避免UI刷屏
                             self.stats['orderbook_dropped'] = self.stats.get('orderbook_dropped', 0) + 1
@@ -368,13 +398,14 @@ class DataReceiver:
                                 return
                             
                             # 🔥 V1逻辑：先转换symbol
-                            std_symbol = self.symbol_converter.convert_from_exchange(symbol, _exchange_name)
+                            std_symbol = (
+                                backpack_symbols.get(symbol) or self.symbol_registry.resolve(_exchange_name, symbol)
+                            ).symbol
                             
                             # 🔥 V1逻辑：检查symbol是否在监控列表中
-                            if std_symbol in symbols:
+                            if std_symbol in backpack_watchlist:
                                 # 调用标准回调（使用固定的 _exchange_name）
-                                callback = self._create_ticker_callback(_exchange_name)
-                                callback(std_symbol, ticker)
+                                backpack_ticker_callback(std_symbol, ticker)
                         except Exception as e:
                             if self.debug.is_debug_enabled():
                                 print(f"⚠️  [backpack] ticker回调失败: {e}")
@@ -437,6 +468,18 @@ class DataReceiver:
             except Exception as e:
                 print(f"❌ [{exchange}] 订阅失败: {e}")
     
+    def _enable_top_of_book_mode(self) -> None:
+        """为支持的适配器开启BBO模式（订单簿回调只推送 TopOfBook）"""
+        for exchange, adapter in self.adapters.items():
+            setter = getattr(adapter, 'set_top_of_book_mode', None)
+            if not callable(setter):
+                continue
+            try:
+                setter(True)
+                self.logger.info("✅ [%s] 已开启订单簿BBO模式", exchange)
+            except Exception as e:
+                self.logger.warning("⚠️ [%s] 开启订单簿BBO模式失败: %s", exchange, e)
+    
     def _create_orderbook_callback(self, exchange: str) -> Callable:
         """
         创建订单簿回调函数
@@ -447,6 +490,9 @@ class DataReceiver:
         Returns:
             回调函数
         """
+        native_symbols = self.symbol_registry.native_table(exchange)
+        resolve = self.symbol_registry.resolve
+
         def callback(*args):
             """
             订单簿回调 - 零延迟设计
@@ -469,7 +515,8 @@ class DataReceiver:
                 return
 
             # 🚀 统一转换为标准符号（保证各层一致）
-            std_symbol = self._normalize_symbol(symbol, exchange)
+            key = native_symbols.get(symbol) or resolve(exchange, symbol)
+            std_symbol = key.symbol
 
             # 🔥 watchlist/TTL：未关注的 (exchange, symbol) 直接丢弃
             if not self._is_accepted(exchange, std_symbol):
@@ -494,6 +541,8 @@ class DataReceiver:
                 self.orderbook_queue.put_nowait({
                     'exchange': exchange,
                     'symbol': std_symbol,
+                    'exchange_id': key.exchange_id,
+                    'symbol_id': key.symbol_id,
                     'data': orderbook,
                     'exchange_timestamp': exchange_timestamp,
                     'received_at': received_at,
@@ -519,6 +568,8 @@ class DataReceiver:
                     self.orderbook_queue.put_nowait({
                         'exchange': exchange,
                         'symbol': std_symbol,
+                        'exchange_id': key.exchange_id,
+                        'symbol_id': key.symbol_id,
                         'data': orderbook,
                         'timestamp': datetime.now()
                     })
@@ -538,6 +589,9 @@ class DataReceiver:
         Returns:
             回调函数
         """
+        native_symbols = self.symbol_registry.native_table(exchange)
+        resolve = self.symbol_registry.resolve
+
         def callback(*args):
             """
             Ticker回调 - 零延迟设计
@@ -560,7 +614,8 @@ class DataReceiver:
                 return
 
             # 🚀 统一转换为标准符号
-            std_symbol = self._normalize_symbol(symbol, exchange)
+            key = native_symbols.get(symbol) or resolve(exchange, symbol)
+            std_symbol = key.symbol
 
             if not self._is_accepted(exchange, std_symbol):
                 return
@@ -570,6 +625,8 @@ class DataReceiver:
                 self.ticker_queue.put_nowait({
                     'exchange': exchange,
                     'symbol': std_symbol,
+                    'exchange_id': key.exchange_id,
+                    'symbol_id': key.symbol_id,
                     'data': ticker,
                     'timestamp': datetime.now()
                 })
@@ -582,6 +639,8 @@ class DataReceiver:
                     self.ticker_queue.put_nowait({
                         'exchange': exchange,
                         'symbol': std_symbol,
+                        'exchange_id': key.exchange_id,
+                        'symbol_id': key.symbol_id,
                         'data': ticker,
                         'timestamp': datetime.now()
                     })
@@ -595,17 +654,7 @@ class DataReceiver:
         """
         将任意格式的交易对转换为系统标准格式（BTC-USDC-PERP）
         """
-        normalized = symbol
-        try:
-            normalized = self.symbol_converter.convert_from_exchange(symbol, exchange)
-        except Exception:
-            normalized = symbol
-
-        if not normalized:
-            return symbol
-
-        candidate = normalized.replace('/', '-').replace(':', '-')
-        return candidate.upper()
+        return self.symbol_registry.resolve(exchange, symbol).symbol
     
     def get_stats(self) -> Dict:
         """获取统计信息"""
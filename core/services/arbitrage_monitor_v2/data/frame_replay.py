@@ -0,0 +1,350 @@
+"""
+行情原始帧录制 / 回放
+
+职责：
+- 录制：为已连接的适配器挂载 FrameWriter，按交易所保存原始 WebSocket 帧（含接收时间），
+  结束时保存回放所需的适配器上下文（符号映射、订阅列表）
+- 回放：离线构造各交易所的 WebSocket 解析对象，恢复上下文后把原始帧送回真实解析入口
+  （LighterWebSocket._handle_direct_ws_message、EdgeX/Backpack._process_websocket_message、
+  ParadexWebSocket._handle_message），经 DataReceiver 回调进入 DataProcessor
+
+回放速度：speed=1 按录制时的节奏，speed=N 为 N 倍速，speed<=0 为最大速度（不等待）。
+多个交易所的帧按接收时间归并，保持录制时的跨交易所先后顺序。
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from core.adapters.exchanges.utils.frame_recorder import (
+    FrameRecorder,
+    iter_frames,
+    list_recorded_exchanges,
+    read_context,
+    FRAME_SUFFIX,
+)
+from core.adapters.exchanges.utils.setup_logging import LoggingConfig
+
+logger = LoggingConfig.setup_logger(
+    name=__name__,
+    log_file='frame_replay.log',
+    console_formatter=None,
+    level=logging.INFO
+)
+logger.propagate = False
+
+
+# ============= 交易所绑定 =============
+
+def _create_lighter_ws():
+    from core.adapters.exchanges.adapters.lighter_websocket import LighterWebSocket
+    return LighterWebSocket({})
+
+
+def _create_edgex_ws():
+    from core.adapters.exchanges.adapters.edgex_websocket import EdgeXWebSocket
+    return EdgeXWebSocket(None, logger)
+
+
+def _create_backpack_ws():
+    from core.adapters.exchanges.adapters.backpack_websocket import BackpackWebSocket
+    return BackpackWebSocket(None, logger)
+
+
+def _create_paradex_ws():
+    from core.adapters.exchanges.adapters.paradex_websocket import ParadexWebSocket
+    return ParadexWebSocket(None, logger)
+
+
+def _register_list_callbacks(ws, context: Dict[str, Any], ob_cb: Callable, tk_cb: Callable) -> None:
+    ws._orderbook_callbacks.append(ob_cb)
+    ws._ticker_callbacks.append(tk_cb)
+
+
+def _register_single_callbacks(ws, context: Dict[str, Any], ob_cb: Callable, tk_cb: Callable) -> None:
+    ws.orderbook_callback = ob_cb
+    ws.ticker_callback = tk_cb
+
+
+def _register_symbol_callbacks(ws, context: Dict[str, Any], ob_cb: Callable, tk_cb: Callable) -> None:
+    for symbol in context.get('orderbook_symbols', []):
+        ws._orderbook_callbacks.setdefault(symbol, []).append(ob_cb)
+    for symbol in context.get('ticker_symbols', []):
+        ws._ticker_callbacks.setdefault(symbol, []).append(tk_cb)
+
+
+def _paradex_extra_context(ws) -> Dict[str, Any]:
+    return {
+        'orderbook_symbols': sorted(ws._orderbook_callbacks.keys()),
+        'ticker_symbols': sorted(ws._ticker_callbacks.keys()),
+    }
+
+
+async def _feed_json(handler: Callable[[Dict[str, Any]], Awaitable[None]], text: str) -> None:
+    await handler(json.loads(text))
+
+
+@dataclass
+class ReplayBinding:
+    """单个交易所的录制/回放绑定"""
+    exchange: str
+    create_ws: Callable[[], Any]
+    register: Callable[[Any, Dict[str, Any], Callable, Callable], None]
+    feed: Callable[[Any, str], Awaitable[None]]
+    # 需要随录制保存、回放时恢复的 WebSocket 属性
+    context_attrs: Tuple[str, ...] = ()
+    # JSON 中键被转成字符串、回放时需要恢复为 int 的字典属性
+    int_key_attrs: Tuple[str, ...] = ()
+    extra_context: Optional[Callable[[Any], Dict[str, Any]]] = None
+
+    def capture_context(self, ws) -> Dict[str, Any]:
+        context: Dict[str, Any] = {'exchange': self.exchange, 'attrs': {}}
+        for attr in self.context_attrs:
+            if hasattr(ws, attr):
+                context['attrs'][attr] = getattr(ws, attr)
+        if self.extra_context is not None:
+            context.update(self.extra_context(ws))
+        return context
+
+    def restore_context(self, ws, context: Dict[str, Any]) -> None:
+        for attr, value in (context.get('attrs') or {}).items():
+            if attr in self.int_key_attrs and isinstance(value, dict):
+                value = {int(k): v for k, v in value.items()}
+            setattr(ws, attr, value)
+
+
+REPLAY_BINDINGS: Dict[str, ReplayBinding] = {
+    'lighter': ReplayBinding(
+        exchange='lighter',
+        create_ws=_create_lighter_ws,
+        register=_register_list_callbacks,
+        feed=lambda ws, text: _feed_json(ws._handle_direct_ws_message, text),
+        context_attrs=('_markets_cache', '_symbol_to_market_index', '_top_of_book_mode'),
+        int_key_attrs=('_markets_cache',),
+    ),
+    'edgex': ReplayBinding(
+        exchange='edgex',
+        create_ws=_create_edgex_ws,
+        register=_register_single_callbacks,
+        feed=lambda ws, text: ws._process_websocket_message(text),
+        context_attrs=('_supported_symbols', '_contract_mappings', '_symbol_contract_mappings',
+                       '_top_of_book_mode'),
+    ),
+    'backpack': ReplayBinding(
+        exchange='backpack',
+        create_ws=_create_backpack_ws,
+        register=_register_single_callbacks,
+        feed=lambda ws, text: ws._process_websocket_message(text),
+        context_attrs=('_top_of_book_mode',),
+    ),
+    'paradex': ReplayBinding(
+        exchange='paradex',
+        create_ws=_create_paradex_ws,
+        register=_register_symbol_callbacks,
+        feed=lambda ws, text: _feed_json(ws._handle_message, text),
+        context_attrs=('_symbol_mapping', '_reverse_symbol_mapping', '_top_of_book_mode'),
+        extra_context=_paradex_extra_context,
+    ),
+}
+
+
+def _resolve_ws(adapter: Any) -> Any:
+    """适配器 → WebSocket 对象（适配器本身就是 WebSocket 时直接返回）"""
+    for attr in ('websocket', '_websocket'):
+        ws = getattr(adapter, attr, None)
+        if ws is not None:
+            return ws
+    return adapter
+
+
+# ============= 录制 =============
+
+class RecordingSession:
+    """为一组适配器录制原始帧"""
+
+    def __init__(self, root: Union[str, Path], adapters: Dict[str, Any], flush_interval: float = 1.0):
+        """
+        Args:
+            root: 录制目录
+            adapters: {exchange: adapter}
+            flush_interval: 刷盘间隔（秒）
+        """
+        self.recorder = FrameRecorder(root, flush_interval=flush_interval)
+        self._targets: Dict[str, Tuple[ReplayBinding, Any]] = {}
+        for exchange, adapter in adapters.items():
+            binding = REPLAY_BINDINGS.get(exchange)
+            if binding is None:
+                logger.warning(f"⚠️ [帧录制] {exchange} 暂不支持录制，跳过")
+                continue
+            self._targets[exchange] = (binding, _resolve_ws(adapter))
+
+    @property
+    def exchanges(self) -> List[str]:
+        return list(self._targets.keys())
+
+    def start(self) -> None:
+        for exchange, (_, ws) in self._targets.items():
+            ws._frame_recorder = self.recorder.writer(exchange)
+        logger.info(f"🎙️ [帧录制] 开始录制: {self.exchanges} -> {self.recorder.root}")
+
+    def save_context(self) -> None:
+        """保存适配器上下文（订阅完成后调用；close 时也会再保存一次）"""
+        for exchange, (binding, ws) in self._targets.items():
+            try:
+                self.recorder.write_context(exchange, binding.capture_context(ws))
+            except Exception as e:
+                logger.error(f"❌ [帧录制] 保存 {exchange} 上下文失败: {e}")
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        return self.recorder.get_stats()
+
+    def close(self) -> None:
+        for _, ws in self._targets.values():
+            ws._frame_recorder = None
+        self.save_context()
+        self.recorder.close()
+        logger.info(f"🎙️ [帧录制] 录制结束: {self.get_stats()}")
+
+
+# ============= 回放 =============
+
+@dataclass
+class ReplayStats:
+    """回放统计"""
+    frames: int = 0
+    errors: int = 0
+    frames_by_exchange: Dict[str, int] = field(default_factory=dict)
+    recorded_span: float = 0.0  # 录制时间跨度（秒）
+    wall_time: float = 0.0      # 回放耗时（秒）
+    max_lag: float = 0.0        # 落后于目标节奏的最大时间（秒，最大速度下不统计）
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'frames': self.frames,
+            'errors': self.errors,
+            'frames_by_exchange': dict(self.frames_by_exchange),
+            'recorded_span': self.recorded_span,
+            'wall_time': self.wall_time,
+            'frames_per_sec': self.frames / self.wall_time if self.wall_time > 0 else 0.0,
+            'max_lag': self.max_lag,
+        }
+
+
+class MarketDataReplayer:
+    """把录制的原始帧送回真实解析路径"""
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        receiver,
+        speed: float = 1.0,
+        exchanges: Optional[List[str]] = None,
+        bbo_only: bool = False,
+        yield_every: int = 64,
+    ):
+        """
+        Args:
+            root: 录制目录
+            receiver: DataReceiver（回放的订单簿/Ticker 经其回调入队）
+            speed: 回放速度（1=原速，N=N倍速，<=0 为最大速度）
+            exchanges: 只回放这些交易所（None 表示全部）
+            bbo_only: 开启适配器 BBO 模式（与 subscribe_all(bbo_only=True) 一致）
+            yield_every: 最大速度下每处理多少帧让出一次事件循环（给 DataProcessor 消费）
+        """
+        self.root = Path(root)
+        self.receiver = receiver
+        self.speed = float(speed or 0)
+        self.exchanges = exchanges
+        self.bbo_only = bbo_only
+        self.yield_every = max(1, int(yield_every))
+        self.stats = ReplayStats()
+        self._ws: Dict[str, Any] = {}
+
+    def setup(self) -> List[str]:
+        """构造解析对象、恢复上下文、注册 DataReceiver 回调，返回可回放的交易所"""
+        recorded = list_recorded_exchanges(self.root)
+        wanted = [ex for ex in recorded if self.exchanges is None or ex in self.exchanges]
+        for exchange in wanted:
+            binding = REPLAY_BINDINGS.get(exchange)
+            if binding is None:
+                logger.warning(f"⚠️ [帧回放] {exchange} 暂不支持回放，跳过")
+                continue
+            try:
+                ws = binding.create_ws()
+            except Exception as e:
+                logger.warning(f"⚠️ [帧回放] 创建 {exchange} 解析对象失败，跳过: {e}")
+                continue
+            context = read_context(self.root, exchange)
+            binding.restore_context(ws, context)
+            if self.bbo_only and hasattr(ws, 'set_top_of_book_mode'):
+                ws.set_top_of_book_mode(True)
+            binding.register(
+                ws,
+                context,
+                self.receiver._create_orderbook_callback(exchange),
+                self.receiver._create_ticker_callback(exchange),
+            )
+            self._ws[exchange] = ws
+            self.stats.frames_by_exchange[exchange] = 0
+        return list(self._ws.keys())
+
+    def _merged_frames(self) -> Iterator[Tuple[float, str, str]]:
+        def _tagged(exchange: str):
+            for recv_ts, text in iter_frames(self.root / f"{exchange}{FRAME_SUFFIX}"):
+                yield recv_ts, exchange, text
+
+        return heapq.merge(*[_tagged(ex) for ex in self._ws], key=lambda item: item[0])
+
+    async def run(self, max_frames: Optional[int] = None) -> ReplayStats:
+        """
+        回放全部帧
+
+        Args:
+            max_frames: 最多回放的帧数（None 表示全部）
+        """
+        if not self._ws:
+            self.setup()
+
+        stats = self.stats
+        first_ts: Optional[float] = None
+        last_ts = 0.0
+        wall_start = time.perf_counter()
+        paced = self.speed > 0
+
+        for recv_ts, exchange, text in self._merged_frames():
+            if max_frames is not None and stats.frames >= max_frames:
+                break
+            if first_ts is None:
+                first_ts = recv_ts
+            last_ts = recv_ts
+
+            if paced:
+                target = (recv_ts - first_ts) / self.speed
+                ahead = target - (time.perf_counter() - wall_start)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+                elif -ahead > stats.max_lag:
+                    stats.max_lag = -ahead
+            elif stats.frames % self.yield_every == 0:
+                await asyncio.sleep(0)
+
+            ws = self._ws[exchange]
+            ws._last_message_time = time.time()
+            try:
+                await REPLAY_BINDINGS[exchange].feed(ws, text)
+            except Exception as e:
+                stats.errors += 1
+                if stats.errors <= 10:
+                    logger.warning(f"⚠️ [帧回放] {exchange} 帧处理失败: {e}")
+            stats.frames += 1
+            stats.frames_by_exchange[exchange] += 1
+
+        stats.recorded_span = (last_ts - first_ts) if first_ts is not None else 0.0
+        stats.wall_time = time.perf_counter() - wall_start
+        logger.info(f"▶️ [帧回放] 回放完成: {stats.to_dict()}")
+        return stats
@@ -0,0 +1,747 @@
+"""
+多进程行情接入（ingest sharding）
+
+背景：
+- 单进程模式下所有交易所的 WebSocket 解析、订单簿构建都挤在主进程的一个事件循环里，
+  规模化订阅时 CPU 被解析占满，分析循环抢不到时间片
+- 本模块把「连接 + 解析」拆到独立工作进程：每个交易所（或交易所的一组交易对）一个进程，
+  主进程只接收紧凑的 BBO/深度记录并投递到原有的 orderbook_queue / ticker_queue，
+  DataProcessor 及之后的分析链路无需任何改动
+
+工作进程：
+- 复用 DataReceiver 的订阅逻辑（各交易所的特殊回调格式只维护一份），数据先进入进程内的
+  ConflatingMailbox / Ticker 队列
+- 按批取出并编码为元组（价格/数量用字符串保证 Decimal 精度），订单簿前 N 档未变化时不重复发送
+  （但每 unchanged_resend_interval 秒至少重发一次，刷新接收时间，安静的订单簿不会被判定为过期）
+- 周期性发送心跳（进程统计 + CPU 时间）
+
+背压（credit 流控）：
+- 每个工作进程最多有 max_inflight_batches 个未确认批次；主进程消费一批回一个 ack
+- 额度耗尽时工作进程不再发送，订单簿继续在本地邮箱中按交易对合并（内存上限 = 交易对数量），
+  Ticker 队列满时丢弃最旧数据，主进程变慢不会导致管道/内存无限堆积
+
+存活检测：
+- 主进程监督任务检查进程存活与心跳间隔，状态同步到 HealthMonitor（alive / stalled / dead），
+  进程退出后按退避自动重启
+
+通信记录格式（工作进程 → 主进程）：
+    ('b', [('o', exchange, symbol, bids, asks, exchange_ts, received_ts), ('t', exchange, symbol, ticker_dict), ...])
+    ('h', stats_dict)
+    ('e', error_message)
+主进程 → 工作进程：
+    ('ack', n) / ('stop',)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.adapters.exchanges.models import OrderBookData, OrderBookLevel, TopOfBook
+from core.adapters.exchanges.utils.setup_logging import LoggingConfig
+
+logger = LoggingConfig.setup_logger(
+    name=__name__,
+    log_file="ingest_workers.log",
+    console_formatter=None,
+    file_formatter="detailed",
+    level=logging.INFO,
+)
+logger.propagate = False
+
+# 记录类型
+_REC_ORDERBOOK = 'o'
+_REC_TICKER = 't'
+
+# 消息类型
+_MSG_BATCH = 'b'
+_MSG_HEARTBEAT = 'h'
+_MSG_ERROR = 'e'
+_MSG_ACK = 'ack'
+_MSG_STOP = 'stop'
+
+
+@dataclass
+class IngestWorkerSpec:
+    """单个工作进程的分片描述（需可 pickle，spawn 模式下传给子进程）"""
+
+    worker_id: str
+    exchanges: List[str]
+    symbols: List[str]
+    bbo_only: bool = False
+    depth: int = 5
+    max_inflight_batches: int = 4
+    max_batch_records: int = 512
+    flush_interval: float = 0.002
+    heartbeat_interval: float = 1.0
+    unchanged_resend_interval: float = 1.0  # 未变化的订单簿最长多久重发一次（秒，需小于下游新鲜度阈值）
+    ticker_queue_size: int = 500
+    exchange_configs: Dict[str, Any] = field(default_factory=dict)  # 可选：预先构建的 ExchangeConfig
+
+
+def plan_ingest_shards(
+    exchanges: List[str],
+    symbols: List[str],
+    worker_count: int = 0,
+    symbol_shards: int = 1,
+) -> List[Tuple[List[str], List[str]]]:
+    """
+    规划分片：返回 [(exchanges, symbols)]
+
+    - symbol_shards > 1 时每个交易所的交易对再切成若干份，每份一个进程（各自建立连接）
+    - worker_count > 0 时把上述分片按轮询合并到最多 worker_count 个进程；0 表示不合并
+    """
+    shards: List[Tuple[List[str], List[str]]] = []
+    shard_count = max(1, int(symbol_shards))
+    for exchange in exchanges:
+        if shard_count == 1 or len(symbols) <= 1:
+            shards.append(([exchange], list(symbols)))
+            continue
+        for index in range(min(shard_count, len(symbols))):
+            part = symbols[index::shard_count]
+            if part:
+                shards.append(([exchange], part))
+
+    if worker_count <= 0 or worker_count >= len(shards):
+        return shards
+
+    # 同一进程内同一交易所只能有一份交易对列表，合并时按交易所归并
+    merged: List[Dict[str, List[str]]] = [dict() for _ in range(worker_count)]
+    for index, (shard_exchanges, shard_symbols) in enumerate(shards):
+        bucket = merged[index % worker_count]
+        for exchange in shard_exchanges:
+            bucket.setdefault(exchange, []).extend(shard_symbols)
+
+    result: List[Tuple[List[str], List[str]]] = []
+    for bucket in merged:
+        if not bucket:
+            continue
+        # 同一进程内的交易所共用一份交易对列表（DataReceiver.subscribe_all 的约束），取并集
+        union: List[str] = []
+        for exchange_symbols in bucket.values():
+            union.extend(exchange_symbols)
+        result.append((list(bucket.keys()), list(dict.fromkeys(union))))
+    return result
+
+
+# ============= 工作进程 =============
+
+def _ingest_worker_main(spec: IngestWorkerSpec, conn) -> None:
+    """工作进程入口（spawn）"""
+    # Ctrl+C 由主进程统一处理后发送 stop，避免子进程被信号打断在半截状态
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        asyncio.run(_IngestWorker(spec, conn).run())
+    except Exception as e:
+        try:
+            conn.send((_MSG_ERROR, f"{type(e).__name__}: {e}"))
+        except Exception:
+            pass
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+class _IngestWorker:
+    """工作进程内的接入循环：连接 → 订阅 → 批量编码发送"""
+
+    def __init__(self, spec: IngestWorkerSpec, conn):
+        self.spec = spec
+        self.conn = conn
+        self.parent_pid = os.getppid()
+        self.running = True
+        self.inflight = 0
+        self.adapters: Dict[str, Any] = {}
+        # 已发送的前 N 档及发送时间（用于跳过未变化的订单簿）：{key: (levels, monotonic)}
+        self._last_sent: Dict[Tuple[str, str], Tuple[Tuple[tuple, tuple], float]] = {}
+        self.stats: Dict[str, Any] = {
+            'worker_id': spec.worker_id,
+            'pid': os.getpid(),
+            'exchanges': list(spec.exchanges),
+            'symbols': len(spec.symbols),
+            'orderbook_sent': 0,
+            'ticker_sent': 0,
+            'unchanged_skipped': 0,
+            'batches_sent': 0,
+            'credit_stalls': 0,
+            'encode_errors': 0,
+        }
+
+    async def run(self) -> None:
+        from .conflating_mailbox import ConflatingMailbox
+        from .data_receiver import DataReceiver
+        from ..config.debug_config import DebugConfig
+
+        self.orderbook_queue = ConflatingMailbox()
+        self.ticker_queue: asyncio.Queue = asyncio.Queue(maxsize=self.spec.ticker_queue_size)
+        self.receiver = DataReceiver(self.orderbook_queue, self.ticker_queue, DebugConfig())
+
+        await self._connect_adapters()
+        await self.receiver.subscribe_all(self.spec.symbols, bbo_only=self.spec.bbo_only)
+
+        heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        try:
+            await self._pump_loop()
+        finally:
+            heartbeat_task.cancel()
+            try:
+                await heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            await self.receiver.cleanup()
+
+    async def _connect_adapters(self) -> None:
+        from pathlib import Path
+
+        from core.adapters.exchanges.factory import ExchangeFactory
+        from core.utils.config_loader import ExchangeConfigLoader
+        from ..core.orchestrator_bootstrap import OrchestratorBootstrap
+
+        factory = ExchangeFactory()
+        config_loader = ExchangeConfigLoader()
+        bootstrap = OrchestratorBootstrap(None)  # 只用到配置解析，不依赖调度器实例
+
+        for exchange in self.spec.exchanges:
+            exchange_config = self.spec.exchange_configs.get(exchange)
+            if exchange_config is None:
+                config_path = Path(f"config/exchanges/{exchange}_config.yaml")
+                if config_path.exists():
+                    exchange_config = bootstrap._load_exchange_config(exchange, config_path, config_loader)
+            adapter = factory.create_adapter(exchange_id=exchange, config=exchange_config)
+            await adapter.connect()
+            self.receiver.register_adapter(exchange, adapter)
+            self.adapters[exchange] = adapter
+
+    def _poll_control(self) -> None:
+        """处理主进程的 ack / stop（非阻塞）"""
+        conn = self.conn
+        try:
+            while conn.poll():
+                message = conn.recv()
+                kind = message[0]
+                if kind == _MSG_ACK:
+                    self.inflight = max(0, self.inflight - int(message[1]))
+                elif kind == _MSG_STOP:
+                    self.running = False
+        except (EOFError, OSError):
+            # 主进程已关闭管道
+            self.running = False
+
+    async def _pump_loop(self) -> None:
+        spec = self.spec
+        while self.running:
+            self._poll_control()
+            if not self.running:
+                break
+            if os.getppid() != self.parent_pid:
+                # 主进程已退出（被 kill -9 等），不再继续占用连接
+                break
+
+            if self.inflight >= spec.max_inflight_batches:
+                # 额度耗尽：数据留在本地邮箱中继续合并
+                self.stats['credit_stalls'] += 1
+                await asyncio.sleep(spec.flush_interval)
+                continue
+
+            records = self._collect(spec.max_batch_records)
+            if not records:
+                await asyncio.sleep(spec.flush_interval)
+                continue
+
+            try:
+                self.conn.send((_MSG_BATCH, records))
+            except (BrokenPipeError, EOFError, OSError):
+                break
+            self.inflight += 1
+            self.stats['batches_sent'] += 1
+            # 让出事件循环，保证 WebSocket 接收协程有时间片
+            await asyncio.sleep(0)
+
+    def _collect(self, limit: int) -> List[tuple]:
+        """从本地队列取出最多 limit 条记录并编码"""
+        records: List[tuple] = []
+        orderbook_queue = self.orderbook_queue
+        while len(records) < limit and not orderbook_queue.empty():
+            record = self._encode_orderbook(orderbook_queue.get_nowait())
+            if record is not None:
+                records.append(record)
+
+        ticker_queue = self.ticker_queue
+        while len(records) < limit and not ticker_queue.empty():
+            record = self._encode_ticker(ticker_queue.get_nowait())
+            if record is not None:
+                records.append(record)
+        return records
+
+    def _encode_orderbook(self, item: Dict[str, Any]) -> Optional[tuple]:
+        try:
+            exchange = item['exchange']
+            symbol = item['symbol']
+            orderbook = item['data']
+            depth = 1 if self.spec.bbo_only else self.spec.depth
+            if depth == 1:
+                bid, ask = orderbook.best_bid, orderbook.best_ask
+                bids = ((str(bid.price), str(bid.size)),) if bid else ()
+                asks = ((str(ask.price), str(ask.size)),) if ask else ()
+            else:
+                bids = tuple((str(level.price), str(level.size)) for level in orderbook.bids[:depth])
+                asks = tuple((str(level.price), str(level.size)) for level in orderbook.asks[:depth])
+
+            key = (exchange, symbol)
+            levels = (bids, asks)
+            now = time.monotonic()
+            last = self._last_sent.get(key)
+            # 🔥 未变化只在限定时间内跳过：到期后照常发送，下游才能拿到新的接收时间
+            if last is not None and last[0] == levels and now - last[1] < self.spec.unchanged_resend_interval:
+                self.stats['unchanged_skipped'] += 1
+                return None
+            self._last_sent[key] = (levels, now)
+
+            exchange_ts = item.get('exchange_timestamp') or getattr(orderbook, 'exchange_timestamp', None)
+            received_at = item.get('received_at') or item.get('timestamp')
+            self.stats['orderbook_sent'] += 1
+            return (
+                _REC_ORDERBOOK, exchange, symbol, bids, asks,
+                exchange_ts.timestamp() if isinstance(exchange_ts, datetime) else None,
+                received_at.timestamp() if isinstance(received_at, datetime) else time.time(),
+            )
+        except Exception:
+            self.stats['encode_errors'] += 1
+            return None
+
+    def _encode_ticker(self, item: Dict[str, Any]) -> Optional[tuple]:
+        from core.services.market_data.protocol import ticker_to_dict
+
+        try:
+            payload = ticker_to_dict(item['data'])
+            self.stats['ticker_sent'] += 1
+            return (_REC_TICKER, item['exchange'], item['symbol'], payload)
+        except Exception:
+            self.stats['encode_errors'] += 1
+            return None
+
+    async def _heartbeat_loop(self) -> None:
+        try:
+            while self.running:
+                receiver_stats = self.receiver.stats
+                heartbeat = dict(self.stats)
+                heartbeat.update({
+                    'ts': time.time(),
+                    'cpu_seconds': time.process_time(),
+                    'inflight': self.inflight,
+                    'received_orderbooks': receiver_stats.get('orderbook_received', 0),
+                    'received_tickers': receiver_stats.get('ticker_received', 0),
+                    'ticker_dropped': receiver_stats.get('ticker_dropped', 0),
+                    'coalesced': self.orderbook_queue.coalesced_total,
+                    'local_pending': self.orderbook_queue.qsize() + self.ticker_queue.qsize(),
+                })
+                try:
+                    self.conn.send((_MSG_HEARTBEAT, heartbeat))
+                except (BrokenPipeError, EOFError, OSError):
+                    self.running = False
+                    return
+                await asyncio.sleep(self.spec.heartbeat_interval)
+        except asyncio.CancelledError:
+            pass
+
+
+# ============= 主进程 =============
+
+@dataclass
+class _WorkerHandle:
+    """主进程侧的工作进程句柄"""
+
+    spec: IngestWorkerSpec
+    process: Any = None
+    conn: Any = None
+    started_at: float = 0.0
+    last_heartbeat: float = 0.0
+    last_stats: Dict[str, Any] = field(default_factory=dict)
+    restarts: int = 0
+    next_restart_at: float = 0.0
+    batches_received: int = 0
+    records_received: int = 0
+    last_error: Optional[str] = None
+    status: str = "starting"
+
+
+class IngestWorkerPool:
+    """
+    多进程行情接入池
+
+    主进程侧：启动/监督工作进程，接收批量记录并还原为 OrderBookData / TopOfBook / TickerData，
+    按 DataReceiver 的队列项格式投递到 orderbook_queue / ticker_queue。
+    """
+
+    def __init__(
+        self,
+        orderbook_queue,
+        ticker_queue: asyncio.Queue,
+        health_monitor=None,
+        worker_count: int = 0,
+        symbol_shards: int = 1,
+        depth: int = 5,
+        max_inflight_batches: int = 4,
+        heartbeat_interval: float = 1.0,
+        worker_timeout: float = 10.0,
+        restart_backoff: float = 5.0,
+        ticker_queue_size: int = 500,
+    ):
+        """
+        初始化接入池
+
+        Args:
+            orderbook_queue: 订单簿队列（ConflatingMailbox）
+            ticker_queue: Ticker队列
+            health_monitor: 健康监控器（可选，上报工作进程存活状态）
+            worker_count: 工作进程数上限（0 = 每个分片一个进程）
+            symbol_shards: 每个交易所的交易对切分份数
+            depth: 转发的订单簿档位数（bbo_only 时固定为 1）
+            max_inflight_batches: 每个工作进程未确认批次上限（背压）
+            heartbeat_interval: 心跳间隔（秒）
+            worker_timeout: 心跳超时（秒），超时标记为 stalled
+            restart_backoff: 进程退出后的重启间隔（秒）
+            ticker_queue_size: 工作进程内 Ticker 队列大小
+        """
+        self.orderbook_queue = orderbook_queue
+        self.ticker_queue = ticker_queue
+        self.health_monitor = health_monitor
+        self.worker_count = worker_count
+        self.symbol_shards = symbol_shards
+        self.depth = max(1, int(depth))
+        self.max_inflight_batches = max(1, int(max_inflight_batches))
+        self.heartbeat_interval = heartbeat_interval
+        self.worker_timeout = worker_timeout
+        self.restart_backoff = restart_backoff
+        self.ticker_queue_size = ticker_queue_size
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.workers: Dict[str, _WorkerHandle] = {}
+        self.bbo_only = False
+        self.running = False
+        self._supervisor_task: Optional[asyncio.Task] = None
+
+        # 与 DataReceiver.stats 保持相同的键，便于 UI/统计直接复用
+        self.stats = {
+            'orderbook_received': 0,
+            'orderbook_dropped': 0,
+            'ticker_received': 0,
+            'ticker_dropped': 0,
+            'decode_errors': 0,
+            'worker_restarts': 0,
+        }
+
+    # ============= 生命周期 =============
+
+    async def start(
+        self,
+        exchanges: List[str],
+        symbols: List[str],
+        bbo_only: bool = False,
+        exchange_configs: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        按分片启动工作进程
+
+        Args:
+            exchanges: 交易所列表
+            symbols: 交易对列表（标准格式）
+            bbo_only: 只转发最优买卖价（主进程还原为 TopOfBook）
+            exchange_configs: 可选的 {exchange: ExchangeConfig}，不传则子进程按配置文件加载
+        """
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self.bbo_only = bbo_only
+        self.running = True
+
+        shards = plan_ingest_shards(exchanges, symbols, self.worker_count, self.symbol_shards)
+        for index, (shard_exchanges, shard_symbols) in enumerate(shards):
+            worker_id = f"ingest-{index}-{'+'.join(shard_exchanges)}"
+            spec = IngestWorkerSpec(
+                worker_id=worker_id,
+                exchanges=shard_exchanges,
+                symbols=shard_symbols,
+                bbo_only=bbo_only,
+                depth=self.depth,
+                max_inflight_batches=self.max_inflight_batches,
+                heartbeat_interval=self.heartbeat_interval,
+                ticker_queue_size=self.ticker_queue_size,
+                exchange_configs={
+                    name: cfg for name, cfg in (exchange_configs or {}).items() if name in shard_exchanges
+                },
+            )
+            handle = _WorkerHandle(spec=spec)
+            self.workers[worker_id] = handle
+            self._spawn(handle)
+
+        self._supervisor_task = asyncio.create_task(self._supervisor_loop())
+        logger.info(
+            "✅ [多进程接入] 已启动 %d 个工作进程: %s",
+            len(self.workers),
+            {wid: h.spec.exchanges for wid, h in self.workers.items()},
+        )
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """停止所有工作进程"""
+        if not self.running:
+            return
+        self.running = False
+        if self._supervisor_task:
+            self._supervisor_task.cancel()
+            try:
+                await self._supervisor_task
+            except asyncio.CancelledError:
+                pass
+            self._supervisor_task = None
+
+        for handle in self.workers.values():
+            self._send(handle, (_MSG_STOP,))
+
+        deadline = time.monotonic() + timeout
+        for handle in self.workers.values():
+            process = handle.process
+            if process is None:
+                continue
+            while process.is_alive() and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            if process.is_alive():
+                logger.warning("⏱️  [多进程接入] %s 停止超时，强制终止", handle.spec.worker_id)
+                process.terminate()
+                process.join(1.0)
+            self._detach(handle)
+            handle.status = "stopped"
+            self._report(handle)
+        logger.info("🛑 [多进程接入] 所有工作进程已停止")
+
+    def _spawn(self, handle: _WorkerHandle) -> None:
+        parent_conn, child_conn = self._ctx.Pipe(duplex=True)
+        process = self._ctx.Process(
+            target=_ingest_worker_main,
+            args=(handle.spec, child_conn),
+            name=handle.spec.worker_id,
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+
+        handle.process = process
+        handle.conn = parent_conn
+        handle.started_at = time.time()
+        handle.last_heartbeat = 0.0
+        handle.status = "starting"
+        self._loop.add_reader(parent_conn.fileno(), self._on_readable, handle)
+        logger.info("🚀 [多进程接入] 工作进程 %s 已启动 (pid=%s)", handle.spec.worker_id, process.pid)
+
+    def _detach(self, handle: _WorkerHandle) -> None:
+        conn = handle.conn
+        if conn is None:
+            return
+        try:
+            self._loop.remove_reader(conn.fileno())
+        except Exception:
+            pass
+        try:
+            conn.close()
+        except Exception:
+            pass
+        handle.conn = None
+
+    def _send(self, handle: _WorkerHandle, message: tuple) -> None:
+        if handle.conn is None:
+            return
+        try:
+            handle.conn.send(message)
+        except (BrokenPipeError, EOFError, OSError):
+            pass
+
+    # ============= 接收 =============
+
+    def _on_readable(self, handle: _WorkerHandle) -> None:
+        """管道可读回调（事件循环线程）：每次最多处理若干条消息，避免长时间占用循环"""
+        conn = handle.conn
+        if conn is None:
+            return
+        acked = 0
+        try:
+            for _ in range(self.max_inflight_batches + 2):
+                if not conn.poll():
+                    break
+                kind, payload = conn.recv()
+                if kind == _MSG_BATCH:
+                    self._dispatch(payload)
+                    handle.batches_received += 1
+                    handle.records_received += len(payload)
+                    acked += 1
+                elif kind == _MSG_HEARTBEAT:
+                    handle.last_heartbeat = time.time()
+                    handle.last_stats = payload
+                    if handle.status != "alive":
+                        handle.status = "alive"
+                        self._report(handle)
+                elif kind == _MSG_ERROR:
+                    handle.last_error = payload
+                    logger.error("❌ [多进程接入] %s 异常退出: %s", handle.spec.worker_id, payload)
+        except (EOFError, OSError):
+            # 子进程已退出，交给监督任务处理重启
+            self._detach(handle)
+            return
+        if acked:
+            self._send(handle, (_MSG_ACK, acked))
+
+    def _dispatch(self, records: List[tuple]) -> None:
+        orderbook_queue = self.orderbook_queue
+        ticker_queue = self.ticker_queue
+        for record in records:
+            try:
+                if record[0] == _REC_ORDERBOOK:
+                    orderbook_queue.put_nowait(self._decode_orderbook(record))
+                    self.stats['orderbook_received'] += 1
+                else:
+                    item = self._decode_ticker(record)
+                    try:
+                        ticker_queue.put_nowait(item)
+                    except asyncio.QueueFull:
+                        # 与 DataReceiver 一致：丢弃最旧数据，保证实时性
+                        try:
+                            ticker_queue.get_nowait()
+                            ticker_queue.put_nowait(item)
+                        except Exception:
+                            pass
+                        self.stats['ticker_dropped'] += 1
+                    self.stats['ticker_received'] += 1
+            except Exception:
+                self.stats['decode_errors'] += 1
+
+    def _decode_orderbook(self, record: tuple) -> Dict[str, Any]:
+        _, exchange, symbol, bids, asks, exchange_ts, received_ts = record
+        bid_levels = [OrderBookLevel(price=Decimal(p), size=Decimal(s)) for p, s in bids]
+        ask_levels = [OrderBookLevel(price=Decimal(p), size=Decimal(s)) for p, s in asks]
+        received_at = datetime.fromtimestamp(received_ts)
+        exchange_timestamp = datetime.fromtimestamp(exchange_ts) if exchange_ts is not None else None
+
+        if self.bbo_only:
+            orderbook = TopOfBook(
+                symbol=symbol,
+                best_bid=bid_levels[0] if bid_levels else None,
+                best_ask=ask_levels[0] if ask_levels else None,
+                timestamp=exchange_timestamp or received_at,
+                exchange_timestamp=exchange_timestamp,
+                received_timestamp=received_at,
+            )
+        else:
+            orderbook = OrderBookData(
+                symbol=symbol,
+                bids=bid_levels,
+                asks=ask_levels,
+                timestamp=exchange_timestamp or received_at,
+                exchange_timestamp=exchange_timestamp,
+                received_timestamp=received_at,
+            )
+        return {
+            'exchange': exchange,
+            'symbol': symbol,
+            'data': orderbook,
+            'exchange_timestamp': exchange_timestamp,
+            'received_at': received_at,
+            'timestamp': received_at,  # 兼容旧字段
+        }
+
+    def _decode_ticker(self, record: tuple) -> Dict[str, Any]:
+        from core.services.market_data.protocol import ticker_from_dict
+
+        _, exchange, symbol, payload = record
+        return {
+            'exchange': exchange,
+            'symbol': symbol,
+            'data': ticker_from_dict(payload),
+            'timestamp': datetime.now(),
+        }
+
+    # ============= 监督 =============
+
+    async def _supervisor_loop(self) -> None:
+        try:
+            while self.running:
+                now = time.time()
+                for handle in self.workers.values():
+                    try:
+                        self._check_worker(handle, now)
+                    except Exception as e:
+                        logger.error("❌ [多进程接入] 检查 %s 失败: %s", handle.spec.worker_id, e)
+                await asyncio.sleep(self.heartbeat_interval)
+        except asyncio.CancelledError:
+            pass
+
+    def _check_worker(self, handle: _WorkerHandle, now: float) -> None:
+        process = handle.process
+        if process is not None and not process.is_alive():
+            if handle.status != "dead":
+                handle.status = "dead"
+                handle.next_restart_at = now + self.restart_backoff
+                self._detach(handle)
+                logger.warning(
+                    "⚠️  [多进程接入] %s 已退出 (exitcode=%s)，%.0f秒后重启",
+                    handle.spec.worker_id, process.exitcode, self.restart_backoff,
+                )
+                self._report(handle)
+            elif now >= handle.next_restart_at:
+                handle.restarts += 1
+                self.stats['worker_restarts'] += 1
+                self._spawn(handle)
+                self._report(handle)
+            return
+
+        last_seen = handle.last_heartbeat or handle.started_at
+        if handle.status == "alive" and now - last_seen > self.worker_timeout:
+            handle.status = "stalled"
+            logger.warning("⚠️  [多进程接入] %s 心跳超时 %.1f秒", handle.spec.worker_id, now - last_seen)
+        self._report(handle)
+
+    def _report(self, handle: _WorkerHandle) -> None:
+        if self.health_monitor is None:
+            return
+        try:
+            self.health_monitor.update_worker_status(handle.spec.worker_id, self._worker_info(handle))
+        except Exception:
+            pass
+
+    def _worker_info(self, handle: _WorkerHandle) -> Dict[str, Any]:
+        stats = handle.last_stats
+        heartbeat_age = time.time() - handle.last_heartbeat if handle.last_heartbeat else None
+        return {
+            'status': handle.status,
+            'pid': handle.process.pid if handle.process is not None else None,
+            'exchanges': list(handle.spec.exchanges),
+            'symbols': len(handle.spec.symbols),
+            'heartbeat_age': heartbeat_age,
+            'restarts': handle.restarts,
+            'batches_received': handle.batches_received,
+            'records_received': handle.records_received,
+            'inflight': stats.get('inflight', 0),
+            'credit_stalls': stats.get('credit_stalls', 0),
+            'coalesced': stats.get('coalesced', 0),
+            'unchanged_skipped': stats.get('unchanged_skipped', 0),
+            'local_pending': stats.get('local_pending', 0),
+            'cpu_seconds': stats.get('cpu_seconds'),
+            'last_error': handle.last_error,
+        }
+
+    # ============= 统计 =============
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息（键与 DataReceiver.get_stats 兼容，另含 workers 明细）"""
+        stats: Dict[str, Any] = dict(self.stats)
+        stats['workers'] = {wid: self._worker_info(handle) for wid, handle in self.workers.items()}
+        return stats
@@ -0,0 +1,432 @@
+"""
+共享内存 BBO 表（mmap + seqlock）
+
+DataProcessor 把每个 (交易所, 交易对) 的最优买卖价、数量、价差和资金费率写入一个
+固定布局的 mmap 文件；同机其它进程（UI、记录、执行）无锁、无序列化地轮询读取。
+
+布局（小端）：
+    头部 64 字节:
+        0   magic        8s   b"BBOTBL1\\0"
+        8   version      u32
+        12  record_size  u32
+        16  capacity     u32
+        20  writer_pid   u32
+        24  generation   u64  布局重置时更新（time_ns），读端据此重建索引
+        32  count        u64  已分配槽位数（槽位键写好之后才递增）
+    槽位 128 字节 × capacity:
+        0   seq          u64  seqlock 序号：奇数=写入中；seq // 2 = 更新次数
+        8   exchange     16s
+        24  symbol       32s
+        56  update_ns    u64  写入时间（time.time_ns）
+        64  exchange_ns  i64  交易所时间戳（0=未知）
+        72  bid, ask, bid_size, ask_size, spread, spread_pct, funding_rate   f64 × 7（缺失为 NaN）
+
+写端单线程（DataProcessor 所在事件循环），读端先读 seq、再读数据、再读 seq，
+两次相等且为偶数即为一致快照。槽位一经分配键不变，读端只需在 count 变化时增量建索引；
+写端重启时沿用已有表（槽位、序号、最后的值均保留），只有容量变化才重置布局并更新 generation。
+读端每次读取前后都比对 generation，布局重置后立即重建索引，不会读到其它交易对的槽位。
+
+本模块只依赖标准库，可单独拷贝给外部进程使用。
+"""
+
+import math
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+MAGIC = b"BBOTBL1\0"
+VERSION = 1
+HEADER_SIZE = 64
+RECORD_SIZE = 128
+DEFAULT_CAPACITY = 4096
+DEFAULT_PATH = "/dev/shm/arbitrage_bbo.tbl" if os.path.isdir("/dev/shm") else "data/shm/arbitrage_bbo.tbl"
+
+_HEADER = struct.Struct("<8sIIIIQQ")
+_COUNT = struct.Struct("<Q")
+_COUNT_OFFSET = 32
+_GENERATION = struct.Struct("<Q")
+_GENERATION_OFFSET = 24
+_SEQ = struct.Struct("<Q")
+_KEY = struct.Struct("<16s32s")
+_KEY_OFFSET = 8
+_PAYLOAD = struct.Struct("<Qqddddddd")
+_PAYLOAD_OFFSET = 56
+_PRICES = struct.Struct("<dd")
+_PRICES_OFFSET = 72
+
+_EXCHANGE_MAX = 16
+_SYMBOL_MAX = 32
+_NAN = float("nan")
+
+
+class BBORecord(NamedTuple):
+    """一条 BBO 快照（价格类字段缺失为 NaN）"""
+    exchange: str
+    symbol: str
+    updates: int
+    update_ns: int
+    exchange_ns: int
+    bid: float
+    ask: float
+    bid_size: float
+    ask_size: float
+    spread: float
+    spread_pct: float
+    funding_rate: float
+
+    @property
+    def age_seconds(self) -> float:
+        """距写入的时间（秒）"""
+        return (time.time_ns() - self.update_ns) / 1e9
+
+    @property
+    def mid(self) -> float:
+        return (self.bid + self.ask) / 2.0
+
+
+# 绕过 NamedTuple.__new__ 的关键字参数处理，读热路径直接构造
+_new_record = tuple.__new__
+
+
+def _decode_key(raw: bytes) -> str:
+    return raw.split(b"\0", 1)[0].decode("utf-8", errors="replace")
+
+
+class SharedBBOWriter:
+    """BBO 表写端（每个文件只允许一个写进程）"""
+
+    def __init__(self, path: str = DEFAULT_PATH, capacity: int = DEFAULT_CAPACITY):
+        """
+        Args:
+            path: 表文件路径（建议放在 /dev/shm 下）
+            capacity: 最大 (交易所, 交易对) 数量
+        """
+        self.path = path
+        self.capacity = int(capacity)
+        self.size = HEADER_SIZE + RECORD_SIZE * self.capacity
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 原地复用同一 inode：读端已有的映射在写端重启后仍然有效（容量变化时读端会重新映射）
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        reusable = self._is_reusable()
+        os.ftruncate(self._fd, self.size)
+        self._mm = mmap.mmap(self._fd, self.size, access=mmap.ACCESS_WRITE)
+
+        self._slots: Dict[Tuple[str, str], int] = {}
+        self._seqs: List[int] = []
+        # 每个槽位最近一次写入的数值 [bid, ask, bid_size, ask_size, funding_rate, exchange_ns]，
+        # 用于只更新部分字段（如资金费率）时重写整条记录
+        self._values: List[List[float]] = []
+        self.dropped_keys = 0
+
+        if reusable:
+            self._adopt()
+        else:
+            # 先发布新的 generation（count=0）再清空槽位：读端据此丢弃旧索引，不会把重新分配的槽位当成旧键
+            _HEADER.pack_into(
+                self._mm, 0, MAGIC, VERSION, RECORD_SIZE, self.capacity, os.getpid(), time.time_ns(), 0
+            )
+            self._mm[HEADER_SIZE:self.size] = bytes(self.size - HEADER_SIZE)
+
+    def _is_reusable(self) -> bool:
+        """已有文件布局与当前容量一致时沿用（读端索引保持有效）"""
+        if os.fstat(self._fd).st_size != self.size:
+            return False
+        header = os.pread(self._fd, _HEADER.size, 0)
+        magic, version, record_size, capacity, _, _, count = _HEADER.unpack(header)
+        return (
+            magic == MAGIC and version == VERSION and record_size == RECORD_SIZE
+            and capacity == self.capacity and count <= capacity
+        )
+
+    def _adopt(self) -> None:
+        """接管已有表：恢复槽位、序号和最后的值"""
+        mm = self._mm
+        magic, version, record_size, capacity, _, generation, count = _HEADER.unpack_from(mm, 0)
+        _HEADER.pack_into(mm, 0, magic, version, record_size, capacity, os.getpid(), generation, count)
+        for index in range(count):
+            offset = HEADER_SIZE + index * RECORD_SIZE
+            exchange_raw, symbol_raw = _KEY.unpack_from(mm, offset + _KEY_OFFSET)
+            seq = _SEQ.unpack_from(mm, offset)[0]
+            if seq & 1:
+                # 上一个写进程在写入中途退出：补成偶数，读端可继续读取
+                seq += 1
+                _SEQ.pack_into(mm, offset, seq)
+            _, exchange_ns, bid, ask, bid_size, ask_size, _, _, funding_rate = _PAYLOAD.unpack_from(
+                mm, offset + _PAYLOAD_OFFSET
+            )
+            self._slots[(_decode_key(exchange_raw), _decode_key(symbol_raw))] = index
+            self._seqs.append(seq)
+            self._values.append([bid, ask, bid_size, ask_size, funding_rate, exchange_ns])
+
+    def _allocate(self, exchange: str, symbol: str) -> Optional[int]:
+        index = len(self._seqs)
+        exchange_raw = exchange.encode("utf-8")
+        symbol_raw = symbol.encode("utf-8")
+        if index >= self.capacity or len(exchange_raw) > _EXCHANGE_MAX or len(symbol_raw) > _SYMBOL_MAX:
+            self.dropped_keys += 1
+            return None
+
+        offset = HEADER_SIZE + index * RECORD_SIZE
+        _KEY.pack_into(self._mm, offset + _KEY_OFFSET, exchange_raw, symbol_raw)
+        _PAYLOAD.pack_into(self._mm, offset + _PAYLOAD_OFFSET, 0, 0, _NAN, _NAN, _NAN, _NAN, _NAN, _NAN, _NAN)
+        self._seqs.append(0)
+        self._values.append([_NAN, _NAN, _NAN, _NAN, _NAN, 0])
+        # 键写完之后才发布 count
+        _COUNT.pack_into(self._mm, _COUNT_OFFSET, index + 1)
+        self._slots[(exchange, symbol)] = index
+        return index
+
+    def _write(self, index: int, values: List[float]) -> None:
+        bid, ask, bid_size, ask_size, funding_rate, exchange_ns = values
+        spread = ask - bid
+        mid = (ask + bid) / 2.0
+        spread_pct = spread / mid * 100.0 if mid > 0 else _NAN
+
+        mm = self._mm
+        offset = HEADER_SIZE + index * RECORD_SIZE
+        seq = self._seqs[index] + 1
+        _SEQ.pack_into(mm, offset, seq)                       # 奇数：写入中
+        _PAYLOAD.pack_into(
+            mm, offset + _PAYLOAD_OFFSET,
+            time.time_ns(), exchange_ns, bid, ask, bid_size, ask_size, spread, spread_pct, funding_rate,
+        )
+        _SEQ.pack_into(mm, offset, seq + 1)                   # 偶数：写入完成
+        self._seqs[index] = seq + 1
+
+    def _slot(self, exchange: str, symbol: str) -> Optional[int]:
+        index = self._slots.get((exchange, symbol))
+        if index is None:
+            index = self._allocate(exchange, symbol)
+        return index
+
+    def update(
+        self,
+        exchange: str,
+        symbol: str,
+        bid: float,
+        ask: float,
+        bid_size: float = _NAN,
+        ask_size: float = _NAN,
+        exchange_ns: int = 0,
+    ) -> bool:
+        """写入一条 BBO（资金费率沿用最近一次 update_funding 的值）"""
+        index = self._slot(exchange, symbol)
+        if index is None:
+            return False
+        values = self._values[index]
+        values[0] = bid
+        values[1] = ask
+        values[2] = bid_size
+        values[3] = ask_size
+        values[5] = exchange_ns
+        self._write(index, values)
+        return True
+
+    def update_funding(self, exchange: str, symbol: str, funding_rate: Optional[float]) -> bool:
+        """只更新资金费率（其余字段沿用最近一次写入）"""
+        index = self._slot(exchange, symbol)
+        if index is None:
+            return False
+        values = self._values[index]
+        values[4] = _NAN if funding_rate is None else funding_rate
+        self._write(index, values)
+        return True
+
+    def close(self, unlink: bool = False) -> None:
+        """关闭映射；unlink=True 时删除表文件（默认保留，读端仍可读到最后的值）"""
+        try:
+            self._mm.close()
+        finally:
+            os.close(self._fd)
+        if unlink:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+class SharedBBOReader:
+    """BBO 表读端（任意数量的进程可同时读取）"""
+
+    def __init__(self, path: str = DEFAULT_PATH, max_retries: int = 64):
+        """
+        Args:
+            path: 表文件路径
+            max_retries: 读到写入中的记录时的最大重试次数
+        """
+        self.path = path
+        self.max_retries = max_retries
+        self._fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._index: Dict[Tuple[str, str], int] = {}
+        self._indexed = 0
+        self._generation = 0
+        self._open()
+
+    def _open(self) -> None:
+        self.close()
+        self._fd = os.open(self.path, os.O_RDONLY)
+        size = os.fstat(self._fd).st_size
+        if size < HEADER_SIZE:
+            raise ValueError(f"BBO 表文件不完整: {self.path}")
+        self._mm = mmap.mmap(self._fd, size, access=mmap.ACCESS_READ)
+        magic, version, record_size, capacity, _, generation, _ = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"BBO 表格式不匹配: {self.path}")
+        if size < HEADER_SIZE + capacity * RECORD_SIZE:
+            raise ValueError(f"BBO 表大小与容量不符: {self.path}")
+        self._generation = generation
+        self._index.clear()
+        self._indexed = 0
+
+    def refresh(self) -> None:
+        """写端重启（generation 变化）时重建索引，并为新增槽位建索引"""
+        mm = self._mm
+        generation = _GENERATION.unpack_from(mm, _GENERATION_OFFSET)[0]
+        if generation != self._generation:
+            _, _, _, capacity, _, _, _ = _HEADER.unpack_from(mm, 0)
+            if len(mm) != HEADER_SIZE + capacity * RECORD_SIZE:
+                self._open()
+                mm = self._mm
+            else:
+                self._generation = generation
+                self._index.clear()
+                self._indexed = 0
+
+        count = _COUNT.unpack_from(mm, _COUNT_OFFSET)[0]
+        while self._indexed < count:
+            offset = HEADER_SIZE + self._indexed * RECORD_SIZE
+            exchange_raw, symbol_raw = _KEY.unpack_from(mm, offset + _KEY_OFFSET)
+            self._index[(_decode_key(exchange_raw), _decode_key(symbol_raw))] = offset
+            self._indexed += 1
+
+    def _layout_changed(self) -> bool:
+        """布局 generation 是否与当前索引不一致"""
+        return _GENERATION.unpack_from(self._mm, _GENERATION_OFFSET)[0] != self._generation
+
+    def _offset(self, exchange: str, symbol: str) -> Optional[int]:
+        """键对应的槽位偏移（布局变化或未命中时先刷新索引）"""
+        if self._layout_changed():
+            self.refresh()
+        offset = self._index.get((exchange, symbol))
+        if offset is None:
+            self.refresh()
+            offset = self._index.get((exchange, symbol))
+        return offset
+
+    def _read(self, exchange: str, symbol: str, offset: int) -> Optional[BBORecord]:
+        mm = self._mm
+        seq_unpack = _SEQ.unpack_from
+        payload_unpack = _PAYLOAD.unpack_from
+        payload_offset = offset + _PAYLOAD_OFFSET
+        retries = self.max_retries
+        while retries:
+            retries -= 1
+            seq = seq_unpack(mm, offset)[0]
+            if seq & 1:
+                continue
+            payload = payload_unpack(mm, payload_offset)
+            if seq_unpack(mm, offset)[0] == seq:
+                return _new_record(BBORecord, (exchange, symbol, seq >> 1) + payload)
+        return None
+
+    def get_bbo(self, exchange: str, symbol: str) -> Optional[Tuple[float, float]]:
+        """热路径：只读取 (bid, ask)；盘口未写入过（含只写过资金费率）或持续写冲突时返回 None"""
+        for _ in range(2):
+            offset = self._offset(exchange, symbol)
+            if offset is None:
+                return None
+            mm = self._mm
+            seq_unpack = _SEQ.unpack_from
+            prices = None
+            retries = self.max_retries
+            while retries:
+                retries -= 1
+                seq = seq_unpack(mm, offset)[0]
+                if seq & 1:
+                    continue
+                candidate = _PRICES.unpack_from(mm, offset + _PRICES_OFFSET)
+                if seq_unpack(mm, offset)[0] == seq:
+                    prices = candidate if seq else None
+                    break
+            if self._layout_changed():
+                # 读取期间布局被重置：该偏移可能已属于其它交易对，重建索引后重读
+                continue
+            if prices is None or prices[0] != prices[0] or prices[1] != prices[1]:
+                return None
+            return prices
+        return None
+
+    def get(self, exchange: str, symbol: str) -> Optional[BBORecord]:
+        """读取一条一致快照；未写入过或持续写冲突时返回 None"""
+        for _ in range(2):
+            offset = self._offset(exchange, symbol)
+            if offset is None:
+                return None
+            record = self._read(exchange, symbol, offset)
+            if self._layout_changed():
+                continue
+            if record is None or record.updates == 0:
+                return None
+            return record
+        return None
+
+    def keys(self) -> List[Tuple[str, str]]:
+        """当前表中的全部 (交易所, 交易对)"""
+        self.refresh()
+        return list(self._index)
+
+    def snapshot(self) -> Dict[Tuple[str, str], BBORecord]:
+        """读取全表"""
+        self.refresh()
+        result: Dict[Tuple[str, str], BBORecord] = {}
+        for (exchange, symbol), offset in self._index.items():
+            record = self._read(exchange, symbol, offset)
+            if record is not None and record.updates:
+                result[(exchange, symbol)] = record
+        return result
+
+    def iter_symbol(self, symbol: str) -> Iterator[BBORecord]:
+        """遍历某交易对在各交易所的记录"""
+        for exchange, key_symbol in self.keys():
+            if key_symbol == symbol:
+                record = self.get(exchange, symbol)
+                if record is not None:
+                    yield record
+
+    def writer_alive(self) -> bool:
+        """写进程是否仍在运行（同一 PID 命名空间内有效）"""
+        pid = _HEADER.unpack_from(self._mm, 0)[4]
+        try:
+            os.kill(pid, 0)
+            return True
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def safe_float(value) -> float:
+    """Decimal / None → float（None 与非法值为 NaN）"""
+    if value is None:
+        return _NAN
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return _NAN
+    return result if not math.isinf(result) else _NAN
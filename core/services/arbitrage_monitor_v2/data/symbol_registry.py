@@ -0,0 +1,264 @@
+"""
+交易对注册表 - 启动时把 (交易所, 原生符号) 一次性映射为整数 ID
+
+行情热路径上每条消息原本都要走 SimpleSymbolConverter.convert_from_exchange
++ 字符串替换/upper，下游再按 (交易所字符串, 交易对字符串) 做多层 dict 查找。
+
+本模块：
+- 启动时从 config/symbol_conversion.yaml（经 SimpleSymbolConverter 合并的直接映射表）
+  和 config/exchanges/*_markets.json 预先注册所有已知原生符号
+- 每个交易所一张 {原生符号: SymbolKey} 表，回调里只需一次 dict 命中
+- 交易所/标准交易对各自分配从 0 开始的连续整数 ID，下游可以按下标直接取数组
+- 未预注册的符号首次出现时按原规则转换后登记，之后同样只需一次 dict 命中
+
+标准符号字符串经过 sys.intern，同一交易对在各层共享同一个字符串对象。
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MARKETS_DIR = Path("config/exchanges")
+
+
+class SymbolKey(NamedTuple):
+    """(交易所, 标准交易对) 的整数键及其字符串形式"""
+    exchange_id: int
+    symbol_id: int
+    exchange: str
+    symbol: str
+
+
+def normalize_symbol(converter, symbol: str, exchange: str) -> str:
+    """
+    将任意格式的交易对转换为系统标准格式（BTC-USDC-PERP）
+
+    与 DataReceiver 原有的逐消息转换规则一致，只在注册表未命中时调用。
+    """
+    normalized = symbol
+    try:
+        normalized = converter.convert_from_exchange(symbol, exchange)
+    except Exception:
+        normalized = symbol
+
+    if not normalized:
+        return symbol
+
+    candidate = normalized.replace('/', '-').replace(':', '-')
+    return candidate.upper()
+
+
+class SymbolRegistry:
+    """
+    交易对注册表（进程内共享，见 get_symbol_registry）
+
+    Args:
+        normalizer: 原生符号 -> 标准符号的转换函数 (symbol, exchange) -> str
+    """
+
+    def __init__(self, normalizer: Optional[Callable[[str, str], str]] = None):
+        self._normalizer = normalizer
+        # ID -> 名称（下标即 ID）
+        self.exchanges: List[str] = []
+        self.symbols: List[str] = []
+        # 名称 -> ID
+        self._exchange_ids: Dict[str, int] = {}
+        self._symbol_ids: Dict[str, int] = {}
+        # {exchange: {原生符号或标准符号: SymbolKey}}
+        self._native: Dict[str, Dict[str, SymbolKey]] = {}
+        # [exchange_id][symbol_id] -> SymbolKey（按需扩展）
+        self._keys: List[List[Optional[SymbolKey]]] = []
+        self._loaded = False
+
+    # ============= ID 分配 =============
+
+    def exchange_id(self, exchange: str) -> int:
+        """交易所 ID（首次出现时分配）"""
+        eid = self._exchange_ids.get(exchange)
+        if eid is None:
+            exchange = sys.intern(exchange)
+            eid = len(self.exchanges)
+            self.exchanges.append(exchange)
+            self._exchange_ids[exchange] = eid
+            self._keys.append([])
+            self._native.setdefault(exchange, {})
+        return eid
+
+    def symbol_id(self, symbol: str) -> int:
+        """标准交易对 ID（首次出现时分配）"""
+        sid = self._symbol_ids.get(symbol)
+        if sid is None:
+            symbol = sys.intern(symbol)
+            sid = len(self.symbols)
+            self.symbols.append(symbol)
+            self._symbol_ids[symbol] = sid
+        return sid
+
+    def find_exchange_id(self, exchange: str) -> Optional[int]:
+        """查询交易所 ID（不分配）"""
+        return self._exchange_ids.get(exchange)
+
+    def find_symbol_id(self, symbol: str) -> Optional[int]:
+        """查询标准交易对 ID（不分配）"""
+        return self._symbol_ids.get(symbol)
+
+    def key(self, exchange: str, symbol: str) -> SymbolKey:
+        """(交易所, 标准交易对) 的 SymbolKey（首次出现时分配）"""
+        eid = self.exchange_id(exchange)
+        sid = self.symbol_id(symbol)
+        row = self._keys[eid]
+        if sid >= len(row):
+            row.extend([None] * (sid + 1 - len(row)))
+        key = row[sid]
+        if key is None:
+            key = SymbolKey(eid, sid, self.exchanges[eid], self.symbols[sid])
+            row[sid] = key
+        return key
+
+    @property
+    def exchange_count(self) -> int:
+        return len(self.exchanges)
+
+    @property
+    def symbol_count(self) -> int:
+        return len(self.symbols)
+
+    # ============= 原生符号解析 =============
+
+    def native_table(self, exchange: str) -> Dict[str, SymbolKey]:
+        """
+        交易所的 {原生符号: SymbolKey} 表
+
+        返回的是注册表内部的同一个 dict 对象，之后登记的符号也会出现在其中，
+        回调可以在创建时取一次并长期持有。
+        """
+        self.exchange_id(exchange)
+        return self._native[exchange]
+
+    def register_native(self, exchange: str, native_symbol: str, symbol: str) -> SymbolKey:
+        """登记一个原生符号对应的标准交易对"""
+        key = self.key(exchange, symbol)
+        table = self._native[key.exchange]
+        table[native_symbol] = key
+        # 标准符号本身也可能直接出现在回调里（适配器已转换过）
+        table.setdefault(key.symbol, key)
+        return key
+
+    def resolve(self, exchange: str, native_symbol: str) -> SymbolKey:
+        """
+        原生符号 -> SymbolKey
+
+        命中时只是一次 dict 查找；未命中时按转换规则得到标准符号并登记。
+        """
+        table = self._native.get(exchange)
+        if table is not None:
+            key = table.get(native_symbol)
+            if key is not None:
+                return key
+        symbol = native_symbol
+        if self._normalizer is not None:
+            symbol = self._normalizer(native_symbol, exchange)
+        return self.register_native(exchange, native_symbol, symbol)
+
+    # ============= 启动预加载 =============
+
+    def preload(
+        self,
+        direct_mapping: Optional[Dict[str, Dict[str, str]]] = None,
+        markets_dir: Optional[Path] = None,
+    ) -> int:
+        """
+        预先注册已知符号
+
+        Args:
+            direct_mapping: {exchange: {标准符号: 原生符号}}（SimpleSymbolConverter.DIRECT_MAPPING，
+                            已合并 symbol_conversion.yaml 中的 standard_to_exchange）
+            markets_dir: 市场列表目录（读取其中的 <exchange>_markets.json）
+
+        Returns:
+            本次注册的原生符号数量
+        """
+        count = 0
+        for exchange, mappings in (direct_mapping or {}).items():
+            if not isinstance(mappings, dict):
+                continue
+            for native_symbol in mappings.values():
+                if native_symbol:
+                    self.resolve(exchange, native_symbol)
+                    count += 1
+
+        markets_dir = Path(markets_dir) if markets_dir is not None else DEFAULT_MARKETS_DIR
+        if markets_dir.is_dir():
+            for path in sorted(markets_dir.glob("*_markets.json")):
+                exchange = path.name[:-len("_markets.json")]
+                try:
+                    with path.open("r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except Exception as e:
+                    logger.warning(f"⚠️ [交易对注册表] 读取 {path} 失败: {e}")
+                    continue
+                for native_symbol in _iter_market_symbols(data):
+                    self.resolve(exchange, native_symbol)
+                    count += 1
+
+        self._loaded = True
+        logger.info(
+            f"✅ [交易对注册表] 预注册 {count} 个原生符号: "
+            f"{self.exchange_count} 个交易所, {self.symbol_count} 个标准交易对"
+        )
+        return count
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'exchanges': self.exchange_count,
+            'symbols': self.symbol_count,
+            'native_symbols': sum(len(table) for table in self._native.values()),
+        }
+
+
+def _iter_market_symbols(data) -> Iterable[str]:
+    """从 <exchange>_markets.json 中提取原生符号（markets 可以是列表或以符号为键的字典）"""
+    if not isinstance(data, dict):
+        return
+    markets = data.get("markets")
+    if isinstance(markets, dict):
+        for name, info in markets.items():
+            symbol = info.get("symbol") if isinstance(info, dict) else None
+            yield str(symbol or name)
+    elif isinstance(markets, list):
+        for info in markets:
+            if isinstance(info, dict) and info.get("symbol"):
+                yield str(info["symbol"])
+
+
+_registry: Optional[SymbolRegistry] = None
+
+
+def get_symbol_registry() -> SymbolRegistry:
+    """
+    获取进程内共享的交易对注册表（首次调用时从配置预加载）
+
+    DataReceiver / DataProcessor / SpreadCalculator / 历史记录器共用同一份 ID 分配。
+    """
+    global _registry
+    if _registry is None:
+        from core.services.arbitrage_monitor.utils.symbol_converter import SimpleSymbolConverter
+
+        converter = SimpleSymbolConverter()
+        registry = SymbolRegistry(
+            normalizer=lambda symbol, exchange: normalize_symbol(converter, symbol, exchange)
+        )
+        try:
+            registry.preload(direct_mapping=converter.DIRECT_MAPPING)
+        except Exception as e:
+            logger.warning(f"⚠️ [交易对注册表] 预加载失败，改为按需注册: {e}")
+        _registry = registry
+    return _registry
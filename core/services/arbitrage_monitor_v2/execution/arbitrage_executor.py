@@ -45,6 +45,7 @@ from ..risk_control.network_state import (
 )
 from core.adapters.exchanges.interface import ExchangeInterface
 from core.adapters.exchanges.models import OrderData, OrderStatus, OrderSide, OrderType
+from core.adapters.exchanges.utils.rate_limiter import get_rate_limiter
 from ..state.symbol_state_manager import SymbolStateManager
 
 # 🔥 使用统一日志系统
@@ -2076,6 +2077,9 @@ class ArbitrageExecutor:
         limiter = self._get_rate_limiter(exchange_name)
         if limiter:
             limiter.register_cooldown(wait_seconds)
+        if exchange_name:
+            # 同步给适配器层共享的 REST 令牌桶，其它组件的查询也一起暂停
+            get_rate_limiter(exchange_name).register_cooldown(wait_seconds)
 
     def _get_rate_limit_default_cooldown(
         self,
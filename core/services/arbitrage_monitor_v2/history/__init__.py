@@ -7,18 +7,30 @@
 - 异步批量写入
 - 数据查询接口
 - 历史数据计算（内存计算结果）
+- 共享数据库存储层（长连接 + WAL + 读连接池）
+- 滑动窗口增量统计（天然价差增量模式）
+- 列式归档（按天/代币分区，长周期区间查询）
 """
 
+from .history_storage import HistoryStorage, get_history_storage
 from .spread_history_recorder import SpreadHistoryRecorder
 from .spread_history_reader import SpreadHistoryReader
 from .chart_generator import ChartGenerator
 from .history_calculator import HistoryDataCalculator, ExchangePairResult
+from .rolling_stats import RollingWindow, DirectionRollingStats
+from .columnar_archive import SpreadColumnarArchive, ARCHIVE_COLUMNS
 
 __all__ = [
+    'HistoryStorage',
+    'get_history_storage',
     'SpreadHistoryRecorder',
     'SpreadHistoryReader',
     'ChartGenerator',
     'HistoryDataCalculator',
     'ExchangePairResult',
+    'RollingWindow',
+    'DirectionRollingStats',
+    'SpreadColumnarArchive',
+    'ARCHIVE_COLUMNS',
 ]
 
@@ -500,6 +500,79 @@ class ChartGenerator:
         else:
             return self.create_spread_chart(df, symbol)
     
+    def create_archive_spread_chart(
+        self,
+        symbol: str,
+        days: float = 30,
+        exchange_buy: Optional[str] = None,
+        exchange_sell: Optional[str] = None,
+        column: str = 'spread_pct',
+        max_points_per_direction: int = 5000,
+        title: Optional[str] = None
+    ) -> go.Figure:
+        """
+        从列式归档创建长周期价差走势图（直接使用 NumPy 数组，不构建 DataFrame）
+        
+        Args:
+            symbol: 代币符号
+            days: 最近N天
+            exchange_buy: 买入交易所（可选）
+            exchange_sell: 卖出交易所（可选）
+            column: 绘制的列（默认 spread_pct）
+            max_points_per_direction: 每个方向最多绘制的点数（超过时等间隔抽样）
+            title: 图表标题（可选）
+            
+        Returns:
+            Plotly图表对象
+        """
+        data = self.reader.query_archive(
+            symbol, exchange_buy, exchange_sell, days=days, columns=(column,)
+        )
+        
+        fig = go.Figure()
+        if not data:
+            fig.add_annotation(
+                text="暂无归档数据",
+                xref="paper", yref="paper",
+                x=0.5, y=0.5, showarrow=False,
+                font=dict(size=20, color='white')
+            )
+            fig.update_layout(
+                plot_bgcolor='#1e1e1e',
+                paper_bgcolor='#1e1e1e'
+            )
+            return fig
+        
+        colors = ['#00ff00', '#00ffff', '#ff00ff', '#ffff00', '#ff8800', '#ff0088', '#0088ff']
+        for idx, ((buy, sell), arrays) in enumerate(sorted(data.items())):
+            timestamps = arrays['timestamp']
+            values = arrays[column]
+            # 🔥 长周期数据等间隔抽样，控制图表点数
+            step = max(1, len(timestamps) // max(1, max_points_per_direction))
+            fig.add_trace(go.Scattergl(
+                x=timestamps[::step],
+                y=values[::step],
+                mode='lines',
+                name=f"{buy}买→{sell}卖",
+                line=dict(color=colors[idx % len(colors)], width=1)
+            ))
+        
+        fig.update_layout(
+            title=title or f'{symbol} 最近{days:g}天价差走势（归档）',
+            xaxis_title='时间',
+            yaxis_title='价差 (%)' if column == 'spread_pct' else column,
+            hovermode='x unified',
+            plot_bgcolor='#1e1e1e',
+            paper_bgcolor='#1e1e1e',
+            font=dict(color='white'),
+            yaxis=dict(
+                autorange=True,
+                automargin=True
+            )
+        )
+        
+        return fig
+    
     def create_funding_rate_chart(
         self,
         df: pd.DataFrame,
@@ -0,0 +1,325 @@
+"""
+价差历史列式归档
+
+职责：
+- 将每日价差采样数据转换为列式归档（按天、按代币分区）
+- 支持列投影 + 分区裁剪的区间查询，长周期分析无需解压/解析CSV
+
+目录结构：
+    {root}/{YYYY-MM-DD}/manifest.json             # 分区清单（写入完成标记）
+    {root}/{YYYY-MM-DD}/{symbol}/index.json       # 方向 → [start, end) 行区间
+    {root}/{YYYY-MM-DD}/{symbol}/timestamp.npy    # datetime64[ms]
+    {root}/{YYYY-MM-DD}/{symbol}/{column}.npy     # float64（缺失值为 NaN）
+
+同一代币分区内的数据按 (方向, 时间) 排序，单个方向是连续行区间；
+查询时以 mmap 方式打开列文件，只读取命中方向、命中时间段的切片。
+"""
+
+import json
+import logging
+import shutil
+from collections import defaultdict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.adapters.exchanges.utils.setup_logging import LoggingConfig
+
+logger = LoggingConfig.setup_logger(
+    name=__name__,
+    log_file='spread_history.log',
+    console_formatter=None,
+    file_formatter='detailed',
+    level=logging.INFO
+)
+logger.propagate = False
+
+# 归档的数值列（与 spread_history_sampled 表 / CSV 列一致）
+ARCHIVE_COLUMNS: Tuple[str, ...] = (
+    'price_buy',
+    'price_sell',
+    'spread_pct',
+    'funding_rate_buy',
+    'funding_rate_sell',
+    'funding_rate_diff',
+    'funding_rate_diff_annual',
+    'size_buy',
+    'size_sell',
+)
+
+DateLike = Union[str, date, datetime, np.datetime64]
+
+
+def _direction_key(exchange_buy: str, exchange_sell: str) -> str:
+    return f"{exchange_buy}|{exchange_sell}"
+
+
+def _partition_name(symbol: str) -> str:
+    """代币 → 分区目录名（避免路径分隔符）"""
+    return symbol.replace('/', '_').replace('\\', '_')
+
+
+def _to_datetime64(value: DateLike) -> np.datetime64:
+    if isinstance(value, np.datetime64):
+        return value.astype('datetime64[ms]')
+    if isinstance(value, (datetime, date)):
+        return np.datetime64(value.isoformat(), 'ms')
+    return np.datetime64(str(value).replace(' ', 'T', 1), 'ms')
+
+
+def _to_float(value: Any) -> float:
+    if value is None or value == '':
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class SpreadColumnarArchive:
+    """按天/代币分区的列式价差归档"""
+
+    def __init__(self, root: str = "data/spread_history/columnar"):
+        """
+        Args:
+            root: 归档根目录
+        """
+        self.root = Path(root)
+
+    # ============= 写入 =============
+
+    def has_day(self, day: date) -> bool:
+        """该日分区是否已完整写入"""
+        return (self.root / day.isoformat() / "manifest.json").exists()
+
+    def list_days(self) -> List[date]:
+        """已归档的日期（升序）"""
+        if not self.root.exists():
+            return []
+        days = []
+        for path in self.root.iterdir():
+            if not (path / "manifest.json").exists():
+                continue
+            try:
+                days.append(date.fromisoformat(path.name))
+            except ValueError:
+                continue
+        return sorted(days)
+
+    def write_day(self, day: date, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        写入（覆盖）单日分区
+
+        Args:
+            day: 日期
+            records: 样本记录（字段同 spread_history_sampled，timestamp 为 ISO 字符串）
+
+        Returns:
+            写入的行数（时间戳无法解析/超出范围的行会被跳过并记录日志，不影响当天其余数据）
+        """
+        # symbol → direction → [timestamps], {column: [values]}
+        grouped: Dict[str, Dict[Tuple[str, str], Tuple[List[np.datetime64], Dict[str, List[float]]]]] = defaultdict(dict)
+        skipped = 0
+        first_bad: Optional[Any] = None
+        # 允许前后一天的时区偏差，超出该范围视为脏数据
+        day_start = np.datetime64(day.isoformat(), 'ms')
+        lower = day_start - np.timedelta64(1, 'D')
+        upper = day_start + np.timedelta64(2, 'D')
+        for record in records:
+            symbol = record.get('symbol')
+            timestamp = record.get('timestamp')
+            if not symbol or not timestamp:
+                continue
+            try:
+                ts = _to_datetime64(timestamp)
+            except (TypeError, ValueError, OverflowError):
+                ts = None
+            if ts is None or np.isnat(ts) or not (lower <= ts < upper):
+                skipped += 1
+                if first_bad is None:
+                    first_bad = timestamp
+                continue
+            direction = (record.get('exchange_buy', ''), record.get('exchange_sell', ''))
+            bucket = grouped[symbol].get(direction)
+            if bucket is None:
+                bucket = ([], {column: [] for column in ARCHIVE_COLUMNS})
+                grouped[symbol][direction] = bucket
+            bucket[0].append(ts)
+            for column in ARCHIVE_COLUMNS:
+                bucket[1][column].append(_to_float(record.get(column)))
+
+        if skipped:
+            logger.warning(
+                f"⚠️  [列式归档] {day.isoformat()} 跳过 {skipped} 行无效时间戳（首个: {first_bad!r}）"
+            )
+
+        # 写入临时目录后整体替换，读取方不会看到写了一半的分区
+        final_dir = self.root / day.isoformat()
+        tmp_dir = self.root / f".{day.isoformat()}.tmp"
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        total_rows = 0
+        symbols_manifest: Dict[str, int] = {}
+        for symbol, directions in grouped.items():
+            part_dir = tmp_dir / _partition_name(symbol)
+            part_dir.mkdir()
+
+            timestamps_parts = []
+            column_parts: Dict[str, List[np.ndarray]] = {column: [] for column in ARCHIVE_COLUMNS}
+            index: Dict[str, List[int]] = {}
+            offset = 0
+            for (exchange_buy, exchange_sell) in sorted(directions):
+                stamps, values = directions[(exchange_buy, exchange_sell)]
+                ts = np.array(stamps, dtype='datetime64[ms]')
+                order = np.argsort(ts, kind='stable')
+                timestamps_parts.append(ts[order])
+                for column in ARCHIVE_COLUMNS:
+                    column_parts[column].append(np.asarray(values[column], dtype=np.float64)[order])
+                index[_direction_key(exchange_buy, exchange_sell)] = [offset, offset + len(ts)]
+                offset += len(ts)
+
+            np.save(part_dir / "timestamp.npy", np.concatenate(timestamps_parts))
+            for column in ARCHIVE_COLUMNS:
+                np.save(part_dir / f"{column}.npy", np.concatenate(column_parts[column]))
+            with open(part_dir / "index.json", 'w', encoding='utf-8') as f:
+                json.dump({'symbol': symbol, 'rows': offset, 'directions': index}, f, ensure_ascii=False)
+
+            symbols_manifest[symbol] = offset
+            total_rows += offset
+
+        with open(tmp_dir / "manifest.json", 'w', encoding='utf-8') as f:
+            json.dump(
+                {
+                    'date': day.isoformat(),
+                    'rows': total_rows,
+                    'columns': list(ARCHIVE_COLUMNS),
+                    'symbols': symbols_manifest,
+                    'created_at': datetime.now().isoformat(),
+                },
+                f,
+                ensure_ascii=False,
+            )
+
+        if final_dir.exists():
+            shutil.rmtree(final_dir)
+        tmp_dir.rename(final_dir)
+        return total_rows
+
+    # ============= 查询 =============
+
+    def iter_chunks(
+        self,
+        symbol: str,
+        exchange_buy: Optional[str] = None,
+        exchange_sell: Optional[str] = None,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        columns: Sequence[str] = ('spread_pct',),
+    ) -> Iterator[Tuple[date, str, str, Dict[str, np.ndarray]]]:
+        """
+        按 (日期, 方向) 逐块读取归档数据
+
+        分区裁剪：只打开 [start, end] 覆盖的日期分区中该代币的目录，
+        并只读取命中方向的行区间；列投影：只打开 columns 指定的列文件。
+
+        Args:
+            symbol: 代币符号
+            exchange_buy: 买入交易所（None 表示不限）
+            exchange_sell: 卖出交易所（None 表示不限）
+            start: 开始时间（含）
+            end: 结束时间（含）
+            columns: 需要的数值列
+
+        Yields:
+            (日期, exchange_buy, exchange_sell, {'timestamp': ..., column: ...})
+        """
+        unknown = [column for column in columns if column not in ARCHIVE_COLUMNS]
+        if unknown:
+            raise ValueError(f"未知的归档列: {unknown}")
+
+        start_ts = _to_datetime64(start) if start is not None else None
+        end_ts = _to_datetime64(end) if end is not None else None
+        start_day = start_ts.astype('datetime64[D]').item() if start_ts is not None else None
+        end_day = end_ts.astype('datetime64[D]').item() if end_ts is not None else None
+
+        for day in self.list_days():
+            if start_day is not None and day < start_day:
+                continue
+            if end_day is not None and day > end_day:
+                continue
+
+            part_dir = self.root / day.isoformat() / _partition_name(symbol)
+            index_file = part_dir / "index.json"
+            if not index_file.exists():
+                continue
+            with open(index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)['directions']
+
+            timestamps = None
+            column_maps: Dict[str, np.ndarray] = {}
+            for direction, (row_start, row_end) in index.items():
+                buy, sell = direction.split('|', 1)
+                if exchange_buy is not None and buy != exchange_buy:
+                    continue
+                if exchange_sell is not None and sell != exchange_sell:
+                    continue
+
+                if timestamps is None:
+                    timestamps = np.load(part_dir / "timestamp.npy", mmap_mode='r')
+                ts = timestamps[row_start:row_end]
+                lo = int(np.searchsorted(ts, start_ts, side='left')) if start_ts is not None else 0
+                hi = int(np.searchsorted(ts, end_ts, side='right')) if end_ts is not None else len(ts)
+                if hi <= lo:
+                    continue
+
+                chunk: Dict[str, np.ndarray] = {'timestamp': np.array(ts[lo:hi])}
+                for column in columns:
+                    data = column_maps.get(column)
+                    if data is None:
+                        data = np.load(part_dir / f"{column}.npy", mmap_mode='r')
+                        column_maps[column] = data
+                    chunk[column] = np.array(data[row_start + lo:row_start + hi])
+                yield day, buy, sell, chunk
+
+    def query(
+        self,
+        symbol: str,
+        exchange_buy: Optional[str] = None,
+        exchange_sell: Optional[str] = None,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        columns: Sequence[str] = ('spread_pct',),
+    ) -> Dict[Tuple[str, str], Dict[str, np.ndarray]]:
+        """
+        区间查询，按方向拼接结果
+
+        Returns:
+            {(exchange_buy, exchange_sell): {'timestamp': ndarray, column: ndarray}}
+        """
+        parts: Dict[Tuple[str, str], List[Dict[str, np.ndarray]]] = defaultdict(list)
+        for _, buy, sell, chunk in self.iter_chunks(symbol, exchange_buy, exchange_sell, start, end, columns):
+            parts[(buy, sell)].append(chunk)
+
+        result: Dict[Tuple[str, str], Dict[str, np.ndarray]] = {}
+        for direction, chunks in parts.items():
+            result[direction] = {
+                key: np.concatenate([chunk[key] for chunk in chunks])
+                for key in chunks[0]
+            }
+        return result
+
+    def list_symbols(self, day: Optional[date] = None) -> List[str]:
+        """已归档的代币（指定日期或全部日期）"""
+        days = [day] if day is not None else self.list_days()
+        symbols = set()
+        for d in days:
+            manifest = self.root / d.isoformat() / "manifest.json"
+            if not manifest.exists():
+                continue
+            with open(manifest, 'r', encoding='utf-8') as f:
+                symbols.update(json.load(f).get('symbols', {}).keys())
+        return sorted(symbols)
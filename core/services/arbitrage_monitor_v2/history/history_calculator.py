@@ -18,16 +18,22 @@
 - 计算结果存储：内存存储，O(1)查询
 - 动态时间窗口：3分钟 - 24小时
 - 更新频率：跟随存储频率（每次存储后立即计算）
+- 批量模式（默认）：每轮一次按方向有序扫描，NumPy 计算所有方向的统计量
+- 增量模式：由历史记录器在写入样本时推送，按方向维护滑动窗口统计量，
+  启动时从数据库预热一次，之后每个样本增量更新（有序窗口插入/移除为 O(n) 搬移，
+  其余统计量 O(1)），结果持续可用
 """
 
 import asyncio
 import logging
 import statistics
-from typing import Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from pathlib import Path
 
+import numpy as np
+
 try:
     import aiosqlite
 except ImportError:
@@ -35,6 +41,8 @@ except ImportError:
 
 # 🔥 使用统一日志系统
 from core.adapters.exchanges.utils.setup_logging import LoggingConfig
+from .history_storage import get_history_storage
+from .rolling_stats import DirectionRollingStats
 
 logger = LoggingConfig.setup_logger(
     name=__name__,
@@ -83,7 +91,10 @@ class HistoryDataCalculator:
         spread_stability_threshold: float = 0.5,
         spread_extreme_ratio: float = 0.15,
         spread_extreme_multiplier: float = 2.0,
-        enable_shared_memory: bool = True  # 🔥 新增：是否启用共享内存文件
+        enable_shared_memory: bool = True,  # 🔥 新增：是否启用共享内存文件
+        batch_mode: bool = True,
+        batch_fetch_size: int = 5000,
+        incremental_mode: bool = False
     ):
         """
         初始化历史数据计算器
@@ -104,11 +115,20 @@ class HistoryDataCalculator:
             spread_stability_threshold: 价差波动系数阈值
             spread_extreme_ratio: 价差极端波动次数占比阈值
             spread_extreme_multiplier: 价差极端波动倍数
+            
+            batch_mode: 批量模式（每轮一次有序扫描 + NumPy 计算全部方向）；
+                        关闭后回退为逐方向查询
+            batch_fetch_size: 批量模式下每次从游标读取的行数
+            incremental_mode: 增量模式（需通过 attach_recorder 接入历史记录器的样本推送，
+                              未接入时仍按 batch_mode 定时从数据库计算）
         """
         if aiosqlite is None:
             raise ImportError("aiosqlite未安装，无法使用历史数据计算功能。请运行: pip install aiosqlite")
         
         self.db_path = Path(db_path)
+        # 🔥 共享存储层：读连接池复用，避免每个交易所方向新建连接
+        self.storage = get_history_storage(str(self.db_path))
+        self._storage_acquired = False
         self.update_interval_minutes = update_interval_minutes
         self.max_history_hours = max_history_hours
         self.min_data_points = min_data_points
@@ -138,6 +158,18 @@ class HistoryDataCalculator:
         self.update_task: Optional[asyncio.Task] = None
         self.running = False
         
+        # 🔥 批量计算配置
+        self.batch_mode = batch_mode
+        self.batch_fetch_size = max(1, int(batch_fetch_size))
+        
+        # 🔥 增量计算：键为 (symbol, exchange_buy, exchange_sell)
+        self.incremental_mode = incremental_mode
+        self._rolling: Dict[Tuple[str, str, str], DirectionRollingStats] = {}
+        self._feed_attached = False
+        self._warmed = False
+        self._warming = False
+        self._pending_samples: List[dict] = []
+        
         # 🔥 共享内存文件配置
         self.enable_shared_memory = enable_shared_memory
         self.shared_memory_path = Path("data/spread_history/calculator_results.json")
@@ -147,6 +179,10 @@ class HistoryDataCalculator:
         logger.info(f"⏱️  [天然价差] 更新间隔: {self.update_interval_minutes}分钟（跟随存储频率）")
         logger.info(f"📊 [天然价差] 动态时间窗口: {self.min_runtime_minutes}分钟 - {self.max_history_hours}小时")
         logger.info(f"🔢 [天然价差] 最少数据点: {self.min_data_points}")
+        logger.info(
+            f"⚡ [天然价差] 计算模式: "
+            f"{'增量滑动窗口' if self.incremental_mode else ('批量扫描(NumPy)' if self.batch_mode else '逐方向查询')}"
+        )
         logger.info(
             f"🕐 [天然价差] 进程启动时间: {self.process_start_time.strftime('%Y-%m-%d %H:%M:%S')} "
             f"(历史窗口基准: 最近 {self.max_history_hours} 小时)"
@@ -176,6 +212,11 @@ class HistoryDataCalculator:
         if self.running:
             return
         
+        # 登记为共享存储的使用方（停止时释放）
+        if not self._storage_acquired:
+            self.storage.acquire()
+            self._storage_acquired = True
+        
         self.running = True
         self.update_task = asyncio.create_task(self._update_loop())
         logger.info("✅ [天然价差] 天然价差计算器已启动")
@@ -191,6 +232,11 @@ class HistoryDataCalculator:
             except asyncio.CancelledError:
                 pass
         
+        # 释放共享存储（其它组件仍在使用时不关闭连接）
+        if self._storage_acquired:
+            self._storage_acquired = False
+            await self.storage.release()
+        
         logger.info("🛑 [天然价差] 天然价差计算器已停止")
     
     async def _write_to_shared_memory(self):
@@ -239,6 +285,10 @@ class HistoryDataCalculator:
     
     async def _update_loop(self):
         """更新循环（跟随存储频率）"""
+        # 🔥 增量模式：启动时从数据库预热一次滑动窗口，结果立即可用
+        if self._incremental_active() and not self._warmed:
+            await self._warm_rolling_from_db()
+        
         while self.running:
             try:
                 await asyncio.sleep(self.update_interval_minutes * 60)
@@ -265,21 +315,39 @@ class HistoryDataCalculator:
                     f"{'='*60}"
                 )
                 
-                # 获取所有交易对和交易所（从数据库查询）
-                symbols_exchanges = await self._get_symbols_exchanges()
-                
-                if not symbols_exchanges:
-                    logger.warning("⚠️ [天然价差] 数据库中没有找到历史数据")
-                    continue
-                
-                # 更新所有交易对的计算结果
                 total_directions = 0
-                for symbol, exchanges in symbols_exchanges.items():
-                    if len(exchanges) < 2:
+                if self._incremental_active():
+                    # 🔥 增量模式：统计量已随样本写入更新，这里只滑出过期样本并汇总（不查询数据库）
+                    if not self._warmed:
+                        await self._warm_rolling_from_db()
+                    if not self._rolling:
+                        logger.warning("⚠️ [天然价差] 滑动窗口中暂无历史数据")
                         continue
+                    total_directions = self._refresh_incremental_results(window_hours, new_results, verbose=True)
+                    symbol_count = len({key[0] for key in self._rolling})
+                else:
+                    # 获取所有交易对和交易所（从数据库查询）
+                    symbols_exchanges = await self._get_symbols_exchanges()
                     
-                    directions_count = await self._update_calculated_results(symbol, exchanges, new_results)
-                    total_directions += directions_count
+                    if not symbols_exchanges:
+                        logger.warning("⚠️ [天然价差] 数据库中没有找到历史数据")
+                        continue
+                    symbol_count = len(symbols_exchanges)
+                    
+                    # 更新所有交易对的计算结果
+                    if self.batch_mode:
+                        # 🔥 批量模式：一次有序扫描计算所有方向
+                        for exchanges in symbols_exchanges.values():
+                            if len(exchanges) >= 2:
+                                total_directions += len(exchanges) * (len(exchanges) - 1)
+                        await self._update_all_results_batched(window_hours, new_results)
+                    else:
+                        for symbol, exchanges in symbols_exchanges.items():
+                            if len(exchanges) < 2:
+                                continue
+                            
+                            directions_count = await self._update_calculated_results(symbol, exchanges, new_results)
+                            total_directions += directions_count
 
                 if new_results:
                     self.results = new_results
@@ -301,7 +369,7 @@ class HistoryDataCalculator:
                 logger.info(
                     f"\n{'='*60}\n"
                     f"✅ [天然价差] 计算完成并提供新数据\n"
-                    f"   交易对数量: {len(symbols_exchanges)}\n"
+                    f"   交易对数量: {symbol_count}\n"
                     f"   交易所组合方向: {total_directions} 个\n"
                     f"   成功计算: {success_count} 个\n"
                     f"   数据不足: {insufficient_count} 个\n"
@@ -325,7 +393,7 @@ class HistoryDataCalculator:
         symbols_exchanges: Dict[str, List[str]] = {}
         
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.storage.reader() as db:
                 # 查询所有唯一的(symbol, exchange_buy, exchange_sell)组合
                 async with db.execute("""
                     SELECT DISTINCT symbol, exchange_buy, exchange_sell
@@ -381,8 +449,6 @@ class HistoryDataCalculator:
             exchange_buy: 买入交易所
             exchange_sell: 卖出交易所
         """
-        pair_key = f"{symbol}_{exchange_buy}_{exchange_sell}"
-        
         # 获取动态时间窗口
         window_hours = self._get_dynamic_window_hours()
         
@@ -442,6 +508,38 @@ class HistoryDataCalculator:
             if funding_rate_diff_history else 0.0
         )
         
+        self._store_pair_result(
+            results_container,
+            symbol=symbol,
+            exchange_buy=exchange_buy,
+            exchange_sell=exchange_sell,
+            natural_spread=natural_spread,
+            natural_funding_rate_diff=natural_funding_rate_diff,
+            data_points=data_points,
+            window_hours=window_hours,
+            funding_rate_stable=funding_rate_stable,
+            spread_stable=spread_stable,
+            current_funding_rate_diff=current_funding_rate_diff,
+        )
+    
+    def _store_pair_result(
+        self,
+        results_container: Dict[str, ExchangePairResult],
+        symbol: str,
+        exchange_buy: str,
+        exchange_sell: str,
+        natural_spread: float,
+        natural_funding_rate_diff: Optional[float],
+        data_points: int,
+        window_hours: float,
+        funding_rate_stable: bool,
+        spread_stable: bool,
+        current_funding_rate_diff: float,
+        verbose: bool = True,
+    ):
+        """将单个方向的计算结果写入结果容器并输出日志（verbose=False 时不输出）"""
+        pair_key = f"{symbol}_{exchange_buy}_{exchange_sell}"
+        
         # 🔥 存储到内存
         results_container[pair_key] = ExchangePairResult(
             exchange_pair=(exchange_buy, exchange_sell),
@@ -455,6 +553,9 @@ class HistoryDataCalculator:
             current_funding_rate_diff=current_funding_rate_diff,  # 🔥 已弃用，保留兼容性
             last_update=datetime.now()
         )
+        
+        if not verbose:
+            return
     
         # 🔥 详细日志
         spread_direction_str = "长期有利" if natural_spread > 0 else ("长期亏损" if natural_spread < 0 else "基本平衡")
@@ -486,6 +587,375 @@ class HistoryDataCalculator:
             f"   价差稳定: {'✅ 是' if spread_stable else '❌ 否'}"
         )
     
+    async def _iter_window_directions(
+        self,
+        window_hours: float,
+    ) -> AsyncIterator[Tuple[Tuple[str, str, str], List[str], List[float], List[Optional[float]]]]:
+        """按方向分组流式读取时间窗口内的全部样本
+        
+        一次按 (symbol, exchange_buy, exchange_sell, timestamp) 有序扫描整个时间窗口，
+        同一时间只在内存中保留一个方向的数据。
+        
+        Yields:
+            ((symbol, exchange_buy, exchange_sell), 时间戳列表, 价差列表, 资金费率差列表)
+        """
+        cutoff_time = datetime.now() - timedelta(hours=window_hours)
+        
+        current_key: Optional[Tuple[str, str, str]] = None
+        timestamps: List[str] = []
+        spreads: List[float] = []
+        fundings: List[Optional[float]] = []
+        
+        async with self.storage.reader() as db:
+            async with db.execute("""
+                SELECT 
+                    symbol,
+                    exchange_buy,
+                    exchange_sell,
+                    timestamp,
+                    spread_pct,
+                    funding_rate_diff
+                FROM spread_history_sampled
+                WHERE timestamp >= ?
+                ORDER BY symbol, exchange_buy, exchange_sell, timestamp ASC
+            """, (cutoff_time.isoformat(),)) as cursor:
+                while True:
+                    rows = await cursor.fetchmany(self.batch_fetch_size)
+                    if not rows:
+                        break
+                    for symbol, exchange_buy, exchange_sell, timestamp, spread_pct, funding_rate_diff in rows:
+                        key = (symbol, exchange_buy, exchange_sell)
+                        if key != current_key:
+                            if current_key is not None:
+                                yield current_key, timestamps, spreads, fundings
+                            current_key = key
+                            timestamps = []
+                            spreads = []
+                            fundings = []
+                        timestamps.append(timestamp)
+                        spreads.append(spread_pct)
+                        fundings.append(funding_rate_diff)
+        
+        if current_key is not None:
+            yield current_key, timestamps, spreads, fundings
+    
+    async def _update_all_results_batched(
+        self,
+        window_hours: float,
+        results_container: Dict[str, ExchangePairResult],
+    ) -> int:
+        """批量计算窗口内所有方向的天然价差
+        
+        单次有序扫描（_iter_window_directions），逐方向用 NumPy 计算
+        中位数/均值/标准差/极端波动次数。
+        
+        Args:
+            window_hours: 时间窗口（小时）
+            results_container: 本轮结果容器（由调用方整体替换 self.results）
+        
+        Returns:
+            有数据的方向数量
+        """
+        if not self.db_path.exists():
+            return 0
+        
+        directions_seen = 0
+        try:
+            async for key, _, spreads, fundings in self._iter_window_directions(window_hours):
+                self._calculate_direction_batched(key, spreads, fundings, window_hours, results_container)
+                directions_seen += 1
+        except Exception as e:
+            logger.error(f"❌ [天然价差] 批量计算失败: {e}", exc_info=True)
+        
+        return directions_seen
+    
+    def _calculate_direction_batched(
+        self,
+        direction: Tuple[str, str, str],
+        spread_values: List[float],
+        funding_values: List[Optional[float]],
+        window_hours: float,
+        results_container: Dict[str, ExchangePairResult],
+    ):
+        """批量模式下计算单个方向的结果（统计口径与逐方向模式一致）"""
+        symbol, exchange_buy, exchange_sell = direction
+        
+        data_points = len(spread_values)
+        if data_points < self.min_data_points:
+            logger.debug(
+                f"⚠️ [天然价差] {symbol} {exchange_buy}→{exchange_sell}: "
+                f"数据点不足（{data_points} < {self.min_data_points}）"
+            )
+            return
+        
+        spread_history = np.asarray(spread_values, dtype=np.float64)
+        # None → NaN，再过滤（与逐方向模式"忽略缺失资金费率差"一致）
+        funding_history = np.asarray(funding_values, dtype=np.float64)
+        funding_history = funding_history[~np.isnan(funding_history)]
+        
+        natural_spread = float(np.median(spread_history))
+        
+        natural_funding_rate_diff = None
+        funding_rate_stable = False
+        if funding_history.size >= self.min_data_points:
+            natural_funding_rate_diff = float(np.median(funding_history))
+            funding_rate_stable = self._funding_rate_stability_np(funding_history)
+        
+        spread_stable = self._spread_stability_np(spread_history)
+        
+        current_funding_rate_diff = float(funding_history[-1]) if funding_history.size else 0.0
+        
+        self._store_pair_result(
+            results_container,
+            symbol=symbol,
+            exchange_buy=exchange_buy,
+            exchange_sell=exchange_sell,
+            natural_spread=natural_spread,
+            natural_funding_rate_diff=natural_funding_rate_diff,
+            data_points=data_points,
+            window_hours=window_hours,
+            funding_rate_stable=funding_rate_stable,
+            spread_stable=spread_stable,
+            current_funding_rate_diff=current_funding_rate_diff,
+        )
+    
+    @staticmethod
+    def _extreme_change_count(history: np.ndarray, multiplier: float) -> int:
+        """相邻变化幅度超过平均变化幅度 multiplier 倍的次数"""
+        if history.size < 2:
+            return 0
+        changes = np.abs(np.diff(history))
+        return int(np.count_nonzero(changes > changes.mean() * multiplier))
+    
+    def _funding_rate_stability_np(self, history: np.ndarray) -> bool:
+        """_calculate_funding_rate_stability 的 NumPy 版本"""
+        n = history.size
+        if n < self.min_data_points:
+            return False
+        
+        duration_ratio = np.count_nonzero(history >= self.funding_rate_min_threshold) / n
+        duration_stable = duration_ratio >= self.funding_rate_duration_ratio
+        
+        mean_diff = float(history.mean())
+        if mean_diff == 0:
+            return False
+        std_diff = float(history.std(ddof=1)) if n > 1 else 0.0
+        volatility_stable = abs(std_diff / mean_diff) <= self.funding_rate_stability_threshold
+        
+        extreme_changes = self._extreme_change_count(history, self.funding_rate_extreme_multiplier)
+        trend_stable = extreme_changes <= n * self.funding_rate_extreme_ratio
+        
+        return bool(duration_stable and volatility_stable and trend_stable)
+    
+    def _spread_stability_np(self, history: np.ndarray) -> bool:
+        """_calculate_spread_stability_v2 的 NumPy 版本"""
+        n = history.size
+        if n < self.min_data_points:
+            return False
+        
+        std_spread = float(history.std(ddof=1)) if n > 1 else 0.0
+        abs_mean = float(np.abs(history).mean())
+        if abs_mean == 0:
+            return False
+        volatility_stable = std_spread / abs_mean <= self.spread_stability_threshold
+        
+        extreme_changes = self._extreme_change_count(history, self.spread_extreme_multiplier)
+        extreme_stable = extreme_changes <= n * self.spread_extreme_ratio
+        
+        return bool(volatility_stable and extreme_stable)
+    
+    # ============= 增量模式 =============
+    
+    def attach_recorder(self, recorder) -> None:
+        """接入历史记录器的样本推送（incremental_mode 开启时生效）"""
+        recorder.add_sample_listener(self.on_samples_written)
+        self._feed_attached = True
+        logger.info("🔗 [天然价差] 已接入历史记录器样本推送")
+    
+    def _incremental_active(self) -> bool:
+        return self.incremental_mode and self._feed_attached
+    
+    @staticmethod
+    def _parse_timestamp(value: Any) -> Optional[float]:
+        """样本时间戳（ISO 字符串 / datetime）→ epoch 秒"""
+        if isinstance(value, datetime):
+            return value.timestamp()
+        try:
+            return datetime.fromisoformat(str(value)).timestamp()
+        except (TypeError, ValueError):
+            return None
+    
+    def _add_rolling_sample(
+        self,
+        key: Tuple[str, str, str],
+        timestamp: Any,
+        spread_pct: Any,
+        funding_rate_diff: Any,
+    ) -> bool:
+        """向方向的滑动窗口追加一个样本，返回是否已追加"""
+        ts = self._parse_timestamp(timestamp)
+        if ts is None or spread_pct is None:
+            return False
+        stats = self._rolling.get(key)
+        if stats is None:
+            stats = DirectionRollingStats(self.funding_rate_min_threshold)
+            self._rolling[key] = stats
+        return stats.add(
+            ts,
+            float(spread_pct),
+            float(funding_rate_diff) if funding_rate_diff is not None else None,
+        )
+    
+    def on_samples_written(self, samples: List[dict]) -> None:
+        """历史记录器写入样本后的回调：更新对应方向的滑动窗口统计量与结果"""
+        if not self.incremental_mode:
+            return
+        if not self._warmed:
+            # 预热期间的样本先缓存，预热完成后补齐（预热前写入的样本由预热从数据库读取）
+            if self._warming:
+                self._pending_samples.extend(samples)
+            return
+        
+        touched = set()
+        for data in samples:
+            key = (data.get('symbol', ''), data.get('exchange_buy', ''), data.get('exchange_sell', ''))
+            if self._add_rolling_sample(
+                key, data.get('timestamp'), data.get('spread_pct'), data.get('funding_rate_diff')
+            ):
+                touched.add(key)
+        
+        if not touched:
+            return
+        
+        window_hours = self._get_dynamic_window_hours()
+        cutoff_ts = (datetime.now() - timedelta(hours=window_hours)).timestamp()
+        for key in touched:
+            self._refresh_direction(key, cutoff_ts, window_hours, self.results, verbose=False)
+    
+    async def _warm_rolling_from_db(self) -> None:
+        """从数据库一次性预热所有方向的滑动窗口"""
+        self._warming = True
+        samples_loaded = 0
+        try:
+            self._rolling = {}
+            if self.db_path.exists():
+                async for key, timestamps, spreads, fundings in self._iter_window_directions(self.max_history_hours):
+                    for timestamp, spread_pct, funding_rate_diff in zip(timestamps, spreads, fundings):
+                        if self._add_rolling_sample(key, timestamp, spread_pct, funding_rate_diff):
+                            samples_loaded += 1
+            logger.info(
+                f"🔥 [天然价差] 滑动窗口预热完成: {len(self._rolling)} 个方向, {samples_loaded} 个样本"
+            )
+        except Exception as e:
+            logger.error(f"❌ [天然价差] 滑动窗口预热失败: {e}", exc_info=True)
+        finally:
+            self._warming = False
+            self._warmed = True
+        
+        pending, self._pending_samples = self._pending_samples, []
+        if pending:
+            self.on_samples_written(pending)
+        
+        new_results: Dict[str, ExchangePairResult] = {}
+        self._refresh_incremental_results(self._get_dynamic_window_hours(), new_results, verbose=False)
+        if new_results:
+            self.results = new_results
+    
+    def _refresh_incremental_results(
+        self,
+        window_hours: float,
+        results_container: Dict[str, ExchangePairResult],
+        verbose: bool = False,
+    ) -> int:
+        """滑出所有方向的过期样本并输出结果，返回方向数量"""
+        cutoff_ts = (datetime.now() - timedelta(hours=window_hours)).timestamp()
+        for key in list(self._rolling.keys()):
+            self._refresh_direction(key, cutoff_ts, window_hours, results_container, verbose=verbose)
+        return len(self._rolling)
+    
+    def _refresh_direction(
+        self,
+        key: Tuple[str, str, str],
+        cutoff_ts: float,
+        window_hours: float,
+        results_container: Dict[str, ExchangePairResult],
+        verbose: bool = False,
+    ) -> None:
+        """根据方向的滑动窗口统计量更新单个方向的结果"""
+        symbol, exchange_buy, exchange_sell = key
+        pair_key = f"{symbol}_{exchange_buy}_{exchange_sell}"
+        
+        stats = self._rolling.get(key)
+        if stats is None:
+            return
+        stats.evict_before(cutoff_ts)
+        if stats.is_empty():
+            del self._rolling[key]
+            results_container.pop(pair_key, None)
+            return
+        
+        spread = stats.spread
+        funding = stats.funding
+        data_points = len(spread)
+        if data_points < self.min_data_points:
+            results_container.pop(pair_key, None)
+            return
+        
+        natural_funding_rate_diff = None
+        funding_rate_stable = False
+        if len(funding) >= self.min_data_points:
+            natural_funding_rate_diff = funding.median()
+            funding_rate_stable = self._funding_rate_stability_rolling(funding)
+        
+        self._store_pair_result(
+            results_container,
+            symbol=symbol,
+            exchange_buy=exchange_buy,
+            exchange_sell=exchange_sell,
+            natural_spread=spread.median(),
+            natural_funding_rate_diff=natural_funding_rate_diff,
+            data_points=data_points,
+            window_hours=window_hours,
+            funding_rate_stable=funding_rate_stable,
+            spread_stable=self._spread_stability_rolling(spread),
+            current_funding_rate_diff=funding.last if funding.last is not None else 0.0,
+            verbose=verbose,
+        )
+    
+    def _funding_rate_stability_rolling(self, window) -> bool:
+        """_calculate_funding_rate_stability 的滑动窗口版本"""
+        n = len(window)
+        if n < self.min_data_points:
+            return False
+        
+        duration_stable = window.at_least_count() / n >= self.funding_rate_duration_ratio
+        
+        mean_diff = window.mean()
+        if mean_diff == 0:
+            return False
+        volatility_stable = abs(window.stdev() / mean_diff) <= self.funding_rate_stability_threshold
+        
+        extreme_changes = window.extreme_change_count(self.funding_rate_extreme_multiplier)
+        trend_stable = extreme_changes <= n * self.funding_rate_extreme_ratio
+        
+        return duration_stable and volatility_stable and trend_stable
+    
+    def _spread_stability_rolling(self, window) -> bool:
+        """_calculate_spread_stability_v2 的滑动窗口版本"""
+        n = len(window)
+        if n < self.min_data_points:
+            return False
+        
+        abs_mean = window.abs_mean()
+        if abs_mean == 0:
+            return False
+        volatility_stable = window.stdev() / abs_mean <= self.spread_stability_threshold
+        
+        extreme_changes = window.extreme_change_count(self.spread_extreme_multiplier)
+        extreme_stable = extreme_changes <= n * self.spread_extreme_ratio
+        
+        return volatility_stable and extreme_stable
+    
     async def _get_history_data_dynamic(
         self,
         symbol: str,
@@ -510,7 +980,7 @@ class HistoryDataCalculator:
         cutoff_time = datetime.now() - timedelta(hours=window_hours)
         
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.storage.reader() as db:
                 async with db.execute("""
                     SELECT 
                         spread_pct,
@@ -0,0 +1,282 @@
+"""
+历史数据存储层（SQLite 连接复用）
+
+职责：
+- 同一个数据库文件在进程内共享一个存储实例（get_history_storage）
+- 长连接写入：单个 writer 连接 + 写锁，批量写入/清理串行执行
+- 读连接池：异步（aiosqlite）与同步（sqlite3，供 pandas 使用）各维护一个小连接池
+- WAL 日志模式 + synchronous/cache_size 等 PRAGMA 调优，读写并发互不阻塞
+- 长连接复用 sqlite3 内置的语句缓存（cached_statements），相同 SQL 只编译一次
+
+所有连接均懒加载：close() 之后再次使用会自动重新打开。
+共享实例按使用方引用计数：组件启动时 acquire()，停止时 release()，最后一个使用方释放时才关闭连接。
+"""
+
+import asyncio
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from core.adapters.exchanges.utils.setup_logging import LoggingConfig
+
+logger = LoggingConfig.setup_logger(
+    name=__name__,
+    log_file='spread_history.log',
+    console_formatter=None,
+    file_formatter='detailed',
+    level=logging.INFO
+)
+logger.propagate = False
+
+try:
+    import aiosqlite
+except ImportError:
+    aiosqlite = None
+
+
+class HistoryStorage:
+    """价差历史数据库存储（单写多读，连接长期复用）"""
+
+    def __init__(
+        self,
+        db_path: str,
+        reader_pool_size: int = 4,
+        synchronous: str = "NORMAL",
+        cache_size_kb: int = 16384,
+        busy_timeout_ms: int = 5000,
+        cached_statements: int = 256,
+    ):
+        """
+        Args:
+            db_path: SQLite 数据库路径
+            reader_pool_size: 读连接池大小（异步/同步各自独立）
+            synchronous: PRAGMA synchronous（WAL 下 NORMAL 即可保证一致性）
+            cache_size_kb: 每个连接的页缓存大小（KB）
+            busy_timeout_ms: 锁等待超时（毫秒）
+            cached_statements: 每个连接缓存的预编译语句数量
+        """
+        self.db_path = Path(db_path)
+        self.reader_pool_size = max(1, int(reader_pool_size))
+        self.synchronous = synchronous
+        self.cache_size_kb = int(cache_size_kb)
+        self.busy_timeout_ms = int(busy_timeout_ms)
+        self.cached_statements = int(cached_statements)
+
+        # 异步连接（aiosqlite）
+        self._writer = None
+        self._writer_lock: Optional[asyncio.Lock] = None
+        self._idle_readers: List[Any] = []
+        self._reader_semaphore: Optional[asyncio.Semaphore] = None
+
+        # 同步读连接池（sqlite3，跨线程使用）
+        self._sync_readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(
+            maxsize=self.reader_pool_size
+        )
+
+        # 使用中的组件数（acquire/release），归零时关闭连接
+        self._users = 0
+
+        self.stats = {
+            'writer_opened': 0,
+            'readers_opened': 0,
+            'sync_readers_opened': 0,
+            'write_sessions': 0,
+            'read_sessions': 0,
+        }
+
+    @property
+    def async_available(self) -> bool:
+        return aiosqlite is not None
+
+    def exists(self) -> bool:
+        return self.db_path.exists()
+
+    # ============= PRAGMA =============
+
+    def _connection_pragmas(self) -> List[str]:
+        return [
+            f"PRAGMA synchronous={self.synchronous}",
+            f"PRAGMA cache_size=-{self.cache_size_kb}",
+            "PRAGMA temp_store=MEMORY",
+            f"PRAGMA busy_timeout={self.busy_timeout_ms}",
+        ]
+
+    # ============= 异步写入 =============
+
+    def _get_writer_lock(self) -> asyncio.Lock:
+        if self._writer_lock is None:
+            self._writer_lock = asyncio.Lock()
+        return self._writer_lock
+
+    async def _ensure_writer(self):
+        if self._writer is not None:
+            return self._writer
+        if aiosqlite is None:
+            raise ImportError("aiosqlite未安装，无法写入历史数据库")
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        db = await aiosqlite.connect(str(self.db_path), cached_statements=self.cached_statements)
+        # WAL 为数据库级持久设置，只需在写连接上设置一次
+        await db.execute("PRAGMA journal_mode=WAL")
+        for pragma in self._connection_pragmas():
+            await db.execute(pragma)
+        self._writer = db
+        self.stats['writer_opened'] += 1
+        logger.info(f"💾 [历史存储] 写连接已打开（WAL）: {self.db_path}")
+        return db
+
+    @asynccontextmanager
+    async def writer(self):
+        """获取长期复用的写连接（持有写锁，调用方负责 commit）"""
+        async with self._get_writer_lock():
+            db = await self._ensure_writer()
+            self.stats['write_sessions'] += 1
+            yield db
+
+    async def execute_write(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """执行单条写语句并提交，返回影响行数"""
+        async with self.writer() as db:
+            cursor = await db.execute(sql, params)
+            await db.commit()
+            return cursor.rowcount
+
+    async def executemany_write(self, sql: str, rows: Iterable[Sequence[Any]]) -> None:
+        """批量写入并提交"""
+        async with self.writer() as db:
+            await db.executemany(sql, rows)
+            await db.commit()
+
+    # ============= 异步读取 =============
+
+    def _get_reader_semaphore(self) -> asyncio.Semaphore:
+        if self._reader_semaphore is None:
+            self._reader_semaphore = asyncio.Semaphore(self.reader_pool_size)
+        return self._reader_semaphore
+
+    async def _open_reader(self):
+        if aiosqlite is None:
+            raise ImportError("aiosqlite未安装，无法读取历史数据库")
+        db = await aiosqlite.connect(str(self.db_path), cached_statements=self.cached_statements)
+        for pragma in self._connection_pragmas():
+            await db.execute(pragma)
+        await db.execute("PRAGMA query_only=ON")
+        self.stats['readers_opened'] += 1
+        return db
+
+    @asynccontextmanager
+    async def reader(self):
+        """从读连接池借出一个连接（WAL 下读不阻塞写）"""
+        async with self._get_reader_semaphore():
+            db = self._idle_readers.pop() if self._idle_readers else await self._open_reader()
+            self.stats['read_sessions'] += 1
+            try:
+                yield db
+            finally:
+                self._idle_readers.append(db)
+
+    async def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        """使用读连接池执行查询"""
+        async with self.reader() as db:
+            async with db.execute(sql, params) as cursor:
+                rows = await cursor.fetchall()
+        return list(rows)
+
+    # ============= 同步读取（pandas / 工具脚本） =============
+
+    def _open_sync_reader(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        for pragma in self._connection_pragmas():
+            conn.execute(pragma)
+        conn.execute("PRAGMA query_only=ON")
+        self.stats['sync_readers_opened'] += 1
+        return conn
+
+    @contextmanager
+    def sync_reader(self):
+        """借出一个同步读连接（同一时间一个连接只被一个线程使用）"""
+        try:
+            conn = self._sync_readers.get_nowait()
+        except queue.Empty:
+            conn = self._open_sync_reader()
+        try:
+            yield conn
+        finally:
+            try:
+                self._sync_readers.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    # ============= 生命周期 =============
+
+    def acquire(self) -> None:
+        """登记一个使用方（组件启动时调用，与 release 成对使用）"""
+        self._users += 1
+
+    async def release(self) -> None:
+        """注销一个使用方；最后一个使用方释放时关闭所有连接"""
+        if self._users > 0:
+            self._users -= 1
+        if self._users == 0:
+            await self.close()
+
+    def close_sync(self) -> None:
+        """关闭同步读连接池"""
+        while True:
+            try:
+                conn = self._sync_readers.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    async def close(self) -> None:
+        """关闭所有连接（之后再次使用会自动重新打开）"""
+        readers, self._idle_readers = self._idle_readers, []
+        for db in readers:
+            try:
+                await db.close()
+            except Exception:
+                pass
+
+        if self._writer is not None:
+            async with self._get_writer_lock():
+                writer, self._writer = self._writer, None
+                if writer is not None:
+                    try:
+                        await writer.execute("PRAGMA optimize")
+                        await writer.close()
+                    except Exception as e:
+                        logger.warning(f"⚠️  [历史存储] 关闭写连接失败: {e}")
+
+        self.close_sync()
+
+
+_storages: Dict[str, HistoryStorage] = {}
+_storages_lock = threading.Lock()
+
+
+def get_history_storage(db_path: str, **kwargs) -> HistoryStorage:
+    """
+    获取数据库文件对应的共享存储实例（同一路径在进程内只创建一次）
+
+    Args:
+        db_path: SQLite 数据库路径
+        **kwargs: 首次创建时传给 HistoryStorage 的参数
+    """
+    key = str(Path(db_path).resolve())
+    with _storages_lock:
+        storage = _storages.get(key)
+        if storage is None:
+            storage = HistoryStorage(db_path, **kwargs)
+            _storages[key] = storage
+        return storage
@@ -0,0 +1,205 @@
+"""
+滑动窗口增量统计
+
+职责：
+- 为每个价差方向维护滑动时间窗口内的流式统计量
+- 新样本写入 / 旧样本滑出窗口时增量更新，无需每轮全量重算
+
+单序列（RollingWindow）维护：
+- 有序窗口（bisect 有序列表）：中位数按下标 O(1) 读取；插入/移除时二分定位 O(log n)，
+  但列表元素搬移是 O(n)（C 层 memmove；插入+移除一次，1 万样本约 4µs、8.6 万样本约 25µs）
+- Welford 均值/方差（支持移除样本）
+- 绝对值之和、相邻变化幅度之和（变化幅度同样维护有序窗口，极端波动次数一次二分 O(log n)）
+- 不低于阈值的样本数量（资金费率差持续时间占比）
+
+浮点累加误差：移除次数累计超过窗口大小时从窗口数据整体重建一次（均摊 O(1)）。
+"""
+
+import math
+from bisect import bisect_right, insort
+from collections import deque
+from typing import Deque, List, Optional
+
+
+class RollingWindow:
+    """单个数值序列的滑动窗口统计（样本按时间顺序追加）"""
+
+    __slots__ = (
+        'threshold',
+        '_times', '_values', '_sorted',
+        '_changes', '_sorted_changes',
+        '_mean', '_m2', '_abs_sum', '_change_sum', '_at_least',
+        '_removals',
+    )
+
+    def __init__(self, threshold: Optional[float] = None):
+        """
+        Args:
+            threshold: 计数阈值（统计 value >= threshold 的样本数，None 表示不统计）
+        """
+        self.threshold = threshold
+        self._times: Deque[float] = deque()
+        self._values: Deque[float] = deque()
+        self._sorted: List[float] = []
+        # _changes[i] = |values[i+1] - values[i]|，与 _values 对齐
+        self._changes: Deque[float] = deque()
+        self._sorted_changes: List[float] = []
+
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._abs_sum = 0.0
+        self._change_sum = 0.0
+        self._at_least = 0
+        self._removals = 0
+
+    # ============= 写入 =============
+
+    def add(self, ts: float, value: float) -> None:
+        """追加一个样本（ts 为 epoch 秒）"""
+        if self._values:
+            change = abs(value - self._values[-1])
+            self._changes.append(change)
+            insort(self._sorted_changes, change)
+            self._change_sum += change
+
+        self._times.append(ts)
+        self._values.append(value)
+        insort(self._sorted, value)
+
+        n = len(self._values)
+        delta = value - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (value - self._mean)
+        self._abs_sum += abs(value)
+        if self.threshold is not None and value >= self.threshold:
+            self._at_least += 1
+
+    def evict_before(self, cutoff_ts: float) -> int:
+        """移除时间早于 cutoff_ts 的样本，返回移除数量"""
+        removed = 0
+        times = self._times
+        while times and times[0] < cutoff_ts:
+            self._pop_oldest()
+            removed += 1
+        if removed:
+            self._removals += removed
+            if self._removals >= max(len(self._values), 64):
+                self._rebuild()
+        return removed
+
+    def _pop_oldest(self) -> None:
+        self._times.popleft()
+        value = self._values.popleft()
+        del self._sorted[bisect_right(self._sorted, value) - 1]
+
+        if self._changes:
+            change = self._changes.popleft()
+            del self._sorted_changes[bisect_right(self._sorted_changes, change) - 1]
+            self._change_sum -= change
+
+        n = len(self._values)
+        if n == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+        else:
+            # Welford 逆运算
+            old_mean = self._mean
+            self._mean = (old_mean * (n + 1) - value) / n
+            self._m2 -= (value - old_mean) * (value - self._mean)
+            if self._m2 < 0:
+                self._m2 = 0.0
+        self._abs_sum -= abs(value)
+        if self.threshold is not None and value >= self.threshold:
+            self._at_least -= 1
+
+    def _rebuild(self) -> None:
+        """从窗口数据重建累加量，消除浮点漂移"""
+        values = self._values
+        n = len(values)
+        self._mean = math.fsum(values) / n if n else 0.0
+        self._m2 = math.fsum((v - self._mean) ** 2 for v in values) if n else 0.0
+        self._abs_sum = math.fsum(abs(v) for v in values)
+        self._change_sum = math.fsum(self._changes)
+        self._removals = 0
+
+    # ============= 读取 =============
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def last_time(self) -> Optional[float]:
+        return self._times[-1] if self._times else None
+
+    @property
+    def last(self) -> Optional[float]:
+        return self._values[-1] if self._values else None
+
+    def median(self) -> Optional[float]:
+        s = self._sorted
+        n = len(s)
+        if n == 0:
+            return None
+        mid = n // 2
+        if n % 2:
+            return s[mid]
+        return (s[mid - 1] + s[mid]) / 2
+
+    def mean(self) -> float:
+        return self._mean
+
+    def stdev(self) -> float:
+        """样本标准差（n-1），样本数 < 2 时为 0"""
+        n = len(self._values)
+        return math.sqrt(self._m2 / (n - 1)) if n > 1 else 0.0
+
+    def abs_mean(self) -> float:
+        n = len(self._values)
+        return self._abs_sum / n if n else 0.0
+
+    def at_least_count(self) -> int:
+        return self._at_least
+
+    def extreme_change_count(self, multiplier: float) -> int:
+        """相邻变化幅度 > 平均变化幅度 × multiplier 的次数"""
+        n = len(self._changes)
+        if n == 0:
+            return 0
+        limit = (self._change_sum / n) * multiplier
+        return n - bisect_right(self._sorted_changes, limit)
+
+
+class DirectionRollingStats:
+    """单个价差方向的滑动窗口统计（价差 + 资金费率差）"""
+
+    __slots__ = ('spread', 'funding')
+
+    def __init__(self, funding_min_threshold: float):
+        self.spread = RollingWindow()
+        self.funding = RollingWindow(threshold=funding_min_threshold)
+
+    @property
+    def last_time(self) -> Optional[float]:
+        return self.spread.last_time
+
+    def add(self, ts: float, spread_pct: float, funding_rate_diff: Optional[float]) -> bool:
+        """
+        追加一个样本；时间不晚于最后一个样本的重复/乱序样本会被忽略
+
+        Returns:
+            是否已追加
+        """
+        last = self.spread.last_time
+        if last is not None and ts <= last:
+            return False
+        self.spread.add(ts, spread_pct)
+        if funding_rate_diff is not None:
+            self.funding.add(ts, funding_rate_diff)
+        return True
+
+    def evict_before(self, cutoff_ts: float) -> None:
+        self.spread.evict_before(cutoff_ts)
+        self.funding.evict_before(cutoff_ts)
+
+    def is_empty(self) -> bool:
+        return len(self.spread) == 0
@@ -5,27 +5,54 @@
 - 从SQLite数据库查询历史数据
 - 支持按代币、时间范围查询
 - 优化查询性能（使用索引）
+- 长周期查询：读取列式归档（分区裁剪 + 列投影，不经过 pandas）
 """
 
-import sqlite3
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+import logging
+from typing import Iterator, List, Optional, Dict, Any, Sequence, Tuple
+from datetime import date, datetime, timedelta
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import re
 
+from core.adapters.exchanges.utils.setup_logging import LoggingConfig
+
+from .history_storage import get_history_storage
+from .columnar_archive import SpreadColumnarArchive
+
+logger = LoggingConfig.setup_logger(
+    name=__name__,
+    log_file='spread_history.log',
+    console_formatter=None,
+    file_formatter='detailed',
+    level=logging.INFO
+)
+logger.propagate = False
+
 
 class SpreadHistoryReader:
     """历史数据查询器"""
     
-    def __init__(self, db_path: str = "data/spread_history/spread_history.db"):
+    def __init__(
+        self,
+        db_path: str = "data/spread_history/spread_history.db",
+        archive_dir: Optional[str] = None
+    ):
         """
         初始化查询器
         
         Args:
             db_path: SQLite数据库路径
+            archive_dir: 列式归档目录（默认与数据库同目录下的 columnar）
         """
         self.db_path = Path(db_path)
+        # 🔥 共享存储层：复用同步读连接池（WAL 下与写入并发）
+        self.storage = get_history_storage(str(self.db_path))
+        # 🔥 列式归档（由 SpreadHistoryRecorder 清理任务写入）
+        self.archive = SpreadColumnarArchive(
+            archive_dir if archive_dir is not None else str(self.db_path.parent / "columnar")
+        )
     
     def _normalize_timestamp(self, timestamp_str: str) -> str:
         """
@@ -74,8 +101,6 @@ class SpreadHistoryReader:
         if not self.db_path.exists():
             return pd.DataFrame()
         
-        conn = sqlite3.connect(self.db_path)
-        
         query = """
         SELECT * FROM spread_history_sampled
         WHERE 1=1
@@ -106,14 +131,13 @@ class SpreadHistoryReader:
             query += f" LIMIT {limit}"
         
         try:
-            df = pd.read_sql_query(query, conn, params=params)
+            with self.storage.sync_reader() as conn:
+                df = pd.read_sql_query(query, conn, params=params)
             if len(df) > 0:
                 df['timestamp'] = pd.to_datetime(df['timestamp'])
         except Exception as e:
             print(f"⚠️  查询历史数据失败: {e}")
             df = pd.DataFrame()
-        finally:
-            conn.close()
         
         return df
     
@@ -139,8 +163,6 @@ class SpreadHistoryReader:
         if not self.db_path.exists():
             return pd.DataFrame()
         
-        conn = sqlite3.connect(self.db_path)
-        
         query = """
         SELECT 
             timestamp,
@@ -172,14 +194,13 @@ class SpreadHistoryReader:
             query += f" LIMIT {limit}"
         
         try:
-            df = pd.read_sql_query(query, conn, params=params)
+            with self.storage.sync_reader() as conn:
+                df = pd.read_sql_query(query, conn, params=params)
             if len(df) > 0:
                 df['timestamp'] = pd.to_datetime(df['timestamp'])
         except Exception as e:
             print(f"⚠️  查询代币走势失败: {e}")
             df = pd.DataFrame()
-        finally:
-            conn.close()
         
         return df
     
@@ -201,8 +222,6 @@ class SpreadHistoryReader:
         if not self.db_path.exists():
             return pd.DataFrame()
         
-        conn = sqlite3.connect(self.db_path)
-        
         query = """
         SELECT * FROM spread_history_sampled
         WHERE symbol = ? 
@@ -211,14 +230,13 @@ class SpreadHistoryReader:
         """
         
         try:
-            df = pd.read_sql_query(query, conn, params=[symbol, minutes])
+            with self.storage.sync_reader() as conn:
+                df = pd.read_sql_query(query, conn, params=[symbol, minutes])
             if len(df) > 0:
                 df['timestamp'] = pd.to_datetime(df['timestamp'])
         except Exception as e:
             print(f"⚠️  查询最新数据失败: {e}")
             df = pd.DataFrame()
-        finally:
-            conn.close()
         
         return df
     
@@ -232,21 +250,18 @@ class SpreadHistoryReader:
         if not self.db_path.exists():
             return []
         
-        conn = sqlite3.connect(self.db_path)
-        
         query = """
         SELECT DISTINCT symbol FROM spread_history_sampled
         ORDER BY symbol
         """
         
         try:
-            cursor = conn.execute(query)
-            symbols = [row[0] for row in cursor.fetchall()]
+            with self.storage.sync_reader() as conn:
+                cursor = conn.execute(query)
+                symbols = [row[0] for row in cursor.fetchall()]
         except Exception as e:
             print(f"⚠️  查询代币列表失败: {e}")
             symbols = []
-        finally:
-            conn.close()
         
         return symbols
     
@@ -285,4 +300,86 @@ class SpreadHistoryReader:
             'min_spread': float(df['spread_pct'].min()),
             'std_spread': float(df['spread_pct'].std()),
         }
-
+    
+    # ============= 列式归档查询 =============
+    
+    def _archive_range(
+        self,
+        days: Optional[float],
+        start_date: Optional[str],
+        end_date: Optional[str],
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """解析归档查询区间（days 优先：最近 N 天）"""
+        if days is not None:
+            end = datetime.now()
+            return (end - timedelta(days=days)).isoformat(), end.isoformat()
+        return (
+            self._normalize_timestamp(start_date) if start_date else None,
+            self._normalize_timestamp(end_date) if end_date else None,
+        )
+    
+    def iter_archive(
+        self,
+        symbol: str,
+        exchange_buy: Optional[str] = None,
+        exchange_sell: Optional[str] = None,
+        days: Optional[float] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        columns: Sequence[str] = ('spread_pct',)
+    ) -> Iterator[Tuple[date, str, str, Dict[str, np.ndarray]]]:
+        """
+        逐块读取列式归档（每块为一天内的一个方向）
+        
+        Args:
+            symbol: 代币符号
+            exchange_buy: 买入交易所（可选）
+            exchange_sell: 卖出交易所（可选）
+            days: 最近N天（可选，优先级高于start_date/end_date）
+            start_date: 开始时间（格式：YYYY-MM-DD HH:MM:SS）
+            end_date: 结束时间（格式：YYYY-MM-DD HH:MM:SS）
+            columns: 需要的数值列（timestamp 总是返回）
+            
+        Yields:
+            (日期, exchange_buy, exchange_sell, {'timestamp': ndarray, 列名: ndarray})
+        """
+        start, end = self._archive_range(days, start_date, end_date)
+        return self.archive.iter_chunks(symbol, exchange_buy, exchange_sell, start, end, columns)
+    
+    def query_archive(
+        self,
+        symbol: str,
+        exchange_buy: Optional[str] = None,
+        exchange_sell: Optional[str] = None,
+        days: Optional[float] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        columns: Sequence[str] = ('spread_pct',)
+    ) -> Dict[Tuple[str, str], Dict[str, np.ndarray]]:
+        """
+        查询列式归档（按方向拼接为 NumPy 数组）
+        
+        例如最近30天 BTC lighter→edgex 价差：
+            reader.query_archive("BTC-USDC-PERP", "lighter", "edgex", days=30)
+        
+        Args:
+            参数同 iter_archive
+            
+        Returns:
+            {(exchange_buy, exchange_sell): {'timestamp': ndarray, 列名: ndarray}}
+        """
+        start, end = self._archive_range(days, start_date, end_date)
+        try:
+            return self.archive.query(symbol, exchange_buy, exchange_sell, start, end, columns)
+        except Exception as e:
+            logger.warning(f"⚠️  [历史查询] 查询列式归档失败: {e}", exc_info=True)
+            return {}
+    
+    def get_archived_days(self) -> List[date]:
+        """
+        获取已归档的日期列表
+        
+        Returns:
+            日期列表（升序）
+        """
+        return self.archive.list_days()
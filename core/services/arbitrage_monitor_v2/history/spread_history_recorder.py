@@ -5,6 +5,7 @@
 - 时间窗口采样
 - 异步批量写入CSV文件
 - 完全异步化，不阻塞核心流程
+- 已结束的自然日转换为列式归档（清理任务中执行）
 
 性能保证：
 - 内存写入：< 0.001ms
@@ -16,11 +17,15 @@
 import asyncio
 import time
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
 
+from .history_storage import get_history_storage
+from .columnar_archive import SpreadColumnarArchive
+from ..data.symbol_registry import get_symbol_registry
+
 # 🔥 使用统一日志系统配置（参考网格系统）
 from core.adapters.exchanges.utils.setup_logging import LoggingConfig
 
@@ -64,7 +69,8 @@ class SpreadHistoryRecorder:
         compress_after_days: int = 10,
         archive_after_days: int = 30,
         cleanup_interval_hours: int = 24,
-        db_retention_hours: int = 48
+        db_retention_hours: int = 48,
+        columnar_archive_enabled: bool = True
     ):
         """
         初始化历史记录器
@@ -80,6 +86,7 @@ class SpreadHistoryRecorder:
             archive_after_days: 归档天数（30天后归档）
             cleanup_interval_hours: 清理任务执行间隔（小时）
             db_retention_hours: 数据库保留时长（小时），默认48小时
+            columnar_archive_enabled: 是否将已结束的自然日转换为列式归档（data_dir/columnar）
         """
         if aiofiles is None:
             raise ImportError("aiofiles未安装，无法使用历史记录功能")
@@ -92,6 +99,9 @@ class SpreadHistoryRecorder:
         # SQLite数据库路径
         self.db_path = self.data_dir / "spread_history.db"
         self.sqlite_enabled = aiosqlite is not None
+        # 🔥 共享存储层：长连接写入 + WAL，与天然价差计算器/查询器复用同一实例
+        self.storage = get_history_storage(str(self.db_path))
+        self._storage_acquired = False
         
         # 压缩和归档配置
         self.compress_after_days = compress_after_days
@@ -101,6 +111,10 @@ class SpreadHistoryRecorder:
         # 🔥 数据库清理配置（保持数据库性能）
         self.db_retention_hours = db_retention_hours
         
+        # 🔥 列式归档（长周期查询不再需要解压/解析CSV）
+        self.columnar_archive_enabled = columnar_archive_enabled
+        self.columnar_archive = SpreadColumnarArchive(str(self.data_dir / "columnar"))
+        
         # 时间窗口采样配置
         self.sample_interval_seconds = sample_interval_seconds
         self.sample_strategy = sample_strategy
@@ -112,8 +126,9 @@ class SpreadHistoryRecorder:
         
         # 🔥 每个价差方向的最后记录时间（用于去重，1分钟内只记录一次）
         # 🔥 修改：同一个代币可能有2个方向的价差（ex1买->ex2卖 和 ex2买->ex1卖），需要分别去重
-        # 键格式：f"{symbol}_{exchange_buy}_{exchange_sell}"
-        self._last_record_time: Dict[str, float] = {}
+        # 键格式：(symbol_id, exchange_buy_id, exchange_sell_id)，ID 来自交易对注册表
+        self.symbol_registry = get_symbol_registry()
+        self._last_record_time: Dict[Tuple[int, int, int], float] = {}
         self._record_interval_seconds = 60  # 每个价差方向1分钟内只记录一次
         
         # 写入队列（异步）
@@ -135,6 +150,9 @@ class SpreadHistoryRecorder:
         # 运行状态
         self.running = False
         
+        # 🔥 样本写入监听器（写入SQLite成功后回调，如天然价差增量计算）
+        self._sample_listeners: List[Callable[[List[dict]], None]] = []
+        
         # 统计信息
         self.stats = {
             'records_received': 0,
@@ -144,6 +162,7 @@ class SpreadHistoryRecorder:
             'queue_drops': 0,
             'files_compressed': 0,
             'files_archived': 0,
+            'columnar_days_archived': 0,
         }
     
     async def start(self):
@@ -151,6 +170,11 @@ class SpreadHistoryRecorder:
         if self.running:
             return
         
+        # 登记为共享存储的使用方（停止时释放）
+        if not self._storage_acquired:
+            self.storage.acquire()
+            self._storage_acquired = True
+        
         # 初始化SQLite数据库（如果启用）
         if self.sqlite_enabled:
             await self._init_sqlite_database()
@@ -198,8 +222,26 @@ class SpreadHistoryRecorder:
         # 写入剩余数据
         await self._flush_remaining_data()
         
+        # 释放共享存储（其它组件仍在使用时不关闭连接）
+        if self._storage_acquired:
+            self._storage_acquired = False
+            await self.storage.release()
+        
         logger.info("🛑 [历史记录] 历史记录器已停止")
     
+    def add_sample_listener(self, callback: Callable[[List[dict]], None]) -> None:
+        """注册样本写入监听器（同步回调，参数为本批写入的样本列表）"""
+        if callback not in self._sample_listeners:
+            self._sample_listeners.append(callback)
+    
+    def _notify_sample_listeners(self, batch: List[dict]) -> None:
+        for callback in self._sample_listeners:
+            try:
+                callback(batch)
+            except Exception as e:
+                # 错误隔离：不影响写入流程
+                logger.error(f"⚠️  [历史记录] 样本监听器回调失败（已隔离）: {e}", exc_info=True)
+    
     async def record_spread(self, data: dict):
         """记录价差（非阻塞，只写入时间窗口缓存）
         
@@ -234,8 +276,13 @@ class SpreadHistoryRecorder:
         
         # 🔥 去重检查：每个价差方向在1分钟内只记录一次
         # 🔥 修改：同一个代币可能有2个方向的价差，需要分别去重
-        # 键格式：f"{symbol}_{exchange_buy}_{exchange_sell}"
-        spread_key = f"{symbol}_{exchange_buy}_{exchange_sell}"
+        # 键格式：(symbol_id, exchange_buy_id, exchange_sell_id)
+        registry = self.symbol_registry
+        spread_key = (
+            registry.symbol_id(symbol),
+            registry.exchange_id(exchange_buy),
+            registry.exchange_id(exchange_sell),
+        )
         current_time = time.time()
         last_record_time = self._last_record_time.get(spread_key, 0)
         if current_time - last_record_time < self._record_interval_seconds:
@@ -393,7 +440,7 @@ class SpreadHistoryRecorder:
             return
         
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.storage.writer() as db:
                 # 创建表
                 await db.execute("""
                     CREATE TABLE IF NOT EXISTS spread_history_sampled (
@@ -452,6 +499,12 @@ class SpreadHistoryRecorder:
                     ON spread_history_sampled(spread_pct)
                 """)
                 
+                # 🔥 按方向有序扫描（天然价差批量计算 / 单方向查询）
+                await db.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_sampled_direction_timestamp 
+                    ON spread_history_sampled(symbol, exchange_buy, exchange_sell, timestamp)
+                """)
+                
                 await db.commit()
                 
         except Exception as e:
@@ -586,7 +639,7 @@ class SpreadHistoryRecorder:
                     return float(v)
                 return v
             
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.storage.writer() as db:
                 # 使用executemany批量插入，提高性能
                 await db.executemany("""
                     INSERT INTO spread_history_sampled 
@@ -615,6 +668,8 @@ class SpreadHistoryRecorder:
                 ])
                 await db.commit()
                 self.stats['sqlite_batches_written'] += 1
+            
+            self._notify_sample_listeners(batch)
                 
         except Exception as e:
             # 错误隔离：不影响核心流程
@@ -652,10 +707,14 @@ class SpreadHistoryRecorder:
         
         while self.running:
             try:
-                # 1. 归档旧文件（压缩和归档）
+                # 1. 🔥 列式归档（读取原始/压缩CSV，需在文件移动前执行）
+                if self.columnar_archive_enabled:
+                    await self._archive_columnar()
+                
+                # 2. 归档旧文件（压缩和归档）
                 await self._archive_old_files()
                 
-                # 2. 🔥 清理数据库旧数据（保持性能）
+                # 3. 🔥 清理数据库旧数据（保持性能）
                 await self._cleanup_database()
                 
                 # 等待清理间隔
@@ -667,6 +726,61 @@ class SpreadHistoryRecorder:
                 logger.error(f"⚠️  [历史记录] 清理任务错误（已隔离）: {e}", exc_info=True)
                 await asyncio.sleep(3600)  # 出错后等待1小时再重试
     
+    def _csv_files_by_day(self) -> Dict[date, List[Path]]:
+        """按日期收集CSV来源（raw/*.csv、raw/*.csv.gz、archive/*.csv.gz）"""
+        files_by_day: Dict[date, List[Path]] = defaultdict(list)
+        for directory, pattern in (
+            (self.data_dir / "raw", "*.csv"),
+            (self.data_dir / "raw", "*.csv.gz"),
+            (self.data_dir / "archive", "*.csv.gz"),
+        ):
+            if not directory.exists():
+                continue
+            for csv_file in directory.glob(pattern):
+                try:
+                    file_date = datetime.strptime(csv_file.name.split('.')[0], "%Y-%m-%d").date()
+                except ValueError:
+                    continue
+                files_by_day[file_date].append(csv_file)
+        return files_by_day
+    
+    def _write_columnar_day(self, day: date, csv_files: List[Path]) -> int:
+        """读取单日CSV并写入列式归档（在线程池中执行）"""
+        import csv
+        import gzip
+        
+        def iter_records():
+            for csv_file in csv_files:
+                opener = gzip.open if csv_file.suffix == '.gz' else open
+                with opener(csv_file, 'rt', encoding='utf-8', newline='') as f:
+                    yield from csv.DictReader(f)
+        
+        return self.columnar_archive.write_day(day, iter_records())
+    
+    async def _archive_columnar(self):
+        """将已结束的自然日（且尚未归档）转换为列式归档"""
+        today = datetime.now().date()
+        files_by_day = self._csv_files_by_day()
+        pending_days = sorted(
+            day for day in files_by_day
+            if day < today and not self.columnar_archive.has_day(day)
+        )
+        
+        loop = asyncio.get_event_loop()
+        for day in pending_days:
+            try:
+                rows = await loop.run_in_executor(
+                    None,
+                    self._write_columnar_day,
+                    day,
+                    files_by_day[day]
+                )
+                self.stats['columnar_days_archived'] += 1
+                logger.info(f"🗄️  [历史记录] 列式归档完成: {day} ({rows} 行)")
+            except Exception as e:
+                # 错误隔离：不影响核心流程
+                logger.error(f"⚠️  [历史记录] 列式归档失败（已隔离）: {day}, {e}", exc_info=True)
+    
     async def _archive_old_files(self):
         """归档旧文件（压缩和归档）"""
         import gzip
@@ -746,7 +860,7 @@ class SpreadHistoryRecorder:
         try:
             cutoff_time = datetime.now() - timedelta(hours=self.db_retention_hours)
             
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.storage.writer() as db:
                 # 1. 查询即将删除的数据量
                 async with db.execute("""
                     SELECT COUNT(*) FROM spread_history_sampled
@@ -768,9 +882,10 @@ class SpreadHistoryRecorder:
                 """, (cutoff_time.isoformat(),)) as cursor:
                     await db.commit()
                 
-                # 3. 优化数据库（释放空间）
+                # 3. 优化数据库（释放空间），并截断 WAL 文件
                 await db.execute("VACUUM")
                 await db.commit()
+                await db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
                 
                 # 4. 查询清理后的数据量
                 async with db.execute("""
@@ -149,7 +149,7 @@ class BalanceMonitor:
 
             # 缓存失效或不存在，调用 REST API
             # 调用交易所API获取所有余额
-            balances = await self.engine.exchange.get_balances()
+            balances = await self.engine.account_state.get_balances()
 
             # 查找USDC余额
             usdc_balance = None
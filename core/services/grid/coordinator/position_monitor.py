@@ -207,11 +207,16 @@ class PositionMonitor:
 
             if is_spot_mode:
                 # 现货模式：通过余额查询
-                position_qty, entry_price = await self._query_spot_position()
+                position_qty, entry_price = await self._query_spot_position(
+                    fresh=is_event_triggered or is_initial
+                )
             else:
                 # 合约模式：通过持仓查询（保持原逻辑）
+                # 定时查询与健康检查等轮询共享同一次请求；事件触发的查询需要最新数据
                 positions = await asyncio.wait_for(
-                    self.engine.exchange.get_positions([self.config.symbol]),
+                    self.engine.account_state.get_positions(
+                        [self.config.symbol], fresh=is_event_triggered or is_initial
+                    ),
                     timeout=self._rest_timeout
                 )
 
@@ -657,10 +662,13 @@ class PositionMonitor:
             self.logger.error(traceback.format_exc())
         return False
 
-    async def _query_spot_position(self) -> tuple:
+    async def _query_spot_position(self, fresh: bool = False) -> tuple:
         """
         查询现货持仓（通过余额）
 
+        Args:
+            fresh: 是否绕过账户状态缓存（事件触发/首次查询时使用）
+
         Returns:
             (position_qty, entry_price): 持仓数量和成本价
         """
@@ -669,8 +677,8 @@ class PositionMonitor:
             symbol_parts = self.config.symbol.split('/')
             base_currency = symbol_parts[0]  # UBTC
 
-            # 查询余额
-            balances = await self.engine.exchange.get_balances()
+            # 查询余额（与余额监控共享同一次请求）
+            balances = await self.engine.account_state.get_balances(fresh=fresh)
 
             # 获取基础货币余额
             total_balance = Decimal('0')
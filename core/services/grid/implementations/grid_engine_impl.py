@@ -32,6 +32,7 @@ from datetime import datetime
 
 from ....logging import get_logger
 from ....adapters.exchanges import ExchangeInterface, OrderSide as ExchangeOrderSide, OrderType
+from ....adapters.exchanges.account_state import get_account_state_service
 from ..interfaces.grid_engine import IGridEngine
 from ..models import GridConfig, GridOrder, GridOrderSide, GridOrderStatus
 
@@ -63,6 +64,8 @@ class GridEngineImpl(IGridEngine):
         """
         self.logger = get_logger(__name__)
         self.exchange = exchange_adapter
+        # 🔥 账户状态共享服务：同账户的挂单/持仓/余额轮询合并为一次请求（短TTL缓存）
+        self.account_state = get_account_state_service(exchange_adapter)
         self.config: GridConfig = None
         self.coordinator = None  # 🔥 协调器引用（用于访问剥头皮管理器等）
 
@@ -280,60 +283,76 @@ class GridEngineImpl(IGridEngine):
                 else:
                     self.logger.info(f"✅ 重试成功: Grid {order.grid_id}")
 
-            # 更新订单ID
-            order.order_id = exchange_order.id or exchange_order.order_id
-            order.status = GridOrderStatus.PENDING
+            return self._register_placed_order(order, exchange_order, source)
 
-            # 🔥 更新 client_id（如果交易所返回了）
-            if hasattr(exchange_order, 'client_id') and exchange_order.client_id:
-                order.client_id = str(exchange_order.client_id)
+        except Exception as e:
+            self.logger.error(f"下单失败: {e}")
+            order.mark_failed()
+            raise
 
-            # 如果订单ID为临时ID（"pending"），尝试从符号查询获取实际ID
-            if order.order_id == "pending" or not order.order_id:
-                # Backpack API 有时只返回状态，需要查询获取实际订单ID
-                # 暂时使用价格+数量作为唯一标识
-                temp_id = f"grid_{order.grid_id}_{int(order.price)}_{int(order.amount*1000000)}"
-                order.order_id = temp_id
-                self.logger.warning(
-                    f"订单ID为临时值，使用组合ID: {temp_id} "
-                    f"(Grid {order.grid_id}, {order.side.value} {order.amount}@{order.price})"
-                )
+    def _register_placed_order(self, order: GridOrder, exchange_order, source: str) -> GridOrder:
+        """
+        记录交易所返回的订单（更新订单ID、加入追踪列表并打印日志）
 
-            # 添加到追踪列表
-            self._pending_orders[order.order_id] = order
+        Args:
+            order: 网格订单
+            exchange_order: 交易所返回的订单
+            source: 下单来源标识
 
-            # 🔥 新方案：如果有 client_id，存入 client_id 缓存
-            # 用于 WebSocket 推送时通过 client_id 查找原始订单
-            if order.client_id:
-                self._pending_orders_by_client_id[order.client_id] = order
-                self.logger.debug(
-                    f"📝 订单已缓存: client_id={order.client_id}, "
-                    f"price={order.price}, grid={order.grid_id}"
-                )
+        Returns:
+            更新后的网格订单
+        """
+        # 更新订单ID
+        order.order_id = exchange_order.id or exchange_order.order_id
+        order.status = GridOrderStatus.PENDING
+
+        # 🔥 更新 client_id（如果交易所返回了）
+        if hasattr(exchange_order, 'client_id') and exchange_order.client_id:
+            order.client_id = str(exchange_order.client_id)
+
+        # 如果订单ID为临时ID（"pending"），尝试从符号查询获取实际ID
+        if order.order_id == "pending" or not order.order_id:
+            # Backpack API 有时只返回状态，需要查询获取实际订单ID
+            # 暂时使用价格+数量作为唯一标识
+            temp_id = f"grid_{order.grid_id}_{int(order.price)}_{int(order.amount*1000000)}"
+            order.order_id = temp_id
+            self.logger.warning(
+                f"订单ID为临时值，使用组合ID: {temp_id} "
+                f"(Grid {order.grid_id}, {order.side.value} {order.amount}@{order.price})"
+            )
 
-            # 🔥 根据来源使用不同的标识符
-            if source == "反手单":
-                prefix = "🔄 [反手]"
-            elif source == "健康检查":
-                prefix = "🏥 [补单]"
-            elif source == "批量初始化":
-                prefix = "🎯 [初始]"
-            elif source == "止盈单":
-                prefix = "💰 [止盈]"
-            else:
-                prefix = "📝 [下单]"
+        # 添加到追踪列表
+        self._pending_orders[order.order_id] = order
+        # 挂单已变化：之前发起的挂单查询结果作废（避免REST轮询把新订单误判为已成交）
+        self.account_state.invalidate('open_orders')
 
-            self.logger.info(
-                f"{prefix} {order.side.value.upper()} {order.amount}@{order.price} "
-                f"(Grid {order.grid_id}, OrderID: {order.order_id})"
+        # 🔥 新方案：如果有 client_id，存入 client_id 缓存
+        # 用于 WebSocket 推送时通过 client_id 查找原始订单
+        if order.client_id:
+            self._pending_orders_by_client_id[order.client_id] = order
+            self.logger.debug(
+                f"📝 订单已缓存: client_id={order.client_id}, "
+                f"price={order.price}, grid={order.grid_id}"
             )
 
-            return order
+        # 🔥 根据来源使用不同的标识符
+        if source == "反手单":
+            prefix = "🔄 [反手]"
+        elif source == "健康检查":
+            prefix = "🏥 [补单]"
+        elif source == "批量初始化":
+            prefix = "🎯 [初始]"
+        elif source == "止盈单":
+            prefix = "💰 [止盈]"
+        else:
+            prefix = "📝 [下单]"
 
-        except Exception as e:
-            self.logger.error(f"下单失败: {e}")
-            order.mark_failed()
-            raise
+        self.logger.info(
+            f"{prefix} {order.side.value.upper()} {order.amount}@{order.price} "
+            f"(Grid {order.grid_id}, OrderID: {order.order_id})"
+        )
+
+        return order
 
     async def place_market_order(self, side: GridOrderSide, amount: Decimal) -> None:
         """
@@ -374,6 +393,68 @@ class GridEngineImpl(IGridEngine):
             self.logger.error(f"❌ 市价单失败: {e}")
             raise
 
+    async def _place_lighter_batch(self, orders: List[GridOrder], source: str) -> list:
+        """
+        Lighter 批量签名+批量提交（本地连续 nonce，按块 sendTxBatch）
+
+        Args:
+            orders: 网格订单列表
+            source: 下单来源标识
+
+        Returns:
+            与 orders 一一对应的结果（GridOrder 或 Exception）
+        """
+        payload = [
+            {
+                'symbol': self.config.symbol,
+                'side': self._convert_order_side(order.side),
+                'quantity': order.amount,
+                'price': order.price,
+            }
+            for order in orders
+        ]
+
+        # 与单笔下单共用全局锁，批次内部的 nonce 由适配器统一分配
+        async with self._lighter_order_lock:
+            placed = await self.exchange.place_limit_orders_batch(payload)
+
+        results = []
+        for order, exchange_order in zip(orders, placed):
+            if exchange_order is None:
+                order.mark_failed()
+                results.append(Exception(
+                    f"批量下单未被接受 (Grid {order.grid_id}, {order.side.value} {order.amount}@{order.price})"
+                ))
+                continue
+            try:
+                results.append(self._register_placed_order(order, exchange_order, source))
+            except Exception as e:
+                order.mark_failed()
+                results.append(e)
+        return results
+
+    async def _place_lighter_serial(self, orders: List[GridOrder], source: str) -> list:
+        """Lighter 逐笔串行下单（批量提交不可用或失败时的回退路径）"""
+        results = []
+        for order in orders:
+            try:
+                # 🔥 批量下单时使用 batch_mode=True，不立即查询 order_index
+                result = await self.place_order(order, batch_mode=True, source=source)
+                results.append(result)
+            except Exception as e:
+                results.append(e)
+                self.logger.error(f"订单下单异常: {e}")
+        return results
+
+    async def _place_lighter_orders(self, orders: List[GridOrder], source: str) -> list:
+        """Lighter 批量下单：优先走批量签名+sendTxBatch，整批失败时回退为串行下单"""
+        if hasattr(self.exchange, 'place_limit_orders_batch'):
+            try:
+                return await self._place_lighter_batch(orders, source)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Lighter批量提交失败，回退为串行下单: {e}")
+        return await self._place_lighter_serial(orders, source)
+
     async def place_batch_orders(self, orders: List[GridOrder], max_retries: int = 2) -> List[GridOrder]:
         """
         批量下单 - 优化版，支持大批量订单和失败重试
@@ -403,21 +484,13 @@ class GridEngineImpl(IGridEngine):
                 f"({len(batch)}个订单)"
             )
 
-            # 🔥 Lighter交易所特殊处理：串行下单（避免nonce冲突）
+            # 🔥 Lighter交易所特殊处理：本地连续nonce + 批量签名提交（失败回退串行）
             # 其他交易所：并发下单（保持原有性能）
             exchange_id = str(self.config.exchange).lower(
             ) if self.config.exchange else ''
             if exchange_id == 'lighter':
-                self.logger.info("🔥 Lighter交易所：使用串行批量下单模式（避免nonce冲突）")
-                results = []
-                for order in batch:
-                    try:
-                        # 🔥 批量下单时使用 batch_mode=True，不立即查询 order_index
-                        result = await self.place_order(order, batch_mode=True, source="批量初始化")
-                        results.append(result)
-                    except Exception as e:
-                        results.append(e)
-                        self.logger.error(f"订单下单异常: {e}")
+                self.logger.info("🔥 Lighter交易所：使用批量签名提交模式（本地分配nonce）")
+                results = await self._place_lighter_orders(batch, "批量初始化")
             else:
                 # 并发下单当前批次（其他交易所）
                 tasks = [self.place_order(order) for order in batch]
@@ -463,19 +536,12 @@ class GridEngineImpl(IGridEngine):
                 retry_orders = [order for order, _ in failed_orders]
                 failed_orders = []  # 清空失败列表
 
-                # 🔥 Lighter交易所：串行重试（避免nonce冲突）
+                # 🔥 Lighter交易所：批量重试（nonce由适配器统一分配）
                 # 其他交易所：并发重试
                 exchange_id = str(self.config.exchange).lower(
                 ) if self.config.exchange else ''
                 if exchange_id == 'lighter':
-                    results = []
-                    for order in retry_orders:
-                        try:
-                            # 🔥 重试也使用批量模式
-                            result = await self.place_order(order, batch_mode=True, source="批量初始化重试")
-                            results.append(result)
-                        except Exception as e:
-                            results.append(e)
+                    results = await self._place_lighter_orders(retry_orders, "批量初始化重试")
                 else:
                     # 重试失败的订单（并发）
                     tasks = [self.place_order(order) for order in retry_orders]
@@ -581,6 +647,7 @@ class GridEngineImpl(IGridEngine):
             self._expected_cancellations.add(order_id)
 
             await self.exchange.cancel_order(order_id, self.config.symbol)
+            self.account_state.invalidate('open_orders')
 
             # 标记为已取消并从追踪列表移除（自动处理 Lighter 双键）
             if order_id in self._pending_orders:
@@ -615,6 +682,7 @@ class GridEngineImpl(IGridEngine):
                 self._expected_cancellations.add(order_id)
 
             cancelled_orders = await self.exchange.cancel_all_orders(self.config.symbol)
+            self.account_state.invalidate('open_orders')
             count = len(cancelled_orders)
 
             # 清空追踪列表
@@ -1149,8 +1217,8 @@ class GridEngineImpl(IGridEngine):
     async def _check_pending_orders(self):
         """检查挂单状态（通过REST API）"""
         try:
-            # 获取当前所有挂单
-            open_orders = await self.exchange.get_open_orders(self.config.symbol)
+            # 获取当前所有挂单（与健康检查等轮询共享同一次请求）
+            open_orders = await self.account_state.get_open_orders(self.config.symbol)
 
             # 创建订单ID集合（用于快速查找）
             open_order_ids = {
@@ -124,8 +124,8 @@ class OrderHealthChecker:
             (订单列表, 持仓列表)
         """
         try:
-            # 获取订单（使用REST API）
-            orders = await self.engine.exchange.get_open_orders(self.config.symbol)
+            # 获取订单（使用REST API，经账户状态服务与其它轮询合并）
+            orders = await self.engine.account_state.get_open_orders(self.config.symbol)
 
             # 🔥 获取持仓（区分现货和合约）
             try:
@@ -135,7 +135,7 @@ class OrderHealthChecker:
                     self.logger.debug("📊 健康检查(现货): 使用余额查询持仓")
                 else:
                     # 🔥 合约模式：通过持仓查询
-                    positions = await self.engine.exchange.get_positions([self.config.symbol])
+                    positions = await self.engine.account_state.get_positions([self.config.symbol])
                     self.logger.debug("📊 健康检查(合约): 使用持仓查询")
 
                 if positions:
@@ -2306,7 +2306,7 @@ class OrderHealthChecker:
             base_currency = symbol_parts[0]  # UBTC
 
             # 查询余额
-            balances = await self.engine.exchange.get_balances()
+            balances = await self.engine.account_state.get_balances()
 
             # 获取基础货币余额
             total_balance = Decimal('0')
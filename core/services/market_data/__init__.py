@@ -0,0 +1,28 @@
+"""
+行情共享服务模块
+
+单进程持有交易所连接并通过 Unix socket 向同机多个策略进程扇出标准化行情：
+- MarketDataDaemon: 守护进程（ExchangeManager + DataAggregator → IPC）
+- MarketDataClient: 守护进程客户端
+- SharedMarketDataAdapter: 行情走守护进程、交易委托原适配器的适配器包装
+"""
+
+from .protocol import (
+    CHANNEL_TICKER,
+    CHANNEL_ORDERBOOK,
+    CHANNEL_TRADES,
+    DEFAULT_SOCKET_PATH,
+)
+from .daemon import MarketDataDaemon, MarketDataDaemonConfig
+from .client import MarketDataClient, SharedMarketDataAdapter
+
+__all__ = [
+    'MarketDataDaemon',
+    'MarketDataDaemonConfig',
+    'MarketDataClient',
+    'SharedMarketDataAdapter',
+    'CHANNEL_TICKER',
+    'CHANNEL_ORDERBOOK',
+    'CHANNEL_TRADES',
+    'DEFAULT_SOCKET_PATH',
+]
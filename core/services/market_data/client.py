@@ -0,0 +1,475 @@
+"""
+行情共享服务 - 客户端
+
+- MarketDataClient: 连接守护进程的 Unix socket，按 (频道, 交易所, 币种) 分发回调，断线自动重连并重放订阅
+- SharedMarketDataAdapter: 包装现有交易所适配器，行情订阅（subscribe_ticker / subscribe_orderbook /
+  subscribe_trades 及 batch_* 变体）改走守护进程；下单、账户、私有推送等全部委托给原适配器。
+  连接时原适配器只建立 REST 侧，交易所行情 WebSocket 不再连接；订阅私有推送时才按需连接
+
+策略进程只需在交易所配置的 extra_params 中设置 shared_market_data_socket，
+ExchangeFactory.create_adapter 会自动完成包装。
+"""
+
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ...logging import get_system_logger
+from ...adapters.exchanges.interface import ExchangeInterface, ExchangeStatus
+from ...adapters.exchanges.models import (
+    BalanceData,
+    ExchangeInfo,
+    OHLCVData,
+    OrderBookData,
+    OrderData,
+    OrderSide,
+    OrderType,
+    PositionData,
+    TickerData,
+    TradeData,
+)
+from .protocol import (
+    CHANNEL_ORDERBOOK,
+    CHANNEL_TICKER,
+    CHANNEL_TRADES,
+    DEFAULT_SOCKET_PATH,
+    DESERIALIZERS,
+    encode_frame,
+    read_frame,
+)
+
+
+TopicKey = Tuple[str, str, str]   # (channel, exchange, symbol)
+
+# 原适配器中 WebSocket 组件的常见属性名
+_INNER_WS_ATTRS = ('_websocket', 'websocket', '_ws_client')
+
+
+class MarketDataClient:
+    """行情共享守护进程客户端"""
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        ack_timeout: float = 35.0,
+    ):
+        """
+        Args:
+            socket_path: 守护进程 Unix socket 路径
+            reconnect_delay: 初始重连间隔（秒），失败后指数退避
+            max_reconnect_delay: 最大重连间隔（秒）
+            ack_timeout: 等待订阅确认的超时（秒）
+        """
+        self.socket_path = socket_path
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.ack_timeout = ack_timeout
+        self.logger = get_system_logger("market_data_client")
+
+        self._callbacks: Dict[TopicKey, List[Callable]] = {}
+        self._latest: Dict[TopicKey, Any] = {}
+        self._acks: Dict[TopicKey, List[asyncio.Future]] = {}
+
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._connected = asyncio.Event()
+        self._run_task: Optional[asyncio.Task] = None
+        self._running = False
+
+        self.frames_received = 0
+        self.reconnects = 0
+
+    # ============= 生命周期 =============
+
+    async def start(self, timeout: float = 10.0) -> bool:
+        """启动连接循环并等待首次连接"""
+        if not self._running:
+            self._running = True
+            self._run_task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            self.logger.warning(f"⚠️ 连接行情共享服务超时: {self.socket_path}（后台继续重试）")
+            return False
+
+    async def stop(self) -> None:
+        """停止连接循环"""
+        self._running = False
+        if self._run_task:
+            self._run_task.cancel()
+            try:
+                await self._run_task
+            except asyncio.CancelledError:
+                pass
+            self._run_task = None
+        await self._close_writer()
+
+    def is_connected(self) -> bool:
+        return self._connected.is_set()
+
+    async def _close_writer(self) -> None:
+        self._connected.clear()
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        while self._running:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.socket_path)
+            except (OSError, ConnectionError) as e:
+                self.logger.debug(f"连接行情共享服务失败: {e}，{delay:.1f}s 后重试")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+
+            self._writer = writer
+            self._connected.set()
+            delay = self.reconnect_delay
+            self.logger.info(f"✅ 已连接行情共享服务: {self.socket_path}")
+
+            # 重连后重放全部订阅
+            for key in list(self._callbacks):
+                self._send_subscribe(key)
+
+            try:
+                while True:
+                    message = await read_frame(reader)
+                    if message is None:
+                        break
+                    await self._handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"行情共享连接异常: {e}")
+            finally:
+                await self._close_writer()
+
+            if self._running:
+                self.reconnects += 1
+                self.logger.warning("⚠️ 行情共享连接断开，准备重连")
+                await asyncio.sleep(delay)
+
+    # ============= 订阅 =============
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        if self._writer is not None:
+            self._writer.write(encode_frame(message))
+
+    def _send_subscribe(self, key: TopicKey) -> None:
+        channel, exchange, symbol = key
+        self._send({"op": "subscribe", "channel": channel, "exchange": exchange, "symbol": symbol})
+
+    async def subscribe(self, channel: str, exchange: str, symbol: str, callback: Callable) -> bool:
+        """
+        订阅主题
+
+        Args:
+            channel: ticker / orderbook / trades
+            exchange: 交易所ID（与守护进程中注册的ID一致）
+            symbol: 交易对符号（与直接调用交易所适配器时的写法一致）
+            callback: 回调，参数为对应的数据模型（支持同步/异步函数）
+
+        Returns:
+            bool: 守护进程是否确认订阅（未连接时先登记，连接后自动发送）
+        """
+        key = (channel, exchange, symbol)
+        callbacks = self._callbacks.setdefault(key, [])
+        if callback is not None and callback not in callbacks:
+            callbacks.append(callback)
+        if len(callbacks) > 1 or not self.is_connected():
+            return self.is_connected()
+
+        future = asyncio.get_running_loop().create_future()
+        self._acks.setdefault(key, []).append(future)
+        self._send_subscribe(key)
+        try:
+            return await asyncio.wait_for(future, timeout=self.ack_timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"订阅确认超时: {channel} {exchange} {symbol}")
+            return False
+
+    async def unsubscribe(
+        self,
+        channel: Optional[str] = None,
+        exchange: Optional[str] = None,
+        symbol: Optional[str] = None,
+    ) -> None:
+        """取消订阅（参数为 None 表示不限定该维度）"""
+        for key in list(self._callbacks):
+            key_channel, key_exchange, key_symbol = key
+            if channel is not None and key_channel != channel:
+                continue
+            if exchange is not None and key_exchange != exchange:
+                continue
+            if symbol is not None and key_symbol != symbol:
+                continue
+            del self._callbacks[key]
+            self._latest.pop(key, None)
+            self._send({"op": "unsubscribe", "channel": key_channel, "exchange": key_exchange, "symbol": key_symbol})
+
+    def get_latest(self, channel: str, exchange: str, symbol: str) -> Optional[Any]:
+        """最近一次收到的数据（ticker / orderbook）"""
+        return self._latest.get((channel, exchange, symbol))
+
+    # ============= 分发 =============
+
+    async def _handle_message(self, message: Dict[str, Any]) -> None:
+        op = message.get("op")
+        if op == "data":
+            channel = message["channel"]
+            key = (channel, message["exchange"], message["symbol"])
+            callbacks = self._callbacks.get(key)
+            if callbacks is None:
+                return
+            self.frames_received += 1
+            data = DESERIALIZERS[channel](message["data"])
+            if channel != CHANNEL_TRADES:
+                self._latest[key] = data
+            for callback in list(callbacks):
+                try:
+                    result = callback(data)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    self.logger.error(f"行情回调执行出错 {key}: {e}")
+        elif op == "ack":
+            key = (message.get("channel"), message.get("exchange"), message.get("symbol"))
+            if not message.get("ok"):
+                self.logger.error(f"❌ 行情共享订阅被拒绝 {key}: {message.get('error')}")
+            for future in self._acks.pop(key, []):
+                if not future.done():
+                    future.set_result(bool(message.get("ok")))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "socket_path": self.socket_path,
+            "connected": self.is_connected(),
+            "topics": len(self._callbacks),
+            "frames_received": self.frames_received,
+            "reconnects": self.reconnects,
+        }
+
+
+class SharedMarketDataAdapter(ExchangeInterface):
+    """
+    行情走共享守护进程的交易所适配器包装
+
+    行情订阅改由 MarketDataClient 提供；其余接口（含 subscribe_user_data 等私有推送、
+    以及原适配器特有的方法和属性）全部委托给被包装的适配器。
+    """
+
+    def __init__(
+        self,
+        inner: ExchangeInterface,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        client: Optional[MarketDataClient] = None,
+    ):
+        """
+        Args:
+            inner: 原交易所适配器（负责交易与账户）
+            socket_path: 守护进程 Unix socket 路径
+            client: 复用已有客户端（多个适配器可共享一条连接）
+        """
+        self._inner = inner
+        super().__init__(inner.config)
+        self.client = client or MarketDataClient(socket_path)
+        self.exchange_id = inner.config.exchange_id
+        self.logger = get_system_logger(f"shared_market_data.{self.exchange_id}")
+        self._private_ws_connected = False
+
+    def __getattr__(self, name: str) -> Any:
+        # 仅在本对象上找不到属性时触发：透传原适配器特有的方法和属性
+        inner = self.__dict__.get('_inner')
+        if inner is None:
+            raise AttributeError(name)
+        return getattr(inner, name)
+
+    @property
+    def inner(self) -> ExchangeInterface:
+        return self._inner
+
+    @property
+    def status(self) -> ExchangeStatus:
+        return self._inner.status
+
+    @status.setter
+    def status(self, value: ExchangeStatus) -> None:
+        # 状态由原适配器维护
+        pass
+
+    # ============= 生命周期 =============
+
+    def _inner_websocket(self) -> Optional[Any]:
+        inner_attrs = getattr(self._inner, '__dict__', {})
+        for attr in _INNER_WS_ATTRS:
+            ws = inner_attrs.get(attr)
+            if ws is not None and callable(getattr(ws, 'connect', None)):
+                return ws
+        return None
+
+    async def connect(self) -> bool:
+        if not await self.client.start():
+            self.logger.warning("⚠️ 行情共享服务暂不可用，订阅将在连接建立后自动生效")
+
+        ws = self._inner_websocket()
+        if ws is None:
+            # 识别不出 WebSocket 组件时退回完整连接（行情仍走共享服务）
+            self.logger.warning("⚠️ 未识别到原适配器的 WebSocket 组件，按完整连接处理")
+            return await self._inner.connect()
+
+        # 🔥 原适配器只建立 REST 侧：连接期间把 WebSocket.connect 替换为空操作
+        async def _skip_connect(*args, **kwargs) -> bool:
+            return True
+
+        ws.connect = _skip_connect
+        try:
+            return await self._inner.connect()
+        finally:
+            del ws.connect
+
+    async def _ensure_private_stream(self) -> None:
+        """私有推送需要交易所 WebSocket：首次订阅时才连接"""
+        if self._private_ws_connected:
+            return
+        ws = self._inner_websocket()
+        if ws is not None and not await ws.connect():
+            self.logger.warning("⚠️ 私有推送 WebSocket 连接失败")
+            return
+        self._private_ws_connected = True
+
+    async def disconnect(self) -> None:
+        await self.client.unsubscribe(exchange=self.exchange_id)
+        await self.client.stop()
+        await self._inner.disconnect()
+
+    async def authenticate(self) -> bool:
+        return await self._inner.authenticate()
+
+    async def health_check(self) -> Dict[str, Any]:
+        health = await self._inner.health_check()
+        if isinstance(health, dict):
+            health = {**health, "shared_market_data": self.client.get_statistics()}
+        return health
+
+    def get_status(self) -> ExchangeStatus:
+        return self._inner.get_status()
+
+    def is_connected(self) -> bool:
+        return self._inner.is_connected()
+
+    def is_authenticated(self) -> bool:
+        return self._inner.is_authenticated()
+
+    # ============= 行情订阅（共享） =============
+
+    async def subscribe_ticker(self, symbol: str, callback: Callable[[TickerData], None]) -> None:
+        await self.client.subscribe(CHANNEL_TICKER, self.exchange_id, symbol, callback)
+
+    async def subscribe_orderbook(self, symbol: str, callback: Callable[[OrderBookData], None], *args, **kwargs) -> None:
+        await self.client.subscribe(CHANNEL_ORDERBOOK, self.exchange_id, symbol, callback)
+
+    async def subscribe_trades(self, symbol: str, callback: Callable[[TradeData], None]) -> None:
+        await self.client.subscribe(CHANNEL_TRADES, self.exchange_id, symbol, callback)
+
+    async def _batch_subscribe(self, channel: str, symbols: Optional[List[str]], callback: Optional[Callable]) -> None:
+        if not symbols:
+            self.logger.warning(f"共享行情不支持全市场批量订阅（{channel}），请显式传入交易对列表")
+            return
+
+        def bind(sym: str) -> Callable:
+            # batch_* 约定回调签名为 (symbol, data)
+            def handler(data):
+                if callback is not None:
+                    return callback(sym, data)
+            return handler
+
+        await asyncio.gather(*(
+            self.client.subscribe(channel, self.exchange_id, symbol, bind(symbol))
+            for symbol in symbols
+        ))
+
+    async def batch_subscribe_tickers(self, symbols: Optional[List[str]] = None,
+                                      callback: Optional[Callable[[str, TickerData], None]] = None) -> None:
+        await self._batch_subscribe(CHANNEL_TICKER, symbols, callback)
+
+    async def batch_subscribe_orderbooks(self, symbols: Optional[List[str]] = None,
+                                         callback: Optional[Callable[[str, OrderBookData], None]] = None,
+                                         **kwargs) -> None:
+        await self._batch_subscribe(CHANNEL_ORDERBOOK, symbols, callback)
+
+    async def batch_subscribe_trades(self, symbols: Optional[List[str]] = None,
+                                     callback: Optional[Callable[[str, TradeData], None]] = None) -> None:
+        await self._batch_subscribe(CHANNEL_TRADES, symbols, callback)
+
+    async def subscribe_user_data(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        await self._ensure_private_stream()
+        await self._inner.subscribe_user_data(callback)
+
+    async def unsubscribe(self, symbol: Optional[str] = None) -> None:
+        await self.client.unsubscribe(exchange=self.exchange_id, symbol=symbol)
+        if symbol is None:
+            await self._inner.unsubscribe(None)
+
+    # ============= 委托给原适配器 =============
+
+    async def get_exchange_info(self) -> ExchangeInfo:
+        return await self._inner.get_exchange_info()
+
+    async def get_ticker(self, symbol: str) -> TickerData:
+        return await self._inner.get_ticker(symbol)
+
+    async def get_tickers(self, symbols: Optional[List[str]] = None) -> List[TickerData]:
+        return await self._inner.get_tickers(symbols)
+
+    async def get_orderbook(self, symbol: str, limit: Optional[int] = None, **kwargs) -> OrderBookData:
+        return await self._inner.get_orderbook(symbol, limit, **kwargs)
+
+    async def get_ohlcv(self, symbol: str, timeframe: str, since: Optional[datetime] = None,
+                        limit: Optional[int] = None) -> List[OHLCVData]:
+        return await self._inner.get_ohlcv(symbol, timeframe, since, limit)
+
+    async def get_trades(self, symbol: str, since: Optional[datetime] = None,
+                         limit: Optional[int] = None) -> List[TradeData]:
+        return await self._inner.get_trades(symbol, since, limit)
+
+    async def get_balances(self) -> List[BalanceData]:
+        return await self._inner.get_balances()
+
+    async def get_positions(self, symbols: Optional[List[str]] = None) -> List[PositionData]:
+        return await self._inner.get_positions(symbols)
+
+    async def create_order(self, symbol: str, side: OrderSide, order_type: OrderType, amount: Decimal,
+                           price: Optional[Decimal] = None, params: Optional[Dict[str, Any]] = None,
+                           **kwargs) -> OrderData:
+        return await self._inner.create_order(symbol, side, order_type, amount, price, params, **kwargs)
+
+    async def cancel_order(self, order_id: str, symbol: str, **kwargs) -> OrderData:
+        return await self._inner.cancel_order(order_id, symbol, **kwargs)
+
+    async def cancel_all_orders(self, symbol: Optional[str] = None) -> List[OrderData]:
+        return await self._inner.cancel_all_orders(symbol)
+
+    async def get_order(self, order_id: str, symbol: str) -> OrderData:
+        return await self._inner.get_order(order_id, symbol)
+
+    async def get_open_orders(self, symbol: Optional[str] = None) -> List[OrderData]:
+        return await self._inner.get_open_orders(symbol)
+
+    async def get_order_history(self, symbol: Optional[str] = None, since: Optional[datetime] = None,
+                                limit: Optional[int] = None) -> List[OrderData]:
+        return await self._inner.get_order_history(symbol, since, limit)
+
+    async def set_leverage(self, symbol: str, leverage: int) -> Dict[str, Any]:
+        return await self._inner.set_leverage(symbol, leverage)
+
+    async def set_margin_mode(self, symbol: str, margin_mode: str) -> Dict[str, Any]:
+        return await self._inner.set_margin_mode(symbol, margin_mode)
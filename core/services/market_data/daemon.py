@@ -0,0 +1,481 @@
+"""
+行情共享守护进程
+
+一个进程持有全部交易所连接（ExchangeManager + DataAggregator），
+把标准化后的 ticker / orderbook / trades 通过 Unix socket 扇出给同机的多个策略进程：
+
+- 每条行情在守护进程内只解析一次、编码一次，按订阅者复用同一份字节
+- 上游订阅去重：同一 (频道, 交易所, 币种) 无论多少客户端订阅，只向交易所订阅一次；
+  短时间窗口内的新订阅合并为一次 DataAggregator 批量订阅
+- 慢客户端不拖累其它客户端：ticker / orderbook 在每个客户端的发送队列中按主题合并
+  （只保留最新一帧），trades 按序排队并有上限
+- 新订阅者立即收到该主题最近一帧（晚启动的策略不必等下一次推送）
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from ...logging import get_system_logger
+from ...data_aggregator import AggregatedData, DataAggregator
+from ...domain.models import DataType
+from ...adapters.exchanges.manager import ExchangeManager
+from .protocol import (
+    CHANNEL_ORDERBOOK,
+    CHANNEL_TICKER,
+    CHANNEL_TRADES,
+    CHANNELS,
+    DEFAULT_SOCKET_PATH,
+    SERIALIZERS,
+    encode_frame,
+    read_frame,
+)
+
+
+TopicKey = Tuple[str, str, str]   # (channel, exchange, symbol)
+
+
+@dataclass
+class MarketDataDaemonConfig:
+    """行情共享守护进程配置"""
+    socket_path: str = DEFAULT_SOCKET_PATH
+    subscribe_batch_window: float = 0.05     # 上游订阅合并窗口（秒）
+    subscribe_timeout: float = 30.0          # 单次上游订阅超时（秒）
+    max_queued_trades: int = 2000            # 每个客户端排队的 trades/控制帧上限
+    # 启动时预订阅：exchange -> {channel: [symbols]}
+    preload: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MarketDataDaemonConfig':
+        preload: Dict[str, Dict[str, List[str]]] = {}
+        for exchange_id, exchange_cfg in (data.get('exchanges') or {}).items():
+            channels = (exchange_cfg or {}).get('preload') or {}
+            preload[exchange_id] = {
+                channel: list(symbols or [])
+                for channel, symbols in channels.items()
+                if channel in CHANNELS
+            }
+        return cls(
+            socket_path=data.get('socket_path', DEFAULT_SOCKET_PATH),
+            subscribe_batch_window=float(data.get('subscribe_batch_window', 0.05)),
+            subscribe_timeout=float(data.get('subscribe_timeout', 30.0)),
+            max_queued_trades=int(data.get('max_queued_trades', 2000)),
+            preload=preload,
+        )
+
+
+class _ClientSession:
+    """单个客户端连接：订阅集合 + 合并式发送队列"""
+
+    def __init__(self, session_id: int, writer: asyncio.StreamWriter, max_queued: int, logger):
+        self.session_id = session_id
+        self.writer = writer
+        self.logger = logger
+        self.topics: Set[TopicKey] = set()
+
+        # 🔥 ticker/orderbook 按主题合并，只保留最新一帧；trades 与控制帧按序排队
+        self._latest: Dict[TopicKey, bytes] = {}
+        self._ordered: Deque[bytes] = deque()
+        self._max_queued = max_queued
+        self._wakeup = asyncio.Event()
+        self._closed = False
+
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.frames_conflated = 0
+        self.frames_dropped = 0
+
+        self._writer_task = asyncio.create_task(self._writer_loop())
+
+    def send_latest(self, key: TopicKey, frame: bytes) -> None:
+        """入队可合并的行情帧（同主题未发出的旧帧被覆盖）"""
+        if self._closed:
+            return
+        if key in self._latest:
+            self.frames_conflated += 1
+        self._latest[key] = frame
+        self._wakeup.set()
+
+    def send_ordered(self, frame: bytes) -> None:
+        """入队必须按序送达的帧（trades / ack / pong）"""
+        if self._closed:
+            return
+        if len(self._ordered) >= self._max_queued:
+            self._ordered.popleft()
+            self.frames_dropped += 1
+        self._ordered.append(frame)
+        self._wakeup.set()
+
+    async def _writer_loop(self) -> None:
+        try:
+            while not self._closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+
+                frames: List[bytes] = list(self._ordered)
+                self._ordered.clear()
+                if self._latest:
+                    frames.extend(self._latest.values())
+                    self._latest.clear()
+                if not frames:
+                    continue
+
+                # 一次写入本轮积累的全部帧；drain 期间到达的行情继续在 _latest 中合并
+                self.writer.writelines(frames)
+                await self.writer.drain()
+                self.frames_sent += len(frames)
+                self.bytes_sent += sum(len(frame) for frame in frames)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            self.logger.warning(f"客户端 #{self.session_id} 发送失败: {e}")
+        finally:
+            self._closed = True
+
+    async def close(self) -> None:
+        self._closed = True
+        self._wakeup.set()
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        try:
+            self.writer.close()
+            await self.writer.wait_closed()
+        except Exception:
+            pass
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "topics": len(self.topics),
+            "frames_sent": self.frames_sent,
+            "bytes_sent": self.bytes_sent,
+            "frames_conflated": self.frames_conflated,
+            "frames_dropped": self.frames_dropped,
+        }
+
+
+class MarketDataDaemon:
+    """行情共享守护进程：DataAggregator 回调 → Unix socket 扇出"""
+
+    _DATA_TYPES = {
+        CHANNEL_TICKER: DataType.TICKER,
+        CHANNEL_ORDERBOOK: DataType.ORDERBOOK,
+        CHANNEL_TRADES: DataType.TRADES,
+    }
+
+    def __init__(
+        self,
+        exchange_manager: ExchangeManager,
+        data_aggregator: DataAggregator,
+        config: Optional[MarketDataDaemonConfig] = None,
+    ):
+        self.exchange_manager = exchange_manager
+        self.data_aggregator = data_aggregator
+        self.config = config or MarketDataDaemonConfig()
+        self.logger = get_system_logger("market_data_daemon")
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._sessions: Dict[int, _ClientSession] = {}
+        self._next_session_id = 0
+
+        # 路由表
+        self._topics: Dict[TopicKey, Set[_ClientSession]] = {}          # 客户端订阅的主题 → 会话
+        self._aliases: Dict[TopicKey, Set[str]] = {}                      # (频道, 交易所, 上游回调符号) → 客户端符号
+        self._latest_frames: Dict[TopicKey, bytes] = {}                   # 主题最近一帧（新订阅者快照）
+        self._last_objects: Dict[TopicKey, Any] = {}                      # 上游重复回调去重
+
+        # 上游订阅（去重 + 批量合并）
+        self._upstream: Set[TopicKey] = set()
+        self._pending_upstream: Dict[Tuple[str, str], Dict[str, List[asyncio.Future]]] = {}
+        self._flush_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+
+        self._callbacks_registered = False
+        self._started_at: Optional[float] = None
+        self._stats = {
+            "updates_received": 0,
+            "updates_published": 0,
+            "updates_unrouted": 0,
+            "updates_duplicated": 0,
+            "frames_encoded": 0,
+            "upstream_batches": 0,
+        }
+
+    # ============= 生命周期 =============
+
+    async def start(self) -> None:
+        """注册聚合器回调、启动 Unix socket 服务并执行预订阅"""
+        if self._server is not None:
+            self.logger.warning("行情共享守护进程已在运行")
+            return
+
+        if not self._callbacks_registered:
+            for channel, data_type in self._DATA_TYPES.items():
+                self.data_aggregator.register_data_callback(data_type, self._make_callback(channel))
+            self._callbacks_registered = True
+
+        socket_path = self.config.socket_path
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self._server = await asyncio.start_unix_server(self._handle_client, path=socket_path)
+        self._started_at = time.time()
+        self.logger.info(f"✅ 行情共享服务已启动: {socket_path}")
+
+        for exchange_id, channels in self.config.preload.items():
+            for channel, symbols in channels.items():
+                if symbols:
+                    results = await asyncio.gather(
+                        *(self._ensure_upstream(channel, exchange_id, symbol) for symbol in symbols)
+                    )
+                    self.logger.info(
+                        f"📡 预订阅 {exchange_id} {channel}: {sum(results)}/{len(symbols)} 成功"
+                    )
+
+    async def stop(self) -> None:
+        """关闭服务端与全部客户端会话"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        for task in self._flush_tasks.values():
+            task.cancel()
+        self._flush_tasks.clear()
+
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        await asyncio.gather(*(session.close() for session in sessions), return_exceptions=True)
+        self._topics.clear()
+
+        try:
+            if os.path.exists(self.config.socket_path):
+                os.unlink(self.config.socket_path)
+        except OSError:
+            pass
+        self.logger.info("行情共享服务已停止")
+
+    # ============= 上游 → 扇出 =============
+
+    def _make_callback(self, channel: str):
+        def callback(aggregated: AggregatedData) -> None:
+            self._publish(channel, aggregated)
+        return callback
+
+    def _publish(self, channel: str, aggregated: AggregatedData) -> None:
+        """把一条聚合行情编码一次后扇出给订阅该主题的全部客户端"""
+        self._stats["updates_received"] += 1
+        exchange = aggregated.exchange
+        data = aggregated.data
+
+        upstream_key = (channel, exchange, aggregated.symbol)
+        requested = self._aliases.get(upstream_key)
+        if not requested:
+            data_symbol = getattr(data, 'symbol', None)
+            if data_symbol:
+                upstream_key = (channel, exchange, data_symbol)
+                requested = self._aliases.get(upstream_key)
+        if not requested:
+            self._stats["updates_unrouted"] += 1
+            return
+
+        # 🔥 同一对象被多个上游回调重复投递时只发送一次
+        if self._last_objects.get(upstream_key) is data:
+            self._stats["updates_duplicated"] += 1
+            return
+        self._last_objects[upstream_key] = data
+
+        payload = None
+        conflate = channel != CHANNEL_TRADES
+        for symbol in requested:
+            key = (channel, exchange, symbol)
+            sessions = self._topics.get(key)
+            if not sessions and not conflate:
+                continue
+            if payload is None:
+                payload = SERIALIZERS[channel](data)
+            frame = encode_frame({
+                "op": "data",
+                "channel": channel,
+                "exchange": exchange,
+                "symbol": symbol,
+                "data": payload,
+            })
+            self._stats["frames_encoded"] += 1
+            if conflate:
+                self._latest_frames[key] = frame
+            if not sessions:
+                continue
+            for session in sessions:
+                if conflate:
+                    session.send_latest(key, frame)
+                else:
+                    session.send_ordered(frame)
+        self._stats["updates_published"] += 1
+
+    # ============= 上游订阅 =============
+
+    def _register_aliases(self, channel: str, exchange_id: str, symbol: str) -> None:
+        """记录上游回调可能使用的符号写法 → 客户端请求的符号"""
+        aliases = {symbol}
+        adapter = self.exchange_manager.get_connected_adapters().get(exchange_id)
+        if adapter is not None:
+            for mapper in ('map_symbol', 'reverse_map_symbol', '_normalize_symbol'):
+                func = getattr(adapter, mapper, None)
+                if func is None:
+                    continue
+                try:
+                    alias = func(symbol)
+                    if isinstance(alias, str) and alias:
+                        aliases.add(alias)
+                except Exception:
+                    continue
+        for alias in aliases:
+            self._aliases.setdefault((channel, exchange_id, alias), set()).add(symbol)
+
+    async def _ensure_upstream(self, channel: str, exchange_id: str, symbol: str) -> bool:
+        """确保上游已订阅该主题（窗口内的新订阅合并为一次批量订阅）"""
+        key = (channel, exchange_id, symbol)
+        if key in self._upstream:
+            return True
+
+        self._register_aliases(channel, exchange_id, symbol)
+
+        group = (channel, exchange_id)
+        future = asyncio.get_running_loop().create_future()
+        self._pending_upstream.setdefault(group, {}).setdefault(symbol, []).append(future)
+        if group not in self._flush_tasks:
+            self._flush_tasks[group] = asyncio.create_task(self._flush_upstream(group))
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=self.config.subscribe_timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"上游订阅超时: {channel} {exchange_id} {symbol}")
+            return False
+
+    async def _flush_upstream(self, group: Tuple[str, str]) -> None:
+        channel, exchange_id = group
+        try:
+            await asyncio.sleep(self.config.subscribe_batch_window)
+        finally:
+            self._flush_tasks.pop(group, None)
+        pending = self._pending_upstream.pop(group, {})
+        symbols = [symbol for symbol in pending if (channel, exchange_id, symbol) not in self._upstream]
+
+        success = True
+        if symbols:
+            self._stats["upstream_batches"] += 1
+            try:
+                if channel == CHANNEL_TICKER:
+                    success = await self.data_aggregator.subscribe_ticker(exchange_id, symbols)
+                elif channel == CHANNEL_ORDERBOOK:
+                    success = await self.data_aggregator.subscribe_orderbook(exchange_id, symbols)
+                else:
+                    success = await self.data_aggregator.subscribe_trades(exchange_id, symbols)
+            except Exception as e:
+                self.logger.error(f"❌ 上游订阅失败 {exchange_id} {channel}: {e}")
+                success = False
+            if success:
+                self._upstream.update((channel, exchange_id, symbol) for symbol in symbols)
+                self.logger.info(f"📡 上游订阅 {exchange_id} {channel}: {len(symbols)} 个交易对")
+
+        for futures in pending.values():
+            for future in futures:
+                if not future.done():
+                    future.set_result(bool(success))
+
+    # ============= 客户端协议 =============
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._next_session_id += 1
+        session = _ClientSession(self._next_session_id, writer, self.config.max_queued_trades, self.logger)
+        self._sessions[session.session_id] = session
+        self.logger.info(f"🔌 客户端 #{session.session_id} 已连接（当前 {len(self._sessions)} 个）")
+
+        try:
+            while True:
+                message = await read_frame(reader)
+                if message is None:
+                    break
+                op = message.get("op")
+                if op == "subscribe":
+                    asyncio.create_task(self._handle_subscribe(session, message))
+                elif op == "unsubscribe":
+                    self._handle_unsubscribe(session, message)
+                elif op == "ping":
+                    session.send_ordered(encode_frame({"op": "pong", "ts": time.time()}))
+                else:
+                    self.logger.warning(f"客户端 #{session.session_id} 未知操作: {op}")
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            self.logger.warning(f"客户端 #{session.session_id} 连接异常: {e}")
+        finally:
+            self._drop_session(session)
+            await session.close()
+            self.logger.info(f"🔌 客户端 #{session.session_id} 已断开（当前 {len(self._sessions)} 个）")
+
+    async def _handle_subscribe(self, session: _ClientSession, message: Dict[str, Any]) -> None:
+        channel = message.get("channel")
+        exchange_id = message.get("exchange")
+        symbol = message.get("symbol")
+        ack = {"op": "ack", "channel": channel, "exchange": exchange_id, "symbol": symbol, "ok": False, "error": None}
+
+        if channel not in CHANNELS or not exchange_id or not symbol:
+            ack["error"] = "invalid subscription"
+        elif exchange_id not in self.exchange_manager.get_connected_adapters():
+            ack["error"] = f"exchange not connected: {exchange_id}"
+        else:
+            ok = await self._ensure_upstream(channel, exchange_id, symbol)
+            if ok and session.session_id in self._sessions:
+                key = (channel, exchange_id, symbol)
+                self._topics.setdefault(key, set()).add(session)
+                session.topics.add(key)
+                ack["ok"] = True
+            elif not ok:
+                ack["error"] = "upstream subscription failed"
+
+        session.send_ordered(encode_frame(ack))
+        if ack["ok"]:
+            frame = self._latest_frames.get((channel, exchange_id, symbol))
+            if frame is not None:
+                session.send_latest((channel, exchange_id, symbol), frame)
+
+    def _handle_unsubscribe(self, session: _ClientSession, message: Dict[str, Any]) -> None:
+        # 上游订阅保持不变：其它进程可能随时重新订阅，交易所侧取消订阅也不区分频道
+        key = (message.get("channel"), message.get("exchange"), message.get("symbol"))
+        session.topics.discard(key)
+        sessions = self._topics.get(key)
+        if sessions is not None:
+            sessions.discard(session)
+            if not sessions:
+                del self._topics[key]
+
+    def _drop_session(self, session: _ClientSession) -> None:
+        self._sessions.pop(session.session_id, None)
+        for key in session.topics:
+            sessions = self._topics.get(key)
+            if sessions is not None:
+                sessions.discard(session)
+                if not sessions:
+                    del self._topics[key]
+        session.topics.clear()
+
+    # ============= 统计 =============
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """获取守护进程统计信息"""
+        return {
+            "socket_path": self.config.socket_path,
+            "uptime": time.time() - self._started_at if self._started_at else 0.0,
+            "clients": len(self._sessions),
+            "topics": len(self._topics),
+            "upstream_subscriptions": len(self._upstream),
+            **self._stats,
+            "sessions": {
+                session_id: session.get_statistics()
+                for session_id, session in self._sessions.items()
+            },
+        }
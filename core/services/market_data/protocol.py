@@ -0,0 +1,213 @@
+"""
+行情共享服务 - 本地 IPC 协议
+
+帧格式：4 字节大端长度 + UTF-8 JSON 消息体。
+
+客户端 → 服务端：
+    {"op": "subscribe",   "channel": "orderbook", "exchange": "lighter", "symbol": "BTC"}
+    {"op": "unsubscribe", "channel": "orderbook", "exchange": "lighter", "symbol": "BTC"}
+    {"op": "ping"}
+
+服务端 → 客户端：
+    {"op": "data", "channel": ..., "exchange": ..., "symbol": ..., "data": {...}}
+    {"op": "ack",  "channel": ..., "exchange": ..., "symbol": ..., "ok": true, "error": null}
+    {"op": "pong", "ts": 1700000000.0}
+
+数据体只保留标准化字段（不含 raw_data）：Decimal 以字符串传输保证精度，
+datetime 以 epoch 秒（float）传输。同一份行情只在服务端编码一次，按订阅者扇出字节。
+"""
+
+import asyncio
+import json
+import struct
+from dataclasses import fields
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from ...adapters.exchanges.models import (
+    OrderBookData,
+    OrderBookLevel,
+    OrderSide,
+    TickerData,
+    TradeData,
+)
+
+
+# 频道
+CHANNEL_TICKER = "ticker"
+CHANNEL_ORDERBOOK = "orderbook"
+CHANNEL_TRADES = "trades"
+CHANNELS = (CHANNEL_TICKER, CHANNEL_ORDERBOOK, CHANNEL_TRADES)
+
+# 默认 Unix socket 路径
+DEFAULT_SOCKET_PATH = "/tmp/market_data_daemon.sock"
+
+# 单帧上限（防止异常长度把进程内存打爆）
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+_HEADER = struct.Struct(">I")
+HEADER_SIZE = _HEADER.size
+
+_json_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+_json_loads = json.loads
+
+# TickerData 字段分类（启动时计算一次）
+_TICKER_DATETIME_FIELDS = frozenset({
+    'timestamp', 'funding_time', 'next_funding_time', 'delivery_date',
+    'high_time', 'low_time', 'start_time', 'end_time',
+    'exchange_timestamp', 'received_timestamp', 'processed_timestamp', 'sent_timestamp',
+})
+_TICKER_FIELDS = tuple(f.name for f in fields(TickerData) if f.name != 'raw_data')
+
+
+# ============= 帧编解码 =============
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """编码一条消息为带长度前缀的帧"""
+    body = _json_dumps(message).encode("utf-8")
+    return _HEADER.pack(len(body)) + body
+
+
+def decode_frame_length(header: bytes) -> int:
+    """解析帧头中的消息体长度"""
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"帧长度超出上限: {length}")
+    return length
+
+
+def decode_body(body: bytes) -> Dict[str, Any]:
+    """解析消息体"""
+    return _json_loads(body)
+
+
+async def read_frame(reader) -> Optional[Dict[str, Any]]:
+    """
+    从 asyncio.StreamReader 读取一条消息
+
+    Returns:
+        消息字典；对端关闭时返回 None
+    """
+    try:
+        header = await reader.readexactly(HEADER_SIZE)
+        body = await reader.readexactly(decode_frame_length(header))
+    except asyncio.IncompleteReadError:
+        return None
+    return decode_body(body)
+
+
+# ============= 模型序列化 =============
+
+def _ts(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value is not None else None
+
+
+def _dt(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, tz=timezone.utc) if value is not None else None
+
+
+def ticker_to_dict(ticker: TickerData) -> Dict[str, Any]:
+    """TickerData → 可 JSON 序列化的字典（省略 None 字段）"""
+    payload: Dict[str, Any] = {}
+    for name in _TICKER_FIELDS:
+        value = getattr(ticker, name)
+        if value is None:
+            continue
+        if isinstance(value, Decimal):
+            payload[name] = str(value)
+        elif isinstance(value, datetime):
+            payload[name] = value.timestamp()
+        else:
+            payload[name] = value
+    return payload
+
+
+def ticker_from_dict(payload: Dict[str, Any]) -> TickerData:
+    """字典 → TickerData（Decimal 字段由 TickerData.__post_init__ 从字符串转换）"""
+    kwargs = dict(payload)
+    for name in _TICKER_DATETIME_FIELDS.intersection(kwargs):
+        kwargs[name] = _dt(kwargs[name])
+    if kwargs.get('timestamp') is None:
+        kwargs['timestamp'] = datetime.now(timezone.utc)
+    return TickerData(**kwargs)
+
+
+def orderbook_to_dict(orderbook: OrderBookData) -> Dict[str, Any]:
+    """OrderBookData → 紧凑字典：档位为 [price, size] 字符串对"""
+    payload: Dict[str, Any] = {
+        "symbol": orderbook.symbol,
+        "b": [[str(level.price), str(level.size)] for level in orderbook.bids],
+        "a": [[str(level.price), str(level.size)] for level in orderbook.asks],
+        "ts": _ts(orderbook.timestamp),
+    }
+    if orderbook.nonce is not None:
+        payload["n"] = orderbook.nonce
+    if orderbook.exchange_timestamp is not None:
+        payload["ets"] = orderbook.exchange_timestamp.timestamp()
+    if orderbook.received_timestamp is not None:
+        payload["rts"] = orderbook.received_timestamp.timestamp()
+    return payload
+
+
+def orderbook_from_dict(payload: Dict[str, Any]) -> OrderBookData:
+    """紧凑字典 → OrderBookData"""
+    return OrderBookData(
+        symbol=payload["symbol"],
+        bids=[OrderBookLevel(price=Decimal(price), size=Decimal(size)) for price, size in payload["b"]],
+        asks=[OrderBookLevel(price=Decimal(price), size=Decimal(size)) for price, size in payload["a"]],
+        timestamp=_dt(payload.get("ts")) or datetime.now(timezone.utc),
+        nonce=payload.get("n"),
+        exchange_timestamp=_dt(payload.get("ets")),
+        received_timestamp=_dt(payload.get("rts")),
+    )
+
+
+def trade_to_dict(trade: TradeData) -> Dict[str, Any]:
+    """TradeData → 字典"""
+    side = trade.side.value if isinstance(trade.side, OrderSide) else trade.side
+    return {
+        "id": trade.id,
+        "symbol": trade.symbol,
+        "side": side,
+        "amount": str(trade.amount),
+        "price": str(trade.price),
+        "cost": str(trade.cost),
+        "fee": trade.fee,
+        "ts": _ts(trade.timestamp),
+        "order_id": trade.order_id,
+    }
+
+
+def trade_from_dict(payload: Dict[str, Any]) -> TradeData:
+    """字典 → TradeData"""
+    side = payload.get("side")
+    try:
+        side = OrderSide(side)
+    except ValueError:
+        pass
+    return TradeData(
+        id=payload.get("id"),
+        symbol=payload["symbol"],
+        side=side,
+        amount=payload["amount"],
+        price=payload["price"],
+        cost=payload["cost"],
+        fee=payload.get("fee"),
+        timestamp=_dt(payload.get("ts")) or datetime.now(timezone.utc),
+        order_id=payload.get("order_id"),
+        raw_data={},
+    )
+
+
+SERIALIZERS = {
+    CHANNEL_TICKER: ticker_to_dict,
+    CHANNEL_ORDERBOOK: orderbook_to_dict,
+    CHANNEL_TRADES: trade_to_dict,
+}
+
+DESERIALIZERS = {
+    CHANNEL_TICKER: ticker_from_dict,
+    CHANNEL_ORDERBOOK: orderbook_from_dict,
+    CHANNEL_TRADES: trade_from_dict,
+}
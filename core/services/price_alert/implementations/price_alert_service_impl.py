@@ -14,6 +14,7 @@ from ....adapters.exchanges.models import TickerData
 from ..interfaces.price_alert_service import IPriceAlertService
 from ..models.alert_config import PriceAlertSystemConfig, SymbolConfig
 from ..models.alert_statistics import SymbolStatistics
+from ..models.rolling_window import RollingPriceWindow
 
 
 class PriceAlertServiceImpl(IPriceAlertService):
@@ -29,6 +30,7 @@ class PriceAlertServiceImpl(IPriceAlertService):
         self.exchange_adapter = exchange_adapter
         self.config: Optional[PriceAlertSystemConfig] = None
         self.statistics: Dict[str, SymbolStatistics] = {}
+        self._symbol_configs: Dict[str, SymbolConfig] = {}
         self.logger: Optional[logging.Logger] = None
         self.alert_logger: Optional[logging.Logger] = None
         
@@ -54,8 +56,13 @@ class PriceAlertServiceImpl(IPriceAlertService):
             # 初始化统计数据
             for symbol_config in config.symbols:
                 if symbol_config.enabled:
+                    self._symbol_configs[symbol_config.symbol] = symbol_config
+                    # 秒级分桶至少覆盖波动报警窗口
                     self.statistics[symbol_config.symbol] = SymbolStatistics(
-                        symbol=symbol_config.symbol
+                        symbol=symbol_config.symbol,
+                        rolling=RollingPriceWindow(
+                            fine_span_seconds=max(3600, symbol_config.volatility_alert.time_window)
+                        )
                     )
                     self.logger.info(f"✅ 已添加监控: {symbol_config.symbol} ({symbol_config.market_type})")
             
@@ -149,6 +156,9 @@ class PriceAlertServiceImpl(IPriceAlertService):
         
         stats = self.statistics[symbol]
         
+        if ticker.last is None:
+            return
+        
         # 更新价格数据
         stats.add_price_point(ticker.last, datetime.now())
         
@@ -282,10 +292,7 @@ class PriceAlertServiceImpl(IPriceAlertService):
 
     def _get_symbol_config(self, symbol: str) -> Optional[SymbolConfig]:
         """获取代币配置"""
-        for s in self.config.symbols:
-            if s.symbol == symbol:
-                return s
-        return None
+        return self._symbol_configs.get(symbol)
 
     def _setup_logging(self):
         """设置日志"""
@@ -1,10 +1,12 @@
 """价格监控统计模型"""
 
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
-from collections import deque
+from typing import Optional, Tuple
+
+from .rolling_window import RollingPriceWindow
 
 
 @dataclass
@@ -23,8 +25,8 @@ class SymbolStatistics:
     highest_price_24h: Decimal = Decimal("0")
     lowest_price_24h: Decimal = Decimal("0")
     
-    # 时间窗口内的价格历史
-    price_history: deque = field(default_factory=lambda: deque(maxlen=1000))
+    # 滚动窗口统计（秒级/分钟级分桶，替代逐点遍历的价格历史）
+    rolling: RollingPriceWindow = field(default_factory=RollingPriceWindow)
     
     # 报警统计
     total_alerts: int = 0
@@ -40,42 +42,42 @@ class SymbolStatistics:
     # 最后更新时间
     last_update_time: Optional[datetime] = None
     
+    # 上次写入 highest/lowest_price_24h 的 float 值
+    _last_high: float = field(default=0.0, repr=False)
+    _last_low: float = field(default=0.0, repr=False)
+    
     def add_price_point(self, price: Decimal, timestamp: datetime = None):
         """添加价格点"""
         if timestamp is None:
             timestamp = datetime.now()
-        self.price_history.append(PricePoint(timestamp=timestamp, price=price))
         self.current_price = price
         self.last_update_time = timestamp
         
-        # 更新24小时最高最低价
-        if self.highest_price_24h == Decimal("0") or price > self.highest_price_24h:
-            self.highest_price_24h = price
-        if self.lowest_price_24h == Decimal("0") or price < self.lowest_price_24h:
-            self.lowest_price_24h = price
+        rolling = self.rolling
+        rolling.add(timestamp.timestamp(), float(price))
+        
+        # 更新滚动24小时最高最低价（只在数值变化时转换 Decimal）
+        high_low = rolling.high_low(rolling.horizon, rolling.last_ts)
+        if high_low is not None:
+            high, low = high_low
+            if high != self._last_high:
+                self._last_high = high
+                self.highest_price_24h = Decimal(repr(high))
+            if low != self._last_low:
+                self._last_low = low
+                self.lowest_price_24h = Decimal(repr(low))
     
     def get_price_change_percent(self, time_window_seconds: int) -> Optional[float]:
         """获取指定时间窗口内的价格变化百分比"""
-        if not self.price_history or len(self.price_history) < 2:
-            return None
-        
-        current_time = datetime.now()
-        current_price = self.current_price
-        
-        # 找到时间窗口开始时的价格
-        window_start_price = None
-        for price_point in reversed(self.price_history):
-            time_diff = (current_time - price_point.timestamp).total_seconds()
-            if time_diff >= time_window_seconds:
-                window_start_price = price_point.price
-                break
-        
-        if window_start_price is None or window_start_price == Decimal("0"):
-            return None
-        
-        # 计算百分比变化
-        change_percent = float((current_price - window_start_price) / window_start_price * 100)
-        return change_percent
+        return self.rolling.change_percent(time_window_seconds, time.time())
+    
+    def get_high_low(self, time_window_seconds: int) -> Optional[Tuple[float, float]]:
+        """获取指定时间窗口内的 (最高价, 最低价)"""
+        return self.rolling.high_low(time_window_seconds, time.time())
+    
+    def get_volatility_percent(self, time_window_seconds: int) -> Optional[float]:
+        """获取指定时间窗口内的已实现波动率（百分比）"""
+        return self.rolling.volatility_percent(time_window_seconds, time.time())
     
     def get_24h_change_percent(self) -> Optional[float]:
         """获取24小时价格变化百分比"""
@@ -0,0 +1,231 @@
+"""滚动窗口价格统计（按时间分桶的环形结构）"""
+
+import math
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+_NAN = float("nan")
+
+
+class _WindowTracker:
+    """
+    单个窗口的增量统计：单调队列维护最高/最低价，收益率平方和维护已实现波动率
+
+    窗口覆盖最近 n 个桶（含当前未完成的桶），每个完成的桶入队一次、出队一次，摊还 O(1)。
+    """
+
+    __slots__ = ("n", "max_q", "min_q", "ret_q", "sum_sq")
+
+    def __init__(self, n: int):
+        self.n = n
+        self.max_q: deque = deque()  # (bucket_id, high)，high 单调递减
+        self.min_q: deque = deque()  # (bucket_id, low)，low 单调递增
+        self.ret_q: deque = deque()  # (bucket_id, r²)
+        self.sum_sq = 0.0
+
+    def push(self, bucket_id: int, high: float, low: float, r_sq: float) -> None:
+        max_q = self.max_q
+        while max_q and max_q[-1][1] <= high:
+            max_q.pop()
+        max_q.append((bucket_id, high))
+        min_q = self.min_q
+        while min_q and min_q[-1][1] >= low:
+            min_q.pop()
+        min_q.append((bucket_id, low))
+        self.ret_q.append((bucket_id, r_sq))
+        self.sum_sq += r_sq
+        self.expire(bucket_id + 1)
+
+    def expire(self, now_bucket: int) -> None:
+        """移除窗口之外（id < now_bucket - n + 1）的桶"""
+        oldest = now_bucket - self.n + 1
+        max_q, min_q, ret_q = self.max_q, self.min_q, self.ret_q
+        while max_q and max_q[0][0] < oldest:
+            max_q.popleft()
+        while min_q and min_q[0][0] < oldest:
+            min_q.popleft()
+        while ret_q and ret_q[0][0] < oldest:
+            self.sum_sq -= ret_q.popleft()[1]
+        if not ret_q:
+            self.sum_sq = 0.0  # 清掉浮点累计误差
+
+
+class _BucketSeries:
+    """
+    固定分辨率的价格桶环形数组
+
+    每个桶记录 收盘/最高/最低；没有成交的桶按上一桶收盘价补齐（平桶），
+    因此「某一时刻的价格」可以按下标 O(1) 取到。
+    """
+
+    def __init__(self, resolution: int, span_seconds: int):
+        self.resolution = resolution
+        self.size = int(math.ceil(span_seconds / resolution)) + 2
+        self._ids = [-1] * self.size
+        self._close = [_NAN] * self.size
+        self._high = [_NAN] * self.size
+        self._low = [_NAN] * self.size
+        self.cur: Optional[int] = None
+        self.first: Optional[int] = None
+        self._trackers: Dict[int, _WindowTracker] = {}
+
+    def add(self, ts: float, price: float) -> None:
+        b = int(ts // self.resolution)
+        cur = self.cur
+        if cur is None:
+            self.first = b
+            self._open(b, price)
+            return
+        if b <= cur:
+            # 同一桶（或乱序的旧数据，计入当前桶）
+            i = cur % self.size
+            self._close[i] = price
+            if price > self._high[i]:
+                self._high[i] = price
+            if price < self._low[i]:
+                self._low[i] = price
+            return
+
+        prev_close = self._close[cur % self.size]
+        self._complete(cur)
+        # 空档补平桶；超过环长的部分没有意义，只补最后 size-1 个
+        for fill in range(max(cur + 1, b - self.size + 1), b):
+            self._open(fill, prev_close)
+            self._complete(fill)
+        self._open(b, price)
+
+    def _open(self, b: int, price: float) -> None:
+        i = b % self.size
+        self._ids[i] = b
+        self._close[i] = price
+        self._high[i] = price
+        self._low[i] = price
+        self.cur = b
+
+    def _complete(self, b: int) -> None:
+        if not self._trackers:
+            return
+        i = b % self.size
+        close = self._close[i]
+        prev = self.close_at(b - 1)
+        r_sq = math.log(close / prev) ** 2 if prev and close > 0 and prev > 0 else 0.0
+        high, low = self._high[i], self._low[i]
+        for tracker in self._trackers.values():
+            tracker.push(b, high, low, r_sq)
+
+    def close_at(self, b: int) -> Optional[float]:
+        """桶 b 结束时的价格；早于首个数据或超出环长返回 None"""
+        cur = self.cur
+        if cur is None or b < self.first:
+            return None
+        if b >= cur:
+            return self._close[cur % self.size]
+        if cur - b >= self.size:
+            return None
+        i = b % self.size
+        return self._close[i] if self._ids[i] == b else None
+
+    def tracker(self, n: int) -> _WindowTracker:
+        """获取（首次访问时创建并用环内已有数据初始化）n 个桶的窗口统计"""
+        tracker = self._trackers.get(n)
+        if tracker is not None:
+            return tracker
+        tracker = _WindowTracker(n)
+        cur = self.cur
+        if cur is not None:
+            for b in range(max(self.first, cur - n + 1, cur - self.size + 1), cur):
+                i = b % self.size
+                if self._ids[i] != b:
+                    continue
+                prev = self.close_at(b - 1)
+                close = self._close[i]
+                r_sq = math.log(close / prev) ** 2 if prev and close > 0 and prev > 0 else 0.0
+                tracker.push(b, self._high[i], self._low[i], r_sq)
+        self._trackers[n] = tracker
+        return tracker
+
+    def window(self, n: int, now_bucket: int) -> Tuple[Optional[_WindowTracker], bool]:
+        """返回窗口统计及「当前未完成的桶是否仍在窗口内」"""
+        if self.cur is None:
+            return None, False
+        tracker = self.tracker(n)
+        tracker.expire(now_bucket)
+        return tracker, self.cur >= now_bucket - n + 1
+
+    def current_high_low(self) -> Tuple[float, float]:
+        i = self.cur % self.size
+        return self._high[i], self._low[i]
+
+
+class RollingPriceWindow:
+    """
+    单个代币的滚动价格统计
+
+    两级分桶：
+    - 秒级桶覆盖 fine_span_seconds（默认1小时），用于短窗口波动报警
+    - 分钟级桶覆盖 horizon_seconds（默认24小时），用于滚动24h最高/最低价
+
+    每个 tick O(1)（摊还）；任意窗口的变化率按下标直接取值，最高/最低价与波动率
+    在首次查询某个窗口时建立增量统计，之后随 tick 增量更新。
+    """
+
+    def __init__(
+        self,
+        fine_span_seconds: int = 3600,
+        horizon_seconds: int = 86400,
+        coarse_resolution: int = 60,
+    ):
+        self.fine_span = max(1, int(fine_span_seconds))
+        self.horizon = max(self.fine_span, int(horizon_seconds))
+        self._fine = _BucketSeries(1, self.fine_span)
+        self._coarse = _BucketSeries(max(1, int(coarse_resolution)), self.horizon)
+        self.last_price: Optional[float] = None
+        self.last_ts: Optional[float] = None
+
+    def add(self, ts: float, price: float) -> None:
+        """记录一个价格点（ts 为 epoch 秒）"""
+        if price is None or price != price or price <= 0:
+            return
+        self._fine.add(ts, price)
+        self._coarse.add(ts, price)
+        self.last_price = price
+        self.last_ts = ts
+
+    def _series(self, window_seconds: float) -> _BucketSeries:
+        return self._fine if window_seconds <= self.fine_span else self._coarse
+
+    def change_percent(self, window_seconds: float, now: float) -> Optional[float]:
+        """最新价相对 window_seconds 之前价格的变化百分比（数据不足时返回 None）"""
+        if self.last_price is None:
+            return None
+        series = self._series(window_seconds)
+        base = series.close_at(int((now - window_seconds) // series.resolution))
+        if not base:
+            return None
+        return (self.last_price - base) / base * 100
+
+    def high_low(self, window_seconds: float, now: float) -> Optional[Tuple[float, float]]:
+        """窗口内的 (最高价, 最低价)"""
+        series = self._series(window_seconds)
+        n = max(1, int(math.ceil(window_seconds / series.resolution)))
+        tracker, include_current = series.window(n, int(now // series.resolution))
+        if tracker is None:
+            return None
+        high = tracker.max_q[0][1] if tracker.max_q else -math.inf
+        low = tracker.min_q[0][1] if tracker.min_q else math.inf
+        if include_current:
+            cur_high, cur_low = series.current_high_low()
+            high = max(high, cur_high)
+            low = min(low, cur_low)
+        if high == -math.inf:
+            return None
+        return high, low
+
+    def volatility_percent(self, window_seconds: float, now: float) -> Optional[float]:
+        """窗口内的已实现波动率（各桶对数收益率平方和开根号，百分比）"""
+        series = self._series(window_seconds)
+        n = max(1, int(math.ceil(window_seconds / series.resolution)))
+        tracker, _ = series.window(n, int(now // series.resolution))
+        if tracker is None or not tracker.ret_q:
+            return None
+        return math.sqrt(max(tracker.sum_sq, 0.0)) * 100
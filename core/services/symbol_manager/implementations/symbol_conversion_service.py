@@ -5,10 +5,10 @@
 """
 
 import re
+import time
 import yaml
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime, timedelta
 from injector import singleton, inject
 
 from core.logging import get_logger
@@ -30,7 +30,8 @@ class SymbolConversionService(ISymbolConversionService):
         self.symbol_mappings = {}
         self.exchange_formats = {}
         self.cache = {}
-        self.cache_timestamps = {}
+        # 写入时间（time.monotonic），按写入顺序排列：最早写入的在最前面
+        self.cache_timestamps: Dict[str, float] = {}
         
         # 性能统计
         self.conversion_stats = {
@@ -480,7 +481,7 @@ class SymbolConversionService(ISymbolConversionService):
         # 检查TTL
         ttl = self.cache_config.get('ttl', 3600)
         if cache_key in self.cache_timestamps:
-            elapsed = (datetime.now() - self.cache_timestamps[cache_key]).total_seconds()
+            elapsed = time.monotonic() - self.cache_timestamps[cache_key]
             if elapsed > ttl:
                 # 缓存过期，删除
                 del self.cache[cache_key]
@@ -496,15 +497,19 @@ class SymbolConversionService(ISymbolConversionService):
         
         max_size = self.cache_config.get('max_size', 10000)
         
+        # 重新写入的键移到末尾，保持 cache_timestamps 按写入时间有序
+        self.cache_timestamps.pop(cache_key, None)
+
         # 检查缓存大小限制
-        if len(self.cache) >= max_size:
-            # 删除最旧的缓存项
-            oldest_key = min(self.cache_timestamps.keys(), key=lambda k: self.cache_timestamps[k])
-            del self.cache[oldest_key]
-            del self.cache_timestamps[oldest_key]
+        if len(self.cache) >= max_size and cache_key not in self.cache:
+            # 删除最旧的缓存项（有序字典的第一个键，O(1)）
+            oldest_key = next(iter(self.cache_timestamps), None)
+            if oldest_key is not None:
+                del self.cache_timestamps[oldest_key]
+                self.cache.pop(oldest_key, None)
         
         self.cache[cache_key] = value
-        self.cache_timestamps[cache_key] = datetime.now()
+        self.cache_timestamps[cache_key] = time.monotonic()
     
     def get_conversion_stats(self) -> Dict[str, Any]:
         """获取转换统计信息"""
@@ -23,6 +23,7 @@ from .models.simulation_result import SimulationResult
 from .core.price_monitor import PriceMonitor
 from .core.cycle_detector import CycleDetector
 from .core.apr_calculator import APRCalculator
+from .core.batch_simulator import BatchGridSimulator
 
 __all__ = [
     'VirtualGrid',
@@ -30,5 +31,6 @@ __all__ = [
     'PriceMonitor',
     'CycleDetector',
     'APRCalculator',
+    'BatchGridSimulator',
 ]
 
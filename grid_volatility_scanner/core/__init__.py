@@ -7,6 +7,7 @@
 from .price_monitor import PriceMonitor
 from .cycle_detector import CycleDetector
 from .apr_calculator import APRCalculator
+from .batch_simulator import BatchGridSimulator
 
-__all__ = ['PriceMonitor', 'CycleDetector', 'APRCalculator']
+__all__ = ['PriceMonitor', 'CycleDetector', 'APRCalculator', 'BatchGridSimulator']
 
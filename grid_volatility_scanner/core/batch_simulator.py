@@ -0,0 +1,461 @@
+"""
+批量网格模拟器 - Batch Grid Simulator
+
+用 NumPy 数组同时模拟「所有代币 × 多组格子间距」的虚拟网格：
+- 每行一个代币，每列一组格子间距（参数扫描）
+- 一批 tick 一次向量化处理，不再逐个调用 VirtualGrid.update_price
+- 价格跳空跨越多格时按格数累计成交（VirtualGrid 每次更新最多成交一格）
+- APR 公式与滚动窗口规则与 VirtualGrid.calculate_apr 一致，结果输出为 SimulationResult
+"""
+
+import math
+import time
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..models.simulation_result import SimulationResult
+
+# 取整容差（单位：格），避免价格恰好落在挂单价上时因浮点误差漏单
+_LEVEL_EPS = 1e-9
+
+# 「最近5分钟循环」统计窗口（秒）
+_RECENT_SECONDS = 300
+
+
+def _to_decimal(value: float, digits: int = 8) -> Decimal:
+    """浮点转 Decimal（先按位数取整，去掉 0.1*3 之类的二进制尾差）"""
+    return Decimal(repr(round(float(value), digits)))
+
+
+def _format_s_duration(duration_seconds: int) -> str:
+    """S级持续时长格式化（与 VirtualGrid.get_s_rating_duration_str 相同）"""
+    if duration_seconds <= 0:
+        return "--"
+    if duration_seconds < 60:
+        return f"{duration_seconds}S"
+    days = duration_seconds // 86400
+    hours = (duration_seconds % 86400) // 3600
+    minutes = (duration_seconds % 3600) // 60
+    return f"{days}D/{hours}H/{minutes}M"
+
+
+class BatchGridSimulator:
+    """
+    批量虚拟网格模拟器
+
+    挂单模型与 VirtualGrid 相同（双边挂单，卖单价 = 买单价 + 2格）：
+    - 价格跌至买单价下方 k 格以内 → 买入 k 次，买/卖单整体下移 k 格
+    - 价格涨至卖单价上方 k 格以内 → 卖出 k 次，买/卖单整体上移 k 格
+    - 完整循环 = min(买入次数, 卖出次数)
+
+    买单价以「初始价格 + 整数格数 × 格子绝对间距」表示，长时间运行也不会累计浮点误差。
+
+    用法：
+        sim = BatchGridSimulator(interval_multipliers=[0.5, 1.0, 2.0])
+        sim.add_symbol('BTC', 100000.0, width_percent=20.0, interval_percent=0.03)
+        sim.submit('BTC', 99950.0)           # 只入缓冲区
+        sim.process()                        # 整批向量化处理
+        sim.compute_apr()
+        results = sim.get_results()
+
+    Args:
+        interval_multipliers: 格子间距扫描倍数（相对每个代币配置的间距）
+        fee_rate_percent: 双边手续费率（%）
+        time_window_minutes: APR 滚动窗口时长（分钟）
+        capacity: 初始代币容量（不足时自动扩容）
+    """
+
+    # 按代币行存储的数组（扩容时统一处理）
+    _ROW_ARRAYS = (
+        '_width', '_init_price', '_last_price', '_start_ts', '_last_ts',
+        '_interval_pct', '_interval_value', '_buy_level',
+        '_buys', '_sells', '_cycles', '_window_cycles', '_recent_cycles',
+        '_cycles_per_hour', '_apr', '_s_since',
+    )
+
+    def __init__(
+        self,
+        interval_multipliers: Sequence[float] = (1.0,),
+        fee_rate_percent: float = 0.004,
+        time_window_minutes: float = 5,
+        capacity: int = 256,
+    ):
+        multipliers = [float(m) for m in interval_multipliers if float(m) > 0]
+        if not multipliers:
+            raise ValueError("interval_multipliers 不能为空")
+        self.interval_multipliers = np.array(multipliers, dtype=np.float64)
+        # 主列：最接近配置间距（倍数1.0）的那一列，无成交时展示该列
+        self.primary_column = int(np.argmin(np.abs(np.log(self.interval_multipliers))))
+        self.fee_rate_percent = float(fee_rate_percent)
+        self.window_seconds = max(1, int(round(float(time_window_minutes) * 60)))
+
+        self.symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._capacity = 0
+
+        k = len(multipliers)
+        cap = max(1, int(capacity))
+        self._width = np.zeros(cap)
+        self._init_price = np.zeros(cap)
+        self._last_price = np.zeros(cap)
+        self._start_ts = np.zeros(cap)
+        self._last_ts = np.zeros(cap)
+        self._interval_pct = np.zeros((cap, k))
+        self._interval_value = np.ones((cap, k))
+        self._buy_level = np.full((cap, k), -1, dtype=np.int64)
+        self._buys = np.zeros((cap, k), dtype=np.int64)
+        self._sells = np.zeros((cap, k), dtype=np.int64)
+        self._cycles = np.zeros((cap, k), dtype=np.int64)
+        self._window_cycles = np.zeros((cap, k), dtype=np.int64)
+        self._recent_cycles = np.zeros((cap, k), dtype=np.int64)
+        self._cycles_per_hour = np.zeros((cap, k))
+        self._apr = np.zeros((cap, k))
+        self._s_since = np.full((cap, k), np.nan)
+        self._capacity = cap
+
+        # 按秒分桶的循环数环形数组：[秒槽, 代币, 间距]
+        self._ring_len = max(self.window_seconds, _RECENT_SECONDS)
+        self._ring = np.zeros((self._ring_len, cap, k), dtype=np.int32)
+        self._ring_ids = np.full(self._ring_len, -1, dtype=np.int64)
+        self._head: Optional[int] = None
+
+        # 待处理的 tick 缓冲区
+        self._tick_rows: List[int] = []
+        self._tick_prices: List[float] = []
+        self._tick_ts: List[float] = []
+
+        self.stats: Dict[str, int] = {'ticks': 0, 'batches': 0, 'rounds': 0}
+
+    # ============= 代币管理 =============
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def add_symbol(
+        self,
+        symbol: str,
+        price: float,
+        width_percent: float,
+        interval_percent: float,
+        ts: Optional[float] = None,
+    ) -> int:
+        """
+        注册代币（已存在则直接返回行号）
+
+        Args:
+            symbol: 交易对符号
+            price: 初始价格（网格中心）
+            width_percent: 网格总宽度（%）
+            interval_percent: 配置的格子间距（%），实际模拟 间距 × 各扫描倍数
+            ts: 开始时间（epoch秒），默认当前时间
+
+        Returns:
+            代币行号
+        """
+        row = self._index.get(symbol)
+        if row is not None:
+            return row
+        price = float(price)
+        if not price > 0:
+            raise ValueError(f"{symbol} 初始价格无效: {price}")
+
+        row = len(self.symbols)
+        if row >= self._capacity:
+            self._grow(self._capacity * 2)
+        now = time.time() if ts is None else float(ts)
+
+        pct = float(interval_percent) * self.interval_multipliers
+        self._width[row] = float(width_percent)
+        self._init_price[row] = price
+        self._last_price[row] = price
+        self._start_ts[row] = now
+        self._last_ts[row] = now
+        self._interval_pct[row] = pct
+        self._interval_value[row] = price * pct / 100
+        self._buy_level[row] = -1  # 初始买单在下方一格，卖单在上方一格
+
+        self.symbols.append(symbol)
+        self._index[symbol] = row
+        return row
+
+    def _grow(self, capacity: int) -> None:
+        """扩容所有按代币行存储的数组"""
+        old = self._capacity
+        for name in self._ROW_ARRAYS:
+            arr = getattr(self, name)
+            shape = (capacity,) + arr.shape[1:]
+            fill = np.nan if name == '_s_since' else (1 if name == '_interval_value' else 0)
+            grown = np.full(shape, fill, dtype=arr.dtype)
+            grown[:old] = arr
+            setattr(self, name, grown)
+        ring = np.zeros((self._ring_len, capacity, self._ring.shape[2]), dtype=self._ring.dtype)
+        ring[:, :old] = self._ring
+        self._ring = ring
+        self._capacity = capacity
+
+    # ============= tick 处理 =============
+
+    def submit(self, symbol: str, price: float, ts: Optional[float] = None) -> bool:
+        """投递一个 tick 到缓冲区（未注册的代币返回 False）"""
+        row = self._index.get(symbol)
+        if row is None:
+            return False
+        price = float(price)
+        if not price > 0:
+            return False
+        self._tick_rows.append(row)
+        self._tick_prices.append(price)
+        self._tick_ts.append(time.time() if ts is None else float(ts))
+        return True
+
+    def process(self) -> int:
+        """
+        处理缓冲区内的全部 tick
+
+        同一代币的多个 tick 必须按顺序撮合：先按代币稳定排序，求出每个 tick 在
+        本代币内的序号，再按序号分轮处理——每一轮里每个代币至多一个 tick，
+        可以对所有代币 × 所有间距一次向量化。轮数 = 本批单个代币的最大 tick 数。
+
+        Returns:
+            处理的 tick 数
+        """
+        count = len(self._tick_rows)
+        if not count:
+            return 0
+        rows = np.asarray(self._tick_rows, dtype=np.int64)
+        prices = np.asarray(self._tick_prices, dtype=np.float64)
+        stamps = np.asarray(self._tick_ts, dtype=np.float64)
+        self._tick_rows, self._tick_prices, self._tick_ts = [], [], []
+
+        self._advance(int(math.floor(stamps.max())))
+
+        order = np.argsort(rows, kind='stable')
+        rows, prices, stamps = rows[order], prices[order], stamps[order]
+        positions = np.arange(count)
+        group_start = np.zeros(count, dtype=bool)
+        group_start[0] = True
+        group_start[1:] = rows[1:] != rows[:-1]
+        rank = positions - np.maximum.accumulate(np.where(group_start, positions, 0))
+
+        rounds = int(rank.max()) + 1
+        if rounds == 1:
+            self._apply(rows, prices, stamps)
+        else:
+            for r in range(rounds):
+                sel = rank == r
+                self._apply(rows[sel], prices[sel], stamps[sel])
+
+        self.stats['ticks'] += count
+        self.stats['batches'] += 1
+        self.stats['rounds'] += rounds
+        return count
+
+    def _apply(self, rows: np.ndarray, prices: np.ndarray, stamps: np.ndarray) -> None:
+        """对一组互不相同的代币各应用一个 tick（所有间距列一起）"""
+        iv = self._interval_value[rows]
+        level = self._buy_level[rows]
+        buy_price = self._init_price[rows][:, None] + level * iv
+        p = prices[:, None]
+
+        # 买单价下方跨越的格数（含买单价本身）
+        down = (buy_price - p) / iv
+        k_down = np.where(down >= -_LEVEL_EPS, np.floor(down + _LEVEL_EPS) + 1, 0).astype(np.int64)
+        # 卖单价（买单价 + 2格）上方跨越的格数
+        up = (p - buy_price) / iv - 2.0
+        k_up = np.where(up >= -_LEVEL_EPS, np.floor(up + _LEVEL_EPS) + 1, 0).astype(np.int64)
+
+        self._buy_level[rows] = level + k_up - k_down
+        buys = self._buys[rows] + k_down
+        sells = self._sells[rows] + k_up
+        self._buys[rows] = buys
+        self._sells[rows] = sells
+        cycles = np.minimum(buys, sells)
+        new_cycles = cycles - self._cycles[rows]
+        self._cycles[rows] = cycles
+
+        self._last_price[rows] = prices
+        self._last_ts[rows] = np.maximum(self._last_ts[rows], stamps)
+
+        if not new_cycles.any():
+            return
+        # 循环计入所在秒的桶和滚动窗口计数（早于环形数组覆盖范围的只计总数）
+        head = self._head
+        seconds = np.floor(stamps).astype(np.int64)
+        slots = seconds % self._ring_len
+        in_ring = (seconds > head - self._ring_len) & (self._ring_ids[slots] == seconds)
+        if not in_ring.all():
+            rows, seconds, slots, new_cycles = rows[in_ring], seconds[in_ring], slots[in_ring], new_cycles[in_ring]
+        self._ring[slots, rows] += new_cycles.astype(np.int32)
+        in_window = (seconds > head - self.window_seconds)[:, None]
+        self._window_cycles[rows] += np.where(in_window, new_cycles, 0)
+        in_recent = (seconds > head - _RECENT_SECONDS)[:, None]
+        self._recent_cycles[rows] += np.where(in_recent, new_cycles, 0)
+
+    def _advance(self, second: int) -> None:
+        """把环形数组推进到指定秒，移出滑出窗口的循环计数"""
+        head = self._head
+        size = self._ring_len
+        if head is None:
+            self._head = second
+            self._ring_ids[second % size] = second
+            return
+        if second <= head:
+            return
+        n = len(self.symbols)
+        if second - head >= size:
+            # 间隔超过整个环：窗口内已无任何历史
+            self._ring[:, :n] = 0
+            self._window_cycles[:n] = 0
+            self._recent_cycles[:n] = 0
+            seconds = np.arange(second - size + 1, second + 1)
+            self._ring_ids[seconds % size] = seconds
+        else:
+            ring, ids = self._ring, self._ring_ids
+            for b in range(head + 1, second + 1):
+                old = b - self.window_seconds
+                if ids[old % size] == old:
+                    self._window_cycles[:n] -= ring[old % size, :n]
+                old = b - _RECENT_SECONDS
+                if ids[old % size] == old:
+                    self._recent_cycles[:n] -= ring[old % size, :n]
+                slot = b % size
+                ring[slot, :n] = 0
+                ids[slot] = b
+        self._head = second
+
+    # ============= APR / 结果 =============
+
+    def compute_apr(self, now: Optional[float] = None) -> np.ndarray:
+        """
+        重新计算所有代币 × 间距的 APR（滚动窗口规则同 VirtualGrid.calculate_apr）
+
+        - 运行不足1分钟：APR=0
+        - 运行不足窗口时长：窗口 = 实际运行时间
+        - APR = (间距% - 手续费%) × 间距% / 宽度% × 每小时循环 × 8760
+
+        Returns:
+            APR 数组（代币数 × 间距数，%）
+        """
+        now = time.time() if now is None else float(now)
+        self._advance(int(math.floor(now)))
+        n = len(self.symbols)
+        if not n:
+            return self._apr[:0]
+
+        running = self._last_ts[:n] - self._start_ts[:n]
+        window_hours = (np.minimum(running, self.window_seconds) / 3600)[:, None]
+        cycles = self._window_cycles[:n]
+        valid = (running >= 60)[:, None] & (cycles > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cycles_per_hour = np.where(valid, cycles / window_hours, 0.0)
+
+        pct = self._interval_pct[:n]
+        net = pct - self.fee_rate_percent
+        single_cycle_rate = np.where(net > 0, net * pct / self._width[:n, None], 0.0)
+        self._cycles_per_hour[:n] = cycles_per_hour
+        self._apr[:n] = single_cycle_rate * cycles_per_hour * 8760
+        return self._apr[:n]
+
+    def _best_columns(self) -> np.ndarray:
+        """每个代币 APR 最高的间距列（全为0时取主列）"""
+        n = len(self.symbols)
+        apr = self._apr[:n]
+        best = np.argmax(apr, axis=1)
+        return np.where(apr.max(axis=1) > 0, best, self.primary_column)
+
+    def get_summary(self, symbol: str) -> Optional[dict]:
+        """单个代币的统计（最优间距列）"""
+        row = self._index.get(symbol)
+        if row is None:
+            return None
+        col = int(self._best_columns()[row])
+        return {
+            'symbol': symbol,
+            'current_price': float(self._last_price[row]),
+            'grid_interval_percent': float(self._interval_pct[row, col]),
+            # 任一间距有成交即视为活跃
+            'total_crosses': int((self._buys[row] + self._sells[row]).max()),
+            'complete_cycles': int(self._cycles[row, col]),
+            'cycles_per_hour': float(self._cycles_per_hour[row, col]),
+            'estimated_apr': float(self._apr[row, col]),
+        }
+
+    def get_results(self, best_only: bool = True, min_cycles: int = 0) -> List[SimulationResult]:
+        """
+        生成模拟结果
+
+        Args:
+            best_only: True=每个代币只输出APR最高的间距；False=输出全部间距组合
+            min_cycles: 最小完整循环次数过滤（0=全部输出）
+
+        Returns:
+            SimulationResult 列表（未排序）
+        """
+        n = len(self.symbols)
+        if not n:
+            return []
+        now = time.time()
+        k = len(self.interval_multipliers)
+        if best_only:
+            cells = [(row, int(col)) for row, col in enumerate(self._best_columns())]
+        else:
+            cells = [(row, col) for row in range(n) for col in range(k)]
+
+        results = []
+        for row, col in cells:
+            cycles = int(self._cycles[row, col])
+            if min_cycles and cycles < min_cycles:
+                continue
+            result = self._build_result(row, col)
+            result.calculate_rating()
+            # S级持续时间（按 代币×间距 单独计时）
+            if result.rating.split()[-1] == "S":
+                if math.isnan(self._s_since[row, col]):
+                    self._s_since[row, col] = now
+                result.s_rating_duration_str = _format_s_duration(int(now - self._s_since[row, col]))
+            else:
+                self._s_since[row, col] = np.nan
+            results.append(result)
+        return results
+
+    def _build_result(self, row: int, col: int) -> SimulationResult:
+        width = _to_decimal(self._width[row])
+        pct = _to_decimal(self._interval_pct[row, col])
+        init_price = _to_decimal(self._init_price[row])
+        half_width = width / Decimal('200')
+        lower = init_price * (Decimal('1') - half_width)
+        upper = init_price * (Decimal('1') + half_width)
+
+        running_seconds = max(0, int(self._last_ts[row] - self._start_ts[row]))
+        buys = int(self._buys[row, col])
+        sells = int(self._sells[row, col])
+        cycles = int(self._cycles[row, col])
+        # 平均5分钟循环 = 总循环 / 运行分钟数 × 5（同 VirtualGrid.get_avg_cycles_per_5min）
+        avg_per_5min = Decimal('0')
+        if running_seconds > 0:
+            avg_per_5min = Decimal(cycles) / (Decimal(running_seconds) / Decimal('60')) * Decimal('5')
+
+        return SimulationResult(
+            symbol=self.symbols[row],
+            current_price=_to_decimal(self._last_price[row], 12),
+            grid_width_percent=width,
+            grid_interval_percent=pct,
+            grid_count=int(width / pct) if pct > 0 else 0,
+            price_range=f'${lower:,.2f} - ${upper:,.2f}',
+            running_seconds=running_seconds,
+            total_crosses=buys + sells,
+            buy_crosses=buys,
+            sell_crosses=sells,
+            complete_cycles=cycles,
+            cycles_per_hour=_to_decimal(self._cycles_per_hour[row, col], 4),
+            avg_cycles_per_5min=avg_per_5min,
+            recent_5min_cycles=int(self._recent_cycles[row, col]),
+            estimated_apr=_to_decimal(self._apr[row, col], 4),
+            volume_24h_usdc=Decimal('0'),
+            price_change_24h_percent=Decimal('0'),
+        )
@@ -23,6 +23,7 @@ from .models.simulation_result import SimulationResult
 from .ui.scanner_ui import ScannerUI
 from .core.apr_calculator import APRCalculator
 from .core.apr_alert import APRAlertManager
+from .core.batch_simulator import BatchGridSimulator
 
 
 logger = logging.getLogger(__name__)
@@ -62,6 +63,10 @@ class GridVolatilityScanner:
         # 虚拟网格字典 {symbol: VirtualGrid}
         self.virtual_grids: Dict[str, VirtualGrid] = {}
 
+        # 🔥 批量模拟器（scanner_config.batch_simulation_enabled=true 时启用）
+        # 启用后 virtual_grids 只作为代币登记表，撮合与APR全部由批量模拟器完成
+        self.batch_simulator: Optional[BatchGridSimulator] = None
+
         # UI
         self.ui: Optional[ScannerUI] = None
 
@@ -110,6 +115,7 @@ class GridVolatilityScanner:
 
         # 1. 加载配置文件
         await self._load_config()
+        self._init_batch_simulator()
 
         # 2. 连接交易所（如果尚未连接）
         if not hasattr(self.adapter, '_connected') or not self.adapter._connected:
@@ -179,6 +185,18 @@ class GridVolatilityScanner:
             logger.error(f"加载配置文件失败: {e}")
             raise
 
+    def _init_batch_simulator(self):
+        """按配置创建批量模拟器（所有代币 × 多组格子间距向量化模拟）"""
+        if not self.scanner_config.get('batch_simulation_enabled', False):
+            return
+        multipliers = self.scanner_config.get('batch_interval_multipliers', [1.0])
+        self.batch_simulator = BatchGridSimulator(
+            interval_multipliers=multipliers,
+            fee_rate_percent=float(self.scanner_config['fee_rate_percent']),
+            time_window_minutes=self.scanner_config.get('apr_time_window_minutes', 5)
+        )
+        logger.info(f"✅ 批量模拟已启用: 间距倍数={list(self.batch_simulator.interval_multipliers)}")
+
     async def _get_all_markets(self) -> List[Dict]:
         """
         获取所有市场
@@ -347,6 +365,13 @@ class GridVolatilityScanner:
             )
 
             self.virtual_grids[symbol] = grid
+            if self.batch_simulator is not None:
+                self.batch_simulator.add_symbol(
+                    symbol,
+                    float(current_price),
+                    float(market_config['grid_width_percent']),
+                    float(market_config['grid_interval_percent'])
+                )
 
             logger.debug(
                 f"✅ 预创建虚拟网格: {symbol:12s} | "
@@ -734,6 +759,11 @@ class GridVolatilityScanner:
         if symbol not in self.virtual_grids:
             return
 
+        # 🔥 批量模式：只入缓冲区，由UI循环整批处理
+        if self.batch_simulator is not None:
+            self.batch_simulator.submit(symbol, price)
+            return
+
         grid = self.virtual_grids[symbol]
 
         # 更新价格并检测穿越
@@ -762,6 +792,54 @@ class GridVolatilityScanner:
                 f"APR={grid.estimated_apr:.2f}%"
             )
 
+    def _collect_batch_results(
+        self,
+        min_cycles: int,
+        check_alerts: bool = False
+    ) -> List[SimulationResult]:
+        """
+        批量模式：处理缓冲的tick、重算APR并生成结果
+
+        每个代币取APR最高的格子间距；过滤规则与虚拟网格模式相同（BTC永远显示）
+
+        Args:
+            min_cycles: 最小循环次数（0=全部显示）
+            check_alerts: 是否检查APR报警
+
+        Returns:
+            模拟结果列表（未排序）
+        """
+        simulator = self.batch_simulator
+        simulator.process()
+        simulator.compute_apr()
+
+        results = []
+        for result in simulator.get_results(best_only=True):
+            # 🔔 检查APR是否超过阈值并触发报警
+            if check_alerts and self.alert_manager and result.estimated_apr > 0:
+                self.alert_manager.check_and_alert(
+                    result.symbol, result.estimated_apr)
+
+            symbol_upper = result.symbol.upper()
+            is_btc = 'BTC' in symbol_upper and not any(
+                x in symbol_upper for x in ['WBTC', 'TBTC', 'RBTC'])
+            if min_cycles == 0 or result.complete_cycles >= min_cycles or is_btc:
+                results.append(result)
+        return results
+
+    def _get_symbol_summary(self, symbol: str) -> Optional[Dict]:
+        """获取代币的穿越/循环/APR统计（兼容虚拟网格与批量模式）"""
+        if self.batch_simulator is not None:
+            return self.batch_simulator.get_summary(symbol)
+        grid = self.virtual_grids.get(symbol)
+        if grid is None:
+            return None
+        return {
+            'total_crosses': grid.total_crosses,
+            'complete_cycles': grid.complete_cycles,
+            'estimated_apr': grid.estimated_apr,
+        }
+
     async def _monitor_prices(self):
         """
         监控价格更新
@@ -906,9 +984,9 @@ class GridVolatilityScanner:
             sorted_received = sorted(self._received_ticker_symbols)
             for idx, symbol in enumerate(sorted_received, 1):
                 # 获取该代币的虚拟网格信息
-                if symbol in self.virtual_grids:
-                    grid = self.virtual_grids[symbol]
-                    f.write(f"{idx}. {symbol:15s} | 循环: {grid.complete_cycles:3d} | APR: {grid.estimated_apr:7.2f}%\n")
+                summary = self._get_symbol_summary(symbol)
+                if summary:
+                    f.write(f"{idx}. {symbol:15s} | 循环: {summary['complete_cycles']:3d} | APR: {summary['estimated_apr']:7.2f}%\n")
                 else:
                     f.write(f"{idx}. {symbol}\n")
             f.write("\n")
@@ -930,43 +1008,49 @@ class GridVolatilityScanner:
 
         while self._running:
             try:
-                # 🔥 定期重新计算所有网格的APR（即使没有新穿越）
-                # 这样可以：
-                # 1. 清理过期的循环事件（超过5分钟窗口）
-                # 2. 更新cycles_per_hour为最新的5分钟数据
-                # 3. 即使代币暂时不波动，也能反映实时状态
-                for symbol, grid in self.virtual_grids.items():
-                    grid.calculate_apr(
-                        order_value_usdc=Decimal(
-                            str(self.scanner_config['order_value_usdc'])),
-                        fee_rate_percent=Decimal(
-                            str(self.scanner_config['fee_rate_percent'])),
-                        time_window_minutes=self.scanner_config.get(
-                            'apr_time_window_minutes', 5)
-                    )
-
-                    # 🔔 检查APR是否超过阈值并触发报警
-                    if self.alert_manager and grid.estimated_apr > 0:
-                        self.alert_manager.check_and_alert(
-                            symbol, grid.estimated_apr)
-
-                # 收集所有结果
-                results = []
                 min_cycles = self.scanner_config.get(
                     'min_cycles_to_display', 0)
-                
-                # 1️⃣ 添加有交易活动的代币（已创建虚拟网格的）
-                for grid in self.virtual_grids.values():
-                    # 🔥 根据配置决定是否显示：
-                    # - min_cycles_to_display=0: 显示所有虚拟网格（包括循环为0的）
-                    # - min_cycles_to_display>0: 只显示循环次数>=min_cycles的，但BTC例外（即使循环为0也显示）
-                    symbol_upper = grid.symbol.upper()
-                    is_btc = 'BTC' in symbol_upper and not any(
-                        x in symbol_upper for x in ['WBTC', 'TBTC', 'RBTC'])
-
-                    if min_cycles == 0 or grid.complete_cycles >= min_cycles or is_btc:
-                        result = SimulationResult.from_virtual_grid(grid)
-                        results.append(result)
+
+                if self.batch_simulator is not None:
+                    # 🔥 批量模式：整批处理缓冲的tick，向量化重算全部代币×间距的APR
+                    results = self._collect_batch_results(
+                        min_cycles, check_alerts=True)
+                else:
+                    # 🔥 定期重新计算所有网格的APR（即使没有新穿越）
+                    # 这样可以：
+                    # 1. 清理过期的循环事件（超过5分钟窗口）
+                    # 2. 更新cycles_per_hour为最新的5分钟数据
+                    # 3. 即使代币暂时不波动，也能反映实时状态
+                    for symbol, grid in self.virtual_grids.items():
+                        grid.calculate_apr(
+                            order_value_usdc=Decimal(
+                                str(self.scanner_config['order_value_usdc'])),
+                            fee_rate_percent=Decimal(
+                                str(self.scanner_config['fee_rate_percent'])),
+                            time_window_minutes=self.scanner_config.get(
+                                'apr_time_window_minutes', 5)
+                        )
+
+                        # 🔔 检查APR是否超过阈值并触发报警
+                        if self.alert_manager and grid.estimated_apr > 0:
+                            self.alert_manager.check_and_alert(
+                                symbol, grid.estimated_apr)
+
+                    # 收集所有结果
+                    results = []
+
+                    # 1️⃣ 添加有交易活动的代币（已创建虚拟网格的）
+                    for grid in self.virtual_grids.values():
+                        # 🔥 根据配置决定是否显示：
+                        # - min_cycles_to_display=0: 显示所有虚拟网格（包括循环为0的）
+                        # - min_cycles_to_display>0: 只显示循环次数>=min_cycles的，但BTC例外（即使循环为0也显示）
+                        symbol_upper = grid.symbol.upper()
+                        is_btc = 'BTC' in symbol_upper and not any(
+                            x in symbol_upper for x in ['WBTC', 'TBTC', 'RBTC'])
+
+                        if min_cycles == 0 or grid.complete_cycles >= min_cycles or is_btc:
+                            result = SimulationResult.from_virtual_grid(grid)
+                            results.append(result)
                 
                 # 2️⃣ 添加订阅成功但无交易活动的代币（占位符）
                 subscribed_symbols = set(self._subscribed_symbols_list)
@@ -984,7 +1068,7 @@ class GridVolatilityScanner:
                     self.ui.update_stats(
                         total_markets=len(self.virtual_grids),
                         active_markets=len(
-                            [g for g in self.virtual_grids.values() if g.complete_cycles > 0])
+                            [r for r in results if r.complete_cycles > 0])
                     )
                     # 🔥 更新订阅统计（实时显示收到数据的代币数量）
                     self.ui.update_subscription_stats(
@@ -1100,17 +1184,20 @@ class GridVolatilityScanner:
         """
         results = []
         min_cycles = self.scanner_config.get('min_cycles_to_display', 0)
-        for grid in self.virtual_grids.values():
-            # 🔥 根据配置决定是否显示：
-            # - min_cycles_to_display=0: 显示所有虚拟网格（包括循环为0的）
-            # - min_cycles_to_display>0: 只显示循环次数>=min_cycles的，但BTC例外（即使循环为0也显示）
-            symbol_upper = grid.symbol.upper()
-            is_btc = 'BTC' in symbol_upper and not any(
-                x in symbol_upper for x in ['WBTC', 'TBTC', 'RBTC'])
-
-            if min_cycles == 0 or grid.complete_cycles >= min_cycles or is_btc:
-                result = SimulationResult.from_virtual_grid(grid)
-                results.append(result)
+        if self.batch_simulator is not None:
+            results = self._collect_batch_results(min_cycles)
+        else:
+            for grid in self.virtual_grids.values():
+                # 🔥 根据配置决定是否显示：
+                # - min_cycles_to_display=0: 显示所有虚拟网格（包括循环为0的）
+                # - min_cycles_to_display>0: 只显示循环次数>=min_cycles的，但BTC例外（即使循环为0也显示）
+                symbol_upper = grid.symbol.upper()
+                is_btc = 'BTC' in symbol_upper and not any(
+                    x in symbol_upper for x in ['WBTC', 'TBTC', 'RBTC'])
+
+                if min_cycles == 0 or grid.complete_cycles >= min_cycles or is_btc:
+                    result = SimulationResult.from_virtual_grid(grid)
+                    results.append(result)
 
         # 🔥 自定义排序：BTC永远第一，其他按APR排序
         def sort_key(result):
@@ -1197,9 +1284,9 @@ class GridVolatilityScanner:
                 active_symbols = []
                 inactive_symbols = []
                 
-                for symbol, grid in self.virtual_grids.items():
+                for symbol in self.virtual_grids:
                     # 如果有任何交易穿越，说明是活跃代币
-                    if grid.total_crosses > 0:
+                    if self._get_symbol_summary(symbol)['total_crosses'] > 0:
                         active_symbols.append(symbol)
                     else:
                         inactive_symbols.append(symbol)
@@ -1314,8 +1401,8 @@ class GridVolatilityScanner:
         active_symbols = []
         inactive_symbols = []
         
-        for symbol, grid in self.virtual_grids.items():
-            if grid.total_crosses > 0:
+        for symbol in self.virtual_grids:
+            if self._get_symbol_summary(symbol)['total_crosses'] > 0:
                 active_symbols.append(symbol)
             else:
                 inactive_symbols.append(symbol)
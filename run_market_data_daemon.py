@@ -0,0 +1,137 @@
+"""
+行情共享守护进程 - 入口文件
+
+单个进程持有交易所 WebSocket 连接（ExchangeManager + DataAggregator），
+通过 Unix socket 向同机运行的网格 / 刷量 / 价格报警 / 套利监控进程扇出标准化行情。
+
+使用方法：
+    python3 run_market_data_daemon.py --config config/market_data/daemon.yaml
+
+策略进程在交易所配置的 extra_params 中设置 shared_market_data_socket 即可接入。
+"""
+
+# 🔥 加载环境变量（必须在其他导入之前）
+from dotenv import load_dotenv
+from pathlib import Path
+env_path = Path(__file__).parent / '.env'
+if env_path.exists():
+    load_dotenv(env_path)
+
+import argparse
+import asyncio
+
+import yaml
+
+from core.adapters.exchanges.interface import ExchangeConfig
+from core.adapters.exchanges.manager import ExchangeManager
+from core.adapters.exchanges.models import ExchangeType
+from core.data_aggregator import DataAggregator
+from core.di.container import get_container
+from core.services.market_data import MarketDataDaemon, MarketDataDaemonConfig
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="行情共享守护进程")
+    parser.add_argument(
+        '--config',
+        type=str,
+        default='config/market_data/daemon.yaml',
+        help='配置文件路径'
+    )
+    parser.add_argument(
+        '--socket',
+        type=str,
+        help='覆盖配置中的 Unix socket 路径'
+    )
+    return parser.parse_args()
+
+
+def build_exchange_config(exchange_id: str, exchange_cfg: dict) -> ExchangeConfig:
+    """构建只用于公共行情的交易所配置（不携带 API 密钥）"""
+    exchange_cfg = exchange_cfg or {}
+    try:
+        exchange_type = ExchangeType(exchange_cfg.get('exchange_type', 'perpetual'))
+    except ValueError:
+        exchange_type = ExchangeType.PERPETUAL
+
+    return ExchangeConfig(
+        exchange_id=exchange_id,
+        name=exchange_cfg.get('name', exchange_id.capitalize()),
+        exchange_type=exchange_type,
+        api_key="",
+        api_secret="",
+        testnet=exchange_cfg.get('testnet', False),
+        base_url=exchange_cfg.get('base_url'),
+        ws_url=exchange_cfg.get('ws_url'),
+        enable_websocket=True,
+        enable_auto_reconnect=True,
+        extra_params=dict(exchange_cfg.get('extra_params') or {}),
+    )
+
+
+async def main():
+    """主函数"""
+    args = parse_args()
+
+    config_path = Path(args.config)
+    if not config_path.exists():
+        print(f"❌ 配置文件不存在: {config_path}")
+        return
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config_data = yaml.safe_load(f) or {}
+
+    daemon_config = MarketDataDaemonConfig.from_dict(config_data)
+    if args.socket:
+        daemon_config.socket_path = args.socket
+
+    container = get_container()
+    exchange_manager = container.get(ExchangeManager)
+    data_aggregator = container.get(DataAggregator)
+
+    for priority, (exchange_id, exchange_cfg) in enumerate((config_data.get('exchanges') or {}).items()):
+        exchange_manager.register_exchange(exchange_id, build_exchange_config(exchange_id, exchange_cfg), priority)
+
+    daemon = MarketDataDaemon(exchange_manager, data_aggregator, daemon_config)
+    stats_interval = float(config_data.get('stats_interval', 60))
+
+    try:
+        print("=" * 60)
+        print("🚀 行情共享守护进程启动中...")
+        print("=" * 60)
+
+        await exchange_manager.start()
+        await daemon.start()
+
+        print(f"\n✅ 服务运行中: {daemon_config.socket_path}，按 Ctrl+C 停止\n")
+
+        while True:
+            await asyncio.sleep(stats_interval if stats_interval > 0 else 3600)
+            if stats_interval > 0:
+                stats = daemon.get_statistics()
+                print(
+                    f"📊 客户端 {stats['clients']} | 主题 {stats['topics']} | "
+                    f"上游订阅 {stats['upstream_subscriptions']} | "
+                    f"收到 {stats['updates_received']} | 发布 {stats['updates_published']} | "
+                    f"编码帧 {stats['frames_encoded']}"
+                )
+
+    except KeyboardInterrupt:
+        print("\n\n收到停止信号 (Ctrl+C)...")
+    except Exception as e:
+        print(f"\n❌ 系统错误: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        await daemon.stop()
+        await data_aggregator.stop()
+        await exchange_manager.stop()
+        print("\n👋 再见！")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+执行链路离线压测（本地模拟交易所）
+
+目标：
+- 不连接真实交易所，用 SimulatedExchangeAdapter 驱动真实的 ArbitrageExecutor / GridEngineImpl
+- 测量开仓/平仓端到端延迟、重试与撤单次数（重试风暴）、并发吞吐、网格批量挂单耗时
+
+场景（--scenario 可多次指定）：
+- arbitrage：两个模拟交易所（sim_a / sim_b），并发提交开仓 + 反向平仓请求
+             --mode limit_market（sim_a 限价先行，sim_b 市价对冲）或 market_market
+- grid：单个模拟交易所上的 GridEngineImpl.place_batch_orders（数百个并发限价单）
+
+延迟/拒单通过 --ack-ms / --notify-ms / --jitter-ms / --reject-rate / --timeout-rate /
+--cancel-reject-rate / --rate-limit 配置，--json PATH 输出机器可读报告（"-" 为标准输出）。
+
+用法：
+    python tools/perf_execution_benchmark.py --scenario arbitrage --mode market_market \\
+        --requests 200 --concurrency 50 --reject-rate 0.02 --json exec.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from perf_stream_benchmark import _git_revision, _summary
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument("--scenario", action="append", choices=["arbitrage", "grid"], help="压测场景（默认 arbitrage）")
+    p.add_argument("--mode", choices=["limit_market", "market_market"], default="market_market", help="套利下单模式")
+    p.add_argument("--symbol", default="BTC-USDC-PERP")
+    p.add_argument("--price", type=float, default=100000.0, help="模拟盘口初始中间价")
+    p.add_argument("--quantity", default="0.01", help="单笔数量")
+    p.add_argument("--requests", type=int, default=100, help="套利请求数（每个请求包含开仓+平仓）")
+    p.add_argument("--concurrency", type=int, default=20, help="并发请求数")
+    p.add_argument("--max-concurrent-orders", type=int, default=None, help="执行器每个交易所并发下单上限（默认=并发数）")
+    p.add_argument("--limit-timeout", type=int, default=5, help="限价单等待成交超时（秒）")
+    p.add_argument("--grid-orders", type=int, default=200, help="网格批量挂单数量")
+
+    # 模拟交易所参数
+    p.add_argument("--ack-ms", type=float, default=20.0, help="下单往返延迟（毫秒）")
+    p.add_argument("--cancel-ms", type=float, default=15.0, help="撤单往返延迟（毫秒）")
+    p.add_argument("--query-ms", type=float, default=10.0, help="REST 查询延迟（毫秒）")
+    p.add_argument("--notify-ms", type=float, default=5.0, help="成交推送延迟（毫秒）")
+    p.add_argument("--jitter-ms", type=float, default=5.0, help="延迟抖动（毫秒）")
+    p.add_argument("--reject-rate", type=float, default=0.0, help="下单拒绝概率")
+    p.add_argument("--timeout-rate", type=float, default=0.0, help="下单响应超时概率（订单已落地）")
+    p.add_argument("--cancel-reject-rate", type=float, default=0.0, help="撤单失败概率")
+    p.add_argument("--rate-limit", type=int, default=0, help="每秒下单上限（0=不限）")
+    p.add_argument("--book-interval", type=float, default=0.05, help="模拟盘口刷新间隔（秒）")
+    p.add_argument("--seed", type=int, default=7)
+    p.add_argument("--verbose", action="store_true", help="输出执行器日志到终端")
+    p.add_argument("--json", default=None, help="输出JSON报告到文件（'-' 表示标准输出）")
+    return p.parse_args()
+
+
+def _create_venue(args: argparse.Namespace, name: str, seed_offset: int, price_offset: float = 0.0):
+    from core.adapters.exchanges.factory import get_exchange_factory
+    from core.adapters.exchanges.interface import ExchangeConfig
+    from core.adapters.exchanges.models import ExchangeType
+
+    config = ExchangeConfig(
+        exchange_id=name,
+        name=name,
+        exchange_type=ExchangeType.PERPETUAL,
+        api_key="simulated",
+        api_secret="simulated",
+        enable_heartbeat=False,
+        extra_params={
+            "symbols": [args.symbol],
+            "initial_prices": {args.symbol: args.price * (1.0 + price_offset)},
+            "book_update_interval": args.book_interval,
+            "seed": args.seed + seed_offset,
+            "latency": {
+                "order_ack_ms": args.ack_ms,
+                "cancel_ack_ms": args.cancel_ms,
+                "query_ms": args.query_ms,
+                "notify_ms": args.notify_ms,
+                "jitter_ms": args.jitter_ms,
+            },
+            "rejection": {
+                "reject_rate": args.reject_rate,
+                "timeout_rate": args.timeout_rate,
+                "cancel_reject_rate": args.cancel_reject_rate,
+                "rate_limit_per_second": args.rate_limit,
+            },
+        },
+    )
+    return get_exchange_factory().create_adapter("simulated", config=config)
+
+
+async def _run_arbitrage(args: argparse.Namespace) -> Dict[str, Any]:
+    from core.services.arbitrage_monitor_v2.config.arbitrage_config import (
+        ExchangeOrderModeConfig,
+        ExchangeRateLimitConfig,
+        ExecutionConfig,
+        OrderExecutionConfig,
+    )
+    from core.services.arbitrage_monitor_v2.execution.arbitrage_executor import (
+        ArbitrageExecutor,
+        ExecutionRequest,
+    )
+
+    venues = {
+        "sim_a": _create_venue(args, "sim_a", 0),
+        "sim_b": _create_venue(args, "sim_b", 1, price_offset=0.001),
+    }
+    for adapter in venues.values():
+        await adapter.connect()
+
+    max_orders = args.max_concurrent_orders or args.concurrency
+    if args.mode == "limit_market":
+        order_modes = {
+            "sim_a": ExchangeOrderModeConfig(order_mode="limit", priority=1),
+            "sim_b": ExchangeOrderModeConfig(order_mode="market"),
+        }
+    else:
+        order_modes = {name: ExchangeOrderModeConfig(order_mode="market") for name in venues}
+    execution_config = ExecutionConfig(
+        default_order_mode=args.mode,
+        exchange_order_modes=order_modes,
+        exchange_rate_limits={
+            name: ExchangeRateLimitConfig(max_concurrent_orders=max_orders) for name in venues
+        },
+        order_execution=OrderExecutionConfig(
+            limit_order_timeout=args.limit_timeout,
+            round_pause_seconds=0,
+        ),
+    )
+    executor = ArbitrageExecutor(
+        execution_config,
+        venues,
+        monitor_only=False,
+        is_segmented_mode=True,
+    )
+    await executor.initialize_websocket_subscriptions()
+
+    quantity = Decimal(args.quantity)
+    samples: Dict[str, List[float]] = {"open": [], "close": [], "round_trip": []}
+    outcome = {"open_success": 0, "open_failed": 0, "close_success": 0, "close_failed": 0}
+    errors: Dict[str, int] = {}
+    semaphore = asyncio.Semaphore(max(1, args.concurrency))
+
+    async def _leg(buy: str, sell: str, is_open: bool):
+        book_buy = await venues[buy].get_orderbook(args.symbol)
+        book_sell = await venues[sell].get_orderbook(args.symbol)
+        request = ExecutionRequest(
+            symbol=args.symbol,
+            exchange_buy=buy,
+            exchange_sell=sell,
+            price_buy=book_buy.asks[0].price,
+            price_sell=book_sell.bids[0].price,
+            quantity=quantity,
+            is_open=is_open,
+            orderbook_buy_ask=book_buy.asks[0].price,
+            orderbook_buy_bid=book_buy.bids[0].price,
+            orderbook_sell_ask=book_sell.asks[0].price,
+            orderbook_sell_bid=book_sell.bids[0].price,
+        )
+        started = time.perf_counter()
+        result = await executor.execute_arbitrage(request)
+        return result, time.perf_counter() - started
+
+    async def _one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            result, elapsed = await _leg("sim_a", "sim_b", True)
+            samples["open"].append(elapsed)
+            if not result.success:
+                outcome["open_failed"] += 1
+                key = (result.error_message or "unknown")[:80]
+                errors[key] = errors.get(key, 0) + 1
+                return
+            outcome["open_success"] += 1
+            result, elapsed = await _leg("sim_b", "sim_a", False)
+            samples["close"].append(elapsed)
+            if result.success:
+                outcome["close_success"] += 1
+                samples["round_trip"].append(time.perf_counter() - started)
+            else:
+                outcome["close_failed"] += 1
+                key = (result.error_message or "unknown")[:80]
+                errors[key] = errors.get(key, 0) + 1
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*[_one() for _ in range(args.requests)])
+    wall = time.perf_counter() - wall_start
+
+    venue_stats = {name: adapter.get_simulation_stats() for name, adapter in venues.items()}
+    for adapter in venues.values():
+        await adapter.disconnect()
+
+    orders_sent = sum(s["orders_submitted"] for s in venue_stats.values())
+    legs = outcome["open_success"] + outcome["open_failed"] + outcome["close_success"] + outcome["close_failed"]
+    return {
+        "scenario": "arbitrage",
+        "mode": args.mode,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "wall_seconds": wall,
+        "executions_per_sec": legs / wall if wall > 0 else 0.0,
+        "outcome": outcome,
+        "errors": errors,
+        "latency_ms": {name: _summary(values, 1000.0) for name, values in samples.items()},
+        # 每个执行请求理论上 2 笔订单，超出部分即为重试/补单/紧急平仓
+        "orders_per_execution": orders_sent / legs if legs else 0.0,
+        "venues": venue_stats,
+    }
+
+
+async def _run_grid(args: argparse.Namespace) -> Dict[str, Any]:
+    from core.services.grid.implementations.grid_engine_impl import GridEngineImpl
+    from core.services.grid.models import GridConfig, GridOrder, GridOrderSide, GridOrderStatus, GridType
+
+    adapter = _create_venue(args, "sim_grid", 2)
+    await adapter.connect()
+
+    interval = Decimal(str(args.price)) * Decimal("0.0005")
+    half = args.grid_orders // 2
+    mid = Decimal(str(args.price))
+    config = GridConfig(
+        exchange="sim_grid",
+        symbol=args.symbol,
+        grid_type=GridType.LONG,
+        grid_interval=interval,
+        order_amount=Decimal(args.quantity),
+        lower_price=mid - interval * (half + 1),
+        upper_price=mid + interval * (args.grid_orders - half + 1),
+    )
+    engine = GridEngineImpl(adapter)
+    # 只测下单链路：不调用 initialize()，避免启动健康检查/价格监控等后台任务
+    engine.config = config
+    await adapter.subscribe_user_data(engine._on_order_update)
+
+    orders = []
+    now = datetime.now()
+    for i in range(args.grid_orders):
+        if i < half:
+            side, price = GridOrderSide.BUY, mid - interval * (i + 1)
+        else:
+            side, price = GridOrderSide.SELL, mid + interval * (i - half + 1)
+        orders.append(GridOrder(
+            order_id="",
+            grid_id=i + 1,
+            side=side,
+            price=price,
+            amount=Decimal(args.quantity),
+            status=GridOrderStatus.PENDING,
+            created_at=now,
+        ))
+
+    started = time.perf_counter()
+    placed = await engine.place_batch_orders(orders)
+    wall = time.perf_counter() - started
+    stats = adapter.get_simulation_stats()
+    await adapter.disconnect()
+
+    return {
+        "scenario": "grid",
+        "orders": args.grid_orders,
+        "placed": len(placed),
+        # place_batch_orders 内含批次间 0.5s 间隔与结束后 3s 的状态同步等待
+        "wall_seconds": wall,
+        "orders_per_sec": len(placed) / wall if wall > 0 else 0.0,
+        "venue": stats,
+    }
+
+
+async def main() -> int:
+    args = _parse_args()
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    runs = []
+    for scenario in args.scenario or ["arbitrage"]:
+        if scenario == "arbitrage":
+            report = await _run_arbitrage(args)
+            open_lat = report["latency_ms"]["open"]
+            close_lat = report["latency_ms"]["close"]
+            print(
+                f"📊 [arbitrage/{args.mode}] {report['executions_per_sec']:.1f} exec/s "
+                f"open p50/p99={open_lat['p50']:.1f}/{open_lat['p99']:.1f}ms "
+                f"close p50/p99={close_lat['p50']:.1f}/{close_lat['p99']:.1f}ms "
+                f"orders/exec={report['orders_per_execution']:.2f} outcome={report['outcome']}"
+            )
+        else:
+            report = await _run_grid(args)
+            print(
+                f"📊 [grid] placed={report['placed']}/{report['orders']} "
+                f"wall={report['wall_seconds']:.2f}s venue={report['venue']}"
+            )
+        runs.append(report)
+
+    if args.json:
+        payload = {
+            "meta": {
+                "generated_at": datetime.now().isoformat(),
+                "git_revision": _git_revision(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "args": {k: v for k, v in vars(args).items() if k != "json"},
+            },
+            "runs": runs,
+        }
+        text = json.dumps(payload, ensure_ascii=False, indent=2, default=str)
+        if args.json == "-":
+            print(text)
+        else:
+            Path(args.json).write_text(text, encoding="utf-8")
+            print(f"💾 JSON报告已写入: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+价差数值模式微基准（decimal vs float）
+
+目标：
+- 对比 SpreadCalculator 在 decimal / float 两种数值模式下的单次价差计算耗时
+- 模拟真实行情：每个 tick 只有部分交易所的最优档位变化（新建 OrderBookLevel），
+  其余交易所复用上一 tick 的档位对象（与 LocalOrderBook 的行为一致）
+- 同时测量 OrderBookLevel 构造（字符串价格）的开销
+
+用法：
+    python tools/perf_spread_numeric_benchmark.py --exchanges 4 --ticks 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument("--exchanges", type=int, default=4, help="交易所数量")
+    p.add_argument("--ticks", type=int, default=50000, help="模拟 tick 数")
+    p.add_argument("--changed", type=int, default=1, help="每个 tick 最优档位变化的交易所数量")
+    p.add_argument("--seed", type=int, default=7, help="随机种子")
+    return p.parse_args()
+
+
+def _build_ticks(exchanges: List[str], ticks: int, changed: int, seed: int) -> List[Dict[str, tuple]]:
+    """预生成每个 tick 的 (bid_price, bid_size, ask_price, ask_size) 字符串报价，排除报价生成本身的开销"""
+    rng = random.Random(seed)
+    mid = 65000.0
+    quotes = []
+    for _ in range(ticks):
+        mid += rng.uniform(-5, 5)
+        tick_quotes = {}
+        for exchange in rng.sample(exchanges, min(changed, len(exchanges))):
+            offset = rng.uniform(-3, 3)
+            bid = mid + offset - rng.uniform(0.1, 1.0)
+            ask = mid + offset + rng.uniform(0.1, 1.0)
+            tick_quotes[exchange] = (
+                f"{bid:.1f}", f"{rng.uniform(0.01, 2):.4f}",
+                f"{ask:.1f}", f"{rng.uniform(0.01, 2):.4f}",
+            )
+        quotes.append(tick_quotes)
+    return quotes
+
+
+def _run_mode(mode: str, exchanges: List[str], quotes: List[Dict[str, tuple]]) -> Dict[str, float]:
+    from core.adapters.exchanges.models import OrderBookData, OrderBookLevel
+    from core.services.arbitrage_monitor_v2.analysis.spread_calculator import SpreadCalculator
+    from core.services.arbitrage_monitor_v2.config.debug_config import DebugConfig
+
+    calculator = SpreadCalculator(DebugConfig(), numeric_mode=mode)
+    now = datetime.now()
+    books: Dict[str, OrderBookData] = {
+        exchange: OrderBookData(
+            symbol="BTC-USDC-PERP",
+            bids=[OrderBookLevel(price=Decimal("64999.5"), size=Decimal("1"))],
+            asks=[OrderBookLevel(price=Decimal("65000.5"), size=Decimal("1"))],
+            timestamp=now,
+        )
+        for exchange in exchanges
+    }
+
+    ingest_ns = 0
+    calc_ns = 0
+    spreads_total = 0
+    for tick_quotes in quotes:
+        t0 = time.perf_counter_ns()
+        for exchange, (bid_p, bid_s, ask_p, ask_s) in tick_quotes.items():
+            books[exchange] = OrderBookData(
+                symbol="BTC-USDC-PERP",
+                bids=[OrderBookLevel(price=bid_p, size=bid_s)],
+                asks=[OrderBookLevel(price=ask_p, size=ask_s)],
+                timestamp=now,
+            )
+        t1 = time.perf_counter_ns()
+        spreads = calculator.calculate_spreads_multi_exchange_directions("BTC-USDC-PERP", books)
+        # 模拟机会识别/payload 对价差结果的读取
+        for s in spreads:
+            if s.spread_pct > 0.05:
+                spreads_total += 1
+        t2 = time.perf_counter_ns()
+        ingest_ns += t1 - t0
+        calc_ns += t2 - t1
+
+    # 核心算术：只测盘口校验 + 价差计算（不含 SpreadData 构造），反映数值模式本身的差异
+    core_ns = 0
+    items = list(books.items())
+    for _ in range(len(quotes)):
+        t0 = time.perf_counter_ns()
+        for i, (_, ob_a) in enumerate(items):
+            if not calculator._validate_orderbook(ob_a):
+                continue
+            for _, ob_b in items[i + 1:]:
+                if not calculator._validate_orderbook(ob_b):
+                    continue
+                calculator._spread_between(ob_a.best_ask, ob_b.best_bid)
+                calculator._spread_between(ob_b.best_ask, ob_a.best_bid)
+        core_ns += time.perf_counter_ns() - t0
+
+    n = max(1, len(quotes))
+    return {
+        "ingest_us": ingest_ns / n / 1000.0,
+        "calc_us": calc_ns / n / 1000.0,
+        "core_us": core_ns / n / 1000.0,
+        "total_us": (ingest_ns + calc_ns) / n / 1000.0,
+        "hits": float(spreads_total),
+    }
+
+
+def main() -> int:
+    args = _parse_args()
+    exchanges = [f"ex{i}" for i in range(max(2, args.exchanges))]
+    quotes = _build_ticks(exchanges, args.ticks, max(1, args.changed), args.seed)
+
+    # 预热（避免首次导入/缓存影响结果）
+    _run_mode("decimal", exchanges, quotes[:1000])
+    _run_mode("float", exchanges, quotes[:1000])
+
+    results = {mode: _run_mode(mode, exchanges, quotes) for mode in ("decimal", "float")}
+
+    print(
+        f"交易所={len(exchanges)} tick={args.ticks} 每tick变化交易所={args.changed} "
+        f"方向数/tick={len(exchanges) * (len(exchanges) - 1)}"
+    )
+    print(
+        f"{'模式':<8} {'入库(us/tick)':>14} {'价差(us/tick)':>14} {'核心算术(us/tick)':>18} "
+        f"{'合计(us/tick)':>14} {'命中':>8}"
+    )
+    for mode, r in results.items():
+        print(
+            f"{mode:<8} {r['ingest_us']:>14.2f} {r['calc_us']:>14.2f} {r['core_us']:>18.2f} "
+            f"{r['total_us']:>14.2f} {int(r['hits']):>8}"
+        )
+
+    dec, flt = results["decimal"], results["float"]
+    if flt["calc_us"] > 0:
+        print(f"价差计算加速比: {dec['calc_us'] / flt['calc_us']:.2f}x")
+    if flt["core_us"] > 0:
+        print(f"核心算术加速比: {dec['core_us'] / flt['core_us']:.2f}x")
+    if dec["hits"] != flt["hits"]:
+        print(f"⚠️ 两种模式命中数不一致: decimal={int(dec['hits'])} float={int(flt['hits'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
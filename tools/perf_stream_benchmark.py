@@ -1,40 +1,108 @@
 #!/usr/bin/env python3
 """
-行情流性能基准测试（不启动 UI / 不做套利分析）
+行情流性能基准测试（不启动 UI）
 
 目标：
 - 关注 N 个币种、M 个交易所时，验证数据接收/入队/出队处理是否出现明显积压
 - 输出队列长度、丢包数量、以及“本地接收 -> 处理完成”的延迟统计（avg/p95/max）
+
+离线模式：
+- --record-dir DIR：实盘运行时同时录制各交易所原始 WebSocket 帧
+- --replay-dir DIR：不连接交易所，把录制的原始帧按 --speed 回放进同一条接收/处理链路
+- --synthetic：不连接交易所，由合成行情源（tools/perf_synthetic_feed.py）驱动真实的
+  DataReceiver 回调；可配置币种/交易所数量、深度、更新频率与突发场景（--scenario 可多次指定）
+
+分析链路（--analysis，合成模式默认开启）：
+- 按编排器的事件驱动方式消费脏 symbol：SpreadCalculator/SpreadMatrix → OpportunityFinder
+  → SpreadHistoryRecorder（写入临时目录）
+- 统计各阶段耗时分位数以及“接收 → 分析完成”的端到端延迟
+
+报告：
+- --json PATH（"-" 表示标准输出）：输出机器可读的结果，便于在版本之间比较
+  （吞吐、各阶段延迟分位数、队列峰值、丢弃/合并数量、GC/内存分配、RSS）
+
+用法：
+    python tools/perf_stream_benchmark.py --synthetic --config config/arbitrage/monitor_v2_all_90.yaml \\
+        --scenario steady --scenario burst --duration 20 --json bench.json
 """
 
 from __future__ import annotations
 
 import argparse
 import asyncio
+import gc
+import json
+import platform
+import resource
+import subprocess
 import sys
+import tempfile
 import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
 from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
 
 import yaml
 from dotenv import load_dotenv
 
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
 
 def _load_env() -> None:
-    env_path = Path(__file__).resolve().parent.parent / ".env"
+    env_path = ROOT / ".env"
     if env_path.exists():
         load_dotenv(env_path)
 
 
 def _parse_args() -> argparse.Namespace:
+    from perf_synthetic_feed import SCENARIOS
+
     p = argparse.ArgumentParser()
     p.add_argument(
         "--config",
         default="config/arbitrage/monitor_v2_all_10.yaml",
         help="监控配置文件路径（monitor_v2*.yaml）",
     )
-    p.add_argument("--duration", type=float, default=30.0, help="运行时长（秒）")
-    p.add_argument("--warmup", type=float, default=5.0, help="预热时长（秒，不计入统计）")
+    p.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="运行时长（秒，实盘/合成默认30；回放默认直到回放结束）",
+    )
+    p.add_argument("--warmup", type=float, default=5.0, help="预热时长（秒，不计入统计；回放模式忽略）")
     p.add_argument("--interval", type=float, default=5.0, help="统计输出间隔（秒）")
+    p.add_argument("--record-dir", default=None, help="录制原始WebSocket帧到该目录")
+    p.add_argument("--replay-dir", default=None, help="离线回放该目录下录制的原始帧（不连接交易所）")
+    p.add_argument("--speed", type=float, default=1.0, help="回放速度（1=原速，N=N倍速，0=最大速度）")
+    p.add_argument("--bbo-only", action="store_true", help="只订阅/回放BBO（订单簿回调只推送 TopOfBook）")
+
+    # 合成行情
+    p.add_argument("--synthetic", action="store_true", help="使用合成行情源（不连接交易所）")
+    p.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS.keys()),
+        help="合成行情场景（可多次指定，依次运行；默认 steady）",
+    )
+    p.add_argument("--symbols", type=int, default=None, help="合成币种数量（默认取配置文件中的全部币种）")
+    p.add_argument("--exchanges", default=None, help="合成交易所列表，逗号分隔（默认取配置文件）")
+    p.add_argument("--depth", type=int, default=10, help="合成订单簿每侧档位数")
+    p.add_argument("--rate", type=float, default=10.0, help="每个(交易所,币种)每秒订单簿更新数")
+    p.add_argument("--ticker-rate", type=float, default=1.0, help="每个(交易所,币种)每秒ticker更新数")
+    p.add_argument("--burst-multiplier", type=float, default=None, help="覆盖场景的突发倍数")
+    p.add_argument("--burst-period", type=float, default=None, help="覆盖场景的突发周期（秒）")
+    p.add_argument("--burst-length", type=float, default=None, help="覆盖场景的突发持续时间（秒）")
+    p.add_argument("--seed", type=int, default=7, help="随机种子")
+
+    # 分析链路与报告
+    p.add_argument("--analysis", action="store_true", help="同时运行价差/机会/历史记录链路（合成模式默认开启）")
+    p.add_argument("--no-history", action="store_true", help="分析链路不写历史记录")
+    p.add_argument("--tracemalloc", action="store_true", help="统计内存分配（开销较大，会拉低吞吐）")
+    p.add_argument("--json", default=None, help="输出JSON报告到文件（'-' 表示标准输出）")
     return p.parse_args()
 
 
@@ -92,75 +160,386 @@ def _load_exchange_config(exchange: str, config_path: Path):
     )
 
 
-async def main() -> int:
-    _load_env()
-    args = _parse_args()
+# ============= 统计工具 =============
 
-    # 让脚本可从任意目录执行
-    repo_root = Path(__file__).resolve().parent.parent
-    sys.path.insert(0, str(repo_root))
+def _summary(samples, scale: float = 1.0) -> Dict[str, float]:
+    """样本分位数（scale 用于单位换算）"""
+    data = sorted(samples)
+    n = len(data)
+    if n == 0:
+        return {"count": 0, "avg": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+    def _pct(q: float) -> float:
+        return data[min(n - 1, max(0, int(n * q + 0.5) - 1))] * scale
+
+    return {
+        "count": n,
+        "avg": sum(data) / n * scale,
+        "p50": _pct(0.50),
+        "p95": _pct(0.95),
+        "p99": _pct(0.99),
+        "max": data[-1] * scale,
+    }
 
+
+class AnalysisStage:
+    """按编排器的事件驱动方式运行 价差 → 机会 → 历史记录，并统计各阶段耗时"""
+
+    def __init__(self, processor, monitor_cfg, debug_cfg, recorder=None, max_samples: int = 50000):
+        from core.services.arbitrage_monitor_v2.analysis.opportunity_finder import OpportunityFinder
+        from core.services.arbitrage_monitor_v2.analysis.spread_calculator import SpreadCalculator
+        from core.services.arbitrage_monitor_v2.analysis.spread_matrix import SpreadMatrix
+
+        self.processor = processor
+        self.exchanges = list(monitor_cfg.exchanges)
+        self.calculator = SpreadCalculator(debug_cfg, numeric_mode=monitor_cfg.numeric_mode)
+        self.matrix = SpreadMatrix(exchanges=self.exchanges) if monitor_cfg.spread_matrix_enabled else None
+        self.finder = OpportunityFinder(monitor_cfg, debug_cfg)
+        self.recorder = recorder
+
+        self.samples: Dict[str, Deque[float]] = {
+            name: deque(maxlen=max_samples)
+            for name in ("spread_calc", "opportunity", "history_record", "tick_to_analysis", "batch")
+        }
+        self.counters = {"batches": 0, "symbols_analyzed": 0, "spreads": 0, "opportunities": 0}
+        self._task: Optional[asyncio.Task] = None
+
+    def reset(self) -> None:
+        for samples in self.samples.values():
+            samples.clear()
+        for key in self.counters:
+            self.counters[key] = 0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    async def _run(self) -> None:
+        processor = self.processor
+        perf = time.perf_counter
+        while True:
+            await processor.wait_for_dirty(timeout=0.5)
+            dirty = processor.pop_dirty_symbols()
+            if not dirty:
+                continue
+            batch_start = perf()
+            for idx, symbol in enumerate(dirty):
+                if idx % 3 == 0:
+                    await asyncio.sleep(0)
+                await self._analyze(symbol)
+            self.samples["batch"].append(perf() - batch_start)
+            self.counters["batches"] += 1
+
+    async def _analyze(self, symbol: str) -> None:
+        processor = self.processor
+        perf = time.perf_counter
+        orderbooks = {}
+        newest = None
+        for exchange in self.exchanges:
+            ob = processor.get_orderbook(exchange, symbol)
+            if ob:
+                orderbooks[exchange] = ob
+                received = getattr(ob, "received_timestamp", None)
+                if received is not None and (newest is None or received > newest):
+                    newest = received
+        if self.matrix is not None:
+            self.matrix.sync(symbol, orderbooks)
+        if len(orderbooks) < 2:
+            return
+
+        t0 = perf()
+        if self.matrix is not None:
+            spreads = self.matrix.spreads(symbol)
+        else:
+            spreads = self.calculator.calculate_spreads(symbol, orderbooks)
+        t1 = perf()
+
+        funding_rates = {}
+        for exchange in self.exchanges:
+            ticker = processor.get_ticker(exchange, symbol)
+            if ticker and getattr(ticker, "funding_rate", None) is not None:
+                funding_rates[exchange] = {symbol: float(ticker.funding_rate)}
+        opportunities = self.finder.find_opportunities(spreads, funding_rates)
+        t2 = perf()
+
+        if self.recorder is not None:
+            for spread in spreads:
+                funding_rate_buy = funding_rates.get(spread.exchange_buy, {}).get(symbol)
+                funding_rate_sell = funding_rates.get(spread.exchange_sell, {}).get(symbol)
+                funding_rate_diff = None
+                if funding_rate_buy is not None and funding_rate_sell is not None:
+                    funding_rate_diff = abs(funding_rate_sell - funding_rate_buy)
+                await self.recorder.record_spread({
+                    'symbol': spread.symbol,
+                    'exchange_buy': spread.exchange_buy,
+                    'exchange_sell': spread.exchange_sell,
+                    'price_buy': float(spread.price_buy),
+                    'price_sell': float(spread.price_sell),
+                    'spread_pct': spread.spread_pct,
+                    'funding_rate_buy': funding_rate_buy,
+                    'funding_rate_sell': funding_rate_sell,
+                    'funding_rate_diff': funding_rate_diff,
+                    'funding_rate_diff_annual': funding_rate_diff * 1095 * 100 if funding_rate_diff else None,
+                    'size_buy': float(spread.size_buy),
+                    'size_sell': float(spread.size_sell),
+                })
+            self.samples["history_record"].append(perf() - t2)
+
+        self.samples["spread_calc"].append(t1 - t0)
+        self.samples["opportunity"].append(t2 - t1)
+        if newest is not None:
+            self.samples["tick_to_analysis"].append((datetime.now() - newest).total_seconds())
+        self.counters["symbols_analyzed"] += 1
+        self.counters["spreads"] += len(spreads)
+        self.counters["opportunities"] += len(opportunities)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "latency_ms": {name: _summary(samples, 1000.0) for name, samples in self.samples.items()},
+        }
+
+
+class ResourceMonitor:
+    """RSS / GC / 内存分配统计"""
+
+    def __init__(self, trace_allocations: bool = False):
+        try:
+            import psutil
+            self._process = psutil.Process()
+        except Exception:
+            self._process = None
+        self.trace_allocations = trace_allocations
+        self.rss_start = self.rss()
+        self.rss_peak = self.rss_start
+        self._gc_start = [s.get("collections", 0) for s in gc.get_stats()]
+        if trace_allocations:
+            tracemalloc.start(10)
+
+    def rss(self) -> int:
+        if self._process is None:
+            return 0
+        try:
+            return int(self._process.memory_info().rss)
+        except Exception:
+            return 0
+
+    def sample(self) -> None:
+        rss = self.rss()
+        if rss > self.rss_peak:
+            self.rss_peak = rss
+
+    def reset(self) -> None:
+        """预热结束：重新计算 GC 次数与分配峰值"""
+        self._gc_start = [s.get("collections", 0) for s in gc.get_stats()]
+        if self.trace_allocations:
+            tracemalloc.reset_peak()
+
+    def report(self) -> Dict[str, Any]:
+        self.sample()
+        gc_now = [s.get("collections", 0) for s in gc.get_stats()]
+        result: Dict[str, Any] = {
+            "rss_start_mb": self.rss_start / 1048576,
+            "rss_end_mb": self.rss() / 1048576,
+            "rss_peak_mb": self.rss_peak / 1048576,
+            # Linux 下 ru_maxrss 单位为 KB
+            "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "gc_collections": {f"gen{i}": now - start for i, (now, start) in enumerate(zip(gc_now, self._gc_start))},
+        }
+        if self.trace_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics("lineno")[:10]
+            result["allocations"] = {
+                "traced_current_mb": current / 1048576,
+                "traced_peak_mb": peak / 1048576,
+                "top": [
+                    {"where": str(stat.traceback[0]), "size_kb": stat.size / 1024, "count": stat.count}
+                    for stat in top
+                ],
+            }
+            tracemalloc.stop()
+        return result
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=str(ROOT), capture_output=True, text=True, timeout=5,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _synthetic_symbols(config_symbols: List[str], count: Optional[int]) -> List[str]:
+    """取前 count 个配置币种，不足时补充合成币种"""
+    symbols = list(config_symbols)
+    if count is None:
+        return symbols
+    symbols = symbols[:count]
+    i = 0
+    while len(symbols) < count:
+        symbols.append(f"SYN{i}-USDC-PERP")
+        i += 1
+    return symbols
+
+
+# ============= 单次运行 =============
+
+async def _run_session(args: argparse.Namespace, config_path: Path, scenario: Optional[str]) -> Optional[Dict[str, Any]]:
     from core.adapters.exchanges.factory import ExchangeFactory
     from core.services.arbitrage_monitor_v2.config.monitor_config import ConfigManager
     from core.services.arbitrage_monitor_v2.config.debug_config import DebugConfig
     from core.services.arbitrage_monitor_v2.data.data_receiver import DataReceiver
     from core.services.arbitrage_monitor_v2.data.data_processor import DataProcessor
-
-    config_path = (repo_root / args.config).resolve() if not Path(args.config).is_absolute() else Path(args.config)
-    if not config_path.exists():
-        raise FileNotFoundError(f"配置文件不存在: {config_path}")
+    from core.services.arbitrage_monitor_v2.data.conflating_mailbox import ConflatingMailbox
+    from core.services.arbitrage_monitor_v2.data.frame_replay import MarketDataReplayer, RecordingSession
+    from core.services.arbitrage_monitor_v2.history import SpreadHistoryRecorder
+    from perf_synthetic_feed import SCENARIOS, BurstPattern, SyntheticFeedConfig, SyntheticMarketFeed
 
     cfg_mgr = ConfigManager(config_path)
     monitor_cfg = cfg_mgr.get_config()
     debug_cfg = DebugConfig.create_production()
 
-    orderbook_queue = asyncio.Queue(maxsize=monitor_cfg.orderbook_queue_size)
+    resources = ResourceMonitor(trace_allocations=args.tracemalloc)
+
+    orderbook_queue = ConflatingMailbox()
     ticker_queue = asyncio.Queue(maxsize=monitor_cfg.ticker_queue_size)
     receiver = DataReceiver(orderbook_queue, ticker_queue, debug_cfg)
     processor = DataProcessor(orderbook_queue, ticker_queue, debug_cfg, scroller=None)
 
-    factory = ExchangeFactory()
-
-    # 1) 创建/连接适配器（尽量多连，失败不阻断）
-    adapters = {}
-    for ex in monitor_cfg.exchanges:
-        ex_cfg_path = repo_root / f"config/exchanges/{ex}_config.yaml"
-        if not ex_cfg_path.exists():
-            print(f"⚠️  [{ex}] 缺少配置文件: {ex_cfg_path}（跳过）")
-            continue
-        try:
-            ex_cfg = _load_exchange_config(ex, ex_cfg_path)
-            adapters[ex] = factory.create_adapter(exchange_id=ex, config=ex_cfg)
-        except Exception as e:
-            print(f"❌ [{ex}] 创建适配器失败: {e}")
-
-    async def _connect_one(name: str, adapter):
-        try:
-            ok = await adapter.connect()
-            if ok is False:
-                raise RuntimeError("connect() returned False")
-            receiver.register_adapter(name, adapter)
-            return name, True, None
-        except Exception as e:
-            return name, False, e
-
-    results = await asyncio.gather(*[_connect_one(n, a) for n, a in adapters.items()])
-    connected = [n for (n, ok, _) in results if ok]
-    failed = [(n, err) for (n, ok, err) in results if not ok]
-
-    print(f"✅ 已连接交易所: {connected}")
-    if failed:
-        print("⚠️  连接失败交易所:")
-        for n, err in failed:
-            print(f"  - {n}: {err}")
-
-    if len(connected) < 1:
-        print("❌ 没有任何交易所连接成功，结束")
-        return 2
-
-    # 2) 订阅行情
-    await receiver.subscribe_all(monitor_cfg.symbols)
-    await processor.start()
+    mode = "replay" if args.replay_dir else ("synthetic" if args.synthetic else "live")
+    duration = args.duration if args.duration is not None else (None if mode == "replay" else 30.0)
+    warmup = 0.0 if mode == "replay" else args.warmup
+
+    replayer = None
+    feed = None
+    source_task = None
+    recording = None
+    feed_info: Dict[str, Any] = {}
+
+    if mode == "synthetic":
+        # 1'') 合成行情：交易所/币种规模可覆盖配置文件
+        if args.exchanges:
+            monitor_cfg.exchanges = [ex.strip() for ex in args.exchanges.split(",") if ex.strip()]
+        monitor_cfg.symbols = _synthetic_symbols(monitor_cfg.symbols, args.symbols)
+        base = SCENARIOS[scenario or "steady"]
+        pattern = BurstPattern(
+            name=base.name,
+            multiplier=args.burst_multiplier if args.burst_multiplier is not None else base.multiplier,
+            period=args.burst_period if args.burst_period is not None else base.period,
+            length=args.burst_length if args.burst_length is not None else base.length,
+        )
+        feed = SyntheticMarketFeed(
+            SyntheticFeedConfig(
+                exchanges=list(monitor_cfg.exchanges),
+                symbols=list(monitor_cfg.symbols),
+                depth=args.depth,
+                orderbook_rate=args.rate,
+                ticker_rate=args.ticker_rate,
+                pattern=pattern,
+                seed=args.seed,
+            ),
+            receiver,
+        )
+        feed_info = {
+            "scenario": pattern.name,
+            "pattern": {"multiplier": pattern.multiplier, "period": pattern.period, "length": pattern.length},
+            "depth": args.depth,
+            "orderbook_rate_per_pair": args.rate,
+            "ticker_rate_per_pair": args.ticker_rate,
+            "target_orderbook_rate": feed.target_orderbook_rate,
+        }
+        print(
+            f"🧪 合成行情[{pattern.name}]: {len(monitor_cfg.exchanges)} 交易所 × {len(monitor_cfg.symbols)} 币种，"
+            f"目标 {feed.target_orderbook_rate:.0f} ob/s"
+        )
+        await processor.start()
+        source_task = asyncio.create_task(feed.run(warmup + duration))
+    elif mode == "replay":
+        # 1') 离线回放：构造解析对象并注册接收回调
+        replayer = MarketDataReplayer(args.replay_dir, receiver, speed=args.speed, bbo_only=args.bbo_only)
+        replay_exchanges = replayer.setup()
+        if not replay_exchanges:
+            print(f"❌ 回放目录中没有可回放的交易所: {args.replay_dir}")
+            return None
+        speed_desc = f"{args.speed:g}x" if args.speed > 0 else "max"
+        print(f"▶️  回放交易所: {replay_exchanges}（speed={speed_desc}）")
+        monitor_cfg.exchanges = replay_exchanges
+        feed_info = {"replay_dir": str(args.replay_dir), "speed": args.speed}
+        await processor.start()
+        source_task = asyncio.create_task(replayer.run())
+    else:
+        factory = ExchangeFactory()
+
+        # 1) 创建/连接适配器（尽量多连，失败不阻断）
+        adapters = {}
+        for ex in monitor_cfg.exchanges:
+            ex_cfg_path = ROOT / f"config/exchanges/{ex}_config.yaml"
+            if not ex_cfg_path.exists():
+                print(f"⚠️  [{ex}] 缺少配置文件: {ex_cfg_path}（跳过）")
+                continue
+            try:
+                ex_cfg = _load_exchange_config(ex, ex_cfg_path)
+                adapters[ex] = factory.create_adapter(exchange_id=ex, config=ex_cfg)
+            except Exception as e:
+                print(f"❌ [{ex}] 创建适配器失败: {e}")
+
+        async def _connect_one(name: str, adapter):
+            try:
+                ok = await adapter.connect()
+                if ok is False:
+                    raise RuntimeError("connect() returned False")
+                receiver.register_adapter(name, adapter)
+                return name, True, None
+            except Exception as e:
+                return name, False, e
+
+        results = await asyncio.gather(*[_connect_one(n, a) for n, a in adapters.items()])
+        connected = [n for (n, ok, _) in results if ok]
+        failed = [(n, err) for (n, ok, err) in results if not ok]
+
+        print(f"✅ 已连接交易所: {connected}")
+        if failed:
+            print("⚠️  连接失败交易所:")
+            for n, err in failed:
+                print(f"  - {n}: {err}")
+
+        if len(connected) < 1:
+            print("❌ 没有任何交易所连接成功，结束")
+            return None
+
+        # 录制需在订阅之前开始，才能录到订阅确认时推送的订单簿快照
+        if args.record_dir:
+            recording = RecordingSession(args.record_dir, {n: adapters[n] for n in connected})
+            recording.start()
+            print(f"🎙️  录制原始帧: {recording.exchanges} -> {args.record_dir}")
+
+        # 2) 订阅行情
+        await receiver.subscribe_all(monitor_cfg.symbols, bbo_only=args.bbo_only)
+        if recording:
+            recording.save_context()
+        await processor.start()
+
+    # 分析链路（价差 → 机会 → 历史记录）
+    analysis = None
+    recorder = None
+    history_dir = None
+    if args.analysis or mode == "synthetic":
+        if not args.no_history:
+            history_dir = tempfile.TemporaryDirectory(prefix="perf_history_")
+            recorder = SpreadHistoryRecorder(data_dir=history_dir.name, columnar_archive_enabled=False)
+            await recorder.start()
+        analysis = AnalysisStage(processor, monitor_cfg, debug_cfg, recorder=recorder)
+        analysis.start()
 
     # 3) 运行并输出统计
     start = time.time()
@@ -175,13 +554,20 @@ async def main() -> int:
         "ob_proc": 0,
         "tk_proc": 0,
     }
+    baseline = dict(last)
+    baseline_coalesced = 0
+    baseline_sent = (0, 0)
+    window_start = start
+    ticker_queue_peak = 0
 
     try:
         while True:
             now = time.time()
+            resources.sample()
+            ticker_queue_peak = max(ticker_queue_peak, ticker_queue.qsize())
 
             # 预热：清掉启动阶段的积压与异常长尾样本
-            if not warmed and (now - start) >= args.warmup:
+            if not warmed and (now - start) >= warmup:
                 try:
                     processor._orderbook_delay_ms.clear()
                     processor._ticker_delay_ms.clear()
@@ -197,13 +583,33 @@ async def main() -> int:
                     "ob_proc": int(ps.get("orderbook_processed", 0)),
                     "tk_proc": int(ps.get("ticker_processed", 0)),
                 }
+                baseline = dict(last)
+                baseline_coalesced = orderbook_queue.coalesced_total
+                orderbook_queue.peak = orderbook_queue.qsize()
+                ticker_queue_peak = ticker_queue.qsize()
+                if feed is not None:
+                    feed.callback_ns.clear()
+                    baseline_sent = (feed.orderbooks_sent, feed.tickers_sent)
+                if analysis is not None:
+                    analysis.reset()
+                resources.reset()
                 start = now
+                window_start = now
                 last_print_at = now
                 next_print = now
                 warmed = True
-                print(f"✅ 预热完成，开始统计（duration={args.duration}s）")
-
-            if warmed and (now - start) >= args.duration:
+                if warmup > 0:
+                    print(f"✅ 预热完成，开始统计（duration={duration}s）")
+
+            source_done = source_task is not None and source_task.done()
+            if source_done:
+                # 数据源结束：等处理器消费完剩余数据，输出最后一行统计
+                for _ in range(50):
+                    if processor.orderbook_queue.empty() and processor.ticker_queue.empty():
+                        break
+                    await asyncio.sleep(0.02)
+                next_print = now
+            elif warmed and duration is not None and (now - start) >= duration:
                 break
             if now >= next_print:
                 rs = receiver.get_stats()
@@ -223,6 +629,7 @@ async def main() -> int:
                 print(
                     f"[{now - start:6.1f}s] "
                     f"Q(ob/tk)={ps.get('orderbook_queue_size')}/{ps.get('ticker_queue_size')} "
+                    f"coalesced={ps.get('orderbook_coalesced_total', 0)} "
                     f"drop(ob/tk)={ob_drop}/{tk_drop} "
                     f"rps(ob/tk)={ob_rps:.0f}/{tk_rps:.0f} "
                     f"delay_ms(ob avg/p95/max)={ps.get('orderbook_delay_avg_ms'):.1f}/"
@@ -242,10 +649,143 @@ async def main() -> int:
                 last_print_at = now
                 next_print = now + args.interval
 
+            if source_done:
+                break
             await asyncio.sleep(0.2)
     finally:
+        window = max(1e-9, time.time() - window_start)
+        if source_task is not None and not source_task.done():
+            source_task.cancel()
+            try:
+                await source_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if analysis is not None:
+            await analysis.stop()
+        if replayer is not None:
+            print(f"▶️  回放统计: {replayer.stats.to_dict()}")
+        if recording is not None:
+            recording.close()
+            print(f"🎙️  录制统计: {recording.get_stats()}")
+
+        rs = receiver.get_stats()
+        ps = processor.get_stats()
         await processor.stop()
         await receiver.cleanup()
+        history_stats = None
+        if recorder is not None:
+            history_stats = recorder.get_stats()
+            await recorder.stop()
+        if history_dir is not None:
+            history_dir.cleanup()
+
+    # 4) 汇总报告
+    ob_recv = int(rs.get("orderbook_received", 0)) - baseline["ob_recv"]
+    tk_recv = int(rs.get("ticker_received", 0)) - baseline["tk_recv"]
+    report: Dict[str, Any] = {
+        "mode": mode,
+        "scenario": scenario,
+        "exchanges": list(monitor_cfg.exchanges),
+        "symbols": len(monitor_cfg.symbols),
+        "window_seconds": window,
+        "source": feed_info,
+        "throughput": {
+            "orderbook_received": ob_recv,
+            "ticker_received": tk_recv,
+            "orderbook_msgs_per_sec": ob_recv / window,
+            "ticker_msgs_per_sec": tk_recv / window,
+        },
+        "latency_ms": {
+            "queue_to_processed": {
+                "avg": ps.get("orderbook_delay_avg_ms"),
+                "p95": ps.get("orderbook_delay_p95_ms"),
+                "max": ps.get("orderbook_delay_max_ms"),
+                "count": ps.get("orderbook_delay_samples"),
+            },
+            "ticker_queue_to_processed": {
+                "avg": ps.get("ticker_delay_avg_ms"),
+                "p95": ps.get("ticker_delay_p95_ms"),
+                "max": ps.get("ticker_delay_max_ms"),
+                "count": ps.get("ticker_delay_samples"),
+            },
+        },
+        "queues": {
+            "orderbook_peak": orderbook_queue.peak,
+            "ticker_peak": ticker_queue_peak,
+            "orderbook_coalesced": orderbook_queue.coalesced_total - baseline_coalesced,
+        },
+        "drops": {
+            "orderbook": int(rs.get("orderbook_dropped", 0)) - baseline["ob_drop"],
+            "ticker": int(rs.get("ticker_dropped", 0)) - baseline["tk_drop"],
+        },
+        "processing_errors": ps.get("processing_errors", 0),
+    }
+    if feed is not None:
+        sent_ob = feed.orderbooks_sent - baseline_sent[0]
+        sent_tk = feed.tickers_sent - baseline_sent[1]
+        report["throughput"].update({
+            "orderbook_sent": sent_ob,
+            "ticker_sent": sent_tk,
+            "orderbook_sent_per_sec": sent_ob / window,
+            "generator_max_step_lag_ms": feed.max_step_lag * 1000.0,
+        })
+        report["latency_ms"]["ingest_callback"] = _summary(feed.callback_ns, 1e-6)
+    if replayer is not None:
+        report["replay"] = replayer.stats.to_dict()
+    if analysis is not None:
+        report["analysis"] = analysis.report()
+    if history_stats is not None:
+        report["history"] = history_stats
+    report["resources"] = resources.report()
+    return report
+
+
+async def main() -> int:
+    _load_env()
+    args = _parse_args()
+
+    config_path = (ROOT / args.config).resolve() if not Path(args.config).is_absolute() else Path(args.config)
+    if not config_path.exists():
+        raise FileNotFoundError(f"配置文件不存在: {config_path}")
+
+    scenarios: List[Optional[str]] = (args.scenario or ["steady"]) if args.synthetic else [None]
+    runs = []
+    for scenario in scenarios:
+        report = await _run_session(args, config_path, scenario)
+        if report is None:
+            return 2
+        runs.append(report)
+        analysis = report.get("analysis")
+        print(
+            f"📊 [{report['mode']}{'/' + scenario if scenario else ''}] "
+            f"ob={report['throughput']['orderbook_msgs_per_sec']:.0f}/s "
+            f"peak(ob/tk)={report['queues']['orderbook_peak']}/{report['queues']['ticker_peak']} "
+            f"coalesced={report['queues']['orderbook_coalesced']} "
+            + (
+                f"tick→analysis p95={analysis['latency_ms']['tick_to_analysis']['p95']:.2f}ms "
+                if analysis else ""
+            )
+            + f"rss_peak={report['resources']['rss_peak_mb']:.0f}MB"
+        )
+
+    if args.json:
+        payload = {
+            "meta": {
+                "generated_at": datetime.now().isoformat(),
+                "git_revision": _git_revision(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "config": str(config_path.relative_to(ROOT) if config_path.is_relative_to(ROOT) else config_path),
+                "args": {k: v for k, v in vars(args).items() if k != "json"},
+            },
+            "runs": runs,
+        }
+        text = json.dumps(payload, ensure_ascii=False, indent=2, default=str)
+        if args.json == "-":
+            print(text)
+        else:
+            Path(args.json).write_text(text, encoding="utf-8")
+            print(f"💾 JSON报告已写入: {args.json}")
 
     return 0
 
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+合成行情源（离线基准测试用）
+
+- 按配置的交易所 × 币种生成随机游走盘口（可配置深度、更新频率、突发模式）
+- 使用交易所原生符号调用 DataReceiver 的真实回调（包含符号转换、校验、入队）
+- 按时间积分发送：事件循环被拖慢时自动追赶，实际发送速率与目标速率可对照
+
+由 tools/perf_stream_benchmark.py --synthetic 使用。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Deque, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.adapters.exchanges.models import OrderBookData, OrderBookLevel, TickerData
+
+
+@dataclass
+class BurstPattern:
+    """突发模式：每 period 秒中有 length 秒速率乘以 multiplier"""
+    name: str
+    multiplier: float = 1.0
+    period: float = 0.0
+    length: float = 0.0
+
+    def factor(self, elapsed: float) -> float:
+        if self.multiplier == 1.0 or self.period <= 0 or self.length <= 0:
+            return 1.0
+        return self.multiplier if (elapsed % self.period) < self.length else 1.0
+
+    def average_factor(self) -> float:
+        if self.multiplier == 1.0 or self.period <= 0 or self.length <= 0:
+            return 1.0
+        share = min(self.length, self.period) / self.period
+        return 1.0 + (self.multiplier - 1.0) * share
+
+
+# 预置场景
+SCENARIOS: Dict[str, BurstPattern] = {
+    "steady": BurstPattern("steady"),
+    "burst": BurstPattern("burst", multiplier=10.0, period=5.0, length=1.0),
+    "spike": BurstPattern("spike", multiplier=50.0, period=10.0, length=0.2),
+}
+
+
+@dataclass
+class SyntheticFeedConfig:
+    """合成行情配置"""
+    exchanges: List[str]
+    symbols: List[str]                 # 标准符号（BTC-USDC-PERP）
+    depth: int = 10                    # 每侧档位数
+    orderbook_rate: float = 10.0       # 每个 (交易所, 币种) 每秒订单簿更新数
+    ticker_rate: float = 1.0           # 每个 (交易所, 币种) 每秒 ticker 更新数
+    pattern: BurstPattern = field(default_factory=lambda: SCENARIOS["steady"])
+    seed: int = 7
+    tick_interval: float = 0.002       # 发送循环步长（秒）
+
+
+class SyntheticMarketFeed:
+    """向 DataReceiver 回调推送合成订单簿 / ticker"""
+
+    def __init__(self, config: SyntheticFeedConfig, receiver, latency_samples: int = 20000):
+        """
+        Args:
+            config: 合成行情配置
+            receiver: DataReceiver
+            latency_samples: 回调耗时样本保留数量
+        """
+        self.config = config
+        self.receiver = receiver
+        self._rng = random.Random(config.seed)
+
+        self._targets: List[Tuple[str, str, str]] = []   # (exchange, std_symbol, native_symbol)
+        self._ob_callbacks = {}
+        self._tk_callbacks = {}
+        for exchange in config.exchanges:
+            self._ob_callbacks[exchange] = receiver._create_orderbook_callback(exchange)
+            self._tk_callbacks[exchange] = receiver._create_ticker_callback(exchange)
+            for symbol in config.symbols:
+                try:
+                    native = receiver.symbol_converter.convert_to_exchange(symbol, exchange)
+                except Exception:
+                    native = symbol
+                self._targets.append((exchange, symbol, native or symbol))
+
+        # 每个币种一个随机游走中间价，各交易所在其上叠加小幅偏移
+        self._mid: Dict[str, float] = {
+            symbol: self._rng.uniform(0.5, 50000.0) for symbol in config.symbols
+        }
+        self._offset: Dict[Tuple[str, str], float] = {
+            (exchange, symbol): self._rng.uniform(-0.002, 0.002)
+            for exchange, symbol, _ in self._targets
+        }
+
+        self.orderbooks_sent = 0
+        self.tickers_sent = 0
+        self.max_step_lag = 0.0
+        self.callback_ns: Deque[int] = deque(maxlen=latency_samples)
+
+    # ============= 数据生成 =============
+
+    def _book(self, exchange: str, symbol: str, native: str) -> OrderBookData:
+        rng = self._rng
+        mid = self._mid[symbol] * (1.0 + rng.gauss(0.0, 0.0002))
+        self._mid[symbol] = mid
+        mid *= 1.0 + self._offset[(exchange, symbol)]
+        tick = mid * 0.0001
+        bids = [
+            OrderBookLevel(price=Decimal(f"{mid - tick * (i + 1):.6g}"), size=Decimal(f"{rng.uniform(0.01, 5):.4f}"))
+            for i in range(self.config.depth)
+        ]
+        asks = [
+            OrderBookLevel(price=Decimal(f"{mid + tick * (i + 1):.6g}"), size=Decimal(f"{rng.uniform(0.01, 5):.4f}"))
+            for i in range(self.config.depth)
+        ]
+        now = datetime.now()
+        return OrderBookData(symbol=native, bids=bids, asks=asks, timestamp=now, exchange_timestamp=now)
+
+    def _ticker(self, exchange: str, symbol: str, native: str) -> TickerData:
+        mid = self._mid[symbol]
+        return TickerData(
+            symbol=native,
+            timestamp=datetime.now(),
+            last=Decimal(f"{mid:.6g}"),
+            funding_rate=Decimal(f"{self._rng.uniform(-0.0005, 0.0005):.6f}"),
+        )
+
+    # ============= 发送 =============
+
+    def _emit_orderbook(self) -> None:
+        exchange, symbol, native = self._targets[self._rng.randrange(len(self._targets))]
+        book = self._book(exchange, symbol, native)
+        started = time.perf_counter_ns()
+        self._ob_callbacks[exchange](native, book)
+        self.callback_ns.append(time.perf_counter_ns() - started)
+        self.orderbooks_sent += 1
+
+    def _emit_ticker(self) -> None:
+        exchange, symbol, native = self._targets[self._rng.randrange(len(self._targets))]
+        self._tk_callbacks[exchange](native, self._ticker(exchange, symbol, native))
+        self.tickers_sent += 1
+
+    @property
+    def target_orderbook_rate(self) -> float:
+        """平均目标订单簿速率（条/秒，含突发）"""
+        return len(self._targets) * self.config.orderbook_rate * self.config.pattern.average_factor()
+
+    async def run(self, duration: float) -> None:
+        """按目标速率发送 duration 秒"""
+        cfg = self.config
+        pairs = len(self._targets)
+        ob_rate = pairs * cfg.orderbook_rate
+        tk_rate = pairs * cfg.ticker_rate
+
+        start = time.perf_counter()
+        last = start
+        ob_budget = 0.0
+        tk_budget = 0.0
+        while True:
+            now = time.perf_counter()
+            elapsed = now - start
+            if elapsed >= duration:
+                break
+            step = now - last
+            last = now
+            if step - cfg.tick_interval > self.max_step_lag:
+                self.max_step_lag = step - cfg.tick_interval
+
+            factor = cfg.pattern.factor(elapsed)
+            ob_budget += ob_rate * factor * step
+            tk_budget += tk_rate * step
+            while ob_budget >= 1.0:
+                self._emit_orderbook()
+                ob_budget -= 1.0
+            while tk_budget >= 1.0:
+                self._emit_ticker()
+                tk_budget -= 1.0
+
+            await asyncio.sleep(cfg.tick_interval)
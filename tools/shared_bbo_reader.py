@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+共享内存 BBO 表读取工具
+
+读取 DataProcessor 写入的 mmap BBO 表（performance.shared_bbo_enabled: true），
+用于查看实时盘口或测量跨进程读取延迟。
+
+用法：
+    python tools/shared_bbo_reader.py                       # 打印全表一次
+    python tools/shared_bbo_reader.py --watch 1             # 每秒刷新
+    python tools/shared_bbo_reader.py --symbol BTC-USDC-PERP
+    python tools/shared_bbo_reader.py --bench 200000        # 测量单次 get() 耗时
+
+读端只依赖标准库：这里直接按文件路径加载 shared_bbo.py，不导入监控系统的其它模块。
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import math
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+_MODULE_PATH = ROOT / "core" / "services" / "arbitrage_monitor_v2" / "data" / "shared_bbo.py"
+
+_spec = importlib.util.spec_from_file_location("shared_bbo", _MODULE_PATH)
+shared_bbo = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(shared_bbo)
+
+
+def _fmt(value: float, digits: int = 6) -> str:
+    return "-" if math.isnan(value) else f"{value:.{digits}g}"
+
+
+def _print_table(reader, symbol: str | None) -> None:
+    rows = sorted(reader.snapshot().values(), key=lambda r: (r.symbol, r.exchange))
+    if symbol:
+        rows = [row for row in rows if row.symbol == symbol]
+    print(f"{'交易对':<20} {'交易所':<12} {'买一':>12} {'卖一':>12} {'价差%':>9} {'资金费率':>11} {'更新次数':>9} {'延迟ms':>9}")
+    for row in rows:
+        print(
+            f"{row.symbol:<20} {row.exchange:<12} {_fmt(row.bid):>12} {_fmt(row.ask):>12} "
+            f"{_fmt(row.spread_pct, 4):>9} {_fmt(row.funding_rate, 4):>11} {row.updates:>9} "
+            f"{row.age_seconds * 1000:>9.1f}"
+        )
+    print(f"共 {len(rows)} 条 | 写端存活: {reader.writer_alive()}")
+
+
+def _bench(reader, iterations: int) -> None:
+    keys = reader.keys()
+    if not keys:
+        print("表为空，无法测试")
+        return
+    exchange, symbol = keys[0]
+    get = reader.get
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        get(exchange, symbol)
+    elapsed = time.perf_counter_ns() - start
+    print(f"get({exchange}, {symbol}) × {iterations}: 平均 {elapsed / iterations:.0f} ns/次")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="共享内存 BBO 表读取工具")
+    parser.add_argument("--path", default=shared_bbo.DEFAULT_PATH, help="BBO 表文件路径")
+    parser.add_argument("--symbol", help="只显示指定交易对")
+    parser.add_argument("--watch", type=float, default=0.0, help="刷新间隔（秒），0 表示只打印一次")
+    parser.add_argument("--bench", type=int, default=0, help="测量 get() 耗时的迭代次数")
+    args = parser.parse_args()
+
+    try:
+        reader = shared_bbo.SharedBBOReader(args.path)
+    except (OSError, ValueError) as e:
+        print(f"❌ 无法打开 BBO 表: {e}")
+        return 1
+
+    try:
+        if args.bench:
+            _bench(reader, args.bench)
+            return 0
+        while True:
+            _print_table(reader, args.symbol)
+            if args.watch <= 0:
+                return 0
+            time.sleep(args.watch)
+            print()
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())